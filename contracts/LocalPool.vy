@@ -0,0 +1,12 @@
+# @version 0.3.10
+"""
+@title Placeholder pool for the local backend
+@notice Sits at the derived Uniswap V3 pool address so pool discovery finds it;
+        trading happens in LocalRouter
+"""
+
+
+@external
+@view
+def liquidity() -> uint128:
+    return 10**24
@@ -0,0 +1,221 @@
+# @version 0.3.10
+"""
+@title Minimal SwapRouter02 and QuoterV2 for the local backend
+@notice Each token has one reserve held by the router; a swap prices
+        token_in -> token_out as a constant-product pair of those reserves.
+        The same code serves as the quoter, reading the router's reserves.
+"""
+
+interface ERC20:
+    def transfer(_to: address, _value: uint256) -> bool: nonpayable
+    def transferFrom(_from: address, _to: address, _value: uint256) -> bool: nonpayable
+    def balanceOf(_owner: address) -> uint256: view
+
+interface WETH9:
+    def deposit(): payable
+    def withdraw(_wad: uint256): nonpayable
+
+interface ReserveHolder:
+    def reserves(_token: address) -> uint256: view
+
+struct ExactInputSingleParams:
+    tokenIn: address
+    tokenOut: address
+    fee: uint24
+    recipient: address
+    amountIn: uint256
+    amountOutMinimum: uint256
+    sqrtPriceLimitX96: uint160
+
+struct ExactInputParams:
+    path: Bytes[MAX_PATH]
+    recipient: address
+    amountIn: uint256
+    amountOutMinimum: uint256
+
+struct QuoteExactInputSingleParams:
+    tokenIn: address
+    tokenOut: address
+    amountIn: uint256
+    fee: uint24
+    sqrtPriceLimitX96: uint160
+
+MSG_SENDER: constant(address) = 0x0000000000000000000000000000000000000001
+ADDRESS_THIS: constant(address) = 0x0000000000000000000000000000000000000002
+FEE_DENOMINATOR: constant(uint256) = 1000000
+GAS_PER_HOP: constant(uint256) = 100000
+MAX_HOPS: constant(uint256) = 4
+MAX_PATH: constant(uint256) = 112  # 20 + 23 * MAX_HOPS
+MAX_CALLS: constant(uint256) = 8
+
+WETH: public(address)
+pool: public(address)  # Holder of the reserves: the router itself, or for the quoter the router
+reserves: public(HashMap[address, uint256])
+
+
+@external
+def setup(_weth: address, _pool: address):
+    assert self.WETH == empty(address), "already set up"
+    self.WETH = _weth
+    self.pool = _pool
+
+
+@external
+def sync(_token: address):
+    """
+    @notice Adopt the router's current balance of a token as its reserve
+    """
+    self.reserves[_token] = ERC20(_token).balanceOf(self)
+
+
+@external
+@payable
+def __default__():
+    pass
+
+
+@internal
+@pure
+def _amount_out(_reserve_in: uint256, _reserve_out: uint256, _amount_in: uint256, _fee: uint24) -> uint256:
+    assert _reserve_in > 0 and _reserve_out > 0, "No pool"
+    with_fee: uint256 = _amount_in * (FEE_DENOMINATOR - convert(_fee, uint256))
+    return with_fee * _reserve_out / (_reserve_in * FEE_DENOMINATOR + with_fee)
+
+
+@internal
+@pure
+def _token_at(_path: Bytes[MAX_PATH], _offset: uint256) -> address:
+    return convert(convert(slice(_path, _offset, 20), bytes20), address)
+
+
+@internal
+@pure
+def _fee_at(_path: Bytes[MAX_PATH], _offset: uint256) -> uint24:
+    return convert(convert(slice(_path, _offset, 3), bytes3), uint24)
+
+
+@internal
+@pure
+def _hops(_path: Bytes[MAX_PATH]) -> uint256:
+    assert len(_path) >= 43 and (len(_path) - 20) % 23 == 0, "Invalid path"
+    return (len(_path) - 20) / 23
+
+
+@internal
+def _pay_in(_token: address, _amount: uint256):
+    # ETH sent with the call is wrapped; anything else is pulled from the caller
+    if _token == self.WETH and self.balance >= _amount:
+        WETH9(_token).deposit(value=_amount)
+    else:
+        assert ERC20(_token).transferFrom(msg.sender, self, _amount), "STF"
+
+
+@internal
+def _pay_out(_token: address, _recipient: address, _amount: uint256):
+    if _recipient == ADDRESS_THIS:
+        return
+    recipient: address = _recipient
+    if _recipient == MSG_SENDER:
+        recipient = msg.sender
+    assert ERC20(_token).transfer(recipient, _amount), "ST"
+
+
+@internal
+def _swap(_token_in: address, _token_out: address, _fee: uint24, _amount_in: uint256) -> uint256:
+    reserve_in: uint256 = self.reserves[_token_in]
+    reserve_out: uint256 = self.reserves[_token_out]
+    amount_out: uint256 = self._amount_out(reserve_in, reserve_out, _amount_in, _fee)
+    self.reserves[_token_in] = reserve_in + _amount_in
+    self.reserves[_token_out] = reserve_out - amount_out
+    return amount_out
+
+
+@external
+@payable
+def exactInputSingle(params: ExactInputSingleParams) -> uint256:
+    self._pay_in(params.tokenIn, params.amountIn)
+    amount_out: uint256 = self._swap(params.tokenIn, params.tokenOut, params.fee, params.amountIn)
+    assert amount_out >= params.amountOutMinimum, "Too little received"
+    self._pay_out(params.tokenOut, params.recipient, amount_out)
+    return amount_out
+
+
+@external
+@payable
+def exactInput(params: ExactInputParams) -> uint256:
+    hops: uint256 = self._hops(params.path)
+    token_in: address = self._token_at(params.path, 0)
+    token_out: address = empty(address)
+    amount: uint256 = params.amountIn
+
+    self._pay_in(token_in, amount)
+    for i in range(MAX_HOPS):
+        if i >= hops:
+            break
+        token_out = self._token_at(params.path, 23 * (i + 1))
+        amount = self._swap(token_in, token_out, self._fee_at(params.path, 23 * i + 20), amount)
+        token_in = token_out
+
+    assert amount >= params.amountOutMinimum, "Too little received"
+    self._pay_out(token_out, params.recipient, amount)
+    return amount
+
+
+@external
+@payable
+def multicall(deadline: uint256, data: DynArray[Bytes[1024], MAX_CALLS]) -> DynArray[Bytes[32], MAX_CALLS]:
+    assert block.timestamp <= deadline, "Transaction too old"
+    results: DynArray[Bytes[32], MAX_CALLS] = []
+    for call in data:
+        results.append(raw_call(self, call, max_outsize=32, is_delegate_call=True))
+    return results
+
+
+@external
+@payable
+def unwrapWETH9(amountMinimum: uint256, recipient: address):
+    held: uint256 = ERC20(self.WETH).balanceOf(self) - self.reserves[self.WETH]
+    assert held >= amountMinimum, "Insufficient WETH9"
+    if held > 0:
+        WETH9(self.WETH).withdraw(held)
+        raw_call(recipient, b"", value=held)
+
+
+@external
+@payable
+def refundETH():
+    if self.balance > 0:
+        raw_call(msg.sender, b"", value=self.balance)
+
+
+@internal
+@view
+def _quote(_token_in: address, _token_out: address, _fee: uint24, _amount_in: uint256) -> uint256:
+    holder: ReserveHolder = ReserveHolder(self.pool)
+    return self._amount_out(holder.reserves(_token_in), holder.reserves(_token_out), _amount_in, _fee)
+
+
+@external
+@view
+def quoteExactInputSingle(params: QuoteExactInputSingleParams) -> (uint256, uint160, uint32, uint256):
+    amount_out: uint256 = self._quote(params.tokenIn, params.tokenOut, params.fee, params.amountIn)
+    return amount_out, 0, 0, GAS_PER_HOP
+
+
+@external
+@view
+def quoteExactInput(path: Bytes[MAX_PATH], amountIn: uint256) -> (uint256, DynArray[uint160, MAX_HOPS], DynArray[uint32, MAX_HOPS], uint256):
+    hops: uint256 = self._hops(path)
+    sqrt_prices: DynArray[uint160, MAX_HOPS] = []
+    ticks_crossed: DynArray[uint32, MAX_HOPS] = []
+    token_in: address = self._token_at(path, 0)
+    amount: uint256 = amountIn
+    for i in range(MAX_HOPS):
+        if i >= hops:
+            break
+        token_out: address = self._token_at(path, 23 * (i + 1))
+        amount = self._quote(token_in, token_out, self._fee_at(path, 23 * i + 20), amount)
+        token_in = token_out
+        sqrt_prices.append(0)
+        ticks_crossed.append(0)
+    return amount, sqrt_prices, ticks_crossed, GAS_PER_HOP * hops
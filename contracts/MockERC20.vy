@@ -0,0 +1,61 @@
+# @version 0.3.10
+"""
+@title Mock ERC20 for the local backend
+@notice Anyone can mint. Symbol and decimals are set once by the chain setup.
+"""
+
+event Transfer:
+    sender: indexed(address)
+    receiver: indexed(address)
+    value: uint256
+
+event Approval:
+    owner: indexed(address)
+    spender: indexed(address)
+    value: uint256
+
+symbol: public(String[16])
+decimals: public(uint8)
+totalSupply: public(uint256)
+balanceOf: public(HashMap[address, uint256])
+allowance: public(HashMap[address, HashMap[address, uint256]])
+
+
+@external
+def setup(_symbol: String[16], _decimals: uint8):
+    assert self.decimals == 0, "already set up"
+    self.symbol = _symbol
+    self.decimals = _decimals
+
+
+@external
+def mint(_to: address, _value: uint256):
+    self.totalSupply += _value
+    self.balanceOf[_to] += _value
+    log Transfer(empty(address), _to, _value)
+
+
+@external
+def transfer(_to: address, _value: uint256) -> bool:
+    self.balanceOf[msg.sender] -= _value
+    self.balanceOf[_to] += _value
+    log Transfer(msg.sender, _to, _value)
+    return True
+
+
+@external
+def approve(_spender: address, _value: uint256) -> bool:
+    self.allowance[msg.sender][_spender] = _value
+    log Approval(msg.sender, _spender, _value)
+    return True
+
+
+@external
+def transferFrom(_from: address, _to: address, _value: uint256) -> bool:
+    allowed: uint256 = self.allowance[_from][msg.sender]
+    if allowed != max_value(uint256):
+        self.allowance[_from][msg.sender] = allowed - _value
+    self.balanceOf[_from] -= _value
+    self.balanceOf[_to] += _value
+    log Transfer(_from, _to, _value)
+    return True
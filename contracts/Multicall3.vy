@@ -0,0 +1,53 @@
+# @version 0.3.10
+"""
+@title Multicall3 subset for the local backend
+@notice aggregate3 plus the block and balance helpers terminalSwap reads
+"""
+
+MAX_CALLS: constant(uint256) = 64
+MAX_DATA: constant(uint256) = 1024
+
+struct Call3:
+    target: address
+    allowFailure: bool
+    callData: Bytes[MAX_DATA]
+
+struct Result:
+    success: bool
+    returnData: Bytes[MAX_DATA]
+
+
+@external
+@payable
+def aggregate3(_calls: DynArray[Call3, MAX_CALLS]) -> DynArray[Result, MAX_CALLS]:
+    results: DynArray[Result, MAX_CALLS] = []
+    for call in _calls:
+        success: bool = False
+        data: Bytes[MAX_DATA] = b""
+        success, data = raw_call(
+            call.target,
+            call.callData,
+            max_outsize=MAX_DATA,
+            revert_on_failure=False,
+        )
+        assert success or call.allowFailure, "Multicall3: call failed"
+        results.append(Result({success: success, returnData: data}))
+    return results
+
+
+@external
+@view
+def getBasefee() -> uint256:
+    return block.basefee
+
+
+@external
+@view
+def getBlockNumber() -> uint256:
+    return block.number
+
+
+@external
+@view
+def getEthBalance(_addr: address) -> uint256:
+    return _addr.balance
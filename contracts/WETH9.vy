@@ -0,0 +1,92 @@
+# @version 0.3.10
+"""
+@title Wrapped ether for the local backend
+@notice Same interface as WETH9: deposit, withdraw and plain ERC20
+"""
+
+event Transfer:
+    sender: indexed(address)
+    receiver: indexed(address)
+    value: uint256
+
+event Approval:
+    owner: indexed(address)
+    spender: indexed(address)
+    value: uint256
+
+event Deposit:
+    dst: indexed(address)
+    wad: uint256
+
+event Withdrawal:
+    src: indexed(address)
+    wad: uint256
+
+totalSupply: public(uint256)
+balanceOf: public(HashMap[address, uint256])
+allowance: public(HashMap[address, HashMap[address, uint256]])
+
+
+@external
+@view
+def symbol() -> String[4]:
+    return "WETH"
+
+
+@external
+@view
+def decimals() -> uint8:
+    return 18
+
+
+@internal
+def _deposit(_dst: address, _wad: uint256):
+    self.totalSupply += _wad
+    self.balanceOf[_dst] += _wad
+    log Deposit(_dst, _wad)
+
+
+@external
+@payable
+def deposit():
+    self._deposit(msg.sender, msg.value)
+
+
+@external
+@payable
+def __default__():
+    self._deposit(msg.sender, msg.value)
+
+
+@external
+def withdraw(_wad: uint256):
+    self.balanceOf[msg.sender] -= _wad
+    self.totalSupply -= _wad
+    raw_call(msg.sender, b"", value=_wad)
+    log Withdrawal(msg.sender, _wad)
+
+
+@external
+def transfer(_to: address, _value: uint256) -> bool:
+    self.balanceOf[msg.sender] -= _value
+    self.balanceOf[_to] += _value
+    log Transfer(msg.sender, _to, _value)
+    return True
+
+
+@external
+def approve(_spender: address, _value: uint256) -> bool:
+    self.allowance[msg.sender][_spender] = _value
+    log Approval(msg.sender, _spender, _value)
+    return True
+
+
+@external
+def transferFrom(_from: address, _to: address, _value: uint256) -> bool:
+    allowed: uint256 = self.allowance[_from][msg.sender]
+    if allowed != max_value(uint256):
+        self.allowance[_from][msg.sender] = allowed - _value
+    self.balanceOf[_from] -= _value
+    self.balanceOf[_to] += _value
+    log Transfer(_from, _to, _value)
+    return True
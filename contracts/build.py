@@ -0,0 +1,45 @@
+"""Compile the local backend's contracts into src/local_contracts.py
+
+Needs vyper 0.3.10 on PATH (pip install vyper==0.3.10). Run from the repo root:
+
+    python contracts/build.py
+"""
+
+import glob
+import os
+import subprocess
+
+VYPER_VERSION = "0.3.10"
+HERE = os.path.dirname(os.path.abspath(__file__))
+OUTPUT = os.path.join(HERE, "..", "src", "local_contracts.py")
+
+HEADER = f'''"""Runtime bytecode for the local backend's contracts
+
+Generated by contracts/build.py from contracts/*.vy with vyper {VYPER_VERSION}; do not edit.
+"""
+
+LOCAL_CONTRACTS = {{
+'''
+
+
+def main():
+    version = subprocess.check_output(["vyper", "--version"], text=True).strip()
+    if not version.startswith(VYPER_VERSION):
+        raise SystemExit(f"vyper {VYPER_VERSION} required, found {version}")
+
+    lines = [HEADER]
+    for path in sorted(glob.glob(os.path.join(HERE, "*.vy"))):
+        name = os.path.splitext(os.path.basename(path))[0]
+        bytecode = subprocess.check_output(
+            ["vyper", "-f", "bytecode_runtime", path], text=True
+        ).strip()
+        lines.append(f'    "{name}": "{bytecode}",\n')
+    lines.append("}\n")
+
+    with open(OUTPUT, "w", encoding="utf-8") as fh:
+        fh.write("".join(lines))
+    print(f"Wrote {os.path.relpath(OUTPUT)}")
+
+
+if __name__ == "__main__":
+    main()
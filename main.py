@@ -1,7 +1,6 @@
 #!/usr/bin/env python3
 import warnings
 import sys
-from src.cli import cli
 
 warnings.filterwarnings("ignore", category=UserWarning, module="web3")
 
@@ -25,5 +24,14 @@ if __name__ == "__main__":
         print("\n📚 More help: python main.py --help")
         print("\n⚠️  Interactive TUI mode coming soon!")
     else:
-        # CLI mode
+        # Read-only commands go to the daemon when one is running
+        from src.daemon import run_remote
+
+        exit_code = run_remote(sys.argv[1:])
+        if exit_code is not None:
+            sys.exit(exit_code)
+
+        # CLI mode; imported here so the usage banner above stays instant
+        from src.cli import cli
+
         cli()
@@ -0,0 +1,136 @@
+"""Cached ERC20 allowances so swaps only approve when they have to"""
+
+import contextlib
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+from .config import DATA_DIR
+from .file_lock import file_lock
+from .rpc import batch_request
+
+ALLOWANCE_SELECTOR = "0xdd62ed3e"  # allowance(address,address)
+MAX_UINT256 = 2**256 - 1
+
+
+class AllowanceManager:
+    """Allowances per (owner, spender, token), read in batches and spent locally"""
+
+    def __init__(
+        self,
+        w3,
+        owner: str,
+        network: str,
+        path: Optional[str] = None,
+        max_age: int = 3600,
+    ):
+        self.w3 = w3
+        self.owner = owner
+        self.network = network
+        self.path = path or os.path.join(DATA_DIR, "allowances.json")
+        self.max_age = max_age  # Seconds before a cached allowance is re-read
+        self._lock = threading.Lock()
+        self._data = self._load()
+
+    def _load(self) -> Dict:
+        """Load cached allowances from disk"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as fh:
+                return json.load(fh)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        """Write cached allowances atomically"""
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as fh:
+                json.dump(self._data, fh, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"DEBUG: Failed to save allowances: {e}")
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        """Apply changes to the file as it is now, under the cross-process lock
+
+        Another process may have approved or spent since this one loaded, and
+        writing back a stale allowance would skip or repeat an approval.
+        """
+        with self._lock, file_lock(self.path):
+            self._data = self._load()
+            yield
+            self._save()
+
+    def _entries(self, spender: str) -> Dict:
+        owners = self._data.setdefault(self.network, {})
+        spenders = owners.setdefault(self.owner.lower(), {})
+        return spenders.setdefault(spender.lower(), {})
+
+    def _set(self, token: str, spender: str, amount: int):
+        self._entries(spender)[token.lower()] = {
+            "allowance": str(amount),
+            "checked_at": time.time(),
+        }
+
+    def get_allowances(self, tokens: List[str], spender: str) -> Dict[str, int]:
+        """Allowances for many tokens; missing or stale ones are read in one batch"""
+        with self._lock:
+            self._data = self._load()  # Pick up other processes' approvals
+            entries = self._entries(spender)
+        stale = [
+            token
+            for token in tokens
+            if token.lower() not in entries
+            or time.time() - entries[token.lower()]["checked_at"] > self.max_age
+        ]
+
+        if stale:
+            data = (
+                ALLOWANCE_SELECTOR
+                + self.owner[2:].lower().zfill(64)
+                + spender[2:].lower().zfill(64)
+            )
+            try:
+                results = batch_request(
+                    self.w3,
+                    [
+                        ("eth_call", [{"to": token, "data": data}, "latest"])
+                        for token in stale
+                    ],
+                )
+                with self._transaction():
+                    for token, result in zip(stale, results):
+                        if result and result != "0x":
+                            self._set(token, spender, int(result, 16))
+                    entries = self._entries(spender)
+            except Exception as e:
+                print(f"DEBUG: Allowance read failed: {e}")
+
+        return {
+            token: int(entries[token.lower()]["allowance"])
+            for token in tokens
+            if token.lower() in entries
+        }
+
+    def has_allowance(self, token: str, spender: str, amount: int) -> bool:
+        """Whether spender can already pull amount of token"""
+        return self.get_allowances([token], spender).get(token, 0) >= amount
+
+    def record_approval(self, token: str, spender: str, amount: int):
+        """Remember an approval we just sent"""
+        with self._transaction():
+            self._set(token, spender, amount)
+
+    def spend(self, token: str, spender: str, amount: int):
+        """Decrement a cached allowance after a swap pulls tokens"""
+        with self._transaction():
+            entry = self._entries(spender).get(token.lower())
+            if not entry:
+                return
+            allowance = int(entry["allowance"])
+            # Unlimited approvals are not decremented by most tokens
+            if allowance != MAX_UINT256:
+                entry["allowance"] = str(max(allowance - amount, 0))
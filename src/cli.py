@@ -1,16 +1,100 @@
 import click
-from rich.console import Console
-from rich.table import Table
-from .wallet import Wallet
 
-# from .config import BASE_TOKENS  # TODO: Use this later
-from .price_fetcher import PriceFetcher
+# rich, Wallet (web3) and PriceFetcher (requests) are imported inside the
+# commands that use them, so --help and cheap commands start fast
 
-console = Console()
+
+class _LazyConsole:
+    """rich Console, created the first time anything is printed"""
+
+    _console = None
+
+    @classmethod
+    def get(cls):
+        """The Console itself, for rich APIs that need the real object"""
+        if cls._console is None:
+            from rich.console import Console
+
+            cls._console = Console()
+        return cls._console
+
+    def __getattr__(self, name):
+        return getattr(self.get(), name)
+
+
+console = _LazyConsole()
+
+# Objects kept for the life of the process. A one-shot command builds them
+# once; inside the daemon they stay warm across commands.
+_warm = {}
+
+
+def _warm_instance(key, factory):
+    """The process-wide instance for key, built on first use"""
+    if key not in _warm:
+        _warm[key] = factory()
+    return _warm[key]
+
+
+def _get_wallet(network):
+    """Shared Wallet for a network"""
+    from .wallet import Wallet
+
+    return _warm_instance(("wallet", network), lambda: Wallet(network))
+
+
+def _get_price_fetcher():
+    """Shared PriceFetcher, so its price cache outlives a single command"""
+    from .price_fetcher import PriceFetcher
+
+    return _warm_instance("prices", PriceFetcher)
+
+
+def _get_swap_preview():
+    """Shared SwapPreview with its DEX, pool state and quote caches"""
+    from .swap_preview import SwapPreview
+
+    return _warm_instance(
+        "preview", lambda: SwapPreview(price_fetcher=_get_price_fetcher())
+    )
+
+
+def _get_token_registry():
+    """Shared TokenRegistry, re-read only when another process changed it"""
+    from .token_registry import TokenRegistry
+
+    registry = _warm_instance("registry", TokenRegistry)
+    registry.reload(force=False)
+    return registry
+
+
+EXPLORER_ADDRESS_URLS = {
+    "base": "https://basescan.org/address/",
+    "base-sepolia": "https://sepolia.basescan.org/address/",
+    "ethereum": "https://etherscan.io/address/",
+    "celo": "https://celoscan.io/address/",
+}
+
+
+# Commands that can write --output json|jsonl records instead of tables
+OUTPUT_COMMANDS = ["balance", "history", "discover", "swap"]
+
+
+def _records():
+    """The RecordWriter when --output json|jsonl was given, else None"""
+    return click.get_current_context().find_root().obj
 
 
 @click.group()
-def cli():
+@click.option(
+    "--output",
+    "output_format",
+    type=click.Choice(["table", "json", "jsonl"]),
+    default="table",
+    help="json/jsonl records for balance, history, discover and swap --preview",
+)
+@click.pass_context
+def cli(ctx, output_format):
     """🚀 terminalSwap - Multi-chain crypto swapping and transfers via terminal
 
     \b
@@ -25,8 +109,17 @@ def cli():
       python main.py balance --all
       python main.py send 0.01 ETH to 0x1234...5678 --network base-sepolia
       python main.py swap 0.1 ETH to USDC --preview
+      python main.py --output jsonl balance --all
     """
-    pass
+    if output_format != "table":
+        if ctx.invoked_subcommand not in OUTPUT_COMMANDS:
+            raise click.UsageError(
+                f"--output {output_format} works with: {', '.join(OUTPUT_COMMANDS)}"
+            )
+        from .output import RecordWriter
+
+        # Closed (finishing the JSON array) when the command returns
+        ctx.obj = ctx.with_resource(RecordWriter(output_format))
 
 
 @cli.command()
@@ -34,79 +127,211 @@ def cli():
     "--network", default="base", help="Network: base, ethereum, celo, base-sepolia"
 )
 @click.option("--all", is_flag=True, help="Check balances on all networks")
-def balance(network, all):
+@click.option(
+    "--show-spam", is_flag=True, help="Include discovered tokens flagged as spam"
+)
+def balance(network, all, show_spam):
     """Check wallet balance across networks"""
+    records = _records()
     try:
         if all:
-            # Check all networks in unified table
-            console.print("[yellow]🔍 Checking all networks...[/yellow]")
-
-            # Create unified table
-            table = Table(title="Multi-Chain Portfolio")
-            table.add_column("Network", style="blue")
-            table.add_column("Token", style="cyan")
-            table.add_column("Balance", style="green")
-            table.add_column("Price (USD)", style="yellow")
-            table.add_column("Value (USD)", style="magenta")
-
-            price_fetcher = PriceFetcher()
-            total_value = 0.0
-
-            networks_to_check = ["base", "ethereum", "celo"]
-
-            for net in networks_to_check:
-                try:
-                    wallet = Wallet(net)
-                    if not wallet.is_connected():
-                        continue
-
-                    tokens_to_check = _get_tokens_for_network(net)
-
-                    for token_name, token_address in tokens_to_check.items():
-                        balance = wallet.get_balance(token_address)
-                        if balance > 0:
-                            price = price_fetcher.get_token_price(token_name)
-                            if price:
-                                value = float(balance) * price
-                                total_value += value
-                                price_str = (
-                                    f"${price:.6f}" if price < 0.01 else f"${price:.2f}"
-                                )
-                                table.add_row(
-                                    net.upper(),
-                                    token_name,
-                                    f"{balance:.6f}",
-                                    price_str,
-                                    f"${value:.2f}",
-                                )
-                            else:
-                                table.add_row(
-                                    net.upper(),
-                                    token_name,
-                                    f"{balance:.6f}",
-                                    "N/A",
-                                    "N/A",
-                                )
-                except Exception:
-                    continue
-
-            console.print(table)
-            console.print(
-                f"\n[bold green]💰 Total Portfolio Value: ${total_value:.2f}[/bold green]"
-            )
+            if records:
+                _write_all_networks_balance(records)
+            else:
+                _show_all_networks_balance()
         else:
             # Single network
-            wallet = Wallet(network)
+            wallet = _get_wallet(network)
             if not wallet.is_connected():
+                if records:
+                    records.write("error", network=network, error="Failed to connect")
+                    return
                 console.print("[red]❌ Failed to connect to network[/red]")
                 return
 
-            _show_network_balance(wallet, network)
+            if records:
+                _write_network_balance(records, wallet, network, show_spam)
+            else:
+                _show_network_balance(wallet, network, show_spam)
 
     except Exception as e:
+        if records:
+            records.write("error", network=network, error=str(e))
+            return
         console.print(f"[red]❌ Error: {e}[/red]")
 
 
+BALANCE_NETWORKS = ["base", "ethereum", "celo"]
+BALANCE_TIMEOUT = 10  # Seconds before a network is shown as timed out
+
+
+def _fetch_network_balances(network):
+    """Non-zero balances of a network's configured tokens, in one batch"""
+    wallet = _get_wallet(network)
+    balances = wallet.get_balances(
+        _get_tokens_for_network(network), timeout=BALANCE_TIMEOUT
+    )
+    return {symbol: balance for symbol, balance in balances.items() if balance > 0}
+
+
+def _iter_all_networks_balance():
+    """Query every network concurrently, yielding results as they arrive
+
+    Yields ("prices", None, {token: price}) once, and per network either
+    ("balances", network, {token: balance}), ("error", network, message) or
+    ("timeout", network, message).
+    """
+    import time
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+    import requests
+
+    # One price request covers every network's tokens, alongside the RPC calls
+    symbols = sorted(
+        {token for net in BALANCE_NETWORKS for token in _get_tokens_for_network(net)}
+    )
+    executor = ThreadPoolExecutor(max_workers=len(BALANCE_NETWORKS) + 1)
+    try:
+        price_future = executor.submit(
+            _get_price_fetcher().get_multiple_prices, symbols
+        )
+        futures = {
+            executor.submit(_fetch_network_balances, net): net
+            for net in BALANCE_NETWORKS
+        }
+        pending = set(futures) | {price_future}
+        deadline = time.monotonic() + BALANCE_TIMEOUT
+
+        while pending:
+            done, pending = wait(
+                pending,
+                timeout=max(deadline - time.monotonic(), 0),
+                return_when=FIRST_COMPLETED,
+            )
+            if not done:
+                break
+            for future in done:
+                if future is price_future:
+                    try:
+                        yield "prices", None, future.result()
+                    except Exception as e:
+                        print(f"DEBUG: Price fetch failed: {e}")
+                        yield "prices", None, {}
+                    continue
+                net = futures[future]
+                try:
+                    yield "balances", net, future.result()
+                except requests.Timeout:
+                    yield "timeout", net, f"Timed out after {BALANCE_TIMEOUT}s"
+                except requests.ConnectionError:
+                    yield "error", net, "Could not connect to RPC"
+                except Exception as e:
+                    yield "error", net, str(e)[:60]
+
+        # A slow or dead RPC only costs its own rows
+        for future in pending:
+            if future is price_future:
+                yield "prices", None, {}
+            else:
+                yield "timeout", futures[future], f"Timed out after {BALANCE_TIMEOUT}s"
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _show_all_networks_balance():
+    """Show every network in one table, adding rows as each network finishes"""
+    from rich.live import Live
+    from rich.table import Table
+
+    console.print("[yellow]🔍 Checking all networks...[/yellow]")
+
+    results = {}  # network -> {token: balance}, or an error to show instead
+    prices = None
+
+    def render():
+        table = Table(title="Multi-Chain Portfolio")
+        table.add_column("Network", style="blue")
+        table.add_column("Token", style="cyan")
+        table.add_column("Balance", style="green")
+        table.add_column("Price (USD)", style="yellow")
+        table.add_column("Value (USD)", style="magenta")
+
+        total_value = 0.0
+        for net in BALANCE_NETWORKS:
+            result = results.get(net)
+            if result is None:
+                table.add_row(net.upper(), "[dim]⏳ Loading...[/dim]", "", "", "")
+                continue
+            if isinstance(result, str):
+                table.add_row(net.upper(), f"[red]{result}[/red]", "", "", "")
+                continue
+            if not result:
+                table.add_row(net.upper(), "[dim]No balances[/dim]", "", "", "")
+            for token_name, balance in result.items():
+                price = (prices or {}).get(token_name)
+                if price:
+                    value = balance * price
+                    total_value += value
+                    price_str = f"${price:.6f}" if price < 0.01 else f"${price:.2f}"
+                    value_str = f"${value:.2f}"
+                else:
+                    price_str = value_str = "..." if prices is None else "N/A"
+                table.add_row(
+                    net.upper(), token_name, f"{balance:.6f}", price_str, value_str
+                )
+        return table, total_value
+
+    with Live(render()[0], console=console.get(), refresh_per_second=8) as live:
+        for event, net, value in _iter_all_networks_balance():
+            if event == "prices":
+                prices = value
+            elif event == "balances":
+                results[net] = value
+            else:
+                results[net] = f"{'⏱' if event == 'timeout' else '❌'} {value}"
+            live.update(render()[0])
+        table, total_value = render()
+        live.update(table)
+
+    console.print(
+        f"\n[bold green]💰 Total Portfolio Value: ${total_value:.2f}[/bold green]"
+    )
+
+
+def _write_all_networks_balance(records):
+    """Write each network's balance records once it and the prices are in"""
+    prices = None
+    waiting = []  # Networks that finished before the prices did
+
+    def write(net, balances):
+        addresses = _get_tokens_for_network(net)
+        for token_name, balance in balances.items():
+            price = prices.get(token_name)
+            records.write(
+                "balance",
+                network=net,
+                token=token_name,
+                address=addresses.get(token_name),
+                balance=balance,
+                price_usd=price,
+                value_usd=balance * price if price else None,
+                discovered=False,
+            )
+
+    for event, net, value in _iter_all_networks_balance():
+        if event == "prices":
+            prices = value
+            for waiting_net, balances in waiting:
+                write(waiting_net, balances)
+            waiting = []
+        elif event == "balances":
+            if prices is None:
+                waiting.append((net, value))
+            else:
+                write(net, value)
+        else:
+            records.write("error", network=net, error=value)
+
+
 def _get_tokens_for_network(network):
     """Get token list for a specific network"""
     if network == "base":
@@ -136,14 +361,108 @@ def _get_tokens_for_network(network):
     else:  # ethereum
         return {
             "ETH": "0x0000000000000000000000000000000000000000",
-            "USDC": "0xA0b86a33E6441E6C673C5C9C7C4b4c4b4b4b4b4b",
+            "USDC": "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48",
             "USDT": "0xdAC17F958D2ee523a2206206994597C13D831ec7",
             "WETH": "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2",
         }
 
 
-def _show_network_balance(wallet, network):
+def _get_dex(network):
+    """Shared Uniswap V3 integration for a network"""
+    from .dex_integration import UniswapV3Integration
+
+    return _warm_instance(("dex", network), lambda: UniswapV3Integration(network))
+
+
+def _get_token_classifier(network):
+    """Spam classifier, with a Uniswap V3 liquidity check where available"""
+    from .token_filter import TokenClassifier
+
+    def build():
+        if network not in ["base", "ethereum"]:
+            return TokenClassifier(price_fetcher=_get_price_fetcher())
+        return TokenClassifier(
+            price_fetcher=_get_price_fetcher(),
+            # Built on the first check, then shared by every token
+            liquidity_checker=lambda token: _get_dex(network).has_liquidity(token),
+        )
+
+    return _warm_instance(("classifier", network), build)
+
+
+def _load_discovered_tokens(wallet, network, show_spam=False):
+    """Discovered tokens from the registry: (tokens, spam count)
+
+    Only the first run waits for the API; later runs refresh the delta in the
+    background when stale and show what the registry already has.
+    """
+    registry = _get_token_registry()
+    classifier = _get_token_classifier(network)
+    if registry.get_entry(network, wallet.address) is None:
+        discovered_tokens = registry.refresh(
+            network, wallet.address, classifier=classifier, include_spam=show_spam
+        )
+    else:
+        discovered_tokens = registry.get_tokens(
+            network, wallet.address, include_spam=show_spam
+        )
+        if registry.is_stale(network, wallet.address):
+            registry.refresh_in_background(
+                network, wallet.address, classifier=classifier
+            )
+    spam_count = len(registry.get_spam_tokens(network, wallet.address))
+    return discovered_tokens, spam_count
+
+
+def _balance_rows(wallet, network, discovered_tokens):
+    """Balance rows for configured and discovered tokens, in balance record shape"""
+    tokens_to_check = _get_tokens_for_network(network)
+
+    # Combine pre-configured and discovered tokens (pre-configured takes priority)
+    all_tokens = {**discovered_tokens, **tokens_to_check}
+
+    # One batched RPC request for every balance, one price request for the rest
+    balances = wallet.get_balances(all_tokens)
+    rows = [
+        {
+            "token": token_name,
+            "address": all_tokens[token_name],
+            "balance": balance,
+            "discovered": token_name not in tokens_to_check,
+        }
+        for token_name, balance in balances.items()
+        # Show tokens with balance > 0, or discovered tokens (to show full discovery results)
+        if balance > 0 or token_name not in tokens_to_check
+    ]
+    prices = (
+        _get_price_fetcher().get_multiple_prices([row["token"] for row in rows])
+        if rows
+        else {}
+    )
+    for row in rows:
+        row["price_usd"] = prices.get(row["token"])
+        row["value_usd"] = (
+            row["balance"] * row["price_usd"] if row["price_usd"] else None
+        )
+    return rows
+
+
+def _write_network_balance(records, wallet, network, show_spam=False):
+    """Write one balance record per shown token"""
+    discovered_tokens = {}
+    try:
+        discovered_tokens, _ = _load_discovered_tokens(wallet, network, show_spam)
+    except Exception as e:
+        print(f"DEBUG: Token discovery failed: {e}")
+
+    for row in _balance_rows(wallet, network, discovered_tokens):
+        records.write("balance", network=network, **row)
+
+
+def _show_network_balance(wallet, network, show_spam=False):
     """Helper function to show balance for a specific network"""
+    from rich.table import Table
+
     console.print(f"[green]✅ Connected to {wallet.network_config.name}[/green]")
     console.print(f"[blue]Address: {wallet.address}[/blue]")
 
@@ -154,57 +473,43 @@ def _show_network_balance(wallet, network):
     table.add_column("Price (USD)", style="yellow")
     table.add_column("Value (USD)", style="magenta")
 
-    # Get prices
-    price_fetcher = PriceFetcher()
-
-    # Get pre-configured tokens for this network
-    tokens_to_check = _get_tokens_for_network(network)
-
-    # Discover additional tokens from transaction history
     discovered_tokens = {}
     try:
-        from .transaction_history import TransactionHistory
-
-        tx_history = TransactionHistory(network)
-        discovered_tokens = tx_history.discover_user_tokens(wallet.address)
+        discovered_tokens, spam_count = _load_discovered_tokens(
+            wallet, network, show_spam
+        )
         if len(discovered_tokens) > 0:
             console.print(
                 f"[dim]🔍 Discovered {len(discovered_tokens)} additional tokens from transaction history[/dim]"
             )
+        if spam_count and not show_spam:
+            console.print(
+                f"[dim]🚫 Skipping {spam_count} likely spam tokens "
+                "(use --show-spam to include)[/dim]"
+            )
     except Exception as e:
         console.print(f"[dim]⚠️ Token discovery failed: {e}[/dim]")
 
-    # Combine pre-configured and discovered tokens (pre-configured takes priority)
-    all_tokens = {**discovered_tokens, **tokens_to_check}
-
-    # Track which tokens are discovered vs pre-configured
     total_value = 0.0
+    rows = _balance_rows(wallet, network, discovered_tokens)
 
-    for token_name, token_address in all_tokens.items():
-        balance = wallet.get_balance(token_address)
-        # Show tokens with balance > 0, or discovered tokens (to show full discovery results)
-        show_token = balance > 0 or (
-            token_name in discovered_tokens and token_name not in tokens_to_check
-        )
-        if show_token:
-            price = price_fetcher.get_token_price(token_name)
-
-            # Mark discovered tokens with an asterisk
-            display_name = token_name
-            if token_name in discovered_tokens and token_name not in tokens_to_check:
-                display_name = f"{token_name}*"
-
-            if price:
-                value = float(balance) * price
-                total_value += value
-                price_str = f"${price:.6f}" if price < 0.01 else f"${price:.2f}"
-                value_str = f"${value:.2f}" if balance > 0 else "N/A"
-                table.add_row(display_name, f"{balance:.6f}", price_str, value_str)
-            else:
-                # Show N/A for price but still show balance
-                price_str = "N/A"
-                value_str = "N/A"
-                table.add_row(display_name, f"{balance:.6f}", price_str, value_str)
+    for row in rows:
+        balance = row["balance"]
+        price = row["price_usd"]
+
+        # Mark discovered tokens with an asterisk
+        display_name = f"{row['token']}*" if row["discovered"] else row["token"]
+
+        if price:
+            total_value += row["value_usd"]
+            price_str = f"${price:.6f}" if price < 0.01 else f"${price:.2f}"
+            value_str = f"${row['value_usd']:.2f}" if balance > 0 else "N/A"
+            table.add_row(display_name, f"{balance:.6f}", price_str, value_str)
+        else:
+            # Show N/A for price but still show balance
+            price_str = "N/A"
+            value_str = "N/A"
+            table.add_row(display_name, f"{balance:.6f}", price_str, value_str)
 
     console.print(table)
 
@@ -213,11 +518,7 @@ def _show_network_balance(wallet, network):
         console.print(f"\n[bold green]💰 Total Value: ${total_value:.2f}[/bold green]")
 
     # Show legend for discovered tokens
-    has_discovered = any(
-        token in discovered_tokens and token not in tokens_to_check
-        for token in all_tokens.keys()
-    )
-    if has_discovered:
+    if any(row["discovered"] for row in rows):
         console.print("\n[dim]* = Discovered from transaction history[/dim]")
 
     # Show helpful tips
@@ -250,7 +551,15 @@ def _show_network_balance(wallet, network):
     "--type", "tx_type", help="Filter by type: send, receive, all (default: all)"
 )
 @click.option("--summary", is_flag=True, help="Show transaction summary statistics")
-def history(network, limit, tx_type, summary):
+@click.option(
+    "--export",
+    "export_path",
+    help="Stream full history to a .csv, .jsonl or .parquet file",
+)
+@click.option(
+    "--all", "all_networks", is_flag=True, help="Merge history from all networks"
+)
+def history(network, limit, tx_type, summary, export_path, all_networks):
     """View transaction history for your wallet
 
     Supported networks (with Etherscan API key):
@@ -261,35 +570,53 @@ def history(network, limit, tx_type, summary):
       history --network ethereum --limit 10
       history --network celo --type send
       history --summary
+      history --network ethereum --export history.csv
+      history --all --limit 50
+      history --summary --all
     """
     from .transaction_history import TransactionHistory
 
+    if all_networks:
+        _show_all_networks_history(limit, tx_type, summary)
+        return
+
+    records = _records()
     try:
         # Initialize wallet to get address
-        wallet = Wallet(network)
+        wallet = _get_wallet(network)
         if not wallet.is_connected():
+            if records:
+                records.write("error", network=network, error="Failed to connect")
+                return
             console.print("[red]❌ Failed to connect to network[/red]")
             return
 
-        console.print(
-            f"[yellow]📜 Fetching transaction history for {network.upper()}...[/yellow]"
-        )
-        console.print(f"[blue]Address: {wallet.address}[/blue]")
+        if not records:
+            console.print(
+                f"[yellow]📜 Fetching transaction history for {network.upper()}...[/yellow]"
+            )
+            console.print(f"[blue]Address: {wallet.address}[/blue]")
 
         # Get transaction history
         tx_history = TransactionHistory(network)
 
-        if summary:
+        if export_path:
+            _export_transaction_history(
+                tx_history, wallet.address, export_path, tx_type
+            )
+        elif summary:
             # Show summary statistics
             stats = tx_history.get_transaction_summary(wallet.address)
+            if records:
+                records.write_from("summary", stats, network=network)
+                return
             _show_transaction_summary(stats, network)
 
             # Check for significant discrepancy between balance and transaction history
             try:
-                from .price_fetcher import PriceFetcher
                 from .config import NETWORKS
 
-                price_fetcher = PriceFetcher()
+                price_fetcher = _get_price_fetcher()
 
                 # Get current native token balance and price
                 native_token = NETWORKS[network].native_token
@@ -340,6 +667,11 @@ def history(network, limit, tx_type, summary):
                 filter_type = tx_type.capitalize()
                 transactions = [tx for tx in transactions if tx["type"] == filter_type]
 
+            if records:
+                for tx in transactions:
+                    records.write_from("transaction", tx)
+                return
+
             if not transactions:
                 console.print("[yellow]No transactions found.[/yellow]")
                 return
@@ -347,11 +679,142 @@ def history(network, limit, tx_type, summary):
             _show_transaction_history(transactions, network)
 
     except Exception as e:
+        if records:
+            records.write("error", network=network, error=str(e))
+            return
         console.print(f"[red]❌ Error: {e}[/red]")
 
 
+def _show_all_networks_history(limit: int, tx_type, summary: bool):
+    """Fetch every network concurrently and merge the results"""
+    from .transaction_history import (
+        aggregate_summaries,
+        fetch_all_networks,
+        merge_transaction_histories,
+    )
+
+    records = _records()
+    try:
+        # Same key on every chain, so one wallet gives the address
+        address = _get_wallet("base").address
+        if not records:
+            console.print(
+                "[yellow]📜 Fetching transaction history for all networks...[/yellow]"
+            )
+            console.print(f"[blue]Address: {address}[/blue]")
+
+        if summary:
+            summaries, errors = fetch_all_networks(
+                lambda tx_history: tx_history.get_transaction_summary(address)
+            )
+            stats = aggregate_summaries(summaries)
+            if records:
+                for net, net_stats in summaries.items():
+                    records.write_from("summary", net_stats, network=net)
+                records.write_from("summary", stats, network="all")
+            else:
+                _show_network_summary_breakdown(summaries)
+                _show_transaction_summary(stats, "all networks")
+            _report_network_errors(records, errors)
+            return
+
+        histories, errors = fetch_all_networks(
+            lambda tx_history: tx_history.get_transaction_history(address, limit)
+        )
+        streams = histories.values()
+        if tx_type and tx_type.lower() in ["send", "receive"]:
+            filter_type = tx_type.capitalize()
+            streams = [
+                [tx for tx in txs if tx["type"] == filter_type] for txs in streams
+            ]
+
+        transactions = merge_transaction_histories(streams, limit)
+        if records:
+            for tx in transactions:
+                records.write_from("transaction", tx)
+        elif not transactions:
+            console.print("[yellow]No transactions found.[/yellow]")
+        else:
+            _show_transaction_history(transactions, "all networks")
+        _report_network_errors(records, errors)
+
+    except Exception as e:
+        if records:
+            records.write("error", network="all", error=str(e))
+            return
+        console.print(f"[red]❌ Error: {e}[/red]")
+
+
+def _report_network_errors(records, errors: dict):
+    """Report networks that failed, after the merged output"""
+    for net, error in errors.items():
+        if records:
+            records.write("error", network=net, error=error)
+        else:
+            console.print(f"[red]❌ {net}: {error}[/red]")
+
+
+def _show_network_summary_breakdown(summaries: dict):
+    """Display per-network summary rows before the combined totals"""
+    from rich.table import Table
+
+    table = Table(title="📊 Per-Network Summary")
+    table.add_column("Network", style="blue")
+    table.add_column("Transactions", style="cyan")
+    table.add_column("Sent", style="red")
+    table.add_column("Received", style="green")
+    table.add_column("Gas Fees", style="yellow")
+    table.add_column("Net Flow", style="magenta")
+
+    for net, stats in summaries.items():
+        table.add_row(
+            net.upper(),
+            str(stats["total_transactions"]),
+            f"${stats['total_sent_usd']:.2f}",
+            f"${stats['total_received_usd']:.2f}",
+            f"${stats['total_gas_spent_usd']:.2f} "
+            f"({stats.get('total_gas_spent_native', 0):.6f} {stats.get('native_token', '')})",
+            f"${stats['net_flow_usd']:.2f}",
+        )
+
+    console.print(table)
+
+
+def _export_transaction_history(tx_history, address: str, path: str, tx_type=None):
+    """Stream the full history for an address to a file"""
+    from .history_export import export_transactions, get_export_format
+
+    export_format = get_export_format(path)
+    records = tx_history.iter_transactions(address)
+
+    if tx_type and tx_type.lower() in ["send", "receive"]:
+        filter_type = tx_type.capitalize()
+        records = (tx for tx in records if tx["type"] == filter_type)
+
+    output = _records()
+    if output:
+        count = export_transactions(records, path)
+        output.write(
+            "export",
+            network=tx_history.network,
+            path=path,
+            format=export_format,
+            count=count,
+        )
+        return
+
+    with console.status(f"[yellow]💾 Exporting to {path}...[/yellow]"):
+        count = export_transactions(records, path)
+
+    console.print(
+        f"[green]✅ Exported {count} transactions to {path} ({export_format.upper()})[/green]"
+    )
+
+
 def _show_transaction_summary(stats: dict, network: str):
     """Display transaction summary statistics"""
+    from rich.table import Table
+
     table = Table(title=f"📊 Recent Transaction Summary - {network.upper()}")
     table.add_column("Metric", style="cyan")
     table.add_column("Value", style="green")
@@ -380,8 +843,13 @@ def _show_transaction_summary(stats: dict, network: str):
 
 def _show_transaction_history(transactions: list, network: str):
     """Display transaction history in a table"""
+    from rich.table import Table
+
+    multi_network = network not in EXPLORER_ADDRESS_URLS
     table = Table(title=f"📜 Transaction History - {network.upper()}")
     table.add_column("Date", style="blue")
+    if multi_network:
+        table.add_column("Network", style="blue")
     table.add_column("Type", style="cyan")
     table.add_column("Token", style="yellow")
     table.add_column("Amount", style="green")
@@ -412,8 +880,10 @@ def _show_transaction_history(transactions: list, network: str):
         # Status color
         status_color = "green" if tx["status"] == "Success" else "red"
 
+        network_cell = [tx["network"].upper()] if multi_network else []
         table.add_row(
             tx["date"],
+            *network_cell,
             f"[{type_color}]{tx['type']}[/{type_color}]",
             tx["token"],
             amount_str,
@@ -425,16 +895,9 @@ def _show_transaction_history(transactions: list, network: str):
     console.print(table)
 
     # Show explorer links
-    explorer_urls = {
-        "base": "https://basescan.org/address/",
-        "base-sepolia": "https://sepolia.basescan.org/address/",
-        "ethereum": "https://etherscan.io/address/",
-        "celo": "https://celoscan.io/address/",
-    }
-
-    if network in explorer_urls:
-        wallet = Wallet(network)
-        explorer_url = explorer_urls[network] + wallet.address
+    if not multi_network:
+        wallet = _get_wallet(network)
+        explorer_url = EXPLORER_ADDRESS_URLS[network] + wallet.address
         console.print(f"\n[blue]🔗 View full history: {explorer_url}[/blue]")
 
 
@@ -442,11 +905,15 @@ def _show_transaction_history(transactions: list, network: str):
 @click.option(
     "--network", default="base", help="Network: base, ethereum, celo, base-sepolia"
 )
-def discover(network):
+@click.option(
+    "--show-spam", is_flag=True, help="Include discovered tokens flagged as spam"
+)
+def discover(network, show_spam):
     """Discover tokens from your transaction history
 
     This command scans your transaction history to find all tokens
     you've interacted with and shows their contract addresses.
+    Results are saved to the local token registry used by 'balance'.
 
     Examples:
       discover --network base
@@ -454,21 +921,55 @@ def discover(network):
     """
     from .transaction_history import TransactionHistory
 
+    records = _records()
     try:
         # Initialize wallet to get address
-        wallet = Wallet(network)
+        wallet = _get_wallet(network)
         if not wallet.is_connected():
+            if records:
+                records.write("error", network=network, error="Failed to connect")
+                return
             console.print("[red]❌ Failed to connect to network[/red]")
             return
 
-        console.print(
-            f"[yellow]🔍 Discovering tokens from {network.upper()} transaction history...[/yellow]"
-        )
-        console.print(f"[blue]Address: {wallet.address}[/blue]")
+        if not records:
+            console.print(
+                f"[yellow]🔍 Discovering tokens from {network.upper()} "
+                "transaction history...[/yellow]"
+            )
+            console.print(f"[blue]Address: {wallet.address}[/blue]")
 
-        # Discover tokens
+        # Discover tokens (forces a registry refresh so balance sees them too)
         tx_history = TransactionHistory(network)
-        discovered_tokens = tx_history.discover_user_tokens(wallet.address)
+        registry = _get_token_registry()
+        discovered_tokens = registry.refresh(
+            network,
+            wallet.address,
+            tx_history,
+            classifier=_get_token_classifier(network),
+            include_spam=show_spam,
+        )
+        spam_tokens = registry.get_spam_tokens(network, wallet.address)
+        preconfigured_tokens = _get_tokens_for_network(network)
+
+        if records:
+            balances = wallet.get_balances(discovered_tokens)
+            for token_symbol, token_address in discovered_tokens.items():
+                if token_symbol in preconfigured_tokens:
+                    status = "preconfigured"
+                elif token_symbol in spam_tokens:
+                    status = "spam"
+                else:
+                    status = "discovered"
+                records.write(
+                    "token",
+                    network=network,
+                    symbol=token_symbol,
+                    address=token_address,
+                    balance=balances[token_symbol],
+                    status=status,
+                )
+            return
 
         if not discovered_tokens:
             if network in ["base", "base-sepolia"]:
@@ -487,6 +988,8 @@ def discover(network):
                 )
             return
 
+        from rich.table import Table
+
         # Create discovery table
         table = Table(title=f"🔍 Discovered Tokens - {network.upper()}")
         table.add_column("Token Symbol", style="cyan")
@@ -494,17 +997,19 @@ def discover(network):
         table.add_column("Balance", style="yellow")
         table.add_column("Status", style="magenta")
 
+        # Current balances, in one batched request
+        balances = wallet.get_balances(discovered_tokens)
+
         for token_symbol, token_address in discovered_tokens.items():
-            # Check current balance
-            balance = wallet.get_balance(token_address)
+            balance = balances[token_symbol]
 
             # Check if it's in pre-configured tokens
-            preconfigured_tokens = _get_tokens_for_network(network)
-            status = (
-                "✅ Pre-configured"
-                if token_symbol in preconfigured_tokens
-                else "🆕 Discovered"
-            )
+            if token_symbol in preconfigured_tokens:
+                status = "✅ Pre-configured"
+            elif token_symbol in spam_tokens:
+                status = "🚫 Likely spam"
+            else:
+                status = "🆕 Discovered"
 
             balance_str = f"{balance:.6f}" if balance > 0 else "0"
 
@@ -517,8 +1022,16 @@ def discover(network):
         console.print(
             "[dim]💡 These tokens will automatically appear in your balance command[/dim]"
         )
+        if spam_tokens and not show_spam:
+            console.print(
+                f"[dim]🚫 Hid {len(spam_tokens)} likely spam tokens "
+                "(use --show-spam to list them)[/dim]"
+            )
 
     except Exception as e:
+        if records:
+            records.write("error", network=network, error=str(e))
+            return
         console.print(f"[red]❌ Error: {e}[/red]")
 
 
@@ -538,6 +1051,7 @@ def send(amount, token, to_keyword, address, network, preview):
       send 0.01 ETH to 0x1234...5678 --network base-sepolia --preview
       send 10 USDC to 0x1234...5678 --network base
     """
+    from .wallet import Wallet
 
     # Validate 'to' keyword
     if to_keyword.lower() != "to":
@@ -660,30 +1174,62 @@ def send(amount, token, to_keyword, address, network, preview):
     "--network", default="base", help="Network: base, ethereum, celo, base-sepolia"
 )
 @click.option("--preview", is_flag=True, help="Show swap preview only")
-def swap(amount, from_token, to_keyword, to_token, network, preview):
+@click.option(
+    "--ladder",
+    default=None,
+    help="Preview several sizes, e.g. 0.1,1,10,100 or 'auto' for a log-spaced ladder",
+)
+@click.option(
+    "--unlimited-approval",
+    is_flag=True,
+    help="Approve the router for unlimited spending so later swaps skip approval",
+)
+def swap(
+    amount,
+    from_token,
+    to_keyword,
+    to_token,
+    network,
+    preview,
+    ladder,
+    unlimited_approval,
+):
     """Swap tokens with natural syntax
 
     Examples:
       swap 0.1 ETH to USDC --preview
+      swap 1 ETH to USDC --preview --ladder 0.1,1,10,100
       swap 10 CELO to G$ --network celo --preview
       swap 0.01 ETH to USDC --network base-sepolia (mock)
     """
-    from .swap_preview import SwapPreview
+    records = _records()
+    if records and not (preview or ladder):
+        raise click.UsageError("--output json|jsonl needs --preview or --ladder")
 
     # Validate 'to' keyword
     if to_keyword.lower() != "to":
+        if records:
+            raise click.UsageError("Use: swap <amount> <from_token> to <to_token>")
         console.print(
             "[red]❌ Invalid syntax. Use: swap <amount> <from_token> to <to_token>[/red]"
         )
         console.print("[yellow]Example: swap 10 CELO to G$[/yellow]")
         return
 
+    ladder_amounts = _parse_ladder(ladder, amount) if ladder else None
+
+    if records:
+        _write_swap_preview(
+            records, from_token, to_token, amount, network, ladder_amounts
+        )
+        return
+
     console.print(
         f"[yellow]🔄 {amount} {from_token} → {to_token} on {network.upper()}[/yellow]"
     )
 
     # Get swap quote
-    swap_preview = SwapPreview()
+    swap_preview = _get_swap_preview()
     quote = swap_preview.get_swap_quote(from_token, to_token, amount, network)
 
     if not quote:
@@ -701,20 +1247,26 @@ def swap(amount, from_token, to_keyword, to_token, network, preview):
     # Display swap preview
     _show_swap_preview(quote)
 
+    if ladder_amounts:
+        _show_swap_ladder(swap_preview, from_token, to_token, ladder_amounts, network)
+        preview = True  # A ladder is for sizing; never execute from it
+
     if preview:
         console.print(
             "[blue]💡 This was a preview only. Remove --preview to execute.[/blue]"
         )
     else:
-        # Check balance before confirming
-        from .wallet import Wallet
-
-        wallet = Wallet(network)
+        # Check balance before confirming, reusing what the quote already read
         token_addresses = _get_tokens_for_network(network)
         from_address = token_addresses.get(from_token.upper())
 
         if from_address:
-            current_balance = wallet.get_balance(from_address)
+            if quote.get("state"):
+                current_balance = quote["state"]["balance"]
+            else:
+                from .wallet import Wallet
+
+                current_balance = Wallet(network).get_balance(from_address)
 
             # Confirm before executing
             console.print(
@@ -751,14 +1303,20 @@ def swap(amount, from_token, to_keyword, to_token, network, preview):
             console.print("[yellow]Swap cancelled.[/yellow]")
             return
 
+        quote = _recheck_confirmed_quote(swap_preview, quote, to_token)
+        if not quote:
+            return
+
         # Execute the actual swap
         console.print("[yellow]🔄 Executing swap...[/yellow]")
 
         # Use mock swap for testnets, real swap for mainnets
         if network == "base-sepolia":
             from .mock_swap import MockSwapExecutor
+            from .price_fetcher import PriceFetcher
 
-            executor = MockSwapExecutor(network)
+            # Pools are seeded from live prices so testnet swaps track mainnet
+            executor = MockSwapExecutor(network, price_source=PriceFetcher())
             tx_hash = executor.execute_mock_swap(
                 from_token, to_token, amount, quote["min_output"]
             )
@@ -767,7 +1325,14 @@ def swap(amount, from_token, to_keyword, to_token, network, preview):
 
             executor = SwapExecutor(network)
             tx_hash = executor.execute_swap(
-                from_token, to_token, amount, quote["min_output"]
+                from_token,
+                to_token,
+                amount,
+                quote["min_output"],
+                fee=quote.get("fee_tier"),
+                route=quote.get("route"),
+                state=quote.get("state"),
+                unlimited_approval=unlimited_approval,
             )
 
         if tx_hash:
@@ -805,8 +1370,45 @@ def swap(amount, from_token, to_keyword, to_token, network, preview):
             )
 
 
+def _write_swap_preview(records, from_token, to_token, amount, network, sizes=None):
+    """Write the quote record, then one ladder record per size"""
+    swap_preview = _get_swap_preview()
+    quote = swap_preview.get_swap_quote(from_token, to_token, amount, network)
+    if not quote:
+        records.write(
+            "error",
+            network=network,
+            error=f"Invalid swap: {from_token} or {to_token} not available",
+        )
+        return
+    records.write_from("quote", quote)
+
+    if not sizes:
+        return
+    result = swap_preview.get_swap_ladder(from_token, to_token, sizes, network)
+    if not result:
+        records.write(
+            "error",
+            network=network,
+            error="Price-impact ladder needs Uniswap V3 quotes (Base or Ethereum)",
+        )
+        return
+    for row in result["rows"]:
+        records.write_from(
+            "ladder",
+            row,
+            network=network,
+            from_token=result["from_token"],
+            to_token=result["to_token"],
+            spot_rate=result["spot_rate"],
+            source=result["source"],
+        )
+
+
 def _show_swap_preview(quote: dict):
     """Display swap preview in a nice table"""
+    from rich.table import Table
+
     table = Table(title="🔄 Swap Preview", show_header=False)
     table.add_column("Field", style="cyan")
     table.add_column("Value", style="green")
@@ -821,7 +1423,7 @@ def _show_swap_preview(quote: dict):
         f"1 {quote['from_token']} = {quote['rate']:.6f} {quote['to_token']}",
     )
     table.add_row("Network", quote["network"].upper())
-    table.add_row("DEX Fee", f"{quote['fee_percentage']:.1f}%")
+    table.add_row("DEX Fee", f"{quote['fee_percentage']:.2f}%")
     table.add_row("Slippage Tolerance", f"{quote['slippage_percentage']:.1f}%")
     table.add_row("Gas Limit", f"{quote['gas_estimate']:,}")
     table.add_row("Gas Price", f"{quote['gas_price_gwei']:.1f} gwei")
@@ -835,5 +1437,602 @@ def _show_swap_preview(quote: dict):
     console.print(table)
 
 
+def _recheck_confirmed_quote(swap_preview, quote: dict, to_token: str):
+    """The quote to execute after the user confirmed, or None to stop
+
+    The quote is reused unless the chain moved past the allowed block drift.
+    A re-quote whose minimum is below the confirmed one is shown and needs a
+    second confirmation, so a swap never accepts less than the user agreed to
+    without being asked.
+    """
+    quoted_block = quote.get("block_number")
+    confirmed_min = quote["min_output"]
+    fresh = swap_preview.refresh_quote(quote)
+    if not fresh:
+        console.print("[red]❌ Could not refresh the swap quote[/red]")
+        return None
+    if fresh.get("block_number") == quoted_block:
+        return fresh
+
+    console.print(
+        f"[yellow]🔄 Re-quoted at block {fresh['block_number']}: "
+        f"~{fresh['estimated_output']:.6f} {to_token}, "
+        f"minimum {fresh['min_output']:.6f}[/yellow]"
+    )
+    if fresh["min_output"] >= confirmed_min:
+        return fresh
+
+    console.print(
+        f"[yellow]⚠️  The new minimum is below the {confirmed_min:.6f} {to_token} "
+        "you confirmed[/yellow]"
+    )
+    confirm = input("Proceed with the new quote? (yes/no): ").lower().strip()
+    if confirm not in ["yes", "y"]:
+        console.print("[yellow]Swap cancelled.[/yellow]")
+        return None
+    return fresh
+
+
+def _parse_ladder(value: str, amount: float) -> list:
+    """Parse --ladder: a comma-separated list of sizes or 'auto'"""
+    from .swap_preview import ladder_sizes
+
+    if value.strip().lower() == "auto":
+        return ladder_sizes(amount)
+    try:
+        sizes = [float(size) for size in value.split(",") if size.strip()]
+    except ValueError:
+        raise click.BadParameter(
+            f"Invalid ladder sizes: {value}", param_hint="--ladder"
+        )
+    if not sizes or any(size <= 0 for size in sizes):
+        raise click.BadParameter("Ladder sizes must be positive", param_hint="--ladder")
+    return sizes
+
+
+def _show_swap_ladder(swap_preview, from_token, to_token, sizes, network):
+    """Quote a range of sizes at one block and show their price impact"""
+    from rich.table import Table
+
+    result = swap_preview.get_swap_ladder(from_token, to_token, sizes, network)
+    if not result:
+        console.print(
+            "[yellow]⚠️  Price-impact ladder needs Uniswap V3 quotes (Base or Ethereum)[/yellow]"
+        )
+        return
+
+    source = "local simulation" if result["source"] == "local" else "QuoterV2"
+    table = Table(title=f"📶 Price Impact: {from_token} → {to_token} ({source})")
+    table.add_column("Size", style="cyan", justify="right")
+    table.add_column("Output", style="green", justify="right")
+    table.add_column("Effective Rate", style="yellow", justify="right")
+    table.add_column("Price Impact", style="magenta", justify="right")
+    table.add_column("Pool", style="blue", justify="right")
+
+    for row in result["rows"]:
+        if not row["output"]:
+            table.add_row(
+                f"{row['amount']:g} {from_token}",
+                "[red]No liquidity[/red]",
+                "-",
+                "-",
+                "-",
+            )
+            continue
+        impact = row["price_impact"]
+        impact_style = "red" if impact >= 1 else "yellow" if impact >= 0.1 else "green"
+        table.add_row(
+            f"{row['amount']:g} {from_token}",
+            f"{row['output']:.6f} {to_token}",
+            f"{row['rate']:.6f}",
+            f"[{impact_style}]{impact:.2f}%[/{impact_style}]",
+            f"{row['fee_tier'] / 10000:.2f}%",
+        )
+
+    console.print(table)
+    console.print(
+        f"[dim]Spot: 1 {from_token} = {result['spot_rate']:.6f} {to_token}, "
+        f"all sizes quoted at the same block[/dim]"
+    )
+
+
+@cli.group()
+def dca():
+    """Recurring swaps (dollar-cost averaging)
+
+    Examples:
+      dca add 0.01 ETH to USDC --every 1d
+      dca list
+      dca run
+    """
+
+
+@dca.command("add")
+@click.argument("amount", type=float)
+@click.argument("from_token")
+@click.argument("to_keyword")
+@click.argument("to_token")
+@click.option("--every", "every", required=True, help="Interval, e.g. 30m, 4h, 1d, 1w")
+@click.option("--network", default="base", help="Network: base, ethereum")
+@click.option("--slippage", default=0.5, type=float, help="Slippage tolerance in %")
+def dca_add(amount, from_token, to_keyword, to_token, every, network, slippage):
+    """Schedule a recurring swap, first run on the next scheduler cycle"""
+    from .dca import DCASchedule, parse_interval
+
+    if to_keyword.lower() != "to":
+        console.print(
+            "[red]❌ Invalid syntax. Use: dca add <amount> <from_token> to <to_token>[/red]"
+        )
+        return
+
+    try:
+        interval = parse_interval(every)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--every")
+    if amount <= 0:
+        raise click.BadParameter("Amount must be positive", param_hint="AMOUNT")
+    if not 0 <= slippage < 100:
+        raise click.BadParameter(
+            "Slippage must be at least 0 and below 100", param_hint="--slippage"
+        )
+
+    # Orders are only sent on Uniswap V3 quotes, so the network needs a quoter
+    from .limit_orders import SUPPORTED_NETWORKS
+
+    if network not in SUPPORTED_NETWORKS:
+        console.print(
+            f"[red]❌ DCA orders need Uniswap V3 quotes: {', '.join(SUPPORTED_NETWORKS)}[/red]"
+        )
+        return
+
+    # Symbols are matched case-insensitively (cUSD, cEUR)
+    tokens = {symbol.upper() for symbol in _get_tokens_for_network(network)}
+    missing = [t for t in (from_token, to_token) if t.upper() not in tokens]
+    if missing:
+        console.print(
+            f"[red]❌ {', '.join(missing)} not available on {network.upper()}[/red]"
+        )
+        return
+
+    order = DCASchedule().add(network, from_token, to_token, amount, interval, slippage)
+    console.print(
+        f"[green]✅ DCA order {order['id']}: {amount} {order['from_token']} → "
+        f"{order['to_token']} every {every} on {network.upper()}[/green]"
+    )
+
+
+@dca.command("list")
+def dca_list():
+    """Show scheduled recurring swaps"""
+    from datetime import datetime
+    from rich.table import Table
+    from .dca import DCASchedule
+
+    orders = DCASchedule().list()
+    if not orders:
+        console.print("[yellow]No DCA orders scheduled[/yellow]")
+        return
+
+    table = Table(title="🔁 DCA Orders")
+    table.add_column("ID", style="cyan")
+    table.add_column("Swap", style="green")
+    table.add_column("Every", style="yellow", justify="right")
+    table.add_column("Network", style="blue")
+    table.add_column("Next Run", style="magenta")
+    table.add_column("Runs", justify="right")
+
+    for order in orders:
+        hours = order["interval"] / 3600
+        table.add_row(
+            order["id"],
+            f"{order['amount']:g} {order['from_token']} → {order['to_token']}",
+            f"{hours:g}h",
+            order["network"].upper(),
+            datetime.fromtimestamp(order["next_run"]).strftime("%Y-%m-%d %H:%M"),
+            str(order.get("runs", 0)),
+        )
+    console.print(table)
+
+
+@dca.command("remove")
+@click.argument("order_id")
+def dca_remove(order_id):
+    """Cancel a recurring swap"""
+    from .dca import DCASchedule
+
+    if DCASchedule().remove(order_id):
+        console.print(f"[green]✅ Removed DCA order {order_id}[/green]")
+    else:
+        console.print(f"[red]❌ No DCA order {order_id}[/red]")
+
+
+@dca.command("run")
+@click.option("--once", is_flag=True, help="Run due orders once and exit")
+def dca_run(once):
+    """Run the scheduler, executing due orders without confirmation"""
+    from .dca import DCAScheduler
+
+    scheduler = DCAScheduler()
+
+    def show(fills):
+        for fill in fills:
+            realized = fill["realized_out"]
+            detail = (
+                f"{realized:.6f} {fill['to_token']} (quoted {fill['quoted_out']:.6f})"
+                if realized is not None
+                else fill["status"]
+            )
+            console.print(
+                f"[{'green' if fill['status'] == 'filled' else 'red'}]"
+                f"{fill['order_id']} {fill['amount']:g} {fill['from_token']} → "
+                f"{detail}[/]"
+            )
+
+    if once:
+        fills = scheduler.run_once()
+        if not fills:
+            console.print("[yellow]No DCA orders due[/yellow]")
+        show(fills)
+        return
+
+    console.print("[yellow]🔁 DCA scheduler running, Ctrl+C to stop[/yellow]")
+    try:
+        while True:
+            show(scheduler.run_once())
+            scheduler.sleep_until_due()
+    except KeyboardInterrupt:
+        console.print("[yellow]DCA scheduler stopped[/yellow]")
+
+
+@dca.command("fills")
+@click.option("--limit", default=20, help="Number of fills to show")
+def dca_fills(limit):
+    """Show logged DCA fills, realized against quoted output"""
+    from datetime import datetime
+    from rich.table import Table
+    from .dca import DCAScheduler
+
+    fills = DCAScheduler().read_fills(limit)
+    if not fills:
+        console.print("[yellow]No DCA fills yet[/yellow]")
+        return
+
+    table = Table(title="📒 DCA Fills")
+    table.add_column("Time", style="cyan")
+    table.add_column("Order", style="blue")
+    table.add_column("Swap", style="green")
+    table.add_column("Quoted", justify="right")
+    table.add_column("Realized", justify="right")
+    table.add_column("Slippage", style="magenta", justify="right")
+    table.add_column("Status", style="yellow")
+
+    for fill in fills:
+        quoted, realized = fill["quoted_out"], fill["realized_out"]
+        bps = fill["slippage_bps"]
+        table.add_row(
+            datetime.fromtimestamp(fill["timestamp"]).strftime("%Y-%m-%d %H:%M"),
+            fill["order_id"],
+            f"{fill['amount']:g} {fill['from_token']} → {fill['to_token']}",
+            f"{quoted:.6f}" if quoted is not None else "-",
+            f"{realized:.6f}" if realized is not None else "-",
+            f"{bps:.1f} bps" if bps is not None else "-",
+            fill["status"],
+        )
+    console.print(table)
+
+
+@cli.group()
+def limit():
+    """Limit orders, filled by a watcher when the rate is reached
+
+    Examples:
+      limit add 1 ETH to USDC --at 4000
+      limit list
+      limit watch
+    """
+
+
+@limit.command("add")
+@click.argument("amount", type=float)
+@click.argument("from_token")
+@click.argument("to_keyword")
+@click.argument("to_token")
+@click.option(
+    "--at", "min_rate", required=True, type=float, help="Minimum rate (to per from)"
+)
+@click.option("--network", default="base", help="Network: base, ethereum")
+def limit_add(amount, from_token, to_keyword, to_token, min_rate, network):
+    """Swap once 1 FROM_TOKEN buys at least --at TO_TOKEN"""
+    from .limit_orders import SUPPORTED_NETWORKS, LimitOrderBook
+
+    if to_keyword.lower() != "to":
+        console.print(
+            "[red]❌ Invalid syntax. Use: limit add <amount> <from_token> to <to_token>[/red]"
+        )
+        return
+    if amount <= 0:
+        raise click.BadParameter("Amount must be positive", param_hint="AMOUNT")
+    if min_rate <= 0:
+        raise click.BadParameter("The rate must be positive", param_hint="--at")
+    if network not in SUPPORTED_NETWORKS:
+        console.print(
+            f"[red]❌ Limit orders need Uniswap V3 quotes: {', '.join(SUPPORTED_NETWORKS)}[/red]"
+        )
+        return
+
+    tokens = _get_tokens_for_network(network)
+    missing = [t for t in (from_token, to_token) if t.upper() not in tokens]
+    if missing:
+        console.print(
+            f"[red]❌ {', '.join(missing)} not available on {network.upper()}[/red]"
+        )
+        return
+
+    order = LimitOrderBook().add(network, from_token, to_token, amount, min_rate)
+    console.print(
+        f"[green]✅ Limit order {order['id']}: {amount} {order['from_token']} → "
+        f"{order['to_token']} at ≥ {min_rate:g} on {network.upper()}[/green]"
+    )
+    console.print(
+        "[blue]💡 Run 'limit watch' to fill it when the rate is reached[/blue]"
+    )
+
+
+@limit.command("list")
+@click.option("--all", "show_all", is_flag=True, help="Include filled and cancelled")
+def limit_list(show_all):
+    """Show limit orders"""
+    from rich.table import Table
+    from .limit_orders import LimitOrderBook
+
+    orders = [
+        order
+        for order in LimitOrderBook().list()
+        if show_all or order["status"] in ("open", "pending")
+    ]
+    if not orders:
+        console.print("[yellow]No limit orders[/yellow]")
+        return
+
+    table = Table(title="🎯 Limit Orders")
+    table.add_column("ID", style="cyan")
+    table.add_column("Swap", style="green")
+    table.add_column("Min Rate", style="yellow", justify="right")
+    table.add_column("Network", style="blue")
+    table.add_column("Status", style="magenta")
+    table.add_column("Transaction")
+
+    for order in orders:
+        table.add_row(
+            order["id"],
+            f"{order['amount']:g} {order['from_token']} → {order['to_token']}",
+            f"{order['min_rate']:g}",
+            order["network"].upper(),
+            order["status"],
+            order.get("tx_hash") or "-",
+        )
+    console.print(table)
+
+
+@limit.command("cancel")
+@click.argument("order_id")
+def limit_cancel(order_id):
+    """Cancel an open limit order"""
+    from .limit_orders import LimitOrderBook
+
+    if LimitOrderBook().cancel(order_id):
+        console.print(f"[green]✅ Cancelled limit order {order_id}[/green]")
+    else:
+        console.print(f"[red]❌ No open limit order {order_id}[/red]")
+
+
+@limit.command("watch")
+@click.option("--once", is_flag=True, help="Check the current block once and exit")
+def limit_watch(once):
+    """Watch open orders every block and execute them without confirmation"""
+    import time
+    from .limit_orders import LimitOrderWatcher
+
+    watcher = LimitOrderWatcher()
+
+    def show(filled):
+        for order in filled:
+            console.print(
+                f"[green]✅ Filled {order['id']}: {order['amount']:g} "
+                f"{order['from_token']} → {order['to_token']} at {order['rate']:.6g} "
+                f"({order['tx_hash']})[/green]"
+            )
+
+    if once:
+        show(watcher.run_once())
+        return
+
+    console.print("[yellow]🎯 Watching limit orders, Ctrl+C to stop[/yellow]")
+    try:
+        while True:
+            show(watcher.run_once())
+            time.sleep(watcher.poll_interval)
+    except KeyboardInterrupt:
+        console.print("[yellow]Limit order watcher stopped[/yellow]")
+
+
+@cli.group()
+def alert():
+    """Price alerts, sent as desktop notifications
+
+    Examples:
+      alert add CELO below 0.40
+      alert add DEGEN +20% in 1h
+      alert watch
+    """
+
+
+@alert.command("add", context_settings={"ignore_unknown_options": True})
+@click.argument("token")
+@click.argument("condition", nargs=-1, required=True)
+def alert_add(token, condition):
+    """Alert when TOKEN goes above/below a USD price or moves by a percent"""
+    from .price_alerts import PriceAlertEngine, describe_rule, parse_rule
+
+    try:
+        rule = parse_rule(condition)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="CONDITION")
+
+    engine = PriceAlertEngine()
+    if not engine.price_fetcher.has_price_source(token):
+        console.print(f"[red]❌ No price source for {token}[/red]")
+        return
+
+    rule = engine.add(token, rule["kind"], rule["threshold"], rule.get("window"))
+    console.print(f"[green]✅ Alert {rule['id']}: {describe_rule(rule)}[/green]")
+    console.print("[blue]💡 Run 'alert watch' to be notified[/blue]")
+
+
+@alert.command("list")
+def alert_list():
+    """Show price alert rules"""
+    from datetime import datetime
+    from rich.table import Table
+    from .price_alerts import PriceAlertEngine, describe_rule
+
+    rules = PriceAlertEngine().list()
+    if not rules:
+        console.print("[yellow]No price alerts[/yellow]")
+        return
+
+    table = Table(title="🔔 Price Alerts")
+    table.add_column("ID", style="cyan")
+    table.add_column("Rule", style="green")
+    table.add_column("Last Fired", style="magenta")
+
+    for rule in rules:
+        last_fired = rule.get("last_fired")
+        table.add_row(
+            rule["id"],
+            describe_rule(rule),
+            (
+                datetime.fromtimestamp(last_fired).strftime("%Y-%m-%d %H:%M")
+                if last_fired
+                else "-"
+            ),
+        )
+    console.print(table)
+
+
+@alert.command("remove")
+@click.argument("rule_id")
+def alert_remove(rule_id):
+    """Delete a price alert"""
+    from .price_alerts import PriceAlertEngine
+
+    if PriceAlertEngine().remove(rule_id):
+        console.print(f"[green]✅ Removed alert {rule_id}[/green]")
+    else:
+        console.print(f"[red]❌ No alert {rule_id}[/red]")
+
+
+@alert.command("watch")
+@click.option("--interval", default=60, help="Seconds between price checks")
+def alert_watch(interval):
+    """Check prices for every ruled token in one request per tick"""
+    import time
+    from .price_alerts import PriceAlertEngine, describe_rule
+
+    engine = PriceAlertEngine()
+    console.print(
+        f"[yellow]🔔 Watching {len(engine.list())} alert(s) every {interval}s, "
+        "Ctrl+C to stop[/yellow]"
+    )
+    try:
+        while True:
+            for fired in engine.check():
+                console.print(
+                    f"[green]🔔 {describe_rule(fired)}: ${fired['price']:.6g}[/green]"
+                )
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        console.print("[yellow]Price alerts stopped[/yellow]")
+
+
+def _run_captured(argv, width, color):
+    """Run a command line for the daemon, returning (exit code, output)"""
+    import contextlib
+    import io
+    from rich.console import Console
+
+    output = io.StringIO()
+    previous = _LazyConsole._console
+    _LazyConsole._console = Console(
+        file=output,
+        width=width,
+        force_terminal=color,
+        color_system="256" if color else None,
+    )
+    exit_code = 0
+    try:
+        with contextlib.redirect_stdout(output):
+            try:
+                cli.main(args=list(argv), prog_name="main.py", standalone_mode=False)
+            except click.ClickException as e:
+                e.show(file=output)
+                exit_code = e.exit_code
+            except click.exceptions.Exit as e:
+                exit_code = e.exit_code
+    finally:
+        _LazyConsole._console = previous
+    return exit_code, output.getvalue()
+
+
+@cli.command()
+@click.option("--stop", is_flag=True, help="Stop the running daemon")
+@click.option("--status", is_flag=True, help="Show whether a daemon is running")
+def daemon(stop, status):
+    """Keep wallets, caches and pool state warm in the background
+
+    While it runs, balance, discover, history and swap --preview are served
+    by it instead of starting from scratch. Runs in the foreground; Ctrl+C
+    or 'daemon --stop' ends it.
+    """
+    from .config import DAEMON_SOCKET, NETWORKS
+    from .daemon import Daemon, request
+
+    if stop or status:
+        response = request({"op": "stop" if stop else "status"})
+        if not response:
+            console.print("[yellow]No daemon running[/yellow]")
+        elif stop:
+            console.print("[green]✅ Daemon stopped[/green]")
+        else:
+            console.print(
+                f"[green]✅ Daemon running (pid {response['pid']}), "
+                f"up {response['uptime'] / 60:.0f} min, "
+                f"{response['served']} command(s) served[/green]"
+            )
+        return
+
+    # Pay the imports and connection setup once, before the first command
+    try:
+        from rich.table import Table  # noqa: F401
+        from .transaction_history import TransactionHistory  # noqa: F401
+
+        _get_swap_preview()
+        for network in NETWORKS:
+            _get_wallet(network)
+    except Exception as e:
+        print(f"DEBUG: Daemon warm-up failed: {e}")
+
+    console.print(f"[green]✅ terminalSwap daemon listening on {DAEMON_SOCKET}[/green]")
+    console.print("[dim]Ctrl+C or 'daemon --stop' to stop[/dim]")
+    try:
+        Daemon(_run_captured).serve_forever()
+    except RuntimeError as e:
+        console.print(f"[red]❌ {e}[/red]")
+        return
+    except KeyboardInterrupt:
+        pass
+    console.print("[yellow]Daemon stopped[/yellow]")
+
+
 if __name__ == "__main__":
     cli()
@@ -1,9 +1,23 @@
+import atexit
 import os
+import shutil
+import tempfile
 from dataclasses import dataclass
 from typing import Dict
 from dotenv import load_dotenv
 
-load_dotenv()
+_env_loaded = False
+
+
+def load_env():
+    """Load .env into the environment once per process"""
+    global _env_loaded
+    if not _env_loaded:
+        load_dotenv()
+        _env_loaded = True
+
+
+load_env()
 
 
 @dataclass
@@ -14,6 +28,26 @@ class NetworkConfig:
     native_token: str
 
 
+# "rpc" talks to each network's RPC URL; "local" runs an in-process EVM instead
+BACKEND = os.getenv("TERMINALSWAP_BACKEND", "rpc")
+
+# Local state (token registry, caches) is kept here between runs
+HOME_DIR = os.getenv(
+    "TERMINALSWAP_HOME", os.path.join(os.path.expanduser("~"), ".terminalswap")
+)
+DATA_DIR = HOME_DIR
+if BACKEND == "local":
+    # The local chain only lives as long as the process, and so do its caches
+    DATA_DIR = tempfile.mkdtemp(prefix="terminalswap-local-")
+    atexit.register(shutil.rmtree, DATA_DIR, ignore_errors=True)
+
+# Unix socket of the optional background daemon (python main.py daemon)
+DAEMON_SOCKET = os.getenv("TERMINALSWAP_SOCKET", os.path.join(HOME_DIR, "daemon.sock"))
+
+# Where notifications go: any of desktop, stdout, webhook (comma-separated)
+NOTIFY_SINKS = os.getenv("TERMINALSWAP_NOTIFY", "desktop")
+NOTIFY_WEBHOOK_URL = os.getenv("TERMINALSWAP_WEBHOOK_URL", "")
+
 NETWORKS: Dict[str, NetworkConfig] = {
     "base": NetworkConfig(
         name="Base",
@@ -41,9 +75,23 @@ NETWORKS: Dict[str, NetworkConfig] = {
     ),
 }
 
+# Networks with real value; "all network" totals leave testnets out
+MAINNET_NETWORKS = ["base", "ethereum", "celo"]
+
 # Common token addresses on Base
 BASE_TOKENS = {
     "ETH": "0x0000000000000000000000000000000000000000",  # Native ETH
     "USDC": "0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913",
     "WETH": "0x4200000000000000000000000000000000000006",
 }
+
+# Tokens that don't use 18 decimals
+TOKEN_DECIMALS = {
+    "USDC": 6,
+    "USDT": 6,
+}
+
+
+def get_token_decimals(symbol: str) -> int:
+    """Get decimals for a token symbol (18 unless listed above)"""
+    return TOKEN_DECIMALS.get(symbol.upper(), 18)
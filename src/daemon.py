@@ -0,0 +1,198 @@
+"""Optional background daemon that keeps wallets, caches and pool state warm
+
+`python main.py daemon` listens on a Unix socket. While it runs, read-only
+commands (balance, discover, history, swap --preview) are executed inside it,
+so repeat calls skip the imports, account setup, RPC handshakes and cold price,
+token and pool caches. The CLI sends the command line and prints the rendered
+output. When no daemon is running, or it can't serve a command, the command
+runs in-process as before.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import socket
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from .config import DAEMON_SOCKET
+
+# Commands that only read state; anything that signs or prompts runs locally
+SERVED_COMMANDS = ("balance", "discover", "history", "swap")
+GLOBAL_OPTIONS = ("--output",)  # Options before the command, each with a value
+CONNECT_TIMEOUT = 0.2  # Seconds; a stale socket file fails fast
+COMMAND_TIMEOUT = 120  # Seconds to wait for a served command before giving up
+MAX_REQUEST = 64 * 1024
+
+# (argv, width, color) -> (exit code, rendered output)
+Runner = Callable[[List[str], int, bool], Tuple[int, str]]
+
+
+def _command_args(argv: Sequence[str]) -> List[str]:
+    """The command and its arguments, after any global options"""
+    args = list(argv)
+    while args and args[0].startswith("-"):
+        option = args.pop(0)
+        if option in GLOBAL_OPTIONS and args:
+            args.pop(0)
+        elif option.split("=")[0] not in GLOBAL_OPTIONS:
+            return []  # --help or an unknown option: let click handle it
+    return args
+
+
+def can_serve(argv: Sequence[str]) -> bool:
+    """Whether a command line is read-only and non-interactive"""
+    argv = _command_args(argv)
+    if not argv or argv[0] not in SERVED_COMMANDS or "--help" in argv:
+        return False
+    if argv[0] == "history":
+        # Export paths are relative to the caller's working directory
+        return not any(arg.startswith("--export") for arg in argv)
+    if argv[0] == "swap":
+        # A ladder is always a preview; anything else would sign and prompt
+        return any(arg == "--preview" or arg.startswith("--ladder") for arg in argv)
+    return True
+
+
+def config_fingerprint() -> str:
+    """Hash of the settings that decide what a command sees
+
+    A daemon only serves clients with the same key, RPC URLs, API keys and
+    terminalSwap settings, so editing .env never returns stale answers.
+    """
+    digest = hashlib.sha256()
+    for name in sorted(os.environ):
+        if (
+            name == "PRIVATE_KEY"
+            or name.startswith("TERMINALSWAP_")
+            or name.endswith(("_RPC_URL", "_API_KEY"))
+        ):
+            digest.update(f"{name}={os.environ[name]}\n".encode())
+    return digest.hexdigest()
+
+
+def request(message: Dict, path: str = DAEMON_SOCKET, timeout: float = 5.0):
+    """Send one message to the daemon; None if none is listening"""
+    if not hasattr(socket, "AF_UNIX") or not os.path.exists(path):
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(CONNECT_TIMEOUT)
+            sock.connect(path)
+            sock.settimeout(timeout)
+            sock.sendall(json.dumps(message).encode() + b"\n")
+            with sock.makefile("rb") as fh:
+                line = fh.readline()
+        return json.loads(line) if line else None
+    except (OSError, ValueError):
+        return None
+
+
+def run_remote(argv: Sequence[str], path: str = DAEMON_SOCKET) -> Optional[int]:
+    """Run a command in the daemon and print its output
+
+    Returns the exit code, or None when the caller should run it in-process.
+    """
+    if not can_serve(argv):
+        return None
+    response = request(
+        {
+            "op": "run",
+            "argv": list(argv),
+            "fingerprint": config_fingerprint(),
+            "width": shutil.get_terminal_size().columns,
+            "color": sys.stdout.isatty(),
+        },
+        path,
+        timeout=COMMAND_TIMEOUT,
+    )
+    if not response or response.get("status") != "ok":
+        return None
+    sys.stdout.write(response["output"])
+    sys.stdout.flush()
+    return response["exit_code"]
+
+
+class Daemon:
+    """Serves command lines over a Unix socket, one at a time, from warm state"""
+
+    def __init__(self, runner: Runner, path: str = DAEMON_SOCKET):
+        self.runner = runner
+        self.path = path
+        self.fingerprint = config_fingerprint()
+        self.started_at = time.time()
+        self.served = 0
+        self._stopping = False
+
+    def handle(self, message: Dict) -> Dict:
+        """Answer one request"""
+        op = message.get("op")
+        if op == "status":
+            return {
+                "status": "ok",
+                "pid": os.getpid(),
+                "uptime": time.time() - self.started_at,
+                "served": self.served,
+            }
+        if op == "stop":
+            self._stopping = True
+            return {"status": "ok"}
+        if op != "run":
+            return {"status": "error", "reason": f"Unknown request: {op}"}
+
+        argv = message.get("argv") or []
+        if message.get("fingerprint") != self.fingerprint:
+            return {"status": "fallback", "reason": "Settings differ from the daemon's"}
+        if not can_serve(argv):
+            return {"status": "fallback", "reason": "Not a read-only command"}
+        try:
+            exit_code, output = self.runner(
+                argv, int(message.get("width", 80)), bool(message.get("color"))
+            )
+        except Exception as e:
+            # The client re-runs it in-process and shows the real error
+            print(f"DEBUG: Daemon command failed: {e}")
+            return {"status": "fallback", "reason": str(e)}
+        self.served += 1
+        return {"status": "ok", "exit_code": exit_code, "output": output}
+
+    def _serve_connection(self, conn: socket.socket):
+        conn.settimeout(5)
+        with conn.makefile("rb") as fh:
+            line = fh.readline(MAX_REQUEST)
+        try:
+            message = json.loads(line)
+        except ValueError:
+            return
+        response = self.handle(message if isinstance(message, dict) else {})
+        conn.settimeout(None)
+        conn.sendall(json.dumps(response).encode() + b"\n")
+
+    def serve_forever(self):
+        """Listen until stopped; commands run one at a time"""
+        if request({"op": "status"}, self.path):
+            raise RuntimeError(f"A daemon is already listening on {self.path}")
+        if os.path.exists(self.path):
+            os.unlink(self.path)  # Left behind by a daemon that was killed
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        previous_umask = os.umask(0o177)  # Only this user may connect
+        try:
+            server.bind(self.path)
+        finally:
+            os.umask(previous_umask)
+        server.listen(16)
+        try:
+            while not self._stopping:
+                conn, _ = server.accept()
+                with conn:
+                    try:
+                        self._serve_connection(conn)
+                    except OSError as e:
+                        print(f"DEBUG: Daemon connection failed: {e}")
+        finally:
+            server.close()
+            if os.path.exists(self.path):
+                os.unlink(self.path)
@@ -0,0 +1,479 @@
+"""Recurring swaps (DCA): a persistent schedule and a long-running scheduler
+
+Due orders on a network are quoted against one shared chain state read and
+sent as a single SwapRouter02 multicall, so a cycle costs one fee and nonce
+lookup per network instead of one per order. Every fill is appended to a
+JSONL log with the quoted and realized output.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from typing import TYPE_CHECKING, Dict, List, Optional
+from .config import DATA_DIR, get_token_decimals
+from .file_lock import file_lock
+
+if TYPE_CHECKING:
+    from .swap_preview import SwapPreview
+
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+TRANSFER_TOPIC = "0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"
+WITHDRAWAL_TOPIC = "0x7fcf532c15f0a6db0bd6d0e038bea71d30d808c7d98cb3bf7268a95bf5081b65"
+
+INTERVAL_UNITS = {"m": 60, "h": 3600, "d": 86400, "w": 604800}
+MIN_INTERVAL = 60
+POLL_INTERVAL = 30  # Seconds the scheduler sleeps between cycles at most
+RECEIPT_TIMEOUT = 180
+PENDING_TIMEOUT = 3600  # Seconds before a pending bundle with no receipt is dropped
+
+
+def parse_interval(interval: str) -> int:
+    """Seconds in an interval like 30m, 4h, 1d or 2w"""
+    match = re.fullmatch(r"\s*(\d+)\s*([mhdw])\s*", interval.lower())
+    if not match:
+        raise ValueError(f"Invalid interval: {interval} (use e.g. 30m, 4h, 1d, 1w)")
+    seconds = int(match.group(1)) * INTERVAL_UNITS[match.group(2)]
+    if seconds < MIN_INTERVAL:
+        raise ValueError(f"Interval must be at least {MIN_INTERVAL} seconds")
+    return seconds
+
+
+def _canonical_symbol(network: str, symbol: str) -> str:
+    """The configured spelling of a symbol (cUSD, not CUSD), matched by case"""
+    from .cli import _get_tokens_for_network
+
+    for known in _get_tokens_for_network(network):
+        if known.upper() == symbol.upper():
+            return known
+    return symbol.upper()
+
+
+class DCASchedule:
+    """Recurring orders kept in DATA_DIR/dca.json, changed under its file lock"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.path.join(DATA_DIR, "dca.json")
+        self._lock = threading.Lock()
+
+    def _load(self) -> List[Dict]:
+        """Load orders from disk"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as fh:
+                return json.load(fh)
+        except (OSError, ValueError):
+            return []
+
+    def _save(self, orders: List[Dict]):
+        """Write orders atomically"""
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as fh:
+                json.dump(orders, fh, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"DEBUG: Failed to save DCA schedule: {e}")
+
+    def list(self) -> List[Dict]:
+        """Every order, active or not"""
+        return self._load()
+
+    def add(
+        self,
+        network: str,
+        from_token: str,
+        to_token: str,
+        amount: float,
+        interval: int,
+        slippage: float = 0.5,
+        start: Optional[float] = None,
+    ) -> Dict:
+        """Schedule a recurring swap; the first run is at start (default now)"""
+        now = time.time()
+        order = {
+            "id": uuid.uuid4().hex[:8],
+            "network": network,
+            "from_token": _canonical_symbol(network, from_token),
+            "to_token": _canonical_symbol(network, to_token),
+            "amount": amount,
+            "interval": interval,
+            "slippage": slippage,
+            "next_run": start if start is not None else now,
+            "runs": 0,
+            "created_at": now,
+            "active": True,
+        }
+        with self._lock, file_lock(self.path):
+            orders = self._load()
+            orders.append(order)
+            self._save(orders)
+        return order
+
+    def remove(self, order_id: str) -> bool:
+        """Delete an order; returns whether it existed"""
+        with self._lock, file_lock(self.path):
+            orders = self._load()
+            remaining = [order for order in orders if order["id"] != order_id]
+            if len(remaining) == len(orders):
+                return False
+            self._save(remaining)
+            return True
+
+    def due(self, now: Optional[float] = None) -> Dict[str, List[Dict]]:
+        """Active orders whose next run has passed, grouped by network"""
+        now = time.time() if now is None else now
+        by_network: Dict[str, List[Dict]] = {}
+        for order in self._load():
+            if order.get("active", True) and order["next_run"] <= now:
+                by_network.setdefault(order["network"], []).append(order)
+        return by_network
+
+    def next_run(self) -> Optional[float]:
+        """Earliest next run of any active order"""
+        runs = [
+            order["next_run"] for order in self._load() if order.get("active", True)
+        ]
+        return min(runs) if runs else None
+
+    def mark_run(self, order_ids: List[str], now: Optional[float] = None):
+        """Advance orders past now, skipping runs missed while stopped"""
+        now = time.time() if now is None else now
+        # The CLI adds and removes orders from another process while this runs
+        with self._lock, file_lock(self.path):
+            # Re-read so orders added while a cycle ran are kept
+            orders = self._load()
+            for order in orders:
+                if order["id"] in order_ids:
+                    order["runs"] = order.get("runs", 0) + 1
+                    while order["next_run"] <= now:
+                        order["next_run"] += order["interval"]
+            self._save(orders)
+
+
+class DCAScheduler:
+    """Runs due orders, one bundled transaction per network per cycle"""
+
+    def __init__(
+        self,
+        schedule: Optional[DCASchedule] = None,
+        preview: Optional["SwapPreview"] = None,
+        fills_path: Optional[str] = None,
+        poll_interval: int = POLL_INTERVAL,
+    ):
+        self.schedule = schedule or DCASchedule()
+        # Wallets, DEX integrations and executors stay warm between cycles
+        if preview is None:
+            from .swap_preview import SwapPreview
+
+            preview = SwapPreview()
+        self.preview = preview
+        self.executors: Dict = {}
+        self.fills_path = fills_path or os.path.join(DATA_DIR, "dca_fills.jsonl")
+        self.poll_interval = poll_interval
+
+    def _get_executor(self, network: str):
+        """Get or create the SwapExecutor for a network"""
+        if network not in self.executors:
+            from .swap_executor import SwapExecutor
+
+            self.executors[network] = SwapExecutor(network)
+        return self.executors[network]
+
+    def run_forever(self):
+        """Run cycles until interrupted"""
+        while True:
+            self.run_once()
+            self.sleep_until_due()
+
+    def sleep_until_due(self):
+        """Sleep until the next order is due, at most poll_interval"""
+        next_run = self.schedule.next_run()
+        delay = self.poll_interval
+        if next_run is not None:
+            delay = min(max(next_run - time.time(), 1), self.poll_interval)
+        time.sleep(delay)
+
+    def run_once(self, now: Optional[float] = None) -> List[Dict]:
+        """Execute every due order and return the fills logged"""
+        now = time.time() if now is None else now
+        fills = self.reconcile_pending()
+        for network, orders in self.schedule.due(now).items():
+            fills.extend(self.run_network(network, orders))
+            self.schedule.mark_run([order["id"] for order in orders], now)
+        return fills
+
+    def run_network(self, network: str, orders: List[Dict]) -> List[Dict]:
+        """Quote and execute one network's due orders as a single bundle"""
+        fills = []
+        try:
+            # One block, gas price and nonce read shared by every order
+            state = self.preview._fetch_chain_state(network, ZERO_ADDRESS, "ETH")
+            if not state:
+                return self._log_fills(
+                    [self._fill(order, network, "failed") for order in orders]
+                )
+
+            quoted, swaps = [], []
+            for order in orders:
+                quote = self.preview.get_swap_quote(
+                    order["from_token"],
+                    order["to_token"],
+                    order["amount"],
+                    network,
+                    state=state,
+                )
+                # Unattended swaps only trust a pool quote, never a price feed
+                if not quote or not str(quote.get("quote_source", "")).startswith(
+                    "Uniswap"
+                ):
+                    fills.append(self._fill(order, network, "no_quote"))
+                    continue
+
+                estimated = quote["estimated_output"]
+                min_out = estimated * (1 - order.get("slippage", 0.5) / 100)
+                quoted.append((order, estimated, min_out))
+                swaps.append(
+                    {
+                        "from_token": order["from_token"],
+                        "to_token": order["to_token"],
+                        "amount": order["amount"],
+                        "min_amount_out": min_out,
+                        "fee": quote.get("fee_tier"),
+                        "route": quote.get("route"),
+                    }
+                )
+
+            if not swaps:
+                return self._log_fills(fills)
+
+            executor = self._get_executor(network)
+            tx_hash = executor.execute_swaps(swaps, state=state)
+            if not tx_hash:
+                fills.extend(
+                    self._fill(order, network, "failed", quoted_out=estimated)
+                    for order, estimated, _ in quoted
+                )
+                return self._log_fills(fills)
+
+            from web3.exceptions import TimeExhausted
+
+            try:
+                receipt = executor.wallet.w3.eth.wait_for_transaction_receipt(
+                    tx_hash, timeout=RECEIPT_TIMEOUT
+                )
+            except TimeExhausted:
+                # Broadcast and maybe mined later; the next cycle reconciles it
+                fills.extend(
+                    self._fill(
+                        order,
+                        network,
+                        "pending",
+                        tx_hash=tx_hash,
+                        quoted_out=estimated,
+                        min_out=min_out,
+                        bundle_size=len(quoted),
+                    )
+                    for order, estimated, min_out in quoted
+                )
+                return self._log_fills(fills)
+
+            fills.extend(self._receipt_fills(receipt, quoted, tx_hash, network))
+
+        except Exception as e:
+            print(f"DEBUG: DCA run failed on {network}: {e}")
+            logged = {fill["order_id"] for fill in fills}
+            fills.extend(
+                self._fill(order, network, "failed")
+                for order in orders
+                if order["id"] not in logged
+            )
+
+        return self._log_fills(fills)
+
+    def _receipt_fills(
+        self, receipt, quoted: List, tx_hash: str, network: str
+    ) -> List[Dict]:
+        """Filled or reverted fills for a bundle's orders from its receipt"""
+        executor = self._get_executor(network)
+        realized = self._realized_outputs(
+            receipt, quoted, executor.wallet.address, network
+        )
+        status = "filled" if receipt["status"] == 1 else "reverted"
+        return [
+            self._fill(
+                order,
+                network,
+                status,
+                tx_hash=tx_hash,
+                block=receipt["blockNumber"],
+                quoted_out=estimated,
+                min_out=min_out,
+                realized_out=realized_out if status == "filled" else 0.0,
+                bundle_size=len(quoted),
+            )
+            for (order, estimated, min_out), realized_out in zip(quoted, realized)
+        ]
+
+    def reconcile_pending(self, now: Optional[float] = None) -> List[Dict]:
+        """Resolve bundles logged as pending once their receipt is available
+
+        Each pending bundle gets a filled or reverted entry for its orders, or
+        "dropped" when no receipt appeared within PENDING_TIMEOUT.
+        """
+        now = time.time() if now is None else now
+        pending: Dict[tuple, List[Dict]] = {}
+        for fill in self.read_fills():
+            key = (fill["network"], fill.get("tx_hash"))
+            if fill["status"] == "pending":
+                pending.setdefault(key, []).append(fill)
+            else:
+                pending.pop(key, None)
+
+        fills = []
+        for (network, tx_hash), entries in pending.items():
+            quoted = [
+                (
+                    {
+                        "id": fill["order_id"],
+                        "from_token": fill["from_token"],
+                        "to_token": fill["to_token"],
+                        "amount": fill["amount"],
+                    },
+                    fill["quoted_out"],
+                    fill["min_out"],
+                )
+                for fill in entries
+            ]
+            from web3.exceptions import TransactionNotFound
+
+            try:
+                w3 = self._get_executor(network).wallet.w3
+                receipt = w3.eth.get_transaction_receipt(tx_hash)
+            except TransactionNotFound:
+                receipt = None
+            except Exception as e:
+                print(f"DEBUG: Pending DCA bundle {tx_hash} check failed: {e}")
+                continue
+
+            if receipt is not None:
+                fills.extend(self._receipt_fills(receipt, quoted, tx_hash, network))
+            elif now - entries[0]["timestamp"] > PENDING_TIMEOUT:
+                fills.extend(
+                    self._fill(
+                        order,
+                        network,
+                        "dropped",
+                        tx_hash=tx_hash,
+                        quoted_out=estimated,
+                        min_out=min_out,
+                        bundle_size=len(quoted),
+                    )
+                    for order, estimated, min_out in quoted
+                )
+        return self._log_fills(fills)
+
+    def _realized_outputs(
+        self, receipt, quoted: List, wallet_address: str, network: str
+    ) -> List[float]:
+        """Output each order received, from the bundle's Transfer and Withdrawal logs
+
+        Orders sharing an output token split what arrived pro rata to their
+        quotes, since the router pays them out together.
+        """
+        from .cli import _get_tokens_for_network
+
+        tokens = _get_tokens_for_network(network)
+        wallet_topic = "0x" + wallet_address[2:].lower().zfill(64)
+        received: Dict[str, int] = {}
+        for log in receipt["logs"]:
+            topics = [self._hex(topic) for topic in log["topics"]]
+            emitter = log["address"].lower()
+            amount = int(self._hex(log["data"]), 16) if self._hex(log["data"]) else 0
+            if topics[0] == TRANSFER_TOPIC and len(topics) == 3:
+                if topics[2] == wallet_topic:
+                    received[emitter] = received.get(emitter, 0) + amount
+            elif topics[0] == WITHDRAWAL_TOPIC:
+                # unwrapWETH9 pays native ETH out of a WETH withdrawal
+                received[ZERO_ADDRESS] = received.get(ZERO_ADDRESS, 0) + amount
+
+        quoted_totals: Dict[str, float] = {}
+        for order, estimated, _ in quoted:
+            token = order["to_token"]
+            quoted_totals[token] = quoted_totals.get(token, 0) + estimated
+
+        realized = []
+        for order, estimated, _ in quoted:
+            token = order["to_token"]
+            address = (tokens.get(token) or "").lower()
+            total = received.get(address, 0) / 10 ** get_token_decimals(token)
+            share = estimated / quoted_totals[token] if quoted_totals[token] else 0
+            realized.append(total * share)
+        return realized
+
+    @staticmethod
+    def _hex(value) -> str:
+        """Topics and data as 0x-prefixed lowercase hex, whatever the provider returns"""
+        if isinstance(value, (bytes, bytearray)):
+            value = value.hex()
+        value = str(value).lower()
+        value = value[2:] if value.startswith("0x") else value
+        return "0x" + value if value else ""
+
+    @staticmethod
+    def _fill(
+        order: Dict,
+        network: str,
+        status: str,
+        tx_hash: Optional[str] = None,
+        block: Optional[int] = None,
+        quoted_out: Optional[float] = None,
+        min_out: Optional[float] = None,
+        realized_out: Optional[float] = None,
+        bundle_size: int = 1,
+    ) -> Dict:
+        """One fill log entry, with realized against quoted output"""
+        slippage_bps = None
+        if quoted_out and realized_out is not None and status == "filled":
+            slippage_bps = round((quoted_out - realized_out) / quoted_out * 10_000, 2)
+        return {
+            "order_id": order["id"],
+            "network": network,
+            "status": status,
+            "from_token": order["from_token"],
+            "to_token": order["to_token"],
+            "amount": order["amount"],
+            "quoted_out": quoted_out,
+            "min_out": min_out,
+            "realized_out": realized_out,
+            "slippage_bps": slippage_bps,
+            "tx_hash": tx_hash,
+            "block": block,
+            "bundle_size": bundle_size,
+            "timestamp": time.time(),
+        }
+
+    def _log_fills(self, fills: List[Dict]) -> List[Dict]:
+        """Append fills to the JSONL fill log"""
+        if not fills:
+            return fills
+        try:
+            os.makedirs(os.path.dirname(self.fills_path), exist_ok=True)
+            with open(self.fills_path, "a", encoding="utf-8") as fh:
+                for fill in fills:
+                    fh.write(json.dumps(fill) + "\n")
+        except OSError as e:
+            print(f"DEBUG: Failed to write DCA fills: {e}")
+        return fills
+
+    def read_fills(self, limit: Optional[int] = None) -> List[Dict]:
+        """Logged fills, oldest first; the last limit if given"""
+        try:
+            with open(self.fills_path, "r", encoding="utf-8") as fh:
+                fills = [json.loads(line) for line in fh if line.strip()]
+        except (OSError, ValueError):
+            return []
+        return fills[-limit:] if limit else fills
@@ -1,110 +1,364 @@
-from typing import Optional, Dict
+from typing import Optional, Dict, List, Tuple
+from .multicall import Multicall
+from .pool_registry import PoolRegistry
+from .pool_state import PoolStateFollower
+from .v3_math import InsufficientTickData, V3Pool
 from .wallet import Wallet
 
+# Uniswap V3 contract addresses
+UNISWAP_V3_CONTRACTS = {
+    "base": {
+        "router": "0x2626664c2603336E57B271c5C0b26F421741e481",  # SwapRouter02
+        "factory": "0x33128a8fC17869897dcE68Ed026d694621f6FDfD",
+        "quoter": "0x3d4e44Eb1374240CE5F1B871ab261CD16335B76a",  # QuoterV2 on Base
+    },
+    "ethereum": {
+        "router": "0x68b3465833fb72A70ecDF485E0e4C7bD8665Fc45",
+        "factory": "0x1F98431c8aD98523631AE4a59f267346ea31F984",
+        "quoter": "0x61fFE014bA17989E743c5F6cB21bF9697530B21e",  # QuoterV2
+    },
+}
+
+WETH_ADDRESSES = {
+    "base": "0x4200000000000000000000000000000000000006",
+    "ethereum": "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2",
+}
+
+# QuoterV2 quoteExactInputSingle
+QUOTER_V2_ABI = [
+    {
+        "inputs": [
+            {
+                "components": [
+                    {"name": "tokenIn", "type": "address"},
+                    {"name": "tokenOut", "type": "address"},
+                    {"name": "amountIn", "type": "uint256"},
+                    {"name": "fee", "type": "uint24"},
+                    {"name": "sqrtPriceLimitX96", "type": "uint160"},
+                ],
+                "name": "params",
+                "type": "tuple",
+            }
+        ],
+        "name": "quoteExactInputSingle",
+        "outputs": [
+            {"name": "amountOut", "type": "uint256"},
+            {"name": "sqrtPriceX96After", "type": "uint160"},
+            {"name": "initializedTicksCrossed", "type": "uint32"},
+            {"name": "gasEstimate", "type": "uint256"},
+        ],
+        "type": "function",
+    }
+]
+
+# UniswapV3Pool state reads used for local snapshots
+POOL_STATE_ABI = [
+    {
+        "inputs": [],
+        "name": "slot0",
+        "outputs": [
+            {"name": "sqrtPriceX96", "type": "uint160"},
+            {"name": "tick", "type": "int24"},
+            {"name": "observationIndex", "type": "uint16"},
+            {"name": "observationCardinality", "type": "uint16"},
+            {"name": "observationCardinalityNext", "type": "uint16"},
+            {"name": "feeProtocol", "type": "uint8"},
+            {"name": "unlocked", "type": "bool"},
+        ],
+        "type": "function",
+    },
+    {
+        "inputs": [],
+        "name": "liquidity",
+        "outputs": [{"name": "", "type": "uint128"}],
+        "type": "function",
+    },
+    {
+        "inputs": [],
+        "name": "fee",
+        "outputs": [{"name": "", "type": "uint24"}],
+        "type": "function",
+    },
+    {
+        "inputs": [],
+        "name": "tickSpacing",
+        "outputs": [{"name": "", "type": "int24"}],
+        "type": "function",
+    },
+    {
+        "inputs": [],
+        "name": "token0",
+        "outputs": [{"name": "", "type": "address"}],
+        "type": "function",
+    },
+    {
+        "inputs": [],
+        "name": "token1",
+        "outputs": [{"name": "", "type": "address"}],
+        "type": "function",
+    },
+    {
+        "inputs": [{"name": "wordPosition", "type": "int16"}],
+        "name": "tickBitmap",
+        "outputs": [{"name": "", "type": "uint256"}],
+        "type": "function",
+    },
+    {
+        "inputs": [{"name": "tick", "type": "int24"}],
+        "name": "ticks",
+        "outputs": [
+            {"name": "liquidityGross", "type": "uint128"},
+            {"name": "liquidityNet", "type": "int128"},
+            {"name": "feeGrowthOutside0X128", "type": "uint256"},
+            {"name": "feeGrowthOutside1X128", "type": "uint256"},
+            {"name": "tickCumulativeOutside", "type": "int56"},
+            {"name": "secondsPerLiquidityOutsideX128", "type": "uint160"},
+            {"name": "secondsOutside", "type": "uint32"},
+            {"name": "initialized", "type": "bool"},
+        ],
+        "type": "function",
+    },
+]
+
+# Tick bitmap words read on each side of the current price for a snapshot
+SNAPSHOT_WORDS = 2
+
 
 class UniswapV3Integration:
     def __init__(self, network: str = "base"):
         self.network = network
         self.wallet = Wallet(network)
 
-        # Uniswap V3 contract addresses
-        self.contracts = {
-            "base": {
-                "router": "0x2626664c2603336E57B271c5C0b26F421741e481",  # SwapRouter02
-                "factory": "0x33128a8fC17869897dcE68Ed026d694621f6FDfD",
-                "quoter": "0x3d4e44Eb1374240CE5F1B871ab261CD16335B76a",  # QuoterV2 on Base
-            },
-            "ethereum": {
-                "router": "0x68b3465833fb72A70ecDF485E0e4C7bD8665Fc45",
-                "factory": "0x1F98431c8aD98523631AE4a59f267346ea31F984",
-                "quoter": "0xb27308f9F90D607463bb33eA1BeBb41C27CE5AB6",
-            },
-        }
+        self.contracts = UNISWAP_V3_CONTRACTS
+
+        # Pools are derived offline and confirmed once, so quotes skip the factory
+        factory = self.contracts.get(network, {}).get("factory")
+        self.pool_registry = PoolRegistry(network, self.wallet.w3, factory)
+        # Local pool snapshots, kept current from logs and persisted across runs
+        self.pool_state = PoolStateFollower(self)
+
+    def has_liquidity(self, token_address: str) -> Optional[bool]:
+        """Check whether a token has a WETH pool with liquidity on any fee tier"""
+        try:
+            weth = WETH_ADDRESSES.get(self.network)
+            if not weth or self.network not in self.contracts:
+                return None
+
+            self.pool_registry.ensure_pairs([(token_address, weth)])
+            return bool(self.pool_registry.live_fee_tiers(token_address, weth))
+
+        except Exception as e:
+            print(f"DEBUG: Liquidity check failed for {token_address}: {e}")
+            return None
 
     def get_quote(
-        self, token_in: str, token_out: str, amount_in: int, fee: int = 500
-    ) -> Optional[int]:
-        """Get exact quote from Uniswap V3 Quoter"""
+        self,
+        token_in: str,
+        token_out: str,
+        amount_in: int,
+        fee_tiers: Optional[List[int]] = None,
+    ) -> Optional[Dict]:
+        """Quote every live fee tier in one Multicall and return the best net of gas"""
         try:
-            quoter_address = self.contracts[self.network]["quoter"]
+            if not fee_tiers:
+                self.pool_registry.ensure_pairs([(token_in, token_out)])
+                fee_tiers = self.pool_registry.live_fee_tiers(token_in, token_out)
+                if not fee_tiers:
+                    print("DEBUG: No pool with liquidity for this pair")
+                    return None
 
-            # QuoterV2 ABI (correct signature)
-            quoter_abi = [
-                {
-                    "inputs": [
-                        {
-                            "components": [
-                                {"name": "tokenIn", "type": "address"},
-                                {"name": "tokenOut", "type": "address"},
-                                {"name": "fee", "type": "uint24"},
-                                {"name": "amountIn", "type": "uint256"},
-                                {"name": "sqrtPriceLimitX96", "type": "uint160"},
-                            ],
-                            "name": "params",
-                            "type": "tuple",
-                        }
-                    ],
-                    "name": "quoteExactInputSingle",
-                    "outputs": [
-                        {"name": "amountOut", "type": "uint256"},
-                        {"name": "sqrtPriceX96After", "type": "uint160"},
-                        {"name": "initializedTicksCrossed", "type": "uint32"},
-                        {"name": "gasEstimate", "type": "uint256"},
-                    ],
-                    "type": "function",
+            w3 = self.wallet.w3
+            quoter = w3.eth.contract(
+                address=self.contracts[self.network]["quoter"], abi=QUOTER_V2_ABI
+            )
+            multicall = Multicall(w3)
+
+            calls = [multicall.encode_self("getBasefee")]
+            for fee_tier in fee_tiers:
+                quote_params = {
+                    "tokenIn": token_in,
+                    "tokenOut": token_out,
+                    "fee": fee_tier,
+                    "amountIn": amount_in,
+                    "sqrtPriceLimitX96": 0,
                 }
-            ]
+                calls.append(
+                    (
+                        quoter.address,
+                        multicall.encode(
+                            quoter, "quoteExactInputSingle", [quote_params]
+                        ),
+                    )
+                )
+
+            results = multicall.call(calls)
+            basefee = multicall.decode(["uint256"], results[0])
+            gas_price = basefee[0] if basefee else 0
+
+            best = None
+            for fee_tier, result in zip(fee_tiers, results[1:]):
+                decoded = multicall.decode(
+                    ["uint256", "uint160", "uint32", "uint256"], result
+                )
+                if not decoded or decoded[0] == 0:
+                    print(f"DEBUG: No quote for fee tier {fee_tier}")
+                    continue
+
+                amount_out, _, _, gas_estimate = decoded
+                gas_cost_out = self._gas_cost_in_output(
+                    token_in, token_out, amount_in, amount_out, gas_estimate * gas_price
+                )
+                quote = {
+                    "amount_out": amount_out,
+                    "net_amount_out": amount_out - gas_cost_out,
+                    "fee": fee_tier,
+                    "gas_estimate": gas_estimate,
+                }
+                if best is None or quote["net_amount_out"] > best["net_amount_out"]:
+                    best = quote
 
-            quoter = self.wallet.w3.eth.contract(address=quoter_address, abi=quoter_abi)
+            if best:
+                print(
+                    f"DEBUG: Best fee tier {best['fee']}, amount_out: {best['amount_out']}"
+                )
+            return best
 
-            # Test if contract exists
+        except Exception as e:
+            print(f"DEBUG: UniswapV3Integration.get_quote error: {e}")
+            return None
+
+    def get_quote_ladder(
+        self, token_in: str, token_out: str, amounts: List[int]
+    ) -> Optional[Dict]:
+        """Quote many input sizes across all live tiers at one block
+
+        A tiny reference size is quoted alongside so price impact can be
+        measured against the same state.
+        """
+        try:
+            self.pool_registry.ensure_pairs([(token_in, token_out)])
+            fee_tiers = self.pool_registry.live_fee_tiers(token_in, token_out)
+            if not fee_tiers or not amounts:
+                return None
+
+            reference = max(min(amounts) // 1000, 1)
+            sizes = [reference] + list(amounts)
             try:
-                code = self.wallet.w3.eth.get_code(quoter_address)
-                print(f"DEBUG: Quoter contract code length: {len(code)}")
-                if len(code) <= 2:  # Just '0x'
-                    print("DEBUG: No contract at quoter address!")
-                    return None
+                outputs = self._quote_sizes(token_in, token_out, sizes, fee_tiers)
+                source = "quoter"
             except Exception as e:
-                print(f"DEBUG: Failed to get contract code: {e}")
+                print(f"DEBUG: Ladder quoter call failed, simulating locally: {e}")
+                outputs = self._simulate_sizes(token_in, token_out, sizes, fee_tiers)
+                source = "local"
+
+            best = []
+            for i in range(len(sizes)):
+                candidates = [
+                    (tier_outputs[i], fee_tier)
+                    for fee_tier, tier_outputs in outputs.items()
+                    if tier_outputs[i]
+                ]
+                best.append(max(candidates) if candidates else (0, None))
+
+            if not best[0][0]:
                 return None
 
-            # First check if pools exist using Factory
-            factory_address = self.contracts[self.network]["factory"]
-            factory_abi = [
-                {
-                    "inputs": [
-                        {"name": "tokenA", "type": "address"},
-                        {"name": "tokenB", "type": "address"},
-                        {"name": "fee", "type": "uint24"},
-                    ],
-                    "name": "getPool",
-                    "outputs": [{"name": "pool", "type": "address"}],
-                    "type": "function",
-                }
-            ]
+            return {
+                "reference_in": reference,
+                "reference_out": best[0][0],
+                "source": source,
+                "quotes": [
+                    {"amount_in": amount, "amount_out": out, "fee": fee}
+                    for amount, (out, fee) in zip(amounts, best[1:])
+                ],
+            }
 
-            factory = self.wallet.w3.eth.contract(
-                address=factory_address, abi=factory_abi
-            )
+        except Exception as e:
+            print(f"DEBUG: UniswapV3Integration.get_quote_ladder error: {e}")
+            return None
 
-            # Try different fee tiers and check if pools exist
-            fee_tiers = [500, 3000, 10000]
+    def _quote_sizes(
+        self, token_in: str, token_out: str, sizes: List[int], fee_tiers: List[int]
+    ) -> Dict[int, List[int]]:
+        """Every (tier, size) through QuoterV2 in a single Multicall"""
+        w3 = self.wallet.w3
+        quoter = w3.eth.contract(
+            address=self.contracts[self.network]["quoter"], abi=QUOTER_V2_ABI
+        )
+        multicall = Multicall(w3)
 
-            for fee_tier in fee_tiers:
+        calls = []
+        for fee_tier in fee_tiers:
+            for size in sizes:
+                quote_params = {
+                    "tokenIn": token_in,
+                    "tokenOut": token_out,
+                    "fee": fee_tier,
+                    "amountIn": size,
+                    "sqrtPriceLimitX96": 0,
+                }
+                calls.append(
+                    (
+                        quoter.address,
+                        multicall.encode(
+                            quoter, "quoteExactInputSingle", [quote_params]
+                        ),
+                    )
+                )
+        results = multicall.call(calls)
+
+        outputs = {}
+        for t, fee_tier in enumerate(fee_tiers):
+            tier_results = results[t * len(sizes) : (t + 1) * len(sizes)]
+            outputs[fee_tier] = []
+            for result in tier_results:
+                decoded = multicall.decode(
+                    ["uint256", "uint160", "uint32", "uint256"], result
+                )
+                outputs[fee_tier].append(decoded[0] if decoded else 0)
+        return outputs
+
+    def _simulate_sizes(
+        self, token_in: str, token_out: str, sizes: List[int], fee_tiers: List[int]
+    ) -> Dict[int, List[int]]:
+        """Every (tier, size) on local pool snapshots"""
+        self.pool_state.sync()
+        outputs = {}
+        for fee_tier in fee_tiers:
+            entry = self.pool_registry.get_pool(token_in, token_out, fee_tier)
+            snapshot = self.pool_state.track(entry["pool"])
+            if not snapshot:
+                continue
+            zero_for_one = token_in.lower() == snapshot.token0.lower()
+            tier_outputs = []
+            for size in sizes:
                 try:
-                    # Check if pool exists
-                    pool_address = factory.functions.getPool(
-                        token_in, token_out, fee_tier
-                    ).call()
-                    print(f"DEBUG: Pool for fee {fee_tier}: {pool_address}")
+                    tier_outputs.append(snapshot.quote(size, zero_for_one))
+                except InsufficientTickData:
+                    tier_outputs.append(0)
+            outputs[fee_tier] = tier_outputs
+        return outputs
 
-                    if pool_address == "0x0000000000000000000000000000000000000000":
-                        print(f"DEBUG: No pool exists for fee tier {fee_tier}")
-                        continue
+    def get_pair_quotes(
+        self, requests: List[Tuple[str, str, int]], block_identifier="latest"
+    ) -> List[Optional[Dict]]:
+        """Best tier for many (token_in, token_out, amount_in) in one Multicall
 
-                    print(f"DEBUG: Trying quoter for fee tier {fee_tier}")
+        Pairs the quoter can't answer are simulated on local pool snapshots.
+        """
+        best: List[Optional[Dict]] = [None] * len(requests)
+        try:
+            self.pool_registry.ensure_pairs([(a, b) for a, b, _ in requests])
+
+            w3 = self.wallet.w3
+            quoter = w3.eth.contract(
+                address=self.contracts[self.network]["quoter"], abi=QUOTER_V2_ABI
+            )
+            multicall = Multicall(w3)
 
-                    # QuoterV2 uses struct parameter
+            calls, owners = [], []
+            for i, (token_in, token_out, amount_in) in enumerate(requests):
+                for fee_tier in self.pool_registry.live_fee_tiers(token_in, token_out):
                     quote_params = {
                         "tokenIn": token_in,
                         "tokenOut": token_out,
@@ -112,26 +366,203 @@ class UniswapV3Integration:
                         "amountIn": amount_in,
                         "sqrtPriceLimitX96": 0,
                     }
-
-                    result = quoter.functions.quoteExactInputSingle(quote_params).call()
-                    amount_out = result[0]  # First element is amountOut
-                    print(
-                        f"DEBUG: Success with fee tier {fee_tier}, amount_out: {amount_out}"
+                    calls.append(
+                        (
+                            quoter.address,
+                            multicall.encode(
+                                quoter, "quoteExactInputSingle", [quote_params]
+                            ),
+                        )
                     )
-                    return amount_out
-                except Exception as e:
-                    print(f"DEBUG: Fee tier {fee_tier} failed: {e}")
+                    owners.append((i, fee_tier))
+
+            results = multicall.call(calls, block_identifier)
+            for (i, fee_tier), result in zip(owners, results):
+                decoded = multicall.decode(
+                    ["uint256", "uint160", "uint32", "uint256"], result
+                )
+                if not decoded or decoded[0] == 0:
                     continue
+                if best[i] is None or decoded[0] > best[i]["amount_out"]:
+                    best[i] = {
+                        "amount_out": decoded[0],
+                        "fee": fee_tier,
+                        "source": "quoter",
+                    }
 
+        except Exception as e:
+            print(f"DEBUG: Batched pair quotes failed, simulating locally: {e}")
+
+        for i, (token_in, token_out, amount_in) in enumerate(requests):
+            if best[i] is None:
+                local = self.get_local_quote(token_in, token_out, amount_in)
+                if local:
+                    best[i] = dict(local, source="local")
+        return best
+
+    def get_route(
+        self, token_in: str, token_out: str, amount_in: int, block_identifier="latest"
+    ) -> Optional[Dict]:
+        """Best 1-3 hop route through hub tokens, quoted in one Multicall"""
+        from .routing import RouteFinder
+
+        if self.network not in self.contracts:
             return None
+        return RouteFinder(self).find_route(
+            token_in, token_out, amount_in, block_identifier
+        )
+
+    def get_pool_snapshot(
+        self,
+        pool_address: str,
+        words: int = SNAPSHOT_WORDS,
+        block_identifier="latest",
+    ) -> Optional[V3Pool]:
+        """Read a pool's price, liquidity and nearby ticks in three Multicalls"""
+        try:
+            w3 = self.wallet.w3
+            pool = w3.eth.contract(
+                address=w3.to_checksum_address(pool_address), abi=POOL_STATE_ABI
+            )
+            multicall = Multicall(w3)
+
+            fields = ["slot0", "liquidity", "fee", "tickSpacing", "token0", "token1"]
+            results = multicall.call(
+                [(pool.address, multicall.encode(pool, name)) for name in fields],
+                block_identifier,
+            )
+            slot0 = multicall.decode(
+                ["uint160", "int24", "uint16", "uint16", "uint16", "uint8", "bool"],
+                results[0],
+            )
+            liquidity = multicall.decode(["uint128"], results[1])
+            fee = multicall.decode(["uint24"], results[2])
+            tick_spacing = multicall.decode(["int24"], results[3])
+            token0 = multicall.decode(["address"], results[4])
+            token1 = multicall.decode(["address"], results[5])
+            if not all([slot0, liquidity, fee, tick_spacing, token0, token1]):
+                return None
+
+            sqrt_price_x96, tick = slot0[0], slot0[1]
+            spacing = tick_spacing[0]
+            word = (tick // spacing) >> 8
+            word_range = (word - words, word + words)
+
+            # Set bits in the bitmap words are the initialized ticks to read
+            word_positions = list(range(word_range[0], word_range[1] + 1))
+            bitmaps = multicall.call(
+                [
+                    (pool.address, multicall.encode(pool, "tickBitmap", [position]))
+                    for position in word_positions
+                ],
+                block_identifier,
+            )
+            initialized = []
+            for position, result in zip(word_positions, bitmaps):
+                bitmap = multicall.decode(["uint256"], result)
+                if not bitmap:
+                    return None
+                for bit in range(256):
+                    if bitmap[0] >> bit & 1:
+                        initialized.append(((position << 8) + bit) * spacing)
+
+            tick_results = multicall.call(
+                [
+                    (pool.address, multicall.encode(pool, "ticks", [t]))
+                    for t in initialized
+                ],
+                block_identifier,
+            )
+            ticks = {}
+            for initialized_tick, result in zip(initialized, tick_results):
+                decoded = multicall.decode(
+                    [
+                        "uint128",
+                        "int128",
+                        "uint256",
+                        "uint256",
+                        "int56",
+                        "uint160",
+                        "uint32",
+                        "bool",
+                    ],
+                    result,
+                )
+                if not decoded:
+                    return None
+                ticks[initialized_tick] = decoded[1]
+
+            return V3Pool(
+                token0[0],
+                token1[0],
+                fee[0],
+                spacing,
+                sqrt_price_x96,
+                tick,
+                liquidity[0],
+                ticks,
+                word_range,
+            )
 
         except Exception as e:
-            print(f"DEBUG: UniswapV3Integration.get_quote error: {e}")
-            import traceback
+            print(f"DEBUG: Pool snapshot failed for {pool_address}: {e}")
+            return None
+
+    def get_local_quote(
+        self, token_in: str, token_out: str, amount_in: int
+    ) -> Optional[Dict]:
+        """Quote live fee tiers from pool snapshots without calling the quoter"""
+        try:
+            self.pool_registry.ensure_pairs([(token_in, token_out)])
+
+            # One eth_getLogs brings every followed pool up to the head
+            self.pool_state.sync()
+
+            best = None
+            for fee_tier in self.pool_registry.live_fee_tiers(token_in, token_out):
+                entry = self.pool_registry.get_pool(token_in, token_out, fee_tier)
+                snapshot = self.pool_state.track(entry["pool"])
+                if not snapshot:
+                    continue
+
+                try:
+                    amount_out = snapshot.quote_token(token_in, amount_in)
+                except InsufficientTickData:
+                    # Trade is too large for the ticks we read; widen once
+                    snapshot = self.pool_state.track(entry["pool"], SNAPSHOT_WORDS * 4)
+                    try:
+                        amount_out = snapshot and snapshot.quote_token(
+                            token_in, amount_in
+                        )
+                    except InsufficientTickData:
+                        amount_out = None
+
+                if amount_out and (best is None or amount_out > best["amount_out"]):
+                    best = {"amount_out": amount_out, "fee": fee_tier}
 
-            traceback.print_exc()
+            return best
+
+        except Exception as e:
+            print(f"DEBUG: Local quote error: {e}")
             return None
 
+    def _gas_cost_in_output(
+        self,
+        token_in: str,
+        token_out: str,
+        amount_in: int,
+        amount_out: int,
+        gas_cost_wei: int,
+    ) -> int:
+        """Express a gas cost in output token units when WETH is on one side"""
+        weth = WETH_ADDRESSES.get(self.network, "").lower()
+        if token_out.lower() == weth:
+            return gas_cost_wei
+        if token_in.lower() == weth and amount_in > 0:
+            return gas_cost_wei * amount_out // amount_in
+        # No WETH leg to price gas with; tiers are compared on output alone
+        return 0
+
     def prepare_swap_transaction(
         self,
         token_in: str,
@@ -0,0 +1,238 @@
+"""On-disk response cache for Etherscan API requests"""
+
+import hashlib
+import json
+import os
+import time
+from typing import Callable, Dict, List, Optional
+import requests
+from .config import DATA_DIR
+
+# Etherscan's "no upper bound" end block
+OPEN_END_BLOCK = 99999999
+
+# Open-ended list queries are split at a multiple of this many blocks below
+# the finalized block, so the older half keeps the same key for hours
+SPLIT_BLOCKS = 10_000
+
+# Entries untouched for this long are evicted, and at most MAX_ENTRIES kept
+MAX_AGE = 7 * 24 * 3600
+MAX_ENTRIES = 5000
+PRUNE_INTERVAL = 3600
+
+
+class CachedResponse:
+    """Minimal stand-in for requests.Response served from the cache"""
+
+    status_code = 200
+
+    def __init__(self, data: Dict):
+        self._data = data
+
+    def json(self) -> Dict:
+        return self._data
+
+
+class EtherscanCache:
+    """Cache Etherscan GET requests keyed by their normalized parameters
+
+    Responses for block ranges that end below the finalized block never change
+    and are kept until evicted; everything else expires after ttl seconds.
+    Open-ended account list queries are split at a finalized block, so only
+    the recent part is refetched once the TTL runs out.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        ttl: int = 60,
+        finalized_block_fn: Optional[Callable[[], Optional[int]]] = None,
+    ):
+        self.cache_dir = cache_dir or os.path.join(DATA_DIR, "etherscan")
+        self.ttl = ttl
+        self.finalized_block_fn = finalized_block_fn
+        self._maybe_prune()
+
+    @staticmethod
+    def make_key(url: str, params: Dict) -> str:
+        """Build a cache key from the request, ignoring the API key"""
+        normalized = {
+            str(name).lower(): str(value).lower()
+            for name, value in params.items()
+            if str(name).lower() != "apikey"
+        }
+        payload = json.dumps([url, normalized], sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _is_immutable(self, params: Dict) -> bool:
+        """Check whether the requested block range is entirely finalized"""
+        try:
+            end_block = int(params.get("endblock", OPEN_END_BLOCK))
+        except (TypeError, ValueError):
+            return False
+        if end_block >= OPEN_END_BLOCK or not self.finalized_block_fn:
+            return False
+
+        finalized_block = self.finalized_block_fn()
+        return finalized_block is not None and end_block <= finalized_block
+
+    @staticmethod
+    def _is_cacheable(data: Dict) -> bool:
+        """Only keep real answers, never rate limit or plan errors"""
+        if not isinstance(data, dict):
+            return False
+        if data.get("status") == "1":
+            return True
+        if data.get("message") == "No transactions found":
+            return True
+        # Proxy (JSON-RPC style) responses carry no status field
+        return "jsonrpc" in data and "result" in data and "error" not in data
+
+    def lookup(self, url: str, params: Dict) -> Optional[Dict]:
+        """Return cached JSON for a request if present and still valid"""
+        path = self._path(self.make_key(url, params))
+        try:
+            with open(path, "r", encoding="utf-8") as fh:
+                entry = json.load(fh)
+        except (OSError, ValueError):
+            return None
+
+        if entry.get("immutable"):
+            # Eviction goes by last use, so keep hot entries young
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+            return entry["data"]
+        if time.time() - entry["stored_at"] < self.ttl:
+            return entry["data"]
+
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        return None
+
+    def store(self, url: str, params: Dict, data: Dict):
+        """Save a response, marking finalized ranges as immutable"""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self._path(self.make_key(url, params))
+            tmp_path = f"{path}.tmp"
+            entry = {
+                "stored_at": time.time(),
+                "immutable": self._is_immutable(params),
+                "data": data,
+            }
+            with open(tmp_path, "w", encoding="utf-8") as fh:
+                json.dump(entry, fh)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"DEBUG: Failed to write Etherscan cache: {e}")
+
+    def _maybe_prune(self):
+        """Evict old entries, at most once per PRUNE_INTERVAL across processes"""
+        marker = os.path.join(self.cache_dir, ".pruned")
+        try:
+            if time.time() - os.path.getmtime(marker) < PRUNE_INTERVAL:
+                return
+        except OSError:
+            pass
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(marker, "w", encoding="utf-8"):
+                pass
+            self.prune()
+        except OSError as e:
+            print(f"DEBUG: Failed to prune Etherscan cache: {e}")
+
+    def prune(self, max_age: int = MAX_AGE, max_entries: int = MAX_ENTRIES):
+        """Remove entries unused for max_age, then the oldest beyond max_entries"""
+        try:
+            entries = sorted(
+                (entry.stat().st_mtime, entry.path)
+                for entry in os.scandir(self.cache_dir)
+                if entry.name.endswith(".json")
+            )
+        except OSError:
+            return
+        cutoff = time.time() - max_age
+        excess = len(entries) - max_entries
+        for index, (mtime, path) in enumerate(entries):
+            if mtime >= cutoff and index >= excess:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _split_block(self, params: Dict) -> Optional[int]:
+        """The block to split an open-ended list query at, if worth splitting"""
+        if params.get("module") != "account" or "startblock" not in params:
+            return None
+        if str(params.get("page", 1)) != "1" or not self.finalized_block_fn:
+            return None
+        try:
+            start_block = int(params["startblock"])
+            end_block = int(params.get("endblock", OPEN_END_BLOCK))
+        except (TypeError, ValueError):
+            return None
+        if end_block < OPEN_END_BLOCK:
+            return None
+
+        finalized_block = self.finalized_block_fn()
+        if not finalized_block:
+            return None
+        split_block = finalized_block - finalized_block % SPLIT_BLOCKS
+        return split_block if split_block > start_block else None
+
+    def _get_split(self, url: str, params: Dict, split_block: int, timeout: int):
+        """Fetch the finalized and recent halves of a query and join them"""
+        offset = int(params.get("offset", 10000))
+        older = {**params, "endblock": split_block}
+        recent = {**params, "startblock": split_block + 1}
+        halves = [recent, older] if params.get("sort") == "desc" else [older, recent]
+
+        results: List[Dict] = []
+        for half in halves:
+            response = self.get(url, half, timeout)
+            if response.status_code != 200:
+                return response
+            data = response.json()
+            if not self._is_cacheable(data):
+                return response
+            if data.get("status") == "1":
+                results.extend(data.get("result", []))
+            if len(results) >= offset:
+                break
+
+        if not results:
+            return CachedResponse(
+                {"status": "0", "message": "No transactions found", "result": []}
+            )
+        return CachedResponse(
+            {"status": "1", "message": "OK", "result": results[:offset]}
+        )
+
+    def get(self, url: str, params: Dict, timeout: int = 10):
+        """Drop-in replacement for requests.get that consults the cache first"""
+        split_block = self._split_block(params)
+        if split_block is not None:
+            return self._get_split(url, params, split_block, timeout)
+
+        cached = self.lookup(url, params)
+        if cached is not None:
+            return CachedResponse(cached)
+
+        response = requests.get(url, params=params, timeout=timeout)
+        if response.status_code == 200:
+            try:
+                data = response.json()
+            except ValueError:
+                return response
+            if self._is_cacheable(data):
+                self.store(url, params, data)
+        return response
@@ -0,0 +1,27 @@
+"""Cross-process lock for the JSON stores under DATA_DIR"""
+
+import contextlib
+import os
+
+try:
+    import fcntl
+except ImportError:  # Windows: stores fall back to per-process locking
+    fcntl = None
+
+
+@contextlib.contextmanager
+def file_lock(path: str):
+    """Hold an exclusive lock on a sidecar file next to path
+
+    The CLI, the daemon and background threads share the same JSON files, so
+    every read-modify-write of a store happens under this lock.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(f"{path}.lock", "a", encoding="utf-8") as fh:
+        if fcntl is not None:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
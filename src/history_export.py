@@ -0,0 +1,119 @@
+"""Streaming transaction history export to CSV, JSONL and Parquet"""
+
+import csv
+import json
+import os
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List
+
+# Stable column order for every export format
+EXPORT_FIELDS = [
+    "timestamp",
+    "date",
+    "network",
+    "hash",
+    "type",
+    "token",
+    "amount",
+    "usd_value",
+    "from",
+    "to",
+    "gas_used",
+    "gas_price",
+    "status",
+]
+
+SUPPORTED_FORMATS = ["csv", "jsonl", "parquet"]
+
+
+def get_export_format(path: str) -> str:
+    """Determine the export format from the file extension"""
+    extension = os.path.splitext(path)[1].lower().lstrip(".")
+    if extension not in SUPPORTED_FORMATS:
+        supported = ", ".join(f".{fmt}" for fmt in SUPPORTED_FORMATS)
+        raise ValueError(f"Unsupported export format '{path}' (use {supported})")
+    return extension
+
+
+def _chunks(records: Iterable[Dict], chunk_size: int) -> Iterator[List[Dict]]:
+    """Group a record stream into lists of at most chunk_size"""
+    iterator = iter(records)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def export_transactions(
+    records: Iterable[Dict], path: str, chunk_size: int = 1000
+) -> int:
+    """Write records to path chunk by chunk and return how many were written"""
+    export_format = get_export_format(path)
+    chunks = _chunks(records, chunk_size)
+
+    if export_format == "csv":
+        return _write_csv(chunks, path)
+    if export_format == "jsonl":
+        return _write_jsonl(chunks, path)
+    return _write_parquet(chunks, path)
+
+
+def _write_csv(chunks: Iterator[List[Dict]], path: str) -> int:
+    count = 0
+    with open(path, "w", encoding="utf-8", newline="") as fh:
+        writer = csv.DictWriter(fh, fieldnames=EXPORT_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        for chunk in chunks:
+            writer.writerows(chunk)
+            count += len(chunk)
+    return count
+
+
+def _write_jsonl(chunks: Iterator[List[Dict]], path: str) -> int:
+    count = 0
+    with open(path, "w", encoding="utf-8") as fh:
+        for chunk in chunks:
+            fh.writelines(
+                json.dumps({field: tx.get(field) for field in EXPORT_FIELDS}) + "\n"
+                for tx in chunk
+            )
+            count += len(chunk)
+    return count
+
+
+def _write_parquet(chunks: Iterator[List[Dict]], path: str) -> int:
+    """Write each chunk as its own row group"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValueError("Parquet export requires pyarrow (pip install pyarrow)")
+
+    schema = pa.schema(
+        [
+            ("timestamp", pa.int64()),
+            ("date", pa.string()),
+            ("network", pa.string()),
+            ("hash", pa.string()),
+            ("type", pa.string()),
+            ("token", pa.string()),
+            ("amount", pa.float64()),
+            ("usd_value", pa.float64()),
+            ("from", pa.string()),
+            ("to", pa.string()),
+            ("gas_used", pa.int64()),
+            ("gas_price", pa.float64()),
+            ("status", pa.string()),
+        ]
+    )
+
+    count = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        for chunk in chunks:
+            columns = {
+                field: [tx.get(field) for tx in chunk] for field in EXPORT_FIELDS
+            }
+            writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+            count += len(chunk)
+    return count
@@ -0,0 +1,419 @@
+"""Off-chain limit orders: an order book and a per-block watcher
+
+"Swap 1 ETH to USDC when the rate is at least 4000" is kept in
+DATA_DIR/limit_orders.json. Open orders are indexed per pair by trigger rate,
+so each block costs one quote per pair and a bisect per pair, however many
+orders are waiting.
+"""
+
+import contextlib
+import json
+import os
+import threading
+import time
+import uuid
+from bisect import bisect_right
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+from .config import DATA_DIR, get_token_decimals
+from .file_lock import file_lock
+
+if TYPE_CHECKING:
+    from .swap_preview import SwapPreview
+
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+POLL_INTERVAL = 2  # Seconds between block checks
+SUPPORTED_NETWORKS = ["base", "ethereum"]  # Networks with a Uniswap V3 quoter
+# Seconds before a pending order with no receipt reopens; past the swap's own
+# 600s deadline, so a dropped transaction can no longer land afterwards
+PENDING_TIMEOUT = 900
+
+
+class LimitOrderBook:
+    """Persistent limit orders, indexed per pair by ascending trigger rate"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.path.join(DATA_DIR, "limit_orders.json")
+        self._lock = threading.Lock()
+        self._mtime = None
+        self.orders: Dict[str, Dict] = {}
+        # (network, from_token, to_token) -> parallel sorted rates and order ids
+        self._index: Dict[Tuple[str, str, str], Tuple[List[float], List[str]]] = {}
+        self.reload()
+
+    def _load(self) -> List[Dict]:
+        """Load orders from disk"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as fh:
+                return json.load(fh)
+        except (OSError, ValueError):
+            return []
+
+    def _save(self):
+        """Write orders atomically"""
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as fh:
+                json.dump(list(self.orders.values()), fh, indent=2)
+            os.replace(tmp_path, self.path)
+            self._mtime = os.path.getmtime(self.path)
+        except OSError as e:
+            print(f"DEBUG: Failed to save limit orders: {e}")
+
+    def reload(self, force: bool = True):
+        """Re-read the file and rebuild the index, if it changed on disk"""
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            mtime = None
+        if not force and mtime == self._mtime:
+            return
+        with self._lock:
+            self._read()
+
+    def _read(self):
+        """Load orders and rebuild the index; the caller holds self._lock"""
+        try:
+            self._mtime = os.path.getmtime(self.path)
+        except OSError:
+            self._mtime = None
+        self.orders = {order["id"]: order for order in self._load()}
+        self._index = {}
+        for order in self.orders.values():
+            if order["status"] == "open":
+                self._insert(order)
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        """Modify the latest orders on disk and write them back, under the file lock
+
+        The CLI adds and cancels orders while the watcher fills them, so every
+        change is applied to what is on disk now, not to a stale copy.
+        """
+        with self._lock, file_lock(self.path):
+            self._read()
+            yield self.orders
+            self._save()
+
+    @staticmethod
+    def _pair(order: Dict) -> Tuple[str, str, str]:
+        return (order["network"], order["from_token"], order["to_token"])
+
+    def _insert(self, order: Dict):
+        rates, ids = self._index.setdefault(self._pair(order), ([], []))
+        position = bisect_right(rates, order["min_rate"])
+        rates.insert(position, order["min_rate"])
+        ids.insert(position, order["id"])
+
+    def _unindex(self, order: Dict):
+        rates, ids = self._index.get(self._pair(order), ([], []))
+        if order["id"] in ids:
+            position = ids.index(order["id"])
+            del rates[position], ids[position]
+        if not ids:
+            self._index.pop(self._pair(order), None)
+
+    def add(
+        self,
+        network: str,
+        from_token: str,
+        to_token: str,
+        amount: float,
+        min_rate: float,
+    ) -> Dict:
+        """Place an order that swaps once 1 from_token buys at least min_rate"""
+        order = {
+            "id": uuid.uuid4().hex[:8],
+            "network": network,
+            "from_token": from_token.upper(),
+            "to_token": to_token.upper(),
+            "amount": amount,
+            "min_rate": min_rate,
+            "status": "open",
+            "created_at": time.time(),
+            "tx_hash": None,
+        }
+        with self._transaction() as orders:
+            orders[order["id"]] = order
+            self._insert(order)
+        return order
+
+    def cancel(self, order_id: str) -> bool:
+        """Cancel an open order; returns whether there was one"""
+        with self._transaction() as orders:
+            order = orders.get(order_id)
+            if not order or order["status"] != "open":
+                return False
+            order["status"] = "cancelled"
+            self._unindex(order)
+            return True
+
+    def mark_pending(self, order_ids: List[str], rates: List[float]) -> List[str]:
+        """Take orders that are still open out of the index before they are sent
+
+        Returns the ids that were still open; the rest were cancelled or sent
+        by another process since they were quoted and must not be sent.
+        """
+        claimed = []
+        with self._transaction() as orders:
+            for order_id, rate in zip(order_ids, rates):
+                order = orders.get(order_id)
+                if not order or order["status"] != "open":
+                    continue
+                order.update(status="pending", rate=rate, sent_at=time.time())
+                self._unindex(order)
+                claimed.append(order_id)
+        return claimed
+
+    def mark_sent(self, order_ids: List[str], tx_hash: str):
+        """Record the transaction pending orders were sent in"""
+        with self._transaction() as orders:
+            for order_id in order_ids:
+                orders[order_id]["tx_hash"] = tx_hash
+
+    def mark_filled(self, order_ids: List[str]):
+        """Close pending orders whose transaction succeeded"""
+        with self._transaction() as orders:
+            for order_id in order_ids:
+                orders[order_id].update(status="filled", filled_at=time.time())
+
+    def reopen(self, order_ids: List[str]):
+        """Put back pending orders that were not sent, reverted or were dropped"""
+        with self._transaction() as orders:
+            for order_id in order_ids:
+                order = orders[order_id]
+                if order["status"] != "pending":
+                    continue
+                order.update(status="open", tx_hash=None)
+                self._insert(order)
+
+    def list(self, status: Optional[str] = None) -> List[Dict]:
+        """Orders, oldest first, optionally only those with a status"""
+        orders = sorted(self.orders.values(), key=lambda order: order["created_at"])
+        return [o for o in orders if status is None or o["status"] == status]
+
+    def pairs(self, network: str) -> List[Tuple[str, str]]:
+        """Pairs with open orders on a network"""
+        return [(f, t) for n, f, t in self._index if n == network]
+
+    def networks(self) -> List[str]:
+        """Networks with open orders"""
+        return sorted({network for network, _, _ in self._index})
+
+    def min_amount(self, network: str, from_token: str, to_token: str) -> float:
+        """Smallest open order on a pair, the size its rate is quoted at"""
+        _, ids = self._index[(network, from_token, to_token)]
+        return min(self.orders[order_id]["amount"] for order_id in ids)
+
+    def triggered(
+        self, network: str, from_token: str, to_token: str, rate: float
+    ) -> List[Dict]:
+        """Open orders on a pair whose trigger rate is at or below rate"""
+        rates, ids = self._index.get((network, from_token, to_token), ([], []))
+        return [self.orders[order_id] for order_id in ids[: bisect_right(rates, rate)]]
+
+
+class LimitOrderWatcher:
+    """Re-quotes every pair with open orders once per block and fills triggers"""
+
+    def __init__(
+        self,
+        book: Optional[LimitOrderBook] = None,
+        preview: Optional["SwapPreview"] = None,
+        poll_interval: float = POLL_INTERVAL,
+    ):
+        self.book = book or LimitOrderBook()
+        # Wallets, DEX integrations and executors stay warm between blocks
+        if preview is None:
+            from .swap_preview import SwapPreview
+
+            preview = SwapPreview()
+        self.preview = preview
+        self.executors: Dict = {}
+        self.poll_interval = poll_interval
+        self.last_blocks: Dict[str, int] = {}
+
+    def _get_executor(self, network: str):
+        """Get or create the SwapExecutor for a network"""
+        if network not in self.executors:
+            from .swap_executor import SwapExecutor
+
+            self.executors[network] = SwapExecutor(network)
+        return self.executors[network]
+
+    def run_forever(self):
+        """Watch until interrupted"""
+        while True:
+            self.run_once()
+            time.sleep(self.poll_interval)
+
+    def run_once(self) -> List[Dict]:
+        """Check every network that moved a block; returns the orders filled
+
+        Executed orders stay pending until their receipt confirms them, so an
+        order only counts as filled on a later pass.
+        """
+        self.book.reload(force=False)  # Pick up orders placed from the CLI
+        filled = self.resolve_pending()
+        for network in self.book.networks():
+            if network not in SUPPORTED_NETWORKS:
+                continue
+            try:
+                self.check_network(network)
+            except Exception as e:
+                print(f"DEBUG: Limit order check failed on {network}: {e}")
+        return filled
+
+    def resolve_pending(self, now: Optional[float] = None) -> List[Dict]:
+        """Fill pending orders whose receipt succeeded and reopen the rest
+
+        A reverted transaction reopens its orders at once; one with no receipt
+        reopens them after PENDING_TIMEOUT.
+        """
+        from web3.exceptions import TransactionNotFound
+
+        now = time.time() if now is None else now
+        pending: Dict[Tuple[str, str], List[Dict]] = {}
+        for order in self.book.list("pending"):
+            pending.setdefault((order["network"], order["tx_hash"]), []).append(order)
+
+        filled = []
+        for (network, tx_hash), orders in pending.items():
+            order_ids = [order["id"] for order in orders]
+            sent_at = min(order["sent_at"] for order in orders)
+            if tx_hash is None:
+                # Claimed by a watcher that stopped before sending them
+                if now - sent_at > PENDING_TIMEOUT:
+                    self.book.reopen(order_ids)
+                continue
+            try:
+                w3 = self._get_executor(network).wallet.w3
+                receipt = w3.eth.get_transaction_receipt(tx_hash)
+            except TransactionNotFound:
+                receipt = None
+            except Exception as e:
+                print(f"DEBUG: Pending limit order tx {tx_hash} check failed: {e}")
+                continue
+
+            if receipt is not None and receipt["status"] == 1:
+                self.book.mark_filled(order_ids)
+                filled.extend(
+                    dict(self.book.orders[order_id]) for order_id in order_ids
+                )
+            elif receipt is not None:
+                print(f"DEBUG: Limit order tx {tx_hash} reverted, reopening")
+                self.book.reopen(order_ids)
+            elif now - sent_at > PENDING_TIMEOUT:
+                print(f"DEBUG: Limit order tx {tx_hash} was dropped, reopening")
+                self.book.reopen(order_ids)
+        return filled
+
+    def pair_rates(self, network: str, block_number) -> Dict[Tuple[str, str], Dict]:
+        """Rate and fee tier per pair, all pairs quoted in a single batched call"""
+        token_addresses = self.preview._get_token_addresses(network)
+        weth = token_addresses.get("WETH")
+
+        def address(symbol):
+            token = token_addresses.get(symbol)
+            return weth if token == ZERO_ADDRESS else token
+
+        pairs = [
+            pair
+            for pair in self.book.pairs(network)
+            if address(pair[0]) and address(pair[1])
+        ]
+        amounts = [self.book.min_amount(network, *pair) for pair in pairs]
+        requests = [
+            (
+                address(from_token),
+                address(to_token),
+                int(amount * 10 ** get_token_decimals(from_token)),
+            )
+            for (from_token, to_token), amount in zip(pairs, amounts)
+        ]
+
+        dex = self.preview._get_dex(network)
+        quotes = dex.get_pair_quotes(requests, block_number)
+
+        rates = {}
+        for (from_token, to_token), amount, quote in zip(pairs, amounts, quotes):
+            if quote:
+                output = quote["amount_out"] / 10 ** get_token_decimals(to_token)
+                rates[(from_token, to_token)] = {
+                    "rate": output / amount,
+                    "fee": quote["fee"],
+                }
+        return rates
+
+    def check_network(self, network: str) -> List[Dict]:
+        """Quote the network's pairs at a new block and send what triggered"""
+        state = self.preview._fetch_chain_state(network, ZERO_ADDRESS, "ETH")
+        if not state or state["block_number"] == self.last_blocks.get(network):
+            return []
+        self.last_blocks[network] = state["block_number"]
+
+        triggered = []
+        for (from_token, to_token), quote in self.pair_rates(
+            network, state["block_number"]
+        ).items():
+            triggered.extend(
+                (order, quote)
+                for order in self.book.triggered(
+                    network, from_token, to_token, quote["rate"]
+                )
+            )
+        if not triggered:
+            return []
+
+        return self.execute(network, triggered, state)
+
+    def execute(self, network: str, triggered: List, state: Dict) -> List[Dict]:
+        """Send triggered orders as one bundle, falling back to one at a time
+
+        Orders are marked pending before anything is sent, so an order
+        cancelled from the CLI in the meantime is left out, and a cancel that
+        comes later finds it no longer open. Each swap's minimum output is the
+        order's own limit, so the preflight simulation rejects any order that
+        the quoted size could not fill. Returns the sent orders as stored.
+        """
+        claimed = set(
+            self.book.mark_pending(
+                [order["id"] for order, _ in triggered],
+                [quote["rate"] for _, quote in triggered],
+            )
+        )
+        triggered = [(o, q) for o, q in triggered if o["id"] in claimed]
+        if not triggered:
+            return []
+        executor = self._get_executor(network)
+        swaps = [self._swap(order, quote["fee"]) for order, quote in triggered]
+
+        tx_hash = executor.execute_swaps(swaps, state=state)
+        if tx_hash:
+            return self._sent([order["id"] for order, _ in triggered], tx_hash)
+
+        # One order below its limit at its own size sinks the whole bundle
+        sent = []
+        for (order, _), swap in zip(triggered, swaps):
+            tx_hash = executor.execute_swaps([swap]) if len(triggered) > 1 else None
+            if tx_hash:
+                sent.extend(self._sent([order["id"]], tx_hash))
+            else:
+                self.book.reopen([order["id"]])
+        return sent
+
+    def _sent(self, order_ids: List[str], tx_hash: str) -> List[Dict]:
+        """Record the transaction orders went out in; returns them as stored"""
+        self.book.mark_sent(order_ids, tx_hash)
+        return [dict(self.book.orders[order_id]) for order_id in order_ids]
+
+    @staticmethod
+    def _swap(order: Dict, fee: Optional[int]) -> Dict:
+        """The order as an execute_swaps leg, its limit as the minimum output"""
+        return {
+            "from_token": order["from_token"],
+            "to_token": order["to_token"],
+            "amount": order["amount"],
+            "min_amount_out": order["amount"] * order["min_rate"],
+            "fee": fee,
+        }
@@ -0,0 +1,197 @@
+"""In-process EVM for offline runs and benchmarks (TERMINALSWAP_BACKEND=local)
+
+Each network gets its own eth-tester chain with mock tokens, WETH9, Multicall3
+and a minimal router deployed at the addresses the rest of the code already
+uses, so every command runs unchanged. Needs eth-tester with py-evm:
+
+    pip install "eth-tester[py-evm]==0.9.1b1"
+"""
+
+import os
+import threading
+from itertools import combinations
+from typing import Dict
+from eth_utils import to_canonical_address, to_checksum_address
+from .config import NETWORKS, get_token_decimals
+from .dex_integration import UNISWAP_V3_CONTRACTS
+from .local_contracts import LOCAL_CONTRACTS
+from .mock_swap import DEFAULT_PRICES
+from .multicall import MULTICALL3_ADDRESS
+from .pool_registry import compute_pool_address
+
+# eth-tester's first default account pays for the setup; the second is the
+# wallet when PRIVATE_KEY isn't set
+SETUP_KEY = "0x" + "00" * 31 + "01"
+LOCAL_DEV_KEY = "0x" + "00" * 31 + "02"
+
+WALLET_ETH = 100  # ETH the wallet starts with
+WALLET_TOKENS_USD = 10_000  # USD value of each token the wallet starts with
+RESERVE_USD = 10_000_000  # USD value of each token the router trades against
+POOL_FEE = 3000  # Tier the placeholder pools are derived for
+SETUP_GAS = 200_000
+
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+# Setup-only functions of the local contracts
+MOCK_ERC20_ABI = [
+    {
+        "inputs": [
+            {"name": "_symbol", "type": "string"},
+            {"name": "_decimals", "type": "uint8"},
+        ],
+        "name": "setup",
+        "outputs": [],
+        "type": "function",
+    },
+    {
+        "inputs": [
+            {"name": "_to", "type": "address"},
+            {"name": "_value", "type": "uint256"},
+        ],
+        "name": "mint",
+        "outputs": [],
+        "type": "function",
+    },
+    {
+        "inputs": [
+            {"name": "_to", "type": "address"},
+            {"name": "_value", "type": "uint256"},
+        ],
+        "name": "transfer",
+        "outputs": [{"name": "", "type": "bool"}],
+        "type": "function",
+    },
+    {
+        "inputs": [],
+        "name": "deposit",
+        "outputs": [],
+        "stateMutability": "payable",
+        "type": "function",
+    },
+]
+
+LOCAL_ROUTER_ABI = [
+    {
+        "inputs": [
+            {"name": "_weth", "type": "address"},
+            {"name": "_pool", "type": "address"},
+        ],
+        "name": "setup",
+        "outputs": [],
+        "type": "function",
+    },
+    {
+        "inputs": [{"name": "_token", "type": "address"}],
+        "name": "sync",
+        "outputs": [],
+        "type": "function",
+    },
+    {
+        "inputs": [{"name": "_token", "type": "address"}],
+        "name": "reserves",
+        "outputs": [{"name": "", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function",
+    },
+]
+
+_chains: Dict = {}
+_lock = threading.Lock()
+
+
+def get_local_web3(network: str):
+    """Web3 for the network's local chain, built on first use and shared"""
+    with _lock:
+        if network not in _chains:
+            _chains[network] = _build_chain(network)
+        return _chains[network]
+
+
+def _build_chain(network: str):
+    """Start a chain with the contracts in genesis, then fund and seed them"""
+    try:
+        from eth_tester import EthereumTester, PyEVMBackend
+    except ImportError:
+        raise ValueError(
+            "TERMINALSWAP_BACKEND=local needs eth-tester: "
+            'pip install "eth-tester[py-evm]==0.9.1b1"'
+        )
+    from web3 import EthereumTesterProvider, Web3
+    from .cli import _get_tokens_for_network
+
+    tokens = {
+        symbol: to_checksum_address(address)
+        for symbol, address in _get_tokens_for_network(network).items()
+        if address != ZERO_ADDRESS
+    }
+    contracts = UNISWAP_V3_CONTRACTS.get(network, {})
+    router, quoter = contracts.get("router"), contracts.get("quoter")
+
+    code = {MULTICALL3_ADDRESS: "Multicall3"}
+    for symbol, address in tokens.items():
+        code[address] = "WETH9" if symbol == "WETH" else "MockERC20"
+    if router:
+        code[router] = "LocalRouter"
+        code[quoter] = "LocalRouter"
+        for token_a, token_b in combinations(tokens.values(), 2):
+            pool = compute_pool_address(
+                contracts["factory"], token_a, token_b, POOL_FEE
+            )
+            code[pool] = "LocalPool"
+
+    wallet = Web3().eth.account.from_key(os.getenv("PRIVATE_KEY") or LOCAL_DEV_KEY)
+    genesis = PyEVMBackend.generate_genesis_state(num_accounts=1)
+    genesis.setdefault(
+        to_canonical_address(wallet.address),
+        {"balance": WALLET_ETH * 10**18, "storage": {}, "code": b"", "nonce": 0},
+    )
+    for address, name in code.items():
+        genesis[to_canonical_address(address)] = {
+            "balance": 0,
+            "storage": {},
+            "code": bytes.fromhex(LOCAL_CONTRACTS[name][2:]),
+            "nonce": 1,
+        }
+
+    backend = PyEVMBackend(genesis_state=genesis)
+    # Signed transactions and CHAINID see the network being stood in for
+    backend.chain.chain_id = NETWORKS[network].chain_id
+    w3 = Web3(EthereumTesterProvider(EthereumTester(backend)))
+    w3.eth.default_account = w3.eth.account.from_key(SETUP_KEY).address
+
+    _seed_tokens(w3, tokens, wallet.address, router)
+    if router:
+        for address in (router, quoter):
+            contract = w3.eth.contract(address=address, abi=LOCAL_ROUTER_ABI)
+            _transact(contract.functions.setup(tokens["WETH"], router))
+    return w3
+
+
+def _seed_tokens(w3, tokens: Dict[str, str], wallet: str, router):
+    """Give the wallet some of every token and the router deep reserves"""
+    for symbol, address in tokens.items():
+        token = w3.eth.contract(address=address, abi=MOCK_ERC20_ABI)
+        units = 10 ** get_token_decimals(symbol) / DEFAULT_PRICES.get(symbol, 1.0)
+        wallet_amount = int(WALLET_TOKENS_USD * units)
+        reserve = int(RESERVE_USD * units)
+
+        if symbol == "WETH":
+            # WETH is only ever backed by deposited ETH
+            _transact(token.functions.deposit(), value=wallet_amount + reserve)
+            _transact(token.functions.transfer(wallet, wallet_amount))
+            if router:
+                _transact(token.functions.transfer(router, reserve))
+        else:
+            _transact(token.functions.setup(symbol, get_token_decimals(symbol)))
+            _transact(token.functions.mint(wallet, wallet_amount))
+            if router:
+                _transact(token.functions.mint(router, reserve))
+
+        if router:
+            router_contract = w3.eth.contract(address=router, abi=LOCAL_ROUTER_ABI)
+            _transact(router_contract.functions.sync(address))
+
+
+def _transact(function, value: int = 0):
+    """Send a setup transaction; the gas is fixed to skip estimating it"""
+    function.transact({"gas": SETUP_GAS, "value": value})
@@ -0,0 +1,12 @@
+"""Runtime bytecode for the local backend's contracts
+
+Generated by contracts/build.py from contracts/*.vy with vyper 0.3.10; do not edit.
+"""
+
+LOCAL_CONTRACTS = {
+    "LocalPool": "0x5f3560e01c631a6865028118610028573461002c5769d3c21bcecceda100000060405260206040f35b5f5ffd5b5f80fd",
+    "LocalRouter": "0x5f3560e01c6002600a820660011b6111db01601e395f51565b63ad5c4648811861003357346111d7575f5460405260206040f35b63a58411948118610c7c576024361034176111d7576004358060a01c6111d7576040526040516370a0823160605230608052602060606024607c845afa61007c573d5f5f3e3d5ffd5b60203d106111d757606090505160026040516020525f5260405f205500610c7c565b6316f0115b8118610c7c57346111d75760015460405260206040f3610c7c565b63d66bd5248118610c7c576024361034176111d7576004358060a01c6111d75760405260026040516020525f5260405f205460605260206060f3610c7c565b632d34ba79811861019e576044361034176111d7576004358060a01c6111d7576040526024358060a01c6111d7576060525f541561019157600e6080527f616c72656164792073657420757000000000000000000000000000000000000060a0526080506080518060a001601f825f031636823750506308c379a06040526020606052601f19601f6080510116604401605cfd5b6040515f55606051600155005b63b858183f8118610c7c5760c33611156111d7576004356004018035810160708135116111d7576020813501808261020037505060208101358060a01c6111d7576102a05260408101356102c05260608101356102e05250602061020051018060408261020060045afa5050610215610320610dff565b6103205161030052602061020051018060408261020060045afa50505f60e052610240610340610d75565b61034051610320525f610340526102c05161036052610320516040526103605160605261026b610ea5565b5f6004905b80610380526103005161038051106102875761037b565b602061020051018060408261020060045afa505061038051600181018181106111d7579050601781028160178204186111d757905060e0526102ca6103a0610d75565b6103a05161034052610320516103e0526103405161040052602061020051018060408261020060045afa505061038051601781028160178204186111d7579050601481018181106111d757905060e0526103256103a0610dba565b6103a0516104205261036051610440526103e051610100526104005161012052610420516101405261044051610160526103606103c0611084565b6103c051610360526103405161032052600101818118610270575b50506102e0516103605110156103f0576013610380527f546f6f206c6974746c65207265636569766564000000000000000000000000006103a0526103805061038051806103a001601f825f031636823750506308c379a061034052602061036052601f19601f61038051011660440161035cfd5b610340516040526102a0516060526103605160805261040d610fa8565b6020610360f3610c7c565b6304e45aaf8118610c7c5760e33611156111d7576004358060a01c6111d757610200526024358060a01c6111d757610220526044358060181c6111d757610240526064358060a01c6111d75761026052604060846102803760c4358060a01c6111d7576102c0526102005160405261028051606052610495610ea5565b61020051610100526102205161012052610240516101405261028051610160526104c0610300611084565b610300516102e0526102a0516102e051101561053b576013610300527f546f6f206c6974746c65207265636569766564000000000000000000000000006103205261030050610300518061032001601f825f031636823750506308c379a06102c05260206102e052601f19601f6103005101166044016102dcfd5b61022051604052610260516060526102e051608052610558610fa8565b60206102e0f3610c7c565b635ae401dc8118610c7c5760633611156111d75760243560040160088135116111d75780355f81600881116111d75780156105d257905b8060051b60208501013560208501016104008135116111d757602081350161042083026060018183823750505060010181811861059a575b5050806040525050600435421115610649576013612160527f5472616e73616374696f6e20746f6f206f6c64000000000000000000000000006121805261216050612160518061218001601f825f031636823750506308c379a061212052602061214052601f19601f61216051011660440161213cfd5b5f612160525f604051600881116111d75780156106f057905b6104208102606001602081510180612380828460045afa50505061216051600781116111d757305a6123805060206127c0612380516123a08585f4905090506106ad573d5f5f3e3d5ffd5b3d602081183d60201002186127a0526127a080518260061b6121800152602081015160208360061b61218001015250600181016121605250600101818118610662575b50506020806123805280612380015f612160518083528060051b5f82600881116111d757801561077557905b828160051b6020880101528060061b6121800183602088010181518152602082015160208201528051806020830101601f825f03163682375050601f19601f82516020010116905090508301925060010181811861071c575b50508201602001915050905081019050612380f3610c7c565b6349404b7c81186108cd5760433611156111d7576024358060a01c6111d7576040525f546370a082316080523060a052602060806024609c845afa6107d5573d5f5f3e3d5ffd5b60203d106111d757608090505160025f546020525f5260405f20548082038281116111d7579050905060605260043560605110156108695760126080527f496e73756666696369656e74205745544839000000000000000000000000000060a0526080506080518060a001601f825f031636823750506308c379a06040526020606052601f19601f6080510116604401605cfd5b606051156108cb575f54632e1a7d4d60805260605160a052803b156111d7575f60806024609c5f855af161089f573d5f5f3e3d5ffd5b506040516060515a5f6080526080505f5f60805160a0858786f19050905090506108cb573d5f5f3e3d5ffd5b005b63c6a5026a8118610c7c5760a4361034176111d7576004358060a01c6111d757610240526024358060a01c6111d75761026052604435610280526064358060181c6111d7576102a0526084358060a01c6111d7576102c052610240516101005261026051610120526102a051610140526102805161016052610950610300611130565b610300516102e0526102e0516103005260403661032037620186a0610360526080610300f3610c7c565b6312210e8a8118610c7c5747156109b25733475a5f6040526040505f5f6040516060858786f19050905090506109b2573d5f5f3e3d5ffd5b00610c7c565b63cdca17538118610c7c576064361034176111d75760043560040160708135116111d75760208135018082610240375050602061024051018060408261024060045afa5050610a08610300610dff565b610300516102e0525f610300525f6103a052602061024051018060408261024060045afa50505f60e052610a3d610460610d75565b6104605161044052602435610460525f6004905b80610480526102e0516104805110610a6857610b9a565b602061024051018060408261024060045afa505061048051600181018181106111d7579050601781028160178204186111d757905060e052610aab6104c0610d75565b6104c0516104a05261044051610500526104a05161052052602061024051018060408261024060045afa505061048051601781028160178204186111d7579050601481018181106111d757905060e052610b066104c0610dba565b6104c0516105405261046051610560526105005161010052610520516101205261054051610140526105605161016052610b416104e0611130565b6104e051610460526104a0516104405261030051600381116111d7575f8160051b61032001526001810161030052506103a051600381116111d7575f8160051b6103c00152600181016103a05250600101818118610a51575b505060806104605161048052806104a05280610480015f610300518083528060051b5f82600481116111d7578015610bec57905b8060051b61032001518160051b602088010152600101818118610bce575b50508201602001915050905081019050806104c05280610480015f6103a0518083528060051b5f82600481116111d7578015610c4257905b8060051b6103c001518160051b602088010152600101818118610c24575b505082016020019150509050810190506102e051620186a0810281620186a08204186111d75790506104e052610480f3610c7c56610c7c565b5b005b60405115610c90576060511515610c92565b5f5b610cf257600760c0527f4e6f20706f6f6c0000000000000000000000000000000000000000000000000060e05260c05060c0518060e001601f825f031636823750506308c379a0608052602060a052601f19601f60c0510116604401609cfd5b60805160a05180620f424003620f424081116111d75790508082028115838383041417156111d7579050905060c05260c0516060518082028115838383041417156111d75790509050604051620f4240810281620f42408204186111d757905060c0518082018281106111d7579050905080156111d75780820490509050815250565b60e05160405160148201116111d75780606001805161012052506014610100526101009050805160200360031b6020820151811c811b905090508060601c9050815250565b60e05160405160038201116111d75780606001805161012052506003610100526101009050805160200360031b6020820151811c811b905090508060e81c9050815250565b602b6040511015610e10575f610e28565b604051601481038181116111d7579050601781069050155b610e8a57600c60e0527f496e76616c6964207061746800000000000000000000000000000000000000006101005260e05060e0518061010001601f825f031636823750506308c379a060a052602060c052601f19601f60e051011660440160bcfd5b604051601481038181116111d7579050601781049050815250565b5f5460405118610eba57606051471015610ebc565b5f5b610f79576040516323b872dd6080523360a0523060c05260605160e052602060806064609c5f855af1610ef1573d5f5f3e3d5ffd5b60203d106111d7576080518060011c6111d75761010052610100905051610fa6576003610120527f53544600000000000000000000000000000000000000000000000000000000006101405261012050610120518061014001601f825f031636823750506308c379a060e052602061010052601f19601f61012051011660440160fcfd610fa6565b60405163d0e30db0608052803b156111d7575f60806004609c606051855af1610fa4573d5f5f3e3d5ffd5b505b565b600260605118610fb757611082565b60605160a052600160605118610fcc573360a0525b60405163a9059cbb60c05260a05160e05260805161010052602060c0604460dc5f855af1610ffc573d5f5f3e3d5ffd5b60203d106111d75760c0518060011c6111d75761012052610120905051611082576002610140527f53540000000000000000000000000000000000000000000000000000000000006101605261014050610140518061016001601f825f031636823750506308c379a061010052602061012052601f19601f61014051011660440161011cfd5b565b6002610100516020525f5260405f2054610180526002610120516020525f5260405f20546101a052610180516040526101a051606052610160516080526101405160a0526110d36101e0610c7e565b6101e0516101c05261018051610160518082018281106111d757905090506002610100516020525f5260405f20556101a0516101c0518082038281116111d757905090506002610120516020525f5260405f20556101c051815250565b600154610180526101805163d66bd5246101a052610100516101c05260206101a060246101bc845afa611165573d5f5f3e3d5ffd5b60203d106111d7576101a09050516040526101805163d66bd5246101e052610120516102005260206101e060246101fc845afa6111a4573d5f5f3e3d5ffd5b60203d106111d7576101e0905051606052610160516080526101405160a0526111ce610220610c7e565b61022051815250565b5f80fd00be0c7b001809b80563009e078e0418097a00fd",
+    "MockERC20": "0x5f3560e01c6002600a820660011b6104e301601e395f51565b6395d89b41811861006757346104df57602080604052806040015f54815260015460208201528051806020830101601f825f03163682375050601f19601f825160200101169050810190506040f35b6318160ddd81186104db57346104df5760035460405260206040f36104db565b63313ce56781186100a357346104df5760025460405260206040f35b6370a0823181186104db576024361034176104df576004358060a01c6104df5760405260046040516020525f5260405f205460605260206060f36104db565b63dd62ed3e81186104db576044361034176104df576004358060a01c6104df576040526024358060a01c6104df5760605260056040516020525f5260405f20806060516020525f5260405f2090505460805260206080f36104db565b6399af1d9a81186104db576064361034176104df5760043560040160108135116104df576020813501808260403750506024358060081c6104df57608052600254156101e057600e60a0527f616c72656164792073657420757000000000000000000000000000000000000060c05260a05060a0518060c001601f825f031636823750506308c379a06060526020608052601f19601f60a0510116604401607cfd5b6040515f55606051600155608051600255006104db565b6340c10f198118610287576044361034176104df576004358060a01c6104df576040526003546024358082018281106104df579050905060035560046040516020525f5260405f2080546024358082018281106104df57905090508155506040515f7fddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef60243560605260206060a3005b63a9059cbb81186104db576044361034176104df576004358060a01c6104df576040526004336020525f5260405f2080546024358082038281116104df579050905081555060046040516020525f5260405f2080546024358082018281106104df5790509050815550604051337fddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef60243560605260206060a3600160605260206060f36104db565b63095ea7b381186103ac576044361034176104df576004358060a01c6104df576040526024356005336020525f5260405f20806040516020525f5260405f20905055604051337f8c5be1e5ebec7d5bd14f71427d1e84f3dd0314c0f7b2291e5b200ac8c7c3b92560243560605260206060a3600160605260206060f35b6323b872dd81186104db576064361034176104df576004358060a01c6104df576040526024358060a01c6104df5760605260056040516020525f5260405f2080336020525f5260405f209050546080527fffffffffffffffffffffffffffffffffffffffffffffffffffffffffffffffff60805114610456576080516044358082038281116104df579050905060056040516020525f5260405f2080336020525f5260405f209050555b60046040516020525f5260405f2080546044358082038281116104df579050905081555060046060516020525f5260405f2080546044358082018281106104df57905090508155506060516040517fddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef60443560a052602060a0a3600160a052602060a0f35b5f5ffd5b5f80fd04db008704db04db04db0018013e01f700e2032f",
+    "Multicall3": "0x5f3560e01c60026003821660011b61034a01601e395f51565b6382ad56cb81186103425760433611156103465760043560040160408135116103465780355f81604081116103465780156100b257905b61046081026060018160051b602086010135602086010180358060a01c61034657825260208101358060011c610346576020830152604081013581016104008135116103465760208135016040840181838237505050505060010181811861004f575b50508060405250505f62011860525f6040516040811161034657801561021a57905b6104608102606001610460620228806104608360045afa505060403662022ce03762022880515a620228c0610400620231408251602084015f8787f190509050905062022ce0523d61040081183d61040010021862023120526202312060208151018062022d00828460045afa50505062022ce05161015757620228a05161015a565b60015b6101cc57601762023120527f4d756c746963616c6c333a2063616c6c206661696c6564000000000000000000620231405262023120506202312051806202314001601f825f031636823750506308c379a0620230e05260206202310052601f19601f62023120510116604401620230fcfd5b6201186051603f8111610346576104408102620118800162022ce0518152602062022d0051016020820181818362022d0060045afa50505050600181016201186052506001018181186100d4575b505060208062022880528062022880015f62011860518083528060051b5f82604081116103465780156102c057905b828160051b602088010152610440810262011880018360208801016040825182528060208301526020830181830160208251018082828560045afa50508051806020830101601f825f03163682375050601f19601f8251602001011690509050810190509050905083019250600101818118610249575b5050820160200191505090508101905062022880f3610342565b633e64a69681186103425734610346574860405260206040f3610342565b6342cbb15c81186103125734610346574360405260206040f35b634d2301cc811861034257602436103417610346576004358060a01c610346576040526040513160605260206060f35b5f5ffd5b5f80fd02f8034202da0018",
+    "WETH9": "0x5f3560e01c60026009820660011b61051101601e395f51565b6318160ddd8118610033573461050d575f5460405260206040f35b6370a0823181186104915760243610341761050d576004358060a01c61050d5760405260016040516020525f5260405f205460605260206060f3610491565b63dd62ed3e81186100ca5760443610341761050d576004358060a01c61050d576040526024358060a01c61050d5760605260026040516020525f5260405f20806060516020525f5260405f2090505460805260206080f35b63d0e30db081186104915733604052346060526100e56104a3565b00610491565b6395d89b418118610491573461050d5760208060805260046040527f574554480000000000000000000000000000000000000000000000000000000060605260408160800181518152602082015160208201528051806020830101601f825f03163682375050601f19601f8251602001011690509050810190506080f3610491565b63313ce5678118610491573461050d57601260405260206040f3610491565b632e1a7d4d81186104915760243610341761050d576001336020525f5260405f20805460043580820382811161050d57905090508155505f5460043580820382811161050d57905090505f55336004355a5f6040526040505f5f6040516060858786f1905090509050610201573d5f5f3e3d5ffd5b337f7fcf532c15f0a6db0bd6d0e038bea71d30d808c7d98cb3bf7268a95bf5081b6560043560405260206040a200610491565b63a9059cbb81186104915760443610341761050d576004358060a01c61050d576040526001336020525f5260405f20805460243580820382811161050d579050905081555060016040516020525f5260405f20805460243580820182811061050d5790509050815550604051337fddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef60243560605260206060a3600160605260206060f3610491565b63095ea7b381186103595760443610341761050d576004358060a01c61050d576040526024356002336020525f5260405f20806040516020525f5260405f20905055604051337f8c5be1e5ebec7d5bd14f71427d1e84f3dd0314c0f7b2291e5b200ac8c7c3b92560243560605260206060a3600160605260206060f35b6323b872dd81186104915760643610341761050d576004358060a01c61050d576040526024358060a01c61050d5760605260026040516020525f5260405f2080336020525f5260405f209050546080527fffffffffffffffffffffffffffffffffffffffffffffffffffffffffffffffff608051146104035760805160443580820382811161050d579050905060026040516020525f5260405f2080336020525f5260405f209050555b60016040516020525f5260405f20805460443580820382811161050d579050905081555060016060516020525f5260405f20805460443580820182811061050d57905090508155506060516040517fddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef60443560a052602060a0a3600160a052602060a0f361049156610491565b5b33604052346060526104a16104a3565b005b5f5460605180820182811061050d57905090505f5560016040516020525f5260405f20805460605180820182811061050d57905090508155506040517fe1fffcc4923d04b559f4d29a8bfc6cda04eb5b0d3c460751c2402c5c5cc9109c60605160805260206080a2565b5f80fd0072001802dc016d018c049000eb02340490",
+}
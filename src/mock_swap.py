@@ -1,55 +1,309 @@
 """
 Mock swap functionality for testing - simulates swaps without using DEX
-This is useful for testing the swap flow on testnets where DEX pools might not exist
+Swaps run against in-process pools seeded from USD prices, and balances live in
+a local ledger, so whole swap flows can run in CI or load tests without a chain
 """
 
-from typing import Optional
+import threading
+import time
+from math import isqrt
+from typing import Dict, List, Optional
+from eth_utils import keccak
+from .config import get_token_decimals
+from .v3_math import (
+    FEE_DENOMINATOR,
+    MAX_TICK,
+    MIN_TICK,
+    V3Pool,
+    get_tick_at_sqrt_ratio,
+)
 from .wallet import Wallet
 
+# Prices used when none are configured and no price source is given
+DEFAULT_PRICES = {"ETH": 2800.0, "WETH": 2800.0, "USDC": 1.0, "USDT": 1.0}
+
+# Starting balances for every address the ledger hasn't seen yet
+DEFAULT_BALANCES = {"ETH": 10.0, "USDC": 10000.0}
+
+DEFAULT_DEPTH_USD = 10_000_000  # USD value of each side of a seeded pool
+DEFAULT_FEE = 3000
+TICK_SPACINGS = {100: 1, 500: 10, 3000: 60, 10000: 200}
+RANGE_SPACINGS = 500  # Half-width of a seeded V3 position, in tick spacings
+POOL_TYPES = ("v2", "v3")
+
+
+class ConstantProductPool:
+    """x * y = k pool in base units, fee in hundredths of a bip like V3"""
+
+    def __init__(
+        self,
+        token0: str,
+        token1: str,
+        reserve0: int,
+        reserve1: int,
+        fee: int = DEFAULT_FEE,
+    ):
+        self.token0 = token0
+        self.token1 = token1
+        self.reserve0 = reserve0
+        self.reserve1 = reserve1
+        self.fee = fee
+
+    def quote(self, amount_in: int, zero_for_one: bool) -> int:
+        """Exact-input output without changing reserves"""
+        if amount_in <= 0:
+            return 0
+        if zero_for_one:
+            reserve_in, reserve_out = self.reserve0, self.reserve1
+        else:
+            reserve_in, reserve_out = self.reserve1, self.reserve0
+        amount_in_with_fee = amount_in * (FEE_DENOMINATOR - self.fee)
+        return (amount_in_with_fee * reserve_out) // (
+            reserve_in * FEE_DENOMINATOR + amount_in_with_fee
+        )
+
+    def swap(self, amount_in: int, zero_for_one: bool) -> int:
+        """Exact-input swap that updates reserves"""
+        amount_out = self.quote(amount_in, zero_for_one)
+        if zero_for_one:
+            self.reserve0 += amount_in
+            self.reserve1 -= amount_out
+        else:
+            self.reserve1 += amount_in
+            self.reserve0 -= amount_out
+        return amount_out
+
+
+def _seed_v3_pool(
+    token0: str, token1: str, reserve0: int, reserve1: int, fee: int
+) -> V3Pool:
+    """A V3 pool whose in-range liquidity matches a constant-product pool's"""
+    spacing = TICK_SPACINGS[fee]
+    sqrt_price_x96 = isqrt((reserve1 << 192) // reserve0)
+    tick = get_tick_at_sqrt_ratio(sqrt_price_x96)
+    liquidity = isqrt(reserve0 * reserve1)
+
+    # One position around the seed price; outside it the pool runs dry
+    centre = tick // spacing
+    lower = max(centre - RANGE_SPACINGS, -(MAX_TICK // spacing)) * spacing
+    upper = min(centre + RANGE_SPACINGS, MAX_TICK // spacing) * spacing
+    return V3Pool(
+        token0,
+        token1,
+        fee,
+        spacing,
+        sqrt_price_x96,
+        tick,
+        liquidity,
+        {lower: liquidity, upper: -liquidity},
+        ((MIN_TICK // spacing) >> 8, (MAX_TICK // spacing) >> 8),
+    )
+
+
+class MockAMM:
+    """Pools per token pair, created on first use from USD prices"""
+
+    def __init__(
+        self,
+        prices: Optional[Dict[str, float]] = None,
+        price_source=None,
+        pool_type: str = "v3",
+        depth_usd: float = DEFAULT_DEPTH_USD,
+        fee: int = DEFAULT_FEE,
+    ):
+        if pool_type not in POOL_TYPES:
+            raise ValueError(f"Unknown pool type: {pool_type}")
+        self.prices = {
+            self._pool_token(symbol): price for symbol, price in (prices or {}).items()
+        }
+        self.price_source = price_source  # e.g. PriceFetcher, for real prices
+        self.pool_type = pool_type
+        self.depth_usd = depth_usd
+        self.fee = fee
+        self.pools: Dict[tuple, object] = {}
+
+    @staticmethod
+    def _pool_token(symbol: str) -> str:
+        """Pools hold WETH, like Uniswap; ETH is wrapped on the way in"""
+        symbol = symbol.upper()
+        return "WETH" if symbol == "ETH" else symbol
+
+    def get_price(self, symbol: str) -> Optional[float]:
+        """Configured price, else the price source, else the defaults"""
+        symbol = self._pool_token(symbol)
+        if symbol not in self.prices:
+            price = None
+            if self.price_source is not None:
+                price = self.price_source.get_token_price(symbol)
+            if price is None:
+                price = DEFAULT_PRICES.get(symbol)
+            if price is None:
+                return None
+            self.prices[symbol] = price
+        return self.prices[symbol]
+
+    def get_pool(self, token_a: str, token_b: str):
+        """The pool for a pair, seeded with depth_usd on each side"""
+        token0, token1 = sorted([self._pool_token(token_a), self._pool_token(token_b)])
+        key = (token0, token1)
+        if key not in self.pools:
+            price0, price1 = self.get_price(token0), self.get_price(token1)
+            if not price0 or not price1 or token0 == token1:
+                return None
+            reserve0 = int(self.depth_usd / price0 * 10 ** get_token_decimals(token0))
+            reserve1 = int(self.depth_usd / price1 * 10 ** get_token_decimals(token1))
+            if self.pool_type == "v2":
+                pool = ConstantProductPool(token0, token1, reserve0, reserve1, self.fee)
+            else:
+                pool = _seed_v3_pool(token0, token1, reserve0, reserve1, self.fee)
+            self.pools[key] = pool
+        return self.pools[key]
+
+    def quote(self, from_token: str, to_token: str, amount_in: int) -> Optional[int]:
+        """Output in base units for amount_in base units, without trading"""
+        pool = self.get_pool(from_token, to_token)
+        if pool is None:
+            return None
+        return pool.quote(amount_in, self._pool_token(from_token) == pool.token0)
+
+    def swap(self, from_token: str, to_token: str, amount_in: int) -> Optional[int]:
+        """Trade against the pool, moving its price"""
+        pool = self.get_pool(from_token, to_token)
+        if pool is None:
+            return None
+        return pool.swap(amount_in, self._pool_token(from_token) == pool.token0)
+
+
+class MockLedger:
+    """Simulated balances per address in base units, plus every swap applied"""
+
+    def __init__(self, balances: Optional[Dict[str, float]] = None):
+        self.starting_balances = {
+            symbol.upper(): int(amount * 10 ** get_token_decimals(symbol))
+            for symbol, amount in (
+                DEFAULT_BALANCES if balances is None else balances
+            ).items()
+        }
+        self.balances: Dict[str, Dict[str, int]] = {}
+        self.entries: List[Dict] = []
+
+    def _account(self, address: str) -> Dict[str, int]:
+        address = address.lower()
+        if address not in self.balances:
+            self.balances[address] = dict(self.starting_balances)
+        return self.balances[address]
+
+    def balance_of(self, address: str, symbol: str) -> int:
+        """Balance in base units"""
+        return self._account(address).get(symbol.upper(), 0)
+
+    def get_balance(self, address: str, symbol: str) -> float:
+        """Balance in whole tokens"""
+        return self.balance_of(address, symbol) / 10 ** get_token_decimals(symbol)
+
+    def apply_swap(
+        self,
+        address: str,
+        from_token: str,
+        to_token: str,
+        amount_in: int,
+        amount_out: int,
+        tx_hash: str,
+    ):
+        """Move balances for a completed swap and record it"""
+        account = self._account(address)
+        from_token, to_token = from_token.upper(), to_token.upper()
+        account[from_token] = account.get(from_token, 0) - amount_in
+        account[to_token] = account.get(to_token, 0) + amount_out
+        self.entries.append(
+            {
+                "hash": tx_hash,
+                "address": address,
+                "from_token": from_token,
+                "to_token": to_token,
+                "amount_in": amount_in,
+                "amount_out": amount_out,
+                "timestamp": time.time(),
+            }
+        )
+
+
+class MockHashGenerator:
+    """Deterministic transaction hashes from a seed and a counter"""
+
+    def __init__(self, seed: int = 0):
+        self.seed = seed
+        self.counter = 0
+
+    def next_hash(self) -> str:
+        self.counter += 1
+        return "0x" + keccak(text=f"terminalswap-mock:{self.seed}:{self.counter}").hex()
+
 
 class MockSwapExecutor:
-    def __init__(self, network: str = "base"):
+    def __init__(
+        self,
+        network: str = "base",
+        prices: Optional[Dict[str, float]] = None,
+        price_source=None,
+        balances: Optional[Dict[str, float]] = None,
+        seed: int = 0,
+        pool_type: str = "v3",
+    ):
         self.network = network
         self.wallet = Wallet(network)
+        self.amm = MockAMM(prices, price_source, pool_type)
+        self.ledger = MockLedger(balances)
+        self.hashes = MockHashGenerator(seed)
+        self._lock = threading.Lock()
 
-        # Mock exchange rates (for simulation only)
-        self.mock_rates = {
-            "ETH_TO_USDC": 2800.0,
-            "USDC_TO_ETH": 1 / 2800.0,
-        }
+    def get_balance(self, token: str) -> float:
+        """Simulated balance of the wallet"""
+        return self.ledger.get_balance(self.wallet.address, token)
 
     def execute_mock_swap(
         self, from_token: str, to_token: str, amount: float, min_amount_out: float
     ) -> Optional[str]:
-        """Execute a mock swap by just sending the equivalent value"""
+        """Execute a mock swap against the local pools and ledger"""
         try:
             print(f"🧪 Mock swap: {amount} {from_token} → {to_token}")
 
-            # Calculate mock output amount
-            if from_token.upper() == "ETH" and to_token.upper() == "USDC":
-                output_amount = (
-                    amount * self.mock_rates["ETH_TO_USDC"] * 0.997
-                )  # 0.3% fee
-            elif from_token.upper() == "USDC" and to_token.upper() == "ETH":
-                output_amount = (
-                    amount * self.mock_rates["USDC_TO_ETH"] * 0.997
-                )  # 0.3% fee
-            else:
-                print(f"Mock swap not supported for {from_token} → {to_token}")
-                return None
+            amount_in = int(amount * 10 ** get_token_decimals(from_token))
+            min_out = int(min_amount_out * 10 ** get_token_decimals(to_token))
+
+            with self._lock:
+                if self.amm.get_pool(from_token, to_token) is None:
+                    print(f"Mock swap not supported for {from_token} → {to_token}")
+                    return None
 
+                balance = self.ledger.balance_of(self.wallet.address, from_token)
+                if balance < amount_in:
+                    print(
+                        f"Insufficient balance. You have {self.get_balance(from_token):.6f} "
+                        f"{from_token}, need {amount}"
+                    )
+                    return None
+
+                # Same check the router makes before the swap lands
+                if self.amm.quote(from_token, to_token, amount_in) < min_out:
+                    print("Mock swap failed: output below minimum (slippage)")
+                    return None
+
+                amount_out = self.amm.swap(from_token, to_token, amount_in)
+                mock_tx_hash = self.hashes.next_hash()
+                self.ledger.apply_swap(
+                    self.wallet.address,
+                    from_token,
+                    to_token,
+                    amount_in,
+                    amount_out,
+                    mock_tx_hash,
+                )
+
+            output_amount = amount_out / 10 ** get_token_decimals(to_token)
             print(
                 f"📊 Mock rate: {amount} {from_token} = {output_amount:.6f} {to_token}"
             )
-
-            # For now, just return a mock transaction hash
-            # In a real implementation, you might:
-            # 1. Send the input tokens to a burn address
-            # 2. Mint/send the output tokens from a treasury
-            mock_tx_hash = f"0xmock{hash(f'{from_token}{to_token}{amount}'):x}"[
-                :42
-            ].ljust(66, "0")
-
             print(f"✅ Mock swap completed! Mock TX: {mock_tx_hash}")
 
             return mock_tx_hash
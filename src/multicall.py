@@ -0,0 +1,95 @@
+"""Batched contract reads through Multicall3"""
+
+from typing import List, Optional, Sequence, Tuple
+
+# Multicall3 is deployed at the same address on every supported chain
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+MULTICALL3_ABI = [
+    {
+        "inputs": [
+            {
+                "components": [
+                    {"name": "target", "type": "address"},
+                    {"name": "allowFailure", "type": "bool"},
+                    {"name": "callData", "type": "bytes"},
+                ],
+                "name": "calls",
+                "type": "tuple[]",
+            }
+        ],
+        "name": "aggregate3",
+        "outputs": [
+            {
+                "components": [
+                    {"name": "success", "type": "bool"},
+                    {"name": "returnData", "type": "bytes"},
+                ],
+                "name": "returnData",
+                "type": "tuple[]",
+            }
+        ],
+        "stateMutability": "payable",
+        "type": "function",
+    },
+    {
+        "inputs": [],
+        "name": "getBasefee",
+        "outputs": [{"name": "basefee", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function",
+    },
+    {
+        "inputs": [],
+        "name": "getBlockNumber",
+        "outputs": [{"name": "blockNumber", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function",
+    },
+    {
+        "inputs": [{"name": "addr", "type": "address"}],
+        "name": "getEthBalance",
+        "outputs": [{"name": "balance", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function",
+    },
+]
+
+
+class Multicall:
+    """Run many eth_calls in a single round trip"""
+
+    def __init__(self, w3, address: str = MULTICALL3_ADDRESS):
+        self.w3 = w3
+        self.address = w3.to_checksum_address(address)
+        self.contract = w3.eth.contract(address=self.address, abi=MULTICALL3_ABI)
+
+    def encode(self, contract, fn_name: str, args: Sequence = ()) -> bytes:
+        """Encode calldata for a contract function"""
+        return bytes.fromhex(contract.encodeABI(fn_name=fn_name, args=list(args))[2:])
+
+    def encode_self(self, fn_name: str, args: Sequence = ()) -> Tuple[str, bytes]:
+        """Encode a call to one of Multicall3's own helpers"""
+        return self.address, self.encode(self.contract, fn_name, args)
+
+    def call(
+        self, calls: List[Tuple[str, bytes]], block_identifier="latest"
+    ) -> List[Tuple[bool, bytes]]:
+        """Execute (target, calldata) pairs; failures don't revert the batch"""
+        if not calls:
+            return []
+        payload = [(target, True, data) for target, data in calls]
+        results = self.contract.functions.aggregate3(payload).call(
+            block_identifier=block_identifier
+        )
+        return [(bool(success), bytes(data)) for success, data in results]
+
+    def decode(self, types: List[str], result: Tuple[bool, bytes]) -> Optional[tuple]:
+        """Decode a single result, or None if it failed or returned nothing"""
+        success, data = result
+        if not success or not data:
+            return None
+        try:
+            return self.w3.codec.decode(types, data)
+        except Exception:
+            return None
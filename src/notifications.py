@@ -1,12 +1,240 @@
-"""System notifications for transaction status"""
+"""System notifications for transaction status
 
-from plyer import notification
+Notifications are handed to a background dispatcher and never block the
+caller. Events of the same kind that arrive together are coalesced
+("✅ 12 Transfers Successful"), and each event goes to the configured sinks:
+desktop (plyer), stdout and a webhook.
+"""
+
+import atexit
+import os
+import queue
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+from .config import NOTIFY_SINKS, NOTIFY_WEBHOOK_URL
+
+MAX_ALERT_LINES = 3  # Events listed in a coalesced notification
+MAX_QUEUE = 256  # Pending events; beyond this new ones are dropped
+COALESCE_WINDOW = 0.25  # Seconds to wait for more events of the same burst
+EXIT_FLUSH_TIMEOUT = 3.0  # Seconds an exiting process waits for delivery
+APP_NAME = "terminalSwap"
+
+
+class DesktopSink:
+    """plyer desktop notifications; skipped for good after the first failure"""
+
+    name = "desktop"
+    available: Optional[bool] = None  # Shared: one failed dbus probe is enough
+
+    @staticmethod
+    def probe() -> bool:
+        """Whether a desktop session could show notifications at all"""
+        if sys.platform.startswith("linux"):
+            return any(
+                os.getenv(name)
+                for name in ("DBUS_SESSION_BUS_ADDRESS", "DISPLAY", "WAYLAND_DISPLAY")
+            )
+        return True
+
+    def send(self, event: Dict) -> bool:
+        if DesktopSink.available is None:
+            DesktopSink.available = self.probe()
+        if not DesktopSink.available:
+            return False
+        try:
+            from plyer import notification
+
+            notification.notify(
+                title=event["title"],
+                message=event["message"],
+                app_name=APP_NAME,
+                app_icon="",  # Empty string instead of None
+                timeout=5,  # 5 seconds
+            )
+            return True
+        except Exception:
+            # e.g. missing dbus on a headless server
+            DesktopSink.available = False
+            return False
+
+
+class StdoutSink:
+    """Print notifications to the terminal"""
+
+    name = "stdout"
+
+    def send(self, event: Dict) -> bool:
+        print(f"📱 {event['title']}: {event['message']}")
+        return True
+
+
+class WebhookSink:
+    """POST notifications as JSON to an endpoint, e.g. a local relay"""
+
+    name = "webhook"
+
+    def __init__(self, url: str, timeout: float = 2.0):
+        self.url = url
+        self.timeout = timeout
+
+    def send(self, event: Dict) -> bool:
+        try:
+            import requests
+
+            response = requests.post(
+                self.url,
+                json={
+                    "app": APP_NAME,
+                    "kind": event["kind"],
+                    "title": event["title"],
+                    "message": event["message"],
+                    "count": event.get("count", 1),
+                    "timestamp": event["timestamp"],
+                },
+                timeout=self.timeout,
+            )
+            return response.status_code < 400
+        except Exception as e:
+            print(f"DEBUG: Notification webhook failed: {e}")
+            return False
+
+
+def build_sinks(names: str = NOTIFY_SINKS, webhook_url: str = NOTIFY_WEBHOOK_URL):
+    """Sinks from a comma-separated list such as 'desktop,webhook'"""
+    sinks = []
+    for name in [n.strip().lower() for n in names.split(",") if n.strip()]:
+        if name == "desktop":
+            sinks.append(DesktopSink())
+        elif name == "stdout":
+            sinks.append(StdoutSink())
+        elif name == "webhook" and webhook_url:
+            sinks.append(WebhookSink(webhook_url))
+        else:
+            print(f"DEBUG: Unknown or unconfigured notification sink: {name}")
+    return sinks
+
+
+class NotificationDispatcher:
+    """Bounded queue drained by one background thread, coalescing bursts"""
+
+    def __init__(
+        self,
+        sinks: Optional[List] = None,
+        max_queue: int = MAX_QUEUE,
+        coalesce_window: float = COALESCE_WINDOW,
+    ):
+        self.sinks = build_sinks() if sinks is None else sinks
+        self.coalesce_window = coalesce_window
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._fallback = StdoutSink()
+        self._thread = threading.Thread(
+            target=self._run, name="notifications", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, kind: str, title: str, message: str, summary: str = ""):
+        """Queue an event without blocking; summary titles a coalesced burst"""
+        event = {
+            "kind": kind,
+            "title": title,
+            "message": message,
+            "summary": summary or title,
+            "timestamp": time.time(),
+        }
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self, timeout: float = EXIT_FLUSH_TIMEOUT) -> bool:
+        """Wait until everything queued has been delivered, up to timeout"""
+        deadline = time.time() + timeout
+        while self._queue.unfinished_tasks:
+            if time.time() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            # Collect the rest of the burst before delivering anything
+            deadline = time.time() + self.coalesce_window
+            while True:
+                try:
+                    batch.append(
+                        self._queue.get(timeout=max(deadline - time.time(), 0))
+                    )
+                except queue.Empty:
+                    break
+            try:
+                for event in self.coalesce(batch):
+                    self._deliver(event)
+            except Exception as e:
+                print(f"DEBUG: Notification dispatch failed: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    @staticmethod
+    def coalesce(events: List[Dict]) -> List[Dict]:
+        """One event per kind, in order of first arrival"""
+        by_kind: Dict[str, List[Dict]] = {}
+        for event in events:
+            by_kind.setdefault(event["kind"], []).append(event)
+
+        merged = []
+        for kind, group in by_kind.items():
+            if len(group) == 1:
+                merged.append(group[0])
+                continue
+            lines = [event["message"].split("\n")[0] for event in group]
+            message = "\n".join(lines[:MAX_ALERT_LINES])
+            if len(lines) > MAX_ALERT_LINES:
+                message += f"\n+{len(lines) - MAX_ALERT_LINES} more"
+            merged.append(
+                {
+                    "kind": kind,
+                    "title": group[0]["summary"].format(count=len(group)),
+                    "message": message,
+                    "count": len(group),
+                    "timestamp": group[-1]["timestamp"],
+                }
+            )
+        return merged
+
+    def _deliver(self, event: Dict):
+        delivered = False
+        for sink in self.sinks:
+            delivered = sink.send(event) or delivered
+        if not delivered:
+            # Fallback - just print if no sink took it (e.g., missing dbus)
+            self._fallback.send(event)
+
+
+_dispatcher: Optional[NotificationDispatcher] = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_dispatcher() -> NotificationDispatcher:
+    """The process-wide dispatcher, started on first use"""
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = NotificationDispatcher()
+            # Short-lived commands exit right after notifying
+            atexit.register(_dispatcher.flush)
+        return _dispatcher
 
 
 class NotificationManager:
-    def __init__(self):
-        self.app_name = "terminalSwap"
+    def __init__(self, dispatcher: Optional[NotificationDispatcher] = None):
+        self.app_name = APP_NAME
         self.app_icon = None  # Could add icon path later
+        self.dispatcher = dispatcher
 
     def notify_transaction_success(
         self, tx_type: str, amount: str, token: str, tx_hash: str
@@ -14,7 +242,8 @@ class NotificationManager:
         """Notify successful transaction"""
         title = f"✅ {tx_type} Successful"
         message = f"{amount} {token}\nTx: {tx_hash[:10]}..."
-        self._send_notification(title, message)
+        summary = f"✅ {{count}} {tx_type}s Successful"
+        self._send_notification(title, message, f"{tx_type}:success", summary)
 
     def notify_transaction_failed(
         self, tx_type: str, amount: str, token: str, error: str
@@ -22,7 +251,8 @@ class NotificationManager:
         """Notify failed transaction"""
         title = f"❌ {tx_type} Failed"
         message = f"{amount} {token}\nError: {error[:50]}..."
-        self._send_notification(title, message)
+        summary = f"❌ {{count}} {tx_type}s Failed"
+        self._send_notification(title, message, f"{tx_type}:failed", summary)
 
     def notify_swap_success(
         self,
@@ -35,7 +265,9 @@ class NotificationManager:
         """Notify successful swap"""
         title = "✅ Swap Successful"
         message = f"{from_amount} {from_token} → {to_amount} {to_token}\nTx: {tx_hash[:10]}..."
-        self._send_notification(title, message)
+        self._send_notification(
+            title, message, "swap:success", "✅ {count} Swaps Successful"
+        )
 
     def notify_swap_failed(
         self, from_amount: str, from_token: str, to_token: str, error: str
@@ -43,18 +275,20 @@ class NotificationManager:
         """Notify failed swap"""
         title = "❌ Swap Failed"
         message = f"{from_amount} {from_token} → {to_token}\nError: {error[:50]}..."
-        self._send_notification(title, message)
+        self._send_notification(
+            title, message, "swap:failed", "❌ {count} Swaps Failed"
+        )
 
-    def _send_notification(self, title: str, message: str):
-        """Send system notification"""
-        try:
-            notification.notify(
-                title=title,
-                message=message,
-                app_name=self.app_name,
-                app_icon="",  # Empty string instead of None
-                timeout=5,  # 5 seconds
+    def notify_price_alerts(self, messages: List[str]):
+        """Notify triggered price alerts; a burst becomes one notification"""
+        for message in messages:
+            self._send_notification(
+                "🔔 Price Alert", message, "price_alert", "🔔 {count} Price Alerts"
             )
-        except Exception:
-            # Fallback - just print if notifications fail (e.g., missing dbus)
-            print(f"📱 {title}: {message}")
+
+    def _send_notification(
+        self, title: str, message: str, kind: str = "message", summary: str = ""
+    ):
+        """Queue a notification for the background dispatcher"""
+        dispatcher = self.dispatcher or get_dispatcher()
+        dispatcher.submit(kind, title, message, summary)
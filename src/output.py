@@ -0,0 +1,146 @@
+"""Machine-readable command output for --output json|jsonl
+
+Records are flat JSON objects with a "type" and a fixed set of fields per
+type (null when unknown), so scripts can poll without scraping tables:
+
+  balance       network, token, address, balance, price_usd, value_usd, discovered
+  transaction   the history export columns (history_export.EXPORT_FIELDS)
+  summary       network plus the transaction summary totals
+  token         network, symbol, address, balance, status
+  quote         the swap preview fields, named as in SwapPreview quotes
+  ladder        one price-impact row of swap --ladder
+  export        network, path, format, count
+  error         network, error
+
+jsonl writes each record on its own line as soon as it is produced. json
+streams the same records as one array, which is valid once the command ends.
+"""
+
+import contextlib
+import json
+import sys
+from decimal import Decimal
+from typing import Dict, List, Optional, TextIO
+from .history_export import EXPORT_FIELDS
+
+OUTPUT_FORMATS = ["json", "jsonl"]
+
+RECORD_FIELDS: Dict[str, List[str]] = {
+    "balance": [
+        "network",
+        "token",
+        "address",
+        "balance",
+        "price_usd",
+        "value_usd",
+        "discovered",
+    ],
+    "transaction": EXPORT_FIELDS,
+    "summary": [
+        "network",
+        "total_transactions",
+        "total_sent_usd",
+        "total_received_usd",
+        "total_gas_spent_usd",
+        "total_gas_spent_native",
+        "native_token",
+        "net_flow_usd",
+    ],
+    "token": ["network", "symbol", "address", "balance", "status"],
+    "quote": [
+        "network",
+        "from_token",
+        "to_token",
+        "from_amount",
+        "estimated_output",
+        "min_output",
+        "rate",
+        "from_price",
+        "to_price",
+        "fee_percentage",
+        "fee_tier",
+        "slippage_percentage",
+        "gas_estimate",
+        "gas_price_gwei",
+        "gas_cost_usd",
+        "quote_source",
+        "block_number",
+    ],
+    "ladder": [
+        "network",
+        "from_token",
+        "to_token",
+        "amount",
+        "output",
+        "rate",
+        "price_impact",
+        "fee_tier",
+        "spot_rate",
+        "source",
+    ],
+    "export": ["network", "path", "format", "count"],
+    "error": ["network", "error"],
+}
+
+
+def _json_default(value):
+    """Balances can be Decimals (web3 from_wei); everything else as text"""
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
+
+
+class RecordWriter:
+    """Streams records to stdout; other prints go to stderr meanwhile"""
+
+    def __init__(self, output_format: str, stream: Optional[TextIO] = None):
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unsupported output format: {output_format}")
+        self.output_format = output_format
+        self.stream = stream
+        self.count = 0
+        self._redirect = None
+
+    def __enter__(self):
+        self.stream = self.stream or sys.stdout
+        # DEBUG lines and tips would corrupt the records
+        self._redirect = contextlib.redirect_stdout(sys.stderr)
+        self._redirect.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._redirect.__exit__(exc_type, exc_value, traceback)
+        # A usage error before any record leaves stdout empty
+        if exc_type is None or self.count:
+            self.close()
+
+    def write(self, record_type: str, **fields):
+        """Write one record; fields outside the record's schema are a bug"""
+        schema = RECORD_FIELDS[record_type]
+        unknown = set(fields) - set(schema)
+        if unknown:
+            raise ValueError(f"Unknown {record_type} fields: {sorted(unknown)}")
+        record = {"type": record_type}
+        record.update({field: fields.get(field) for field in schema})
+        line = json.dumps(record, default=_json_default, ensure_ascii=False)
+
+        if self.output_format == "json":
+            line = ("[\n" if self.count == 0 else ",\n") + line
+        else:
+            line += "\n"
+        self.stream.write(line)
+        self.stream.flush()
+        self.count += 1
+
+    def write_from(self, record_type: str, data: Dict, **fields):
+        """Write a record whose fields come from a dict, e.g. a quote or tx"""
+        schema = RECORD_FIELDS[record_type]
+        values = {field: data[field] for field in schema if field in data}
+        values.update(fields)
+        self.write(record_type, **values)
+
+    def close(self):
+        """Finish the JSON array (an empty one if nothing was written)"""
+        if self.output_format == "json":
+            self.stream.write("[]\n" if self.count == 0 else "\n]\n")
+            self.stream.flush()
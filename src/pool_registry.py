@@ -0,0 +1,255 @@
+"""Persistent registry of Uniswap V3 pools with offline address derivation"""
+
+import contextlib
+import json
+import os
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from eth_abi import encode
+from eth_utils import function_signature_to_4byte_selector, keccak, to_checksum_address
+from .config import DATA_DIR
+from .file_lock import file_lock
+from .rpc import batch_request
+
+# Uniswap V3 fee tiers in hundredths of a bip (100 = 0.01%)
+FEE_TIERS = [100, 500, 3000, 10000]
+
+# keccak256 of the UniswapV3Pool creation code, shared by the canonical deployments
+POOL_INIT_CODE_HASH = (
+    "0xe34f199b19b2b4f47f68442619d555527d244f78a3297ea89325f50f6f1f4b54"
+)
+
+LIQUIDITY_SELECTOR = "0x" + function_signature_to_4byte_selector("liquidity()").hex()
+
+FACTORY_GET_POOL_ABI = [
+    {
+        "inputs": [
+            {"name": "tokenA", "type": "address"},
+            {"name": "tokenB", "type": "address"},
+            {"name": "fee", "type": "uint24"},
+        ],
+        "name": "getPool",
+        "outputs": [{"name": "pool", "type": "address"}],
+        "type": "function",
+    }
+]
+
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+
+def sort_tokens(token_a: str, token_b: str) -> Tuple[str, str]:
+    """Order a pair the way the factory does (by address value)"""
+    token_a, token_b = to_checksum_address(token_a), to_checksum_address(token_b)
+    if int(token_a, 16) < int(token_b, 16):
+        return token_a, token_b
+    return token_b, token_a
+
+
+def compute_pool_address(
+    factory: str,
+    token_a: str,
+    token_b: str,
+    fee: int,
+    init_code_hash: str = POOL_INIT_CODE_HASH,
+) -> str:
+    """Derive a pool address with CREATE2, no RPC needed"""
+    token0, token1 = sort_tokens(token_a, token_b)
+    salt = keccak(encode(["address", "address", "uint24"], [token0, token1, fee]))
+    digest = keccak(
+        b"\xff" + bytes.fromhex(factory[2:]) + salt + bytes.fromhex(init_code_hash[2:])
+    )
+    return to_checksum_address(digest[12:])
+
+
+class PoolRegistry:
+    """Known pools per (pair, fee) with their last observed liquidity"""
+
+    def __init__(
+        self,
+        network: str,
+        w3=None,
+        factory: Optional[str] = None,
+        path: Optional[str] = None,
+        max_age: int = 3600,
+    ):
+        self.network = network
+        self.w3 = w3
+        self.factory = factory
+        self.path = path or os.path.join(DATA_DIR, "pools.json")
+        self.max_age = max_age  # Seconds before liquidity is re-checked
+        self._lock = threading.Lock()
+        self._data = self._load()
+
+    def _load(self) -> Dict:
+        """Load registry from disk"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as fh:
+                return json.load(fh)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        """Write registry to disk atomically"""
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as fh:
+                json.dump(self._data, fh, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"DEBUG: Failed to save pool registry: {e}")
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        """Apply changes to the file as it is now, under the cross-process lock"""
+        with self._lock, file_lock(self.path):
+            self._data = self._load()
+            yield
+            self._save()
+
+    @staticmethod
+    def _pair_key(token_a: str, token_b: str) -> str:
+        token0, token1 = sort_tokens(token_a, token_b)
+        return f"{token0}:{token1}"
+
+    def _pairs(self) -> Dict:
+        return self._data.setdefault(self.network, {})
+
+    def get_pools(self, token_a: str, token_b: str) -> Dict[int, Dict]:
+        """Get cached entries for a pair as {fee: entry}"""
+        entries = self._pairs().get(self._pair_key(token_a, token_b), {})
+        return {int(fee): entry for fee, entry in entries.items()}
+
+    def get_pool(self, token_a: str, token_b: str, fee: int) -> Optional[Dict]:
+        """Get the cached entry for one pool"""
+        return self.get_pools(token_a, token_b).get(fee)
+
+    def live_fee_tiers(self, token_a: str, token_b: str) -> List[int]:
+        """Fee tiers with liquidity for a pair, deepest first"""
+        pools = self.get_pools(token_a, token_b)
+        live = [
+            (entry.get("liquidity", 0), fee)
+            for fee, entry in pools.items()
+            if entry.get("exists") and entry.get("liquidity", 0) > 0
+        ]
+        return [fee for _, fee in sorted(live, reverse=True)]
+
+    def iter_pools(self) -> Iterator[Tuple[str, str, int, Dict]]:
+        """Yield (token0, token1, fee, entry) for every live pool on this network"""
+        for pair_key, entries in self._pairs().items():
+            token0, token1 = pair_key.split(":")
+            for fee, entry in entries.items():
+                if entry.get("exists") and entry.get("liquidity", 0) > 0:
+                    yield token0, token1, int(fee), entry
+
+    def _needs_check(self, entry: Optional[Dict]) -> bool:
+        if entry is None:
+            return True
+        return time.time() - entry.get("checked_at", 0) > self.max_age
+
+    def ensure_pairs(
+        self,
+        pairs: Sequence[Tuple[str, str]],
+        fee_tiers: Sequence[int] = FEE_TIERS,
+    ):
+        """Confirm unknown or stale pools for many pairs in one batched request"""
+        if not self.w3 or not self.factory:
+            return
+
+        candidates = []
+        for token_a, token_b in pairs:
+            for fee in fee_tiers:
+                if self._needs_check(self.get_pool(token_a, token_b, fee)):
+                    known = self.get_pool(token_a, token_b, fee) or {}
+                    pool = known.get("pool") or compute_pool_address(
+                        self.factory, token_a, token_b, fee
+                    )
+                    candidates.append((token_a, token_b, fee, pool))
+
+        if not candidates:
+            return
+
+        try:
+            self._check_pools(candidates)
+        except Exception as e:
+            print(f"DEBUG: Pool registry check failed: {e}")
+
+    def _check_pools(
+        self, candidates: List[Tuple[str, str, int, str]], allow_factory: bool = True
+    ):
+        """Read code and liquidity for candidate pools, one batch for all"""
+        calls = []
+        for _, _, _, pool in candidates:
+            calls.append(("eth_getCode", [pool, "latest"]))
+            calls.append(
+                ("eth_call", [{"to": pool, "data": LIQUIDITY_SELECTOR}, "latest"])
+            )
+        results = batch_request(self.w3, calls)
+
+        missing = []
+        with self._transaction():
+            now = time.time()
+            for i, (token_a, token_b, fee, pool) in enumerate(candidates):
+                code, liquidity_data = results[2 * i], results[2 * i + 1]
+                exists = bool(code) and code not in ("0x", "0x0")
+                has_data = liquidity_data not in (None, "0x")
+                liquidity = int(liquidity_data, 16) if exists and has_data else 0
+                if not exists:
+                    missing.append((token_a, token_b, fee))
+                self._store(token_a, token_b, fee, pool, exists, liquidity, now)
+
+        # A pair with no derivable pool on any tier may be on a chain with a
+        # different init code hash; ask the factory once and remember the answer
+        lookups = [
+            (token_a, token_b, fee)
+            for token_a, token_b, fee in missing
+            if not any(
+                entry.get("exists")
+                for entry in self.get_pools(token_a, token_b).values()
+            )
+        ]
+        if lookups and allow_factory:
+            self._resolve_with_factory(lookups)
+
+    def _resolve_with_factory(self, lookups: List[Tuple[str, str, int]]):
+        """Fallback: look pools up through factory.getPool in one Multicall"""
+        from .multicall import Multicall
+
+        multicall = Multicall(self.w3)
+        factory = self.w3.eth.contract(
+            address=to_checksum_address(self.factory), abi=FACTORY_GET_POOL_ABI
+        )
+        calls = [
+            (factory.address, multicall.encode(factory, "getPool", [a, b, fee]))
+            for a, b, fee in lookups
+        ]
+        results = multicall.call(calls)
+
+        found = []
+        for (token_a, token_b, fee), result in zip(lookups, results):
+            decoded = multicall.decode(["address"], result)
+            if decoded and decoded[0] != ZERO_ADDRESS:
+                print(f"DEBUG: Factory pool {decoded[0]} differs from derived address")
+                found.append((token_a, token_b, fee, to_checksum_address(decoded[0])))
+
+        if found:
+            self._check_pools(found, allow_factory=False)
+
+    def _store(
+        self,
+        token_a: str,
+        token_b: str,
+        fee: int,
+        pool: str,
+        exists: bool,
+        liquidity: int,
+        checked_at: float,
+    ):
+        entries = self._pairs().setdefault(self._pair_key(token_a, token_b), {})
+        entries[str(fee)] = {
+            "pool": pool,
+            "exists": exists,
+            "liquidity": liquidity,
+            "checked_at": checked_at,
+        }
@@ -0,0 +1,242 @@
+"""Keep local Uniswap V3 pool snapshots current from Swap, Mint and Burn logs"""
+
+import json
+import os
+import threading
+from typing import Dict, List, Optional
+from eth_utils import keccak, to_checksum_address
+from .config import DATA_DIR
+from .file_lock import file_lock
+from .v3_math import V3Pool
+
+SWAP_TOPIC = (
+    "0x"
+    + keccak(text="Swap(address,address,int256,int256,uint160,uint128,int24)").hex()
+)
+MINT_TOPIC = (
+    "0x"
+    + keccak(text="Mint(address,address,int24,int24,uint128,uint256,uint256)").hex()
+)
+BURN_TOPIC = (
+    "0x" + keccak(text="Burn(address,int24,int24,uint128,uint256,uint256)").hex()
+)
+
+MAX_LOG_RANGE = 2000  # Blocks per eth_getLogs request
+MAX_SYNC_GAP = 50000  # Beyond this, re-snapshotting is cheaper than replaying logs
+
+
+def _hex(value) -> str:
+    """Normalise HexBytes/bytes/str log fields to 0x-prefixed hex"""
+    if isinstance(value, str):
+        return value if value.startswith("0x") else "0x" + value
+    return "0x" + bytes(value).hex()
+
+
+def _signed_topic(topic) -> int:
+    """Decode an indexed int24 topic (sign-extended to 256 bits)"""
+    value = int(_hex(topic), 16)
+    return value - (1 << 256) if value >= 1 << 255 else value
+
+
+class PoolStateFollower:
+    """Tracked pool snapshots plus the last block whose logs were applied"""
+
+    def __init__(self, dex, path: Optional[str] = None):
+        self.dex = dex
+        self.network = dex.network
+        self.path = path or os.path.join(DATA_DIR, "pool_state.json")
+        self._lock = threading.Lock()
+        self._data = self._load()
+
+        state = self._data.get(self.network, {})
+        self.last_block: Optional[int] = state.get("last_block")
+        self.pools: Dict[str, V3Pool] = {
+            address: V3Pool.from_dict(pool)
+            for address, pool in state.get("pools", {}).items()
+        }
+
+    def _load(self) -> Dict:
+        """Load persisted snapshots from disk"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as fh:
+                return json.load(fh)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        """Merge snapshots into the file under the cross-process lock
+
+        Other networks are kept as they are on disk. For this network the state
+        at the later block wins, since snapshots are only valid with their
+        last_block; when another process followed further, its state is adopted.
+        """
+        try:
+            with file_lock(self.path):
+                data = self._load()
+                state = data.get(self.network, {})
+                disk_block = state.get("last_block")
+                disk_pools = state.get("pools", {})
+
+                if disk_block is not None and (
+                    self.last_block is None or disk_block > self.last_block
+                ):
+                    self.last_block = disk_block
+                    self.pools = {
+                        address: V3Pool.from_dict(pool)
+                        for address, pool in disk_pools.items()
+                    }
+                    self._data = data
+                    return
+
+                if disk_block == self.last_block:
+                    # Pools tracked elsewhere at the same block are still valid
+                    for address, pool in disk_pools.items():
+                        if address not in self.pools:
+                            self.pools[address] = V3Pool.from_dict(pool)
+
+                data[self.network] = {
+                    "last_block": self.last_block,
+                    "pools": {
+                        address: pool.to_dict() for address, pool in self.pools.items()
+                    },
+                }
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                tmp_path = f"{self.path}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as fh:
+                    json.dump(data, fh)
+                os.replace(tmp_path, self.path)
+                self._data = data
+        except OSError as e:
+            print(f"DEBUG: Failed to save pool state: {e}")
+
+    def track(self, pool_address: str, words: Optional[int] = None) -> Optional[V3Pool]:
+        """Snapshot a pool at the follower's block and start following it
+
+        Passing words re-reads an already tracked pool with a wider tick range.
+        """
+        pool_address = to_checksum_address(pool_address)
+        if pool_address in self.pools and words is None:
+            return self.pools[pool_address]
+
+        try:
+            # Snapshot at the block logs were last applied to, so replaying
+            # later Mint/Burn logs never counts a position twice
+            if self.pools:
+                self.sync()
+            if self.last_block is None:
+                self.last_block = self.dex.wallet.w3.eth.block_number
+
+            kwargs = {"block_identifier": self.last_block}
+            if words is not None:
+                kwargs["words"] = words
+            snapshot = self.dex.get_pool_snapshot(pool_address, **kwargs)
+            if not snapshot:
+                return None
+
+            with self._lock:
+                self.pools[pool_address] = snapshot
+                self._save()
+            return snapshot
+
+        except Exception as e:
+            print(f"DEBUG: Failed to track pool {pool_address}: {e}")
+            return None
+
+    def sync(self) -> bool:
+        """Apply logs for every tracked pool up to the chain head"""
+        try:
+            w3 = self.dex.wallet.w3
+            head = w3.eth.block_number
+            if self.last_block is None or not self.pools:
+                self.last_block = head
+                return True
+            if head <= self.last_block:
+                return True
+
+            if head - self.last_block > MAX_SYNC_GAP:
+                return self._resnapshot(head)
+
+            addresses = list(self.pools)
+            from_block = self.last_block + 1
+            while from_block <= head:
+                to_block = min(from_block + MAX_LOG_RANGE - 1, head)
+                logs = w3.eth.get_logs(
+                    {
+                        "fromBlock": from_block,
+                        "toBlock": to_block,
+                        "address": addresses,
+                        "topics": [[SWAP_TOPIC, MINT_TOPIC, BURN_TOPIC]],
+                    }
+                )
+                with self._lock:
+                    self.apply_logs(logs)
+                    self.last_block = to_block
+                from_block = to_block + 1
+
+            with self._lock:
+                self._save()
+            return True
+
+        except Exception as e:
+            print(f"DEBUG: Pool state sync failed: {e}")
+            return False
+
+    def _resnapshot(self, block: int) -> bool:
+        """Replace every tracked snapshot with a fresh read at block"""
+        fresh = {}
+        for address, pool in self.pools.items():
+            words = (pool.word_range[1] - pool.word_range[0]) // 2
+            snapshot = self.dex.get_pool_snapshot(
+                address, words=words, block_identifier=block
+            )
+            if snapshot:
+                fresh[address] = snapshot
+
+        with self._lock:
+            self.pools = fresh
+            self.last_block = block
+            self._save()
+        return True
+
+    def apply_logs(self, logs: List[Dict]):
+        """Apply Swap/Mint/Burn logs in chain order"""
+        codec = self.dex.wallet.w3.codec
+        ordered = sorted(logs, key=lambda log: (log["blockNumber"], log["logIndex"]))
+        for log in ordered:
+            pool = self.pools.get(to_checksum_address(log["address"]))
+            if pool is None:
+                continue
+
+            topics = [_hex(topic) for topic in log["topics"]]
+            data = bytes.fromhex(_hex(log["data"])[2:])
+
+            if topics[0] == SWAP_TOPIC:
+                _, _, sqrt_price_x96, liquidity, tick = codec.decode(
+                    ["int256", "int256", "uint160", "uint128", "int24"], data
+                )
+                pool.sqrt_price_x96 = sqrt_price_x96
+                pool.liquidity = liquidity
+                pool.tick = tick
+
+            elif topics[0] in (MINT_TOPIC, BURN_TOPIC):
+                # Both index owner, tickLower and tickUpper
+                tick_lower = _signed_topic(topics[2])
+                tick_upper = _signed_topic(topics[3])
+                if topics[0] == MINT_TOPIC:
+                    # Mint's data starts with the (non-indexed) sender
+                    _, amount, _, _ = codec.decode(
+                        ["address", "uint128", "uint256", "uint256"], data
+                    )
+                else:
+                    amount, _, _ = codec.decode(["uint128", "uint256", "uint256"], data)
+                    amount = -amount
+
+                if amount == 0:
+                    continue
+                # A tick outside the snapshot's words would make a partly known
+                # word look complete; leave those words unknown instead
+                for tick, delta in ((tick_lower, amount), (tick_upper, -amount)):
+                    if pool.covers_tick(tick):
+                        pool.set_tick(tick, pool.ticks.get(tick, 0) + delta)
+                if tick_lower <= pool.tick < tick_upper:
+                    pool.liquidity += amount
@@ -0,0 +1,312 @@
+"""Price alerts: thresholds and percent moves checked against PriceFetcher
+
+Rules ("CELO below 0.40", "DEGEN +20% in 1h") live in DATA_DIR/price_alerts.json.
+They are indexed per token with sorted thresholds, so each tick costs one
+batched price request for the tokens that have rules, plus a bisect per rule
+list to find what was crossed since the last tick.
+"""
+
+import contextlib
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from bisect import bisect_left, bisect_right
+from collections import deque
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+from .config import DATA_DIR
+from .file_lock import file_lock
+from .dca import parse_interval
+from .notifications import NotificationManager
+from .price_fetcher import PriceFetcher
+
+DEFAULT_INTERVAL = 60  # Seconds between ticks; the price cache lasts as long
+DEFAULT_COOLDOWN = 900  # Seconds before the same rule may fire again
+NOTIFY_GAP = 60  # Alerts within this many seconds share one notification
+MAX_PRICE_AGE = 300  # Seconds before a cached price is too stale to check rules
+
+# Rule lists that fire as the value rises through them; the rest fire as it falls
+RISING = ("above", "up")
+
+
+def parse_rule(words: Sequence[str]) -> Dict:
+    """Parse 'below 0.40', 'above 4000' or '+20% in 1h' into a rule"""
+    text = " ".join(words).strip().lower()
+    match = re.fullmatch(r"(above|below)\s+\$?([0-9]*\.?[0-9]+)", text)
+    if match:
+        return {"kind": match.group(1), "threshold": float(match.group(2))}
+
+    match = re.fullmatch(r"([+-][0-9]*\.?[0-9]+)\s*%\s+(?:in\s+)?(\S+)", text)
+    if match:
+        threshold = float(match.group(1))
+        if threshold == 0:
+            raise ValueError("A percent move must be non-zero")
+        return {
+            "kind": "up" if threshold > 0 else "down",
+            "threshold": threshold,
+            "window": parse_interval(match.group(2)),
+        }
+
+    raise ValueError(
+        f"Invalid alert: {text} (use e.g. 'below 0.40', 'above 4000', '+20% in 1h')"
+    )
+
+
+def describe_rule(rule: Dict) -> str:
+    """Human-readable rule, e.g. 'DEGEN +20% in 1h'"""
+    if rule["kind"] in ("above", "below"):
+        return f"{rule['token']} {rule['kind']} ${rule['threshold']:g}"
+    hours = rule["window"] / 3600
+    window = f"{hours:g}h" if hours >= 1 else f"{rule['window'] // 60}m"
+    return f"{rule['token']} {rule['threshold']:+g}% in {window}"
+
+
+class PriceAlertEngine:
+    """Rules indexed by token and sorted threshold, checked once per tick"""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        price_fetcher: Optional[PriceFetcher] = None,
+        notifier: Optional[NotificationManager] = None,
+        cooldown: int = DEFAULT_COOLDOWN,
+        notify_gap: int = NOTIFY_GAP,
+    ):
+        self.path = path or os.path.join(DATA_DIR, "price_alerts.json")
+        self.price_fetcher = price_fetcher or PriceFetcher()
+        self.notifier = notifier or NotificationManager()
+        self.cooldown = cooldown
+        self.notify_gap = notify_gap
+        self._lock = threading.Lock()
+        self._mtime = None
+        self.rules: Dict[str, Dict] = {}
+        # (token, kind, window) -> parallel sorted thresholds and rule ids
+        self._index: Dict[Tuple, Tuple[List[float], List[str]]] = {}
+        # Last value each rule list was checked against, to detect crossings
+        self._last_values: Dict[Tuple, float] = {}
+        self._history: Dict[str, Deque[Tuple[float, float]]] = {}
+        self.pending: List[str] = []
+        self.last_notified = 0.0
+        self.reload()
+
+    def _load(self) -> List[Dict]:
+        """Load rules from disk"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as fh:
+                return json.load(fh)
+        except (OSError, ValueError):
+            return []
+
+    def _save(self):
+        """Write rules atomically"""
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as fh:
+                json.dump(list(self.rules.values()), fh, indent=2)
+            os.replace(tmp_path, self.path)
+            self._mtime = os.path.getmtime(self.path)
+        except OSError as e:
+            print(f"DEBUG: Failed to save price alerts: {e}")
+
+    def reload(self, force: bool = True):
+        """Re-read the rules file and rebuild the index, if it changed on disk"""
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            mtime = None
+        if not force and mtime == self._mtime:
+            return
+        with self._lock:
+            self._read()
+
+    def _read(self):
+        """Load rules and rebuild the index; the caller holds self._lock"""
+        try:
+            self._mtime = os.path.getmtime(self.path)
+        except OSError:
+            self._mtime = None
+        self.rules = {rule["id"]: rule for rule in self._load()}
+        self._index = {}
+        for rule in self.rules.values():
+            self._insert(rule)
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        """Modify the latest rules on disk and write them back, under the file lock
+
+        Rules are added and removed from the CLI while 'alert watch' records
+        when they fired, so changes are applied to what is on disk now.
+        """
+        with self._lock, file_lock(self.path):
+            self._read()
+            yield self.rules
+            self._save()
+
+    @staticmethod
+    def _key(rule: Dict) -> Tuple:
+        return (rule["token"], rule["kind"], rule.get("window"))
+
+    def _insert(self, rule: Dict):
+        thresholds, ids = self._index.setdefault(self._key(rule), ([], []))
+        position = bisect_right(thresholds, rule["threshold"])
+        thresholds.insert(position, rule["threshold"])
+        ids.insert(position, rule["id"])
+
+    def add(
+        self,
+        token: str,
+        kind: str,
+        threshold: float,
+        window: Optional[int] = None,
+    ) -> Dict:
+        """Add a rule; kind is above, below, up or down"""
+        rule = {
+            "id": uuid.uuid4().hex[:8],
+            "token": token.upper(),
+            "kind": kind,
+            "threshold": threshold,
+            "window": window,
+            "created_at": time.time(),
+            "last_fired": None,
+        }
+        with self._transaction() as rules:
+            rules[rule["id"]] = rule
+            self._insert(rule)
+        return rule
+
+    def remove(self, rule_id: str) -> bool:
+        """Delete a rule; returns whether it existed"""
+        with self._transaction() as rules:
+            rule = rules.pop(rule_id, None)
+            if not rule:
+                return False
+            thresholds, ids = self._index[self._key(rule)]
+            position = ids.index(rule_id)
+            del thresholds[position], ids[position]
+            if not ids:
+                del self._index[self._key(rule)]
+            return True
+
+    def list(self) -> List[Dict]:
+        """Rules, oldest first"""
+        return sorted(self.rules.values(), key=lambda rule: rule["created_at"])
+
+    def tokens(self) -> List[str]:
+        """Tokens that have at least one rule"""
+        return sorted({token for token, _, _ in self._index})
+
+    def _change(self, token: str, window: int, now: float) -> Optional[float]:
+        """Percent move since the oldest price seen within the window"""
+        history = self._history.get(token)
+        if not history or len(history) < 2:
+            return None
+        for seen_at, price in history:
+            if seen_at >= now - window:
+                return (history[-1][1] / price - 1) * 100 if price else None
+        return None
+
+    def _record(self, token: str, price: float, now: float):
+        """Keep prices, stamped with their fetch time, for the longest window"""
+        longest = max(
+            (window or 0 for t, _, window in self._index if t == token), default=0
+        )
+        history = self._history.setdefault(token, deque())
+        history.append((now, price))
+        while history and history[0][0] < now - longest:
+            history.popleft()
+
+    def _crossed(self, key: Tuple, value: float) -> List[str]:
+        """Rule ids whose threshold the value moved through since last tick"""
+        thresholds, ids = self._index[key]
+        previous = self._last_values.get(key)
+        self._last_values[key] = value
+        if key[1] in RISING:
+            start = 0 if previous is None else bisect_right(thresholds, previous)
+            return ids[start : bisect_right(thresholds, value)]
+        end = len(ids) if previous is None else bisect_left(thresholds, previous)
+        return ids[bisect_left(thresholds, value) : end]
+
+    def check(
+        self, now: Optional[float] = None, prices: Optional[Dict[str, float]] = None
+    ) -> List[Dict]:
+        """Fetch prices for ruled tokens in one request and fire crossed rules
+
+        Prices passed in count as fetched now. A fetched price is skipped when
+        it is no newer than the last one recorded for its token, or older than
+        MAX_PRICE_AGE, as the fetcher falls back to its cache when CoinGecko fails.
+        """
+        now = time.time() if now is None else now
+        self.reload(force=False)  # Pick up rules added from the CLI
+        tokens = self.tokens()
+        if not tokens:
+            return []
+        if prices is None:
+            timed_prices = self.price_fetcher.get_timed_prices(tokens)
+        else:
+            timed_prices = {token: (price, now) for token, price in prices.items()}
+
+        fired = []
+        with self._lock:
+            for token in tokens:
+                if token not in timed_prices:
+                    continue
+                price, fetched_at = timed_prices[token]
+                history = self._history.get(token)
+                if now - fetched_at > MAX_PRICE_AGE or (
+                    history and fetched_at <= history[-1][0]
+                ):
+                    continue
+                self._record(token, price, fetched_at)
+
+                for key in [key for key in self._index if key[0] == token]:
+                    if key[1] in ("above", "below"):
+                        value = price
+                    else:
+                        value = self._change(token, key[2], now)
+                        if value is None:
+                            continue
+                    for rule_id in self._crossed(key, value):
+                        rule = self.rules[rule_id]
+                        # Debounce a price hovering around the threshold
+                        if (
+                            rule["last_fired"]
+                            and now - rule["last_fired"] < self.cooldown
+                        ):
+                            continue
+                        fired.append(dict(rule, price=price, value=value))
+
+        if fired:
+            # Merge into the file as it is now; rules removed meanwhile stay gone
+            with self._transaction() as rules:
+                fired = [alert for alert in fired if alert["id"] in rules]
+                for alert in fired:
+                    rules[alert["id"]]["last_fired"] = now
+                    alert["last_fired"] = now
+
+        self.pending.extend(self._message(alert) for alert in fired)
+        self.flush(now)
+        return fired
+
+    @staticmethod
+    def _message(alert: Dict) -> str:
+        if alert["kind"] in ("above", "below"):
+            return f"{describe_rule(alert)} (now ${alert['price']:.6g})"
+        return f"{describe_rule(alert)} (now {alert['value']:+.1f}%, ${alert['price']:.6g})"
+
+    def flush(self, now: Optional[float] = None):
+        """Send pending alerts as one notification, at most once per notify_gap"""
+        now = time.time() if now is None else now
+        if not self.pending or now - self.last_notified < self.notify_gap:
+            return
+        messages, self.pending = self.pending, []
+        self.last_notified = now
+        self.notifier.notify_price_alerts(messages)
+
+    def run_forever(self, interval: int = DEFAULT_INTERVAL):
+        """Check prices every interval until interrupted"""
+        while True:
+            self.check()
+            time.sleep(interval)
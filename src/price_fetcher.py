@@ -1,7 +1,25 @@
 import requests
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 import time
 
+# Map common symbols to CoinGecko IDs
+COINGECKO_IDS = {
+    "ETH": "ethereum",
+    "WETH": "ethereum",
+    "USDC": "usd-coin",
+    "USDT": "tether",
+    "CELO": "celo",
+    "CUSD": "celo-dollar",
+    "cUSD": "celo-dollar",  # Support mixed case
+    "CEUR": "celo-euro",
+    "cEUR": "celo-euro",  # Support mixed case
+    "DEGEN": "degen-base",
+    "BRETT": "brett",
+    "G$": "gooddollar",
+    "ZORA": "zora",
+    "WCT": "connect-token-wct",
+}
+
 
 class PriceFetcher:
     def __init__(self):
@@ -21,28 +39,7 @@ class PriceFetcher:
                 return cached_price
 
         try:
-            # Map common symbols to CoinGecko IDs
-            token_map = {
-                "ETH": "ethereum",
-                "WETH": "ethereum",
-                "USDC": "usd-coin",
-                "USDT": "tether",
-                "CELO": "celo",
-                "CUSD": "celo-dollar",
-                "cUSD": "celo-dollar",  # Support mixed case
-                "CEUR": "celo-euro",
-                "cEUR": "celo-euro",  # Support mixed case
-                "DEGEN": "degen-base",
-                "BRETT": "brett",
-                "G$": "gooddollar",
-                "ZORA": "zora",
-                "WCT": "connect-token-wct",
-            }
-
-            # Try exact match first, then uppercase
-            token_id = token_map.get(token_symbol) or token_map.get(
-                token_symbol.upper()
-            )
+            token_id = self._get_token_id(token_symbol)
             if not token_id:
                 return None
 
@@ -75,11 +72,69 @@ class PriceFetcher:
 
         return None
 
+    def _get_token_id(self, token_symbol: str) -> Optional[str]:
+        """Map a token symbol to its CoinGecko ID"""
+        # Try exact match first, then uppercase
+        return COINGECKO_IDS.get(token_symbol) or COINGECKO_IDS.get(
+            token_symbol.upper()
+        )
+
+    def has_price_source(self, token_symbol: str) -> bool:
+        """Check if a token can be priced without making a request"""
+        return self._get_token_id(token_symbol) is not None
+
     def get_multiple_prices(self, symbols: list) -> Dict[str, float]:
-        """Get prices for multiple tokens at once"""
+        """Get prices for multiple tokens in one request; fresh ones come from cache"""
+        return {
+            symbol: price
+            for symbol, (price, _) in self.get_timed_prices(symbols).items()
+        }
+
+    def get_timed_prices(self, symbols: list) -> Dict[str, Tuple[float, float]]:
+        """Like get_multiple_prices, with the time each price was fetched
+
+        When CoinGecko fails the last cached price is returned with its original
+        fetch time, so callers can tell it is stale.
+        """
         prices = {}
+        current_time = time.time()
+
+        # Symbols sharing a CoinGecko ID (ETH/WETH) are fetched once
+        missing: Dict[str, list] = {}
         for symbol in symbols:
-            price = self.get_token_price(symbol)
-            if price:
-                prices[symbol] = price
+            cache_key = symbol.upper()
+            if cache_key in self.cache:
+                cached_price, cached_time = self.cache[cache_key]
+                if current_time - cached_time < self.cache_duration:
+                    prices[symbol] = (cached_price, cached_time)
+                    continue
+            token_id = self._get_token_id(symbol)
+            if token_id:
+                missing.setdefault(token_id, []).append(symbol)
+
+        if not missing:
+            return prices
+
+        data = {}
+        try:
+            response = requests.get(
+                f"{self.base_url}/simple/price",
+                params={"ids": ",".join(sorted(missing)), "vs_currencies": "usd"},
+                timeout=5,
+            )
+            if response.status_code == 200:
+                data = response.json()
+        except Exception:
+            pass
+
+        for token_id, token_symbols in missing.items():
+            price = data.get(token_id, {}).get("usd")
+            for symbol in token_symbols:
+                cache_key = symbol.upper()
+                if price is not None:
+                    self.cache[cache_key] = (price, current_time)
+                    prices[symbol] = (price, current_time)
+                elif cache_key in self.cache:
+                    # Rate limited or down: a stale price beats none
+                    prices[symbol] = self.cache[cache_key]
         return prices
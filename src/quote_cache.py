@@ -0,0 +1,87 @@
+"""Block-pinned swap quotes shared between preview and execution"""
+
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+QUOTE_TTL = 30  # Seconds a quote may be reused at all
+
+# Blocks the chain may advance before a quote is recomputed
+MAX_BLOCK_DRIFT = {
+    "ethereum": 1,  # ~12s blocks
+    "base": 5,  # ~2s blocks
+    "base-sepolia": 5,
+    "celo": 3,  # ~5s blocks
+}
+DEFAULT_BLOCK_DRIFT = 2
+
+
+def max_block_drift(network: str) -> int:
+    """How far a network may move before its quotes go stale"""
+    return MAX_BLOCK_DRIFT.get(network, DEFAULT_BLOCK_DRIFT)
+
+
+class QuoteCache:
+    """Quotes keyed by (network, pair, amount, block) with a short TTL"""
+
+    def __init__(self, ttl: int = QUOTE_TTL):
+        self.ttl = ttl
+        self._quotes: Dict[Tuple, Dict] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(
+        network: str, from_token: str, to_token: str, amount: float, block: int
+    ) -> Tuple:
+        return (network, from_token.upper(), to_token.upper(), float(amount), block)
+
+    def is_fresh(self, quote: Dict, current_block: Optional[int]) -> bool:
+        """Young enough, and computed within the network's block drift"""
+        if time.time() - quote.get("quoted_at", 0) > self.ttl:
+            return False
+        quoted_block = quote.get("block_number")
+        if quoted_block is None or current_block is None:
+            return False
+        return 0 <= current_block - quoted_block <= max_block_drift(quote["network"])
+
+    def get(
+        self,
+        network: str,
+        from_token: str,
+        to_token: str,
+        amount: float,
+        current_block: Optional[int],
+    ) -> Optional[Dict]:
+        """Newest fresh quote for this trade, if any"""
+        if current_block is None:
+            return None
+        with self._lock:
+            for block in range(
+                current_block, current_block - max_block_drift(network) - 1, -1
+            ):
+                quote = self._quotes.get(
+                    self.make_key(network, from_token, to_token, amount, block)
+                )
+                if quote and self.is_fresh(quote, current_block):
+                    return quote
+        return None
+
+    def put(self, quote: Dict):
+        """Store a quote tagged with block_number and quoted_at"""
+        if quote.get("block_number") is None:
+            return
+        key = self.make_key(
+            quote["network"],
+            quote["from_token"],
+            quote["to_token"],
+            quote["from_amount"],
+            quote["block_number"],
+        )
+        with self._lock:
+            now = time.time()
+            self._quotes = {
+                k: q
+                for k, q in self._quotes.items()
+                if now - q["quoted_at"] <= self.ttl
+            }
+            self._quotes[key] = quote
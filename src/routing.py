@@ -0,0 +1,210 @@
+"""Multi-hop route finding over the cached Uniswap V3 pool graph"""
+
+from typing import Dict, Iterator, List, Optional, Tuple
+from eth_utils import to_checksum_address
+from .multicall import Multicall
+from .pool_registry import FEE_TIERS
+
+# Intermediate tokens a route may pass through
+HUB_TOKENS = {
+    "base": [
+        "0x4200000000000000000000000000000000000006",  # WETH
+        "0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913",  # USDC
+    ],
+    "ethereum": [
+        "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2",  # WETH
+        "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48",  # USDC
+    ],
+}
+
+MAX_HOPS = 3
+MAX_TIERS_PER_PAIR = 2  # Only the deepest tiers of each pair become edges
+MAX_CANDIDATES = 16  # Paths quoted per request, ranked by bottleneck liquidity
+
+# QuoterV2 quoteExactInput
+QUOTE_EXACT_INPUT_ABI = [
+    {
+        "inputs": [
+            {"name": "path", "type": "bytes"},
+            {"name": "amountIn", "type": "uint256"},
+        ],
+        "name": "quoteExactInput",
+        "outputs": [
+            {"name": "amountOut", "type": "uint256"},
+            {"name": "sqrtPriceX96AfterList", "type": "uint160[]"},
+            {"name": "initializedTicksCrossedList", "type": "uint32[]"},
+            {"name": "gasEstimate", "type": "uint256"},
+        ],
+        "type": "function",
+    }
+]
+
+
+def encode_path(tokens: List[str], fees: List[int]) -> bytes:
+    """Pack a route as token (20 bytes) | fee (3 bytes) | token ..."""
+    if len(tokens) != len(fees) + 1:
+        raise ValueError("A path needs exactly one fee per hop")
+    path = bytes.fromhex(to_checksum_address(tokens[0])[2:])
+    for fee, token in zip(fees, tokens[1:]):
+        path += fee.to_bytes(3, "big") + bytes.fromhex(to_checksum_address(token)[2:])
+    return path
+
+
+def decode_path(path: bytes) -> Tuple[List[str], List[int]]:
+    """Unpack an encoded path into its tokens and fees"""
+    tokens = [to_checksum_address(path[:20])]
+    fees = []
+    offset = 20
+    while offset < len(path):
+        fees.append(int.from_bytes(path[offset : offset + 3], "big"))
+        tokens.append(to_checksum_address(path[offset + 3 : offset + 23]))
+        offset += 23
+    return tokens, fees
+
+
+class PoolGraph:
+    """Adjacency view of the live pools in a PoolRegistry"""
+
+    def __init__(self, registry, max_tiers_per_pair: int = MAX_TIERS_PER_PAIR):
+        self.edges: Dict[str, List[Tuple[str, int, int]]] = {}
+        by_pair: Dict[Tuple[str, str], List[Tuple[int, int]]] = {}
+        for token0, token1, fee, entry in registry.iter_pools():
+            by_pair.setdefault((token0, token1), []).append(
+                (entry.get("liquidity", 0), fee)
+            )
+
+        for (token0, token1), tiers in by_pair.items():
+            for liquidity, fee in sorted(tiers, reverse=True)[:max_tiers_per_pair]:
+                self.edges.setdefault(token0, []).append((token1, fee, liquidity))
+                self.edges.setdefault(token1, []).append((token0, fee, liquidity))
+
+    def neighbours(self, token: str) -> List[Tuple[str, int, int]]:
+        """(token, fee, liquidity) edges leaving a token"""
+        return self.edges.get(to_checksum_address(token), [])
+
+    def iter_paths(
+        self,
+        token_in: str,
+        token_out: str,
+        hubs: List[str],
+        max_hops: int = MAX_HOPS,
+    ) -> Iterator[Tuple[List[str], List[int], int]]:
+        """Yield (tokens, fees, bottleneck liquidity) for paths through hub tokens"""
+        token_in, token_out = to_checksum_address(token_in), to_checksum_address(
+            token_out
+        )
+        hubs = {to_checksum_address(hub) for hub in hubs}
+
+        stack = [([token_in], [], None)]
+        while stack:
+            tokens, fees, bottleneck = stack.pop()
+            for neighbour, fee, liquidity in self.neighbours(tokens[-1]):
+                if neighbour in tokens:
+                    continue
+                depth = liquidity if bottleneck is None else min(bottleneck, liquidity)
+                if neighbour == token_out:
+                    yield tokens + [neighbour], fees + [fee], depth
+                elif neighbour in hubs and len(fees) + 1 < max_hops:
+                    stack.append((tokens + [neighbour], fees + [fee], depth))
+
+
+class RouteFinder:
+    """Find and quote the best exactInput route for a pair"""
+
+    def __init__(
+        self,
+        dex,
+        hubs: Optional[List[str]] = None,
+        max_hops: int = MAX_HOPS,
+        max_candidates: int = MAX_CANDIDATES,
+    ):
+        self.dex = dex
+        self.hubs = hubs if hubs is not None else HUB_TOKENS.get(dex.network, [])
+        self.max_hops = max_hops
+        self.max_candidates = max_candidates
+
+    def candidate_paths(
+        self, token_in: str, token_out: str
+    ) -> List[Tuple[List[str], List[int]]]:
+        """Deepest candidate paths, pruned by cached liquidity"""
+        registry = self.dex.pool_registry
+
+        # Make sure every leg a route could use is known; stale entries are
+        # refreshed together in one batch
+        legs = [(token_in, token_out)]
+        for hub in self.hubs:
+            legs.extend([(token_in, hub), (hub, token_out)])
+        legs.extend((a, b) for i, a in enumerate(self.hubs) for b in self.hubs[i + 1 :])
+        registry.ensure_pairs(
+            [(a, b) for a, b in legs if a.lower() != b.lower()], FEE_TIERS
+        )
+
+        graph = PoolGraph(registry)
+        paths = graph.iter_paths(token_in, token_out, self.hubs, self.max_hops)
+        ranked = sorted(paths, key=lambda path: path[2], reverse=True)
+        return [(tokens, fees) for tokens, fees, _ in ranked[: self.max_candidates]]
+
+    def find_route(
+        self, token_in: str, token_out: str, amount_in: int, block_identifier="latest"
+    ) -> Optional[Dict]:
+        """Quote every candidate path in one Multicall and return the best net of gas"""
+        try:
+            candidates = self.candidate_paths(token_in, token_out)
+            if not candidates:
+                print("DEBUG: No route between these tokens")
+                return None
+
+            w3 = self.dex.wallet.w3
+            quoter = w3.eth.contract(
+                address=self.dex.contracts[self.dex.network]["quoter"],
+                abi=QUOTE_EXACT_INPUT_ABI,
+            )
+            multicall = Multicall(w3)
+
+            calls = [multicall.encode_self("getBasefee")]
+            for tokens, fees in candidates:
+                path = encode_path(tokens, fees)
+                calls.append(
+                    (
+                        quoter.address,
+                        multicall.encode(quoter, "quoteExactInput", [path, amount_in]),
+                    )
+                )
+
+            results = multicall.call(calls, block_identifier)
+            basefee = multicall.decode(["uint256"], results[0])
+            gas_price = basefee[0] if basefee else 0
+
+            best = None
+            for (tokens, fees), result in zip(candidates, results[1:]):
+                decoded = multicall.decode(
+                    ["uint256", "uint160[]", "uint32[]", "uint256"], result
+                )
+                if not decoded or decoded[0] == 0:
+                    continue
+
+                amount_out, _, _, gas_estimate = decoded
+                gas_cost_out = self.dex._gas_cost_in_output(
+                    token_in, token_out, amount_in, amount_out, gas_estimate * gas_price
+                )
+                route = {
+                    "amount_out": amount_out,
+                    "net_amount_out": amount_out - gas_cost_out,
+                    "gas_estimate": gas_estimate,
+                    "tokens": tokens,
+                    "fees": fees,
+                    "path": "0x" + encode_path(tokens, fees).hex(),
+                }
+                if best is None or route["net_amount_out"] > best["net_amount_out"]:
+                    best = route
+
+            if best:
+                print(
+                    f"DEBUG: Best route {len(best['fees'])} hop(s), "
+                    f"amount_out: {best['amount_out']}"
+                )
+            return best
+
+        except Exception as e:
+            print(f"DEBUG: RouteFinder.find_route error: {e}")
+            return None
@@ -0,0 +1,73 @@
+"""Batched JSON-RPC requests"""
+
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import requests
+
+# One keep-alive session per endpoint, so repeat batches skip the TCP/TLS
+# handshake (it matters most in the long-lived daemon)
+_sessions: Dict[str, requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+
+def get_session(endpoint: str) -> requests.Session:
+    """Shared HTTP session for an RPC endpoint"""
+    with _sessions_lock:
+        if endpoint not in _sessions:
+            _sessions[endpoint] = requests.Session()
+        return _sessions[endpoint]
+
+
+def batch_call(w3, calls: Sequence[Tuple[str, list]], timeout: int = 10) -> List[Dict]:
+    """Send several JSON-RPC calls in one HTTP request
+
+    Returns each call's full response ({"result": ...} or {"error": ...}) in
+    order. Providers without an HTTP endpoint fall back to one request per call.
+    """
+    if not calls:
+        return []
+
+    endpoint = getattr(w3.provider, "endpoint_uri", None)
+    if not endpoint:
+        # Go through the middlewares so non-HTTP providers see normal requests
+        make_request = w3.provider.request_func(w3, w3.middleware_onion)
+        responses = []
+        for method, params in calls:
+            try:
+                response = make_request(method, params)
+                result = response.get("result")
+                # Quantities come back as hex strings over HTTP; keep that shape
+                if isinstance(result, int) and not isinstance(result, bool):
+                    response = dict(response, result=hex(result))
+                responses.append(response)
+            except Exception as e:
+                responses.append({"error": {"message": str(e)}})
+        return responses
+
+    payload = [
+        {"jsonrpc": "2.0", "id": i, "method": method, "params": params}
+        for i, (method, params) in enumerate(calls)
+    ]
+    response = get_session(endpoint).post(endpoint, json=payload, timeout=timeout)
+    response.raise_for_status()
+    body = response.json()
+
+    # Some nodes answer a batch with a single error object
+    if isinstance(body, dict):
+        raise ValueError(body.get("error", {}).get("message", "Batch request failed"))
+
+    by_id = {item.get("id"): item for item in body}
+    return [
+        by_id.get(i, {"error": {"message": "Missing response"}})
+        for i in range(len(calls))
+    ]
+
+
+def batch_request(
+    w3, calls: Sequence[Tuple[str, list]], timeout: int = 10
+) -> List[Optional[Any]]:
+    """Send several JSON-RPC calls in one HTTP request
+
+    Returns each call's result in order, or None for calls that errored.
+    """
+    return [response.get("result") for response in batch_call(w3, calls, timeout)]
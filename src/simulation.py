@@ -0,0 +1,139 @@
+"""Pre-flight simulation of transactions before they are signed and sent"""
+
+from typing import Dict, Optional
+from eth_abi import decode
+from .rpc import batch_call
+
+ERROR_SELECTOR = "08c379a0"  # Error(string)
+PANIC_SELECTOR = "4e487b71"  # Panic(uint256)
+
+PANIC_CODES = {
+    0x01: "assertion failed",
+    0x11: "arithmetic overflow or underflow",
+    0x12: "division by zero",
+    0x21: "invalid enum value",
+    0x31: "pop on empty array",
+    0x32: "array index out of bounds",
+    0x41: "out of memory",
+    0x51: "call to uninitialized function",
+}
+
+GAS_LIMIT_MULTIPLIER = 1.2  # Headroom over eth_estimateGas
+
+
+def decode_revert_reason(data) -> str:
+    """Turn revert data into a readable reason"""
+    if isinstance(data, (bytes, bytearray)):
+        data = data.hex()
+    data = (data or "").lower().removeprefix("0x")
+    if not data:
+        return "execution reverted (no reason given)"
+
+    selector, payload = data[:8], bytes.fromhex(data[8:])
+    try:
+        if selector == ERROR_SELECTOR:
+            return decode(["string"], payload)[0]
+        if selector == PANIC_SELECTOR:
+            code = decode(["uint256"], payload)[0]
+            return f"panic 0x{code:02x} ({PANIC_CODES.get(code, 'unknown')})"
+    except Exception:
+        pass
+    return f"custom error 0x{selector}"
+
+
+def _rpc_transaction(tx: Dict) -> Dict:
+    """Encode a built transaction for eth_call / eth_estimateGas"""
+    call = {}
+    for field, key in [
+        ("from", "from"),
+        ("to", "to"),
+        ("data", "data"),
+        ("value", "value"),
+        ("gas", "gas"),
+        ("gasPrice", "gasPrice"),
+    ]:
+        value = tx.get(field)
+        if value is None:
+            continue
+        if isinstance(value, int):
+            value = hex(value)
+        elif isinstance(value, (bytes, bytearray)):
+            value = "0x" + bytes(value).hex()
+        call[key] = value
+    return call
+
+
+def _error_reason(error: Dict) -> str:
+    """Reason from a JSON-RPC error, preferring the raw revert data"""
+    data = error.get("data")
+    if isinstance(data, dict):
+        data = data.get("data") or data.get("result")
+    if isinstance(data, str) and data.startswith("0x") and len(data) > 2:
+        return decode_revert_reason(data)
+
+    message = error.get("message", "execution reverted")
+    return message.removeprefix("execution reverted: ")
+
+
+def simulate_transaction(w3, tx: Dict) -> Dict:
+    """Run a transaction with eth_call at pending, its gas estimate and the
+    sender's balance in one batched request
+
+    Returns {"success", "error", "gas_limit"}; gas_limit is the estimate with
+    headroom, or the transaction's own gas when no estimate came back.
+    """
+    call = _rpc_transaction(tx)
+    try:
+        # Gas fields would make eth_call fail on balance before it can revert
+        call_only = {k: v for k, v in call.items() if k not in ("gas", "gasPrice")}
+        responses = batch_call(
+            w3,
+            [
+                ("eth_call", [call_only, "pending"]),
+                ("eth_estimateGas", [call_only]),
+                ("eth_getBalance", [call["from"], "pending"]),
+            ],
+        )
+    except Exception as e:
+        # A node that can't simulate shouldn't block sending
+        print(f"DEBUG: Simulation unavailable: {e}")
+        return {"success": True, "error": None, "gas_limit": tx.get("gas")}
+
+    call_response, estimate_response, balance_response = responses
+    for response in (call_response, estimate_response):
+        if "error" in response:
+            return {
+                "success": False,
+                "error": _error_reason(response["error"]),
+                "gas_limit": None,
+            }
+
+    gas_limit = tx.get("gas")
+    estimate = estimate_response.get("result")
+    if estimate:
+        gas_limit = int(int(estimate, 16) * GAS_LIMIT_MULTIPLIER)
+
+    balance = balance_response.get("result")
+    if balance and gas_limit:
+        # EIP-1559 transactions have no gasPrice; the node reserves the max fee
+        fee_per_gas = tx.get("maxFeePerGas") or tx.get("gasPrice", 0)
+        needed = tx.get("value", 0) + gas_limit * fee_per_gas
+        if int(balance, 16) < needed:
+            return {
+                "success": False,
+                "error": "insufficient native balance for value plus gas",
+                "gas_limit": gas_limit,
+            }
+
+    return {"success": True, "error": None, "gas_limit": gas_limit}
+
+
+def preflight(w3, tx: Dict, label: str = "Transaction") -> Optional[Dict]:
+    """Simulate a transaction; return it with a measured gas limit, or None"""
+    simulation = simulate_transaction(w3, tx)
+    if not simulation["success"]:
+        print(f"{label} would fail: {simulation['error']}")
+        return None
+    if simulation["gas_limit"]:
+        tx = dict(tx, gas=simulation["gas_limit"])
+    return tx
@@ -1,6 +1,85 @@
-from typing import Optional, Dict
+import time
+from typing import Optional, Dict, List
+from .allowance import MAX_UINT256, AllowanceManager
+from .config import get_token_decimals
+from .simulation import preflight
 from .wallet import Wallet
 
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+# SwapRouter02 treats this recipient as "keep the output in the router"
+ADDRESS_THIS = "0x0000000000000000000000000000000000000002"
+
+SWAP_DEADLINE_SECONDS = 600
+
+# Networks with a SwapRouter02 deployment to swap through
+SUPPORTED_NETWORKS = ["base", "base-sepolia", "ethereum"]
+
+# SwapRouter02 swap, multicall and payment functions
+SWAP_ROUTER02_ABI = [
+    {
+        "inputs": [
+            {
+                "components": [
+                    {"name": "tokenIn", "type": "address"},
+                    {"name": "tokenOut", "type": "address"},
+                    {"name": "fee", "type": "uint24"},
+                    {"name": "recipient", "type": "address"},
+                    {"name": "amountIn", "type": "uint256"},
+                    {"name": "amountOutMinimum", "type": "uint256"},
+                    {"name": "sqrtPriceLimitX96", "type": "uint160"},
+                ],
+                "name": "params",
+                "type": "tuple",
+            }
+        ],
+        "name": "exactInputSingle",
+        "outputs": [{"name": "amountOut", "type": "uint256"}],
+        "type": "function",
+    },
+    {
+        "inputs": [
+            {
+                "components": [
+                    {"name": "path", "type": "bytes"},
+                    {"name": "recipient", "type": "address"},
+                    {"name": "amountIn", "type": "uint256"},
+                    {"name": "amountOutMinimum", "type": "uint256"},
+                ],
+                "name": "params",
+                "type": "tuple",
+            }
+        ],
+        "name": "exactInput",
+        "outputs": [{"name": "amountOut", "type": "uint256"}],
+        "type": "function",
+    },
+    {
+        "inputs": [
+            {"name": "deadline", "type": "uint256"},
+            {"name": "data", "type": "bytes[]"},
+        ],
+        "name": "multicall",
+        "outputs": [{"name": "results", "type": "bytes[]"}],
+        "type": "function",
+    },
+    {
+        "inputs": [
+            {"name": "amountMinimum", "type": "uint256"},
+            {"name": "recipient", "type": "address"},
+        ],
+        "name": "unwrapWETH9",
+        "outputs": [],
+        "type": "function",
+    },
+    {
+        "inputs": [],
+        "name": "refundETH",
+        "outputs": [],
+        "type": "function",
+    },
+]
+
 
 class SwapExecutor:
     def __init__(self, network: str = "base"):
@@ -14,8 +93,9 @@ class SwapExecutor:
             "ethereum": "0x68b3465833fb72A70ecDF485E0e4C7bD8665Fc45",
         }
 
-        # Networks that support swapping
-        self.supported_networks = ["base", "base-sepolia", "ethereum"]
+        self.supported_networks = SUPPORTED_NETWORKS
+
+        self.allowances = AllowanceManager(self.wallet.w3, self.wallet.address, network)
 
     def execute_swap(
         self,
@@ -24,52 +104,119 @@ class SwapExecutor:
         amount: float,
         min_amount_out: float,
         slippage: float = 0.5,
+        fee: Optional[int] = None,
+        route: Optional[str] = None,
+        state: Optional[Dict] = None,
+        unlimited_approval: bool = False,
     ) -> Optional[str]:
-        """Execute a token swap transaction"""
+        """Execute a token swap transaction
+
+        fee is the pool fee tier picked by the quote; without it the
+        executor falls back to its default tier order. route is an encoded
+        multi-hop path, swapped with exactInput instead of exactInputSingle.
+        state is the quote's chain state (balance, nonce, gas price); when
+        given, nothing is re-read before signing.
+        """
+        swap = {
+            "from_token": from_token,
+            "to_token": to_token,
+            "amount": amount,
+            "min_amount_out": min_amount_out,
+            "fee": fee,
+            "route": route,
+        }
+        return self.execute_swaps([swap], state, unlimited_approval)
+
+    def execute_swaps(
+        self,
+        swaps: List[Dict],
+        state: Optional[Dict] = None,
+        unlimited_approval: bool = False,
+    ) -> Optional[str]:
+        """Execute one or more swaps as a single SwapRouter02 multicall
+
+        Each swap is a dict with from_token, to_token, amount, min_amount_out
+        and optionally fee and route. Swaps to ETH are unwrapped in the same
+        transaction. ERC20 inputs are approved only when the cached allowance
+        is short, with the approval sent right before on the previous nonce.
+        """
         try:
             # Check if network supports swapping
             if self.network not in self.supported_networks:
                 print(f"Swap execution not supported on {self.network} network")
                 return None
-            # Get token addresses
-            from .cli import _get_tokens_for_network
 
-            token_addresses = _get_tokens_for_network(self.network)
+            legs = [self._resolve_swap(swap) for swap in swaps]
+            if not legs or not all(legs):
+                return None
 
-            from_address = token_addresses.get(from_token.upper())
-            to_address = token_addresses.get(to_token.upper())
+            # Check minimum swap amount (0.001 ETH minimum)
+            if any(leg["amount"] < 0.001 for leg in legs):
+                print("Amount too small. Minimum: 0.001 ETH")
+                return None
 
-            if not from_address or not to_address:
+            if state and state.get("address") != self.wallet.address:
+                state = None
+            if not self._check_balances(legs, state):
                 return None
 
-            # For ETH swaps, we'll use exactInputSingle with ETH value
-            # No need to approve when sending ETH directly
-            is_eth_input = from_token.upper() == "ETH"
-
-            # Convert ETH to WETH address for the swap parameters
-            if from_address == "0x0000000000000000000000000000000000000000":
-                from_address = token_addresses.get("WETH")
-            if to_address == "0x0000000000000000000000000000000000000000":
-                to_address = token_addresses.get("WETH")
-
-            # Prepare swap transaction
-            tx_data = self._prepare_swap_transaction(
-                from_address,
-                to_address,
-                amount,
-                min_amount_out,
-                from_token,
-                is_eth_input,
-            )
+            # Build transactions with a fresh nonce, unless the quote already read it
+            if state:
+                nonce, gas_price = state["nonce"], state["gas_price"]
+            else:
+                nonce = self.wallet.w3.eth.get_transaction_count(
+                    self.wallet.address, "pending"
+                )
+                gas_price = self.wallet.w3.eth.gas_price
+
+            # Approve only if the router can't already pull each input token
+            router_address = self.router_addresses[self.network]
+            spends = {}
+            for leg in legs:
+                if not leg["is_eth_input"]:
+                    token = leg["token_in"]
+                    spends[token] = spends.get(token, 0) + leg["amount_in_wei"]
+
+            approvals = []
+            for token, spend in spends.items():
+                if self.allowances.has_allowance(token, router_address, spend):
+                    continue
+                approve_amount = MAX_UINT256 if unlimited_approval else spend
+                approval_tx = self._build_approval(
+                    token, router_address, approve_amount, nonce, gas_price
+                )
+                approval_tx = preflight(self.wallet.w3, approval_tx, "Approval")
+                if not approval_tx:
+                    return None
+                approvals.append((token, approve_amount, approval_tx))
+                nonce += 1
 
+            tx_data = self._prepare_swap_transaction(legs, nonce, gas_price)
             if not tx_data:
                 return None
 
-            # Sign and send transaction
-            signed_tx = self.wallet.w3.eth.account.sign_transaction(
-                tx_data, self.wallet.account.key
-            )
-            tx_hash = self.wallet.w3.eth.send_raw_transaction(signed_tx.rawTransaction)
+            # Reverts (no pool, slippage, allowance) are caught before paying gas.
+            # A swap behind a not-yet-mined approval would always revert in
+            # simulation, so it keeps its fixed gas limit instead.
+            if not approvals:
+                tx_data = preflight(self.wallet.w3, tx_data, "Swap")
+                if not tx_data:
+                    return None
+
+            # Sign everything up front so the swap follows approvals immediately
+            signed_txs = [
+                self.wallet.w3.eth.account.sign_transaction(tx, self.wallet.account.key)
+                for tx in [approval_tx for _, _, approval_tx in approvals] + [tx_data]
+            ]
+            for signed_tx in signed_txs:
+                tx_hash = self.wallet.w3.eth.send_raw_transaction(
+                    signed_tx.rawTransaction
+                )
+
+            for token, approve_amount, _ in approvals:
+                self.allowances.record_approval(token, router_address, approve_amount)
+            for token, spend in spends.items():
+                self.allowances.spend(token, router_address, spend)
 
             return tx_hash.hex()
 
@@ -77,155 +224,244 @@ class SwapExecutor:
             print(f"Swap execution error: {e}")
             return None
 
-    def _prepare_swap_transaction(
-        self,
-        token_in: str,
-        token_out: str,
-        amount: float,
-        min_amount_out: float,
-        from_token: str,
-        is_eth_input: bool = False,
-    ) -> Optional[Dict]:
-        """Prepare swap transaction using SwapRouter02"""
+    def _get_registry_fee_tier(self, token_in: str, token_out: str) -> Optional[int]:
+        """Pick the fee tier with the most liquidity from the pool registry"""
         try:
-            router_address = self.router_addresses[self.network]
+            from .dex_integration import UNISWAP_V3_CONTRACTS
+            from .pool_registry import PoolRegistry
 
-            # SwapRouter02 exactInputSingle ABI
-            router_abi = [
-                {
-                    "inputs": [
-                        {
-                            "components": [
-                                {"name": "tokenIn", "type": "address"},
-                                {"name": "tokenOut", "type": "address"},
-                                {"name": "fee", "type": "uint24"},
-                                {"name": "recipient", "type": "address"},
-                                {"name": "amountIn", "type": "uint256"},
-                                {"name": "amountOutMinimum", "type": "uint256"},
-                                {"name": "sqrtPriceLimitX96", "type": "uint160"},
-                            ],
-                            "name": "params",
-                            "type": "tuple",
-                        }
-                    ],
-                    "name": "exactInputSingle",
-                    "outputs": [{"name": "amountOut", "type": "uint256"}],
-                    "type": "function",
-                }
-            ]
+            contracts = UNISWAP_V3_CONTRACTS.get(self.network)
+            if not contracts:
+                return None
 
-            router = self.wallet.w3.eth.contract(address=router_address, abi=router_abi)
+            registry = PoolRegistry(self.network, self.wallet.w3, contracts["factory"])
+            registry.ensure_pairs([(token_in, token_out)])
+            live_tiers = registry.live_fee_tiers(token_in, token_out)
+            return live_tiers[0] if live_tiers else None
 
-            # Get token decimals
-            from_decimals = 18  # Default to 18 for ETH/WETH
-            to_decimals = (
-                6 if "usdt" in token_out.lower() or "usdc" in token_out.lower() else 18
-            )
+        except Exception as e:
+            print(f"DEBUG: Pool registry lookup failed: {e}")
+            return None
 
-            # Convert amounts to wei with proper decimals
-            amount_in_wei = int(amount * 10**from_decimals)
-            min_amount_out_wei = int(min_amount_out * 10**to_decimals)
+    def _resolve_swap(self, swap: Dict) -> Optional[Dict]:
+        """Token addresses and base-unit amounts for one swap"""
+        # Get token addresses
+        from .cli import _get_tokens_for_network
 
-            # Check minimum swap amount (0.001 ETH minimum)
-            if amount < 0.001:
-                print("Amount too small. Minimum: 0.001 ETH")
-                return None
+        token_addresses = _get_tokens_for_network(self.network)
+
+        from_token, to_token = swap["from_token"], swap["to_token"]
+        from_address = token_addresses.get(from_token.upper())
+        to_address = token_addresses.get(to_token.upper())
+
+        if not from_address or not to_address:
+            return None
+
+        # Convert ETH to WETH address for the swap parameters; ETH input is
+        # sent as value and ETH output is unwrapped by the router
+        if from_address == ZERO_ADDRESS:
+            from_address = token_addresses.get("WETH")
+        if to_address == ZERO_ADDRESS:
+            to_address = token_addresses.get("WETH")
+
+        fee, route = swap.get("fee"), swap.get("route")
+
+        # Without a quoted tier, use the deepest known pool instead of guessing
+        if fee is None and not route:
+            fee = self._get_registry_fee_tier(from_address, to_address)
+
+        # Try different fee tiers for Base Sepolia, else 0.3% first
+        fee_tiers = [3000, 500, 10000] if self.network == "base-sepolia" else [3000]
+
+        return {
+            "from_token": from_token,
+            "to_token": to_token,
+            "token_in": from_address,
+            "token_out": to_address,
+            "amount": swap["amount"],
+            "amount_in_wei": int(swap["amount"] * 10 ** get_token_decimals(from_token)),
+            "min_out_wei": int(
+                swap["min_amount_out"] * 10 ** get_token_decimals(to_token)
+            ),
+            "fee": fee or fee_tiers[0],
+            "route": route,
+            "is_eth_input": from_token.upper() == "ETH",
+            "unwrap": to_token.upper() == "ETH",
+        }
+
+    def _check_balances(self, legs: List[Dict], state: Optional[Dict]) -> bool:
+        """Make sure every input token covers the total being swapped"""
+        needed = {}
+        for leg in legs:
+            symbol = leg["from_token"].upper()
+            needed[symbol] = needed.get(symbol, 0) + leg["amount"]
+
+        for leg in legs:
+            symbol = leg["from_token"].upper()
+            if symbol not in needed:
+                continue
+            amount = needed.pop(symbol)
 
-            # Check if user has enough balance
             # For ETH swaps, check native ETH balance, not WETH
-            balance_address = (
-                "0x0000000000000000000000000000000000000000"
-                if from_token.upper() == "ETH"
-                else token_in
-            )
-            current_balance = self.wallet.get_balance(balance_address)
+            if state and len(legs) == 1 and state.get("token", symbol) == symbol:
+                current_balance = state["balance"]
+            else:
+                current_balance = self.wallet.get_balance(
+                    ZERO_ADDRESS if leg["is_eth_input"] else leg["token_in"]
+                )
             if float(current_balance) < amount:
                 print(
-                    f"Insufficient balance. You have {current_balance:.6f} {from_token}, "
-                    f"need {amount}"
+                    f"Insufficient balance. You have {current_balance:.6f} "
+                    f"{leg['from_token']}, need {amount}"
                 )
-                return None
-
-            # Try different fee tiers for Base Sepolia
-            fee_tiers = [3000, 500, 10000] if self.network == "base-sepolia" else [3000]
-
-            # Swap parameters - try 0.3% fee first, then 0.05%, then 1%
-            swap_params = {
-                "tokenIn": token_in,
-                "tokenOut": token_out,
-                "fee": fee_tiers[0],  # Start with 0.3% fee tier
-                "recipient": self.wallet.address,
-                "amountIn": amount_in_wei,
-                "amountOutMinimum": min_amount_out_wei,
-                "sqrtPriceLimitX96": 0,  # No price limit
-            }
+                return False
+        return True
 
-            # Build transaction with fresh nonce
-            nonce = self.wallet.w3.eth.get_transaction_count(
-                self.wallet.address, "pending"
+    def _prepare_swap_transaction(
+        self, legs: List[Dict], nonce: int, gas_price: int
+    ) -> Optional[Dict]:
+        """Compose multicall(deadline, [swaps..., unwrapWETH9, refundETH])"""
+        try:
+            router_address = self.router_addresses[self.network]
+            router = self.wallet.w3.eth.contract(
+                address=router_address, abi=SWAP_ROUTER02_ABI
             )
 
-            # Set value to amount_in_wei if swapping ETH, otherwise 0
-            tx_value = amount_in_wei if is_eth_input else 0
+            calls = []
+            gas = 0
+            unwrap_minimum = 0
+            for leg in legs:
+                # ETH output stays in the router until it is unwrapped below
+                recipient = ADDRESS_THIS if leg["unwrap"] else self.wallet.address
+                if leg["route"]:
+                    # Multi-hop: the path already encodes every token and fee
+                    path = bytes.fromhex(leg["route"][2:])
+                    calls.append(
+                        router.encodeABI(
+                            fn_name="exactInput",
+                            args=[
+                                {
+                                    "path": path,
+                                    "recipient": recipient,
+                                    "amountIn": leg["amount_in_wei"],
+                                    "amountOutMinimum": leg["min_out_wei"],
+                                }
+                            ],
+                        )
+                    )
+                    gas += 200000 + 100000 * (len(path) // 23 - 1)
+                else:
+                    calls.append(
+                        router.encodeABI(
+                            fn_name="exactInputSingle",
+                            args=[
+                                {
+                                    "tokenIn": leg["token_in"],
+                                    "tokenOut": leg["token_out"],
+                                    "fee": leg["fee"],
+                                    "recipient": recipient,
+                                    "amountIn": leg["amount_in_wei"],
+                                    "amountOutMinimum": leg["min_out_wei"],
+                                    "sqrtPriceLimitX96": 0,  # No price limit
+                                }
+                            ],
+                        )
+                    )
+                    gas += 200000
+                if leg["unwrap"]:
+                    unwrap_minimum += leg["min_out_wei"]
+
+            if any(leg["unwrap"] for leg in legs):
+                calls.append(
+                    router.encodeABI(
+                        fn_name="unwrapWETH9",
+                        args=[unwrap_minimum, self.wallet.address],
+                    )
+                )
+                gas += 50000
+
+            # Set value to the ETH being swapped; anything unused comes back
+            tx_value = sum(leg["amount_in_wei"] for leg in legs if leg["is_eth_input"])
+            if tx_value:
+                calls.append(router.encodeABI(fn_name="refundETH"))
+                gas += 30000
 
-            transaction = router.functions.exactInputSingle(
-                swap_params
+            deadline = int(time.time()) + SWAP_DEADLINE_SECONDS
+            return router.functions.multicall(
+                deadline, [bytes.fromhex(call[2:]) for call in calls]
             ).build_transaction(
                 {
+                    "chainId": self.wallet.network_config.chain_id,
                     "from": self.wallet.address,
-                    "gas": 200000,
-                    "gasPrice": self.wallet.w3.eth.gas_price,
+                    "gas": gas,
+                    "gasPrice": gas_price,
                     "nonce": nonce,
                     "value": tx_value,
                 }
             )
 
-            return transaction
-
         except Exception as e:
             print(f"Transaction preparation error: {e}")
             return None
 
+    def _build_approval(
+        self,
+        token_address: str,
+        spender: str,
+        amount: int,
+        nonce: int,
+        gas_price: int,
+    ) -> Dict:
+        """Build (but don't send) an ERC20 approve transaction"""
+        # ERC20 approve ABI
+        erc20_abi = [
+            {
+                "inputs": [
+                    {"name": "spender", "type": "address"},
+                    {"name": "amount", "type": "uint256"},
+                ],
+                "name": "approve",
+                "outputs": [{"name": "", "type": "bool"}],
+                "type": "function",
+            }
+        ]
+
+        token_contract = self.wallet.w3.eth.contract(
+            address=token_address, abi=erc20_abi
+        )
+        return token_contract.functions.approve(spender, amount).build_transaction(
+            {
+                "chainId": self.wallet.network_config.chain_id,
+                "from": self.wallet.address,
+                "gas": 100000,
+                "gasPrice": gas_price,
+                "nonce": nonce,
+            }
+        )
+
     def approve_token(
         self, token_address: str, spender: str, amount: int
     ) -> Optional[str]:
         """Approve token spending for SwapRouter"""
         try:
-            # ERC20 approve ABI
-            erc20_abi = [
-                {
-                    "inputs": [
-                        {"name": "spender", "type": "address"},
-                        {"name": "amount", "type": "uint256"},
-                    ],
-                    "name": "approve",
-                    "outputs": [{"name": "", "type": "bool"}],
-                    "type": "function",
-                }
-            ]
-
-            token_contract = self.wallet.w3.eth.contract(
-                address=token_address, abi=erc20_abi
-            )
-
             # Build approval transaction with fresh nonce
             nonce = self.wallet.w3.eth.get_transaction_count(
                 self.wallet.address, "pending"
             )
-            tx = token_contract.functions.approve(spender, amount).build_transaction(
-                {
-                    "from": self.wallet.address,
-                    "gas": 100000,
-                    "gasPrice": self.wallet.w3.eth.gas_price,
-                    "nonce": nonce,
-                }
+            tx = self._build_approval(
+                token_address, spender, amount, nonce, self.wallet.w3.eth.gas_price
             )
 
+            tx = preflight(self.wallet.w3, tx, "Approval")
+            if not tx:
+                return None
+
             # Sign and send
             signed_tx = self.wallet.w3.eth.account.sign_transaction(
                 tx, self.wallet.account.key
             )
             tx_hash = self.wallet.w3.eth.send_raw_transaction(signed_tx.rawTransaction)
+            self.allowances.record_approval(token_address, spender, amount)
 
             return tx_hash.hex()
 
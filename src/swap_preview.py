@@ -1,34 +1,97 @@
-from typing import Optional, Dict
+import time
+from typing import Optional, Dict, List
+from .config import get_token_decimals
 from .price_fetcher import PriceFetcher
+from .quote_cache import QuoteCache
+from .rpc import batch_request
 from .wallet import Wallet
 from .dex_integration import UniswapV3Integration
 
 
+def ladder_sizes(
+    amount: float, decades: int = 2, steps_per_decade: int = 2
+) -> List[float]:
+    """Log-spaced trade sizes from amount / 10^decades to amount * 10^decades"""
+    steps = decades * steps_per_decade
+    return [
+        float(f"{amount * 10 ** (i / steps_per_decade):.6g}")
+        for i in range(-steps, steps + 1)
+    ]
+
+
 class SwapPreview:
-    def __init__(self):
-        self.price_fetcher = PriceFetcher()
+    def __init__(
+        self,
+        quote_cache: Optional[QuoteCache] = None,
+        price_fetcher: Optional[PriceFetcher] = None,
+    ):
+        self.price_fetcher = price_fetcher or PriceFetcher()
         self.dex_integrations = {}  # Cache DEX instances
+        self.wallets = {}  # Cache Wallet instances
+        self.quote_cache = quote_cache or QuoteCache()
 
     def get_swap_quote(
-        self, from_token: str, to_token: str, amount: float, network: str = "base"
+        self,
+        from_token: str,
+        to_token: str,
+        amount: float,
+        network: str = "base",
+        state: Optional[Dict] = None,
     ) -> Optional[Dict]:
-        """Get swap quote using simple price calculation"""
+        """Get swap quote from Uniswap V3, falling back to price calculation
+
+        state is a chain state already read for this network, shared by
+        several quotes so the block, gas price and nonce are read once.
+        """
         try:
             # Validate tokens exist on network
             if not self._validate_tokens_on_network(from_token, to_token, network):
                 return None
 
-            # DEX quotes temporarily disabled due to RPC rate limits
-            # TODO: Add proper RPC with API key for production
-            # token_addresses = self._get_token_addresses(network)
-            # from_address = token_addresses.get(from_token.upper())
-            # to_address = token_addresses.get(to_token.upper())
-            # dex_quote = self._get_dex_quote(from_address, to_address, amount, network)
-            dex_quote = None
+            token_addresses = self._get_token_addresses(network)
+            from_address = token_addresses.get(from_token.upper())
+            to_address = token_addresses.get(to_token.upper())
+
+            # Block, gas price, nonce and balance in one batch; execution reuses them
+            if state is None:
+                state = self._fetch_chain_state(network, from_address, from_token)
+            block_number = state["block_number"] if state else None
+            cached = self.quote_cache.get(
+                network, from_token, to_token, amount, block_number
+            )
+            if cached:
+                # Same pricing, but keep the nonce and balance just read
+                return dict(cached, state=state) if state else cached
+
+            # DEX quotes take a single batched RPC round trip for all fee tiers
+            dex_quote = self._get_dex_quote(
+                from_address,
+                to_address,
+                amount,
+                network,
+                from_token,
+                to_token,
+                block_number if block_number is not None else "latest",
+            )
 
+            fee_tier = None
+            route = None
+            pool_fee = None
             if dex_quote:
                 estimated_output = dex_quote["amount_out"]
-                quote_source = "Uniswap V3"
+                fees = dex_quote["fees"]
+                # Fees compound along a multi-hop route
+                pool_fee = 1.0
+                for fee in fees:
+                    pool_fee *= 1 - fee / 1_000_000
+                pool_fee = 1 - pool_fee
+                if len(fees) == 1:
+                    fee_tier = fees[0]
+                    quote_source = f"Uniswap V3 ({fee_tier / 10000:.2f}% pool)"
+                else:
+                    route = dex_quote["route"]
+                    hops = " → ".join(dex_quote["symbols"])
+                    quote_source = f"Uniswap V3 ({hops})"
             else:
                 # Fallback to price-based calculation
                 from_price = self.price_fetcher.get_token_price(from_token)
@@ -44,18 +107,25 @@ class SwapPreview:
             if not from_price or not to_price:
                 from_price = to_price = 1.0  # Fallback
 
-            # Simulate 0.3% DEX fee
-            fee_percentage = 0.003
-            output_after_fee = estimated_output * (1 - fee_percentage)
+            if pool_fee is not None:
+                # Quoter output already has the pool fees taken out
+                fee_percentage = pool_fee
+                output_after_fee = estimated_output
+            else:
+                # Simulate 0.3% DEX fee
+                fee_percentage = 0.003
+                output_after_fee = estimated_output * (1 - fee_percentage)
 
             # Simulate slippage (0.5% for this example)
             slippage = 0.005
             min_output = output_after_fee * (1 - slippage)
 
             # Get gas estimation
-            gas_info = self._estimate_gas(network)
+            gas_info = self._estimate_gas(
+                network, state["gas_price"] if state else None
+            )
 
-            return {
+            quote = {
                 "from_token": from_token,
                 "to_token": to_token,
                 "from_amount": amount,
@@ -71,20 +141,184 @@ class SwapPreview:
                 "gas_price_gwei": gas_info["gas_price_gwei"],
                 "gas_cost_usd": gas_info["gas_cost_usd"],
                 "quote_source": quote_source,
+                "fee_tier": fee_tier,
+                "route": route,
+                "block_number": block_number,
+                "quoted_at": time.time(),
+                "state": state,
             }
+            self.quote_cache.put(quote)
+            return quote
 
         except Exception:
             return None
 
-    def _estimate_gas(self, network: str) -> Dict:
+    def refresh_quote(self, quote: Dict) -> Optional[Dict]:
+        """Reuse a quote while the chain hasn't moved too far, else re-quote"""
+        try:
+            wallet = self._get_wallet(quote["network"])
+            current_block = wallet.w3.eth.block_number
+        except Exception as e:
+            print(f"DEBUG: Block number check failed: {e}")
+            current_block = None
+
+        if self.quote_cache.is_fresh(quote, current_block):
+            return quote
+
+        return self.get_swap_quote(
+            quote["from_token"],
+            quote["to_token"],
+            quote["from_amount"],
+            quote["network"],
+        )
+
+    def _get_wallet(self, network: str) -> Wallet:
+        """Get or create the Wallet for a network"""
+        if network not in self.wallets:
+            self.wallets[network] = Wallet(network)
+        return self.wallets[network]
+
+    def _get_dex(self, network: str) -> UniswapV3Integration:
+        """Get or create the DEX integration for a network"""
+        if network not in self.dex_integrations:
+            self.dex_integrations[network] = UniswapV3Integration(network)
+        return self.dex_integrations[network]
+
+    def _fetch_chain_state(
+        self, network: str, token_address: Optional[str], token: str
+    ) -> Optional[Dict]:
+        """Block number, gas price, pending nonce and balance in one request"""
+        try:
+            wallet = self._get_wallet(network)
+            address = wallet.address
+
+            if (
+                not token_address
+                or token_address == "0x0000000000000000000000000000000000000000"
+            ):
+                balance_call = ("eth_getBalance", [address, "latest"])
+            else:
+                balance_call = (
+                    "eth_call",
+                    [
+                        {
+                            "to": token_address,
+                            "data": "0x70a08231" + address[2:].lower().zfill(64),
+                        },
+                        "latest",
+                    ],
+                )
+
+            results = batch_request(
+                wallet.w3,
+                [
+                    ("eth_blockNumber", []),
+                    ("eth_gasPrice", []),
+                    ("eth_getTransactionCount", [address, "pending"]),
+                    balance_call,
+                ],
+            )
+            if any(result in (None, "0x") for result in results):
+                return None
+
+            block_number, gas_price, nonce, balance_wei = [
+                int(result, 16) for result in results
+            ]
+            return {
+                "address": address,
+                "block_number": block_number,
+                "gas_price": gas_price,
+                "nonce": nonce,
+                "balance_wei": balance_wei,
+                "token": token.upper(),
+                "balance": balance_wei / 10 ** get_token_decimals(token),
+            }
+
+        except Exception as e:
+            print(f"DEBUG: Chain state fetch failed: {e}")
+            return None
+
+    def get_swap_ladder(
+        self,
+        from_token: str,
+        to_token: str,
+        amounts: List[float],
+        network: str = "base",
+    ) -> Optional[Dict]:
+        """Quote several trade sizes at one block and measure their price impact"""
+        try:
+            if network not in ["base", "ethereum"]:
+                return None
+            if not self._validate_tokens_on_network(from_token, to_token, network):
+                return None
+
+            token_addresses = self._get_token_addresses(network)
+            from_address = token_addresses.get(from_token.upper())
+            to_address = token_addresses.get(to_token.upper())
+
+            # Convert ETH to WETH for Uniswap V3
+            zero_address = "0x0000000000000000000000000000000000000000"
+            if from_address == zero_address:
+                from_address = token_addresses.get("WETH")
+            if to_address == zero_address:
+                to_address = token_addresses.get("WETH")
+
+            dex = self._get_dex(network)
+
+            decimals_in = get_token_decimals(from_token)
+            decimals_out = get_token_decimals(to_token)
+            amounts = sorted(amounts)
+            ladder = dex.get_quote_ladder(
+                from_address,
+                to_address,
+                [int(amount * 10**decimals_in) for amount in amounts],
+            )
+            if not ladder:
+                return None
+
+            spot_rate = (ladder["reference_out"] / 10**decimals_out) / (
+                ladder["reference_in"] / 10**decimals_in
+            )
+
+            rows = []
+            for amount, quote in zip(amounts, ladder["quotes"]):
+                output = quote["amount_out"] / 10**decimals_out
+                rate = output / amount if amount > 0 else 0
+                rows.append(
+                    {
+                        "amount": amount,
+                        "output": output,
+                        "rate": rate,
+                        "price_impact": (
+                            (1 - rate / spot_rate) * 100 if output else None
+                        ),
+                        "fee_tier": quote["fee"],
+                    }
+                )
+
+            return {
+                "from_token": from_token,
+                "to_token": to_token,
+                "network": network,
+                "spot_rate": spot_rate,
+                "source": ladder["source"],
+                "rows": rows,
+            }
+
+        except Exception as e:
+            print(f"DEBUG: Swap ladder error: {e}")
+            return None
+
+    def _estimate_gas(self, network: str, gas_price_wei: Optional[int] = None) -> Dict:
         """Estimate gas costs for swap transaction"""
         try:
-            wallet = Wallet(network)
-            if not wallet.is_connected():
-                return self._get_fallback_gas(network)
+            wallet = self._get_wallet(network)
+            if gas_price_wei is None:
+                if not wallet.is_connected():
+                    return self._get_fallback_gas(network)
 
-            # Get current gas price
-            gas_price_wei = wallet.w3.eth.gas_price
+                # Get current gas price
+                gas_price_wei = wallet.w3.eth.gas_price
             gas_price_gwei = wallet.w3.from_wei(gas_price_wei, "gwei")
 
             # Estimate gas limit for swap (typical Uniswap V3 swap)
@@ -158,7 +392,14 @@ class SwapPreview:
         return _get_tokens_for_network(network)
 
     def _get_dex_quote(
-        self, from_address: str, to_address: str, amount: float, network: str
+        self,
+        from_address: str,
+        to_address: str,
+        amount: float,
+        network: str,
+        from_token: str = "ETH",
+        to_token: str = "ETH",
+        block_identifier="latest",
     ) -> Optional[Dict]:
         """Get real DEX quote from Uniswap V3"""
         try:
@@ -176,37 +417,55 @@ class SwapPreview:
                 token_addresses = self._get_token_addresses(network)
                 to_address = token_addresses.get("WETH")
 
-            # Get or create DEX integration
-            if network not in self.dex_integrations:
-                self.dex_integrations[network] = UniswapV3Integration(network)
-
-            dex = self.dex_integrations[network]
-
-            # Convert amount to wei (18 decimals for ETH/WETH, 6 for USDC)
-            if "USDC" in str(to_address).upper():
-                decimals_out = 6
-            else:
-                decimals_out = 18
+            dex = self._get_dex(network)
 
-            amount_wei = int(amount * 10**18)  # ETH is always 18 decimals
+            # Convert amount to base units using each token's decimals
+            decimals_in = get_token_decimals(from_token)
+            decimals_out = get_token_decimals(to_token)
+            amount_wei = int(amount * 10**decimals_in)
 
-            # Get quote from Uniswap V3
+            # Direct and multi-hop routes are quoted together in one round trip
             print(
                 f"DEBUG: Calling DEX with from={from_address}, to={to_address}, amount={amount_wei}"
             )
-            amount_out_wei = dex.get_quote(from_address, to_address, amount_wei)
-            print(f"DEBUG: DEX returned: {amount_out_wei}")
+            dex_quote = dex.get_route(
+                from_address, to_address, amount_wei, block_identifier
+            )
+            print(f"DEBUG: DEX returned: {dex_quote}")
+
+            if not dex_quote:
+                # Quoter unavailable (e.g. rate limited): simulate on pool snapshots
+                local_quote = dex.get_local_quote(from_address, to_address, amount_wei)
+                if local_quote:
+                    dex_quote = {
+                        "amount_out": local_quote["amount_out"],
+                        "fees": [local_quote["fee"]],
+                        "gas_estimate": 0,
+                        "tokens": [from_address, to_address],
+                        "path": None,
+                    }
 
-            if amount_out_wei:
+            if dex_quote:
                 # Convert back to human readable
-                amount_out = amount_out_wei / 10**decimals_out
-                return {"amount_out": amount_out}
+                amount_out = dex_quote["amount_out"] / 10**decimals_out
+                symbols_by_address = {
+                    address.lower(): symbol
+                    for symbol, address in self._get_token_addresses(network).items()
+                    if symbol != "ETH"
+                }
+                return {
+                    "amount_out": amount_out,
+                    "fees": dex_quote["fees"],
+                    "gas_estimate": dex_quote["gas_estimate"],
+                    "route": dex_quote["path"],
+                    "symbols": [
+                        symbols_by_address.get(token.lower(), token[:8])
+                        for token in dex_quote["tokens"]
+                    ],
+                }
 
             return None
 
         except Exception as e:
             print(f"DEBUG: DEX quote error: {e}")  # Debug
-            import traceback
-
-            traceback.print_exc()
             return None
@@ -0,0 +1,84 @@
+"""Spam token classification for discovered tokens"""
+
+import re
+from typing import Callable, Dict, List, Optional
+from .price_fetcher import PriceFetcher
+
+# Patterns that show up in airdropped scam token symbols
+SUSPICIOUS_SYMBOL_PATTERNS = [
+    r"https?:",
+    r"www\.",
+    r"\.(com|io|org|net|xyz|app|site|finance|gift|fi)\b",
+    r"t\.me",
+    r"@",
+    r"\s",
+    r"claim",
+    r"visit",
+    r"reward",
+    r"airdrop",
+    r"voucher",
+    r"bonus",
+]
+
+# Heuristic weights; a token at or above SPAM_THRESHOLD is treated as spam.
+# Without a liquidity checker (Celo) only a suspicious symbol reaches it
+WEIGHTS = {
+    "suspicious_symbol": 3,
+    "no_liquidity": 2,
+    "unpriceable": 1,
+    "unsolicited": 1,
+}
+SPAM_THRESHOLD = 3
+
+
+class TokenClassifier:
+    """Score discovered tokens by spam heuristics"""
+
+    def __init__(
+        self,
+        price_fetcher: Optional[PriceFetcher] = None,
+        liquidity_checker: Optional[Callable[[str], Optional[bool]]] = None,
+    ):
+        self.price_fetcher = price_fetcher or PriceFetcher()
+        # Optional on-chain check: token address -> has a pool with liquidity
+        # (None when unknown). Only consulted for tokens already under suspicion.
+        self.liquidity_checker = liquidity_checker
+        self._patterns = [
+            re.compile(p, re.IGNORECASE) for p in SUSPICIOUS_SYMBOL_PATTERNS
+        ]
+
+    def is_suspicious_symbol(self, symbol: str) -> bool:
+        """Check a symbol for URLs, promo words and other scam markers"""
+        if len(symbol) > 20 or not symbol.isascii():
+            return True
+        return any(pattern.search(symbol) for pattern in self._patterns)
+
+    def classify(self, symbol: str, info: Dict) -> Dict:
+        """Classify a single token from its registry info"""
+        reasons: List[str] = []
+
+        if self.is_suspicious_symbol(symbol):
+            reasons.append("suspicious_symbol")
+        if not self.price_fetcher.has_price_source(symbol):
+            reasons.append("unpriceable")
+        if not info.get("sent", False):
+            reasons.append("unsolicited")
+
+        score = sum(WEIGHTS[reason] for reason in reasons)
+
+        # The liquidity check costs RPC calls, so only spend them on tokens
+        # that other signals can't settle either way
+        if 0 < score < SPAM_THRESHOLD and self.liquidity_checker:
+            try:
+                has_liquidity = self.liquidity_checker(info["address"])
+            except Exception:
+                has_liquidity = None
+            if has_liquidity is False:
+                reasons.append("no_liquidity")
+                score += WEIGHTS["no_liquidity"]
+
+        return {
+            "spam": score >= SPAM_THRESHOLD,
+            "spam_score": score,
+            "spam_reasons": reasons,
+        }
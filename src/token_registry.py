@@ -0,0 +1,264 @@
+"""Persistent registry of tokens discovered from transaction history"""
+
+import atexit
+import contextlib
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from .config import DATA_DIR
+from .file_lock import file_lock
+
+REFRESH_EXIT_TIMEOUT = 5  # Seconds exit waits for background refreshes to finish
+_refresh_threads: List[threading.Thread] = []
+
+
+@atexit.register
+def _finish_refreshes():
+    """Give background refreshes a few seconds to save and classify at exit
+
+    Unfinished ones are redone by the next run that finds the entry stale, but
+    their tokens would be shown unclassified until then.
+    """
+    deadline = time.time() + REFRESH_EXIT_TIMEOUT
+    for thread in list(_refresh_threads):
+        thread.join(max(0, deadline - time.time()))
+
+
+class TokenRegistry:
+    """Discovered tokens per (network, address), refreshed incrementally by block"""
+
+    def __init__(self, path: Optional[str] = None, max_age: int = 600):
+        self.path = path or os.path.join(DATA_DIR, "tokens.json")
+        self.max_age = max_age  # Seconds before an entry is considered stale
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._data = {}
+        self.reload()
+
+    def _load(self) -> Dict:
+        """Load registry from disk, re-keying symbol-keyed tokens by address"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as fh:
+                data = json.load(fh)
+        except (OSError, ValueError):
+            return {}
+        for entry in data.values():
+            entry["tokens"] = {
+                info["address"].lower(): {"symbol": key, **info}
+                for key, info in entry.get("tokens", {}).items()
+            }
+        return data
+
+    def _save(self):
+        """Write registry to disk atomically"""
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as fh:
+                json.dump(self._data, fh, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+            self._mtime = os.path.getmtime(self.path)
+        except OSError as e:
+            print(f"DEBUG: Failed to save token registry: {e}")
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        """Modify the latest registry on disk and write it back, under the file lock
+
+        The CLI, its background refresh and the daemon all write this file, so
+        changes are applied to what is on disk now, not to a stale copy.
+        """
+        with self._lock, file_lock(self.path):
+            self._data = self._load()
+            yield self._data
+            self._save()
+
+    def reload(self, force: bool = True):
+        """Re-read the registry, if it changed on disk (e.g. another process)"""
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            mtime = None
+        if not force and mtime == self._mtime:
+            return
+        with self._lock:
+            self._mtime = mtime
+            self._data = self._load()
+
+    @staticmethod
+    def _key(network: str, address: str) -> str:
+        return f"{network}:{address.lower()}"
+
+    def get_entry(self, network: str, address: str) -> Optional[Dict]:
+        """Get the raw registry entry for a wallet on a network"""
+        return self._data.get(self._key(network, address))
+
+    @staticmethod
+    def _named(entry: Dict) -> List[Tuple[str, Dict]]:
+        """Tokens as (display name, info), one plain symbol per name
+
+        Contracts sharing a symbol (a fake "USDC" airdrop) are all kept. The
+        plain symbol goes to a token classified clean, then to an unclassified
+        one, and the rest are shown with their address so that none of them is
+        priced or listed as the other.
+        """
+
+        def rank(info: Dict) -> Tuple[int, str]:
+            if "spam" not in info:
+                return (1, info["address"].lower())
+            return (2 if info["spam"] else 0, info["address"].lower())
+
+        named = []
+        taken = set()
+        for info in sorted(entry.get("tokens", {}).values(), key=rank):
+            name = info["symbol"]
+            if name in taken:
+                name = f"{name} ({info['address'][:8]})"
+            taken.add(name)
+            named.append((name, info))
+        return named
+
+    def get_tokens(
+        self, network: str, address: str, include_spam: bool = False
+    ) -> Dict[str, str]:
+        """Get discovered tokens as {symbol: contract address} without any API calls"""
+        entry = self.get_entry(network, address)
+        if not entry:
+            return {}
+        return {
+            name: info["address"]
+            for name, info in self._named(entry)
+            if include_spam or not info.get("spam", False)
+        }
+
+    def get_spam_tokens(self, network: str, address: str) -> Dict[str, str]:
+        """Get tokens classified as spam as {symbol: contract address}"""
+        entry = self.get_entry(network, address)
+        if not entry:
+            return {}
+        return {
+            name: info["address"]
+            for name, info in self._named(entry)
+            if info.get("spam", False)
+        }
+
+    def is_stale(self, network: str, address: str) -> bool:
+        """Check whether an entry is missing or older than max_age"""
+        entry = self.get_entry(network, address)
+        if not entry:
+            return True
+        return time.time() - entry.get("refreshed_at", 0) > self.max_age
+
+    def update(self, network: str, address: str, activity: Dict[str, Dict]):
+        """Merge newly discovered token activity, keyed by contract address"""
+        with self._transaction() as data:
+            key = self._key(network, address)
+            entry = data.setdefault(
+                key, {"last_block": 0, "refreshed_at": 0, "tokens": {}}
+            )
+
+            for info in activity.values():
+                token_key = info["address"].lower()
+                known = entry["tokens"].get(token_key, {})
+                last_seen = max(
+                    known.get("last_seen_block", 0), info.get("last_seen_block", 0)
+                )
+                entry["tokens"][token_key] = {
+                    **known,
+                    "symbol": info["symbol"],
+                    "address": info["address"],
+                    "last_seen_block": last_seen,
+                    "sent": known.get("sent", False) or info.get("sent", False),
+                }
+                entry["last_block"] = max(entry["last_block"], last_seen)
+
+            entry["refreshed_at"] = time.time()
+
+    def classify(self, network: str, address: str, classifier=None):
+        """Classify tokens that changed since they were last scored
+
+        Scoring can cost RPC calls (liquidity checks), so it runs on a snapshot
+        without holding the lock, and the results are merged in afterwards.
+        """
+        entry = self.get_entry(network, address)
+        if not entry:
+            return
+
+        # Sending a token can clear the unsolicited flag, so re-score then
+        pending = {
+            token_key: dict(info)
+            for token_key, info in entry["tokens"].items()
+            if "spam" not in info
+            or info.get("classified_sent") != info.get("sent", False)
+        }
+        if not pending:
+            return
+
+        if classifier is None:
+            from .token_filter import TokenClassifier
+
+            classifier = TokenClassifier()
+
+        results = {
+            token_key: {
+                **classifier.classify(info["symbol"], info),
+                "classified_sent": info.get("sent", False),
+            }
+            for token_key, info in pending.items()
+        }
+
+        with self._transaction() as data:
+            tokens = data.get(self._key(network, address), {}).get("tokens", {})
+            for token_key, result in results.items():
+                # Skip tokens whose sent flag moved on while they were scored
+                info = tokens.get(token_key)
+                if info and info.get("sent", False) == result["classified_sent"]:
+                    info.update(result)
+
+    def refresh(
+        self,
+        network: str,
+        address: str,
+        tx_history=None,
+        classifier=None,
+        include_spam: bool = False,
+    ) -> Dict[str, str]:
+        """Fetch only the token activity since the last seen block"""
+        try:
+            if tx_history is None:
+                from .transaction_history import TransactionHistory
+
+                tx_history = TransactionHistory(network)
+
+            entry = self.get_entry(network, address)
+            start_block = entry["last_block"] + 1 if entry else 0
+
+            activity = tx_history.discover_token_activity(address, start_block)
+            self.update(network, address, activity)
+            self.classify(network, address, classifier)
+
+        except Exception as e:
+            print(f"DEBUG: Token registry refresh failed: {e}")
+
+        return self.get_tokens(network, address, include_spam)
+
+    def refresh_in_background(
+        self, network: str, address: str, tx_history=None, classifier=None
+    ) -> threading.Thread:
+        """Refresh on a worker thread that never holds up the command
+
+        The command's output doesn't wait for it; exit waits up to
+        REFRESH_EXIT_TIMEOUT so new tokens are usually classified before then.
+        """
+        thread = threading.Thread(
+            target=self.refresh,
+            args=(network, address, tx_history, classifier),
+            name=f"token-registry-{network}",
+            daemon=True,
+        )
+        _refresh_threads[:] = [t for t in _refresh_threads if t.is_alive()]
+        _refresh_threads.append(thread)
+        thread.start()
+        return thread
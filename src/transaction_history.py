@@ -1,11 +1,17 @@
 """Transaction history fetcher for terminalSwap"""
 
-import requests
-from typing import List, Dict, Optional
+import heapq
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Dict, Optional, Tuple
 from datetime import datetime
-from .config import NETWORKS
+from .config import MAINNET_NETWORKS, NETWORKS
+from .etherscan_cache import EtherscanCache, OPEN_END_BLOCK, SPLIT_BLOCKS
 from .price_fetcher import PriceFetcher
 
+# Etherscan only serves page * offset up to this many records per query
+MAX_RESULT_WINDOW = 10000
+
 
 class TransactionHistory:
     def __init__(self, network: str = "base"):
@@ -28,9 +34,51 @@ class TransactionHistory:
             "celo": 42220,
         }
 
+        # Blocks behind the tip after which Etherscan data can't change
+        self.finality_depths = {
+            "ethereum": 64,
+            "base": 1800,
+            "base-sepolia": 1800,
+            "celo": 1800,
+        }
+        self._finalized_block = None
+
+        # Responses are cached on disk; finalized block ranges never expire
+        self.etherscan = EtherscanCache(finalized_block_fn=self._get_finalized_block)
+
         # Token addresses for each network (for filtering ERC20 transfers)
         self.token_addresses = self._get_network_tokens()
 
+    def _get_finalized_block(self) -> Optional[int]:
+        """Get a block number old enough that its history is final"""
+        if self._finalized_block is not None:
+            return self._finalized_block
+
+        try:
+            chain_id = self.etherscan_v2_chains.get(self.network)
+            if not chain_id or not self.etherscan_api_key:
+                return None
+
+            params = {
+                "chainid": chain_id,
+                "module": "proxy",
+                "action": "eth_blockNumber",
+                "apikey": self.etherscan_api_key,
+            }
+            response = self.etherscan.get(
+                self.etherscan_v2_url, params=params, timeout=10
+            )
+            if response.status_code != 200:
+                return None
+
+            latest_block = int(response.json()["result"], 16)
+            depth = self.finality_depths.get(self.network, 1800)
+            self._finalized_block = max(latest_block - depth, 0)
+            return self._finalized_block
+
+        except Exception:
+            return None
+
     def _get_network_tokens(self) -> Dict[str, str]:
         """Get token addresses for the current network"""
         if self.network == "base":
@@ -56,7 +104,7 @@ class TransactionHistory:
             }
         else:  # ethereum
             return {
-                "USDC": "0xA0b86a33E6441E6C673C5C9C7C4b4c4b4b4b4b4b",
+                "USDC": "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48",
                 "USDT": "0xdAC17F958D2ee523a2206206994597C13D831ec7",
                 "WETH": "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2",
             }
@@ -101,6 +149,171 @@ class TransactionHistory:
             print(f"Error fetching transaction history: {e}")
             return []
 
+    def iter_transactions(self, address: str, page_size: int = 1000) -> Iterator[Dict]:
+        """Stream the full history oldest first, one API page in memory at a time"""
+        eth_txs = self._iter_parsed_pages(
+            "txlist", address, page_size, self._parse_eth_transactions
+        )
+        token_txs = self._iter_parsed_pages(
+            "tokentx", address, page_size, self._parse_token_transactions
+        )
+        # Both streams are already in block order, so merge instead of sorting
+        return heapq.merge(eth_txs, token_txs, key=lambda tx: tx["timestamp"])
+
+    def _iter_parsed_pages(
+        self, action: str, address: str, page_size: int, parse
+    ) -> Iterator[Dict]:
+        """Parse each raw page as it arrives"""
+        for page in self._iter_raw_pages(action, address, page_size):
+            yield from parse(page, address)
+
+    def _iter_raw_pages(
+        self, action: str, address: str, page_size: int
+    ) -> Iterator[List[Dict]]:
+        """Walk an Etherscan account list by block range, ascending
+
+        Etherscan caps page * offset, so instead of paging deeper each request
+        restarts at the last block seen. The finalized part of the history is
+        fetched as closed ranges so those pages are cached permanently. Once
+        records have been yielded, a failed request raises instead of cutting
+        the history short.
+        """
+        chain_id = self.etherscan_v2_chains.get(self.network)
+        if not chain_id or not self.etherscan_api_key:
+            return
+
+        # Split where the cache does, so finalized pages keep their keys
+        finalized_block = self._get_finalized_block()
+        end_blocks = [OPEN_END_BLOCK]
+        if finalized_block and finalized_block >= SPLIT_BLOCKS:
+            end_blocks.insert(0, finalized_block - finalized_block % SPLIT_BLOCKS)
+
+        cursor = 0
+        yielded = False
+        for end_block in end_blocks:
+            seen_in_cursor_block = set()
+
+            while cursor <= end_block:
+                try:
+                    results = self._get_raw_page(
+                        chain_id, action, address, cursor, end_block, 1, page_size
+                    )
+                except RuntimeError as e:
+                    if yielded:
+                        raise
+                    print(f"DEBUG: {e}")
+                    return
+                if not results:
+                    break
+
+                page = [
+                    tx
+                    for tx in results
+                    if self._record_key(tx) not in seen_in_cursor_block
+                ]
+                if page:
+                    yield page
+                    yielded = True
+
+                if len(results) < page_size:
+                    break
+
+                last_block = int(results[-1]["blockNumber"])
+                if not page:
+                    # A single block holds more than a full page; page within it
+                    yield from self._iter_block_pages(
+                        chain_id,
+                        action,
+                        address,
+                        last_block,
+                        page_size,
+                        seen_in_cursor_block,
+                    )
+                    cursor = last_block + 1
+                    seen_in_cursor_block = set()
+                    continue
+
+                # Restart at the last block and drop the records already yielded
+                if last_block != cursor:
+                    seen_in_cursor_block = set()
+                cursor = last_block
+                seen_in_cursor_block.update(
+                    self._record_key(tx)
+                    for tx in results
+                    if int(tx["blockNumber"]) == last_block
+                )
+
+            cursor = max(cursor, end_block + 1)
+
+    def _iter_block_pages(
+        self,
+        chain_id: int,
+        action: str,
+        address: str,
+        block: int,
+        page_size: int,
+        seen: set,
+    ) -> Iterator[List[Dict]]:
+        """Page through one block's records, skipping those already yielded"""
+        page_number = 1
+        while True:
+            if page_number * page_size > MAX_RESULT_WINDOW:
+                raise RuntimeError(
+                    f"Block {block} has more than {MAX_RESULT_WINDOW} {action} records"
+                )
+            results = self._get_raw_page(
+                chain_id, action, address, block, block, page_number, page_size
+            )
+            page = [tx for tx in results if self._record_key(tx) not in seen]
+            if page:
+                yield page
+            if len(results) < page_size:
+                return
+            page_number += 1
+
+    def _get_raw_page(
+        self,
+        chain_id: int,
+        action: str,
+        address: str,
+        start_block: int,
+        end_block: int,
+        page_number: int,
+        page_size: int,
+    ) -> List[Dict]:
+        """One page of an account list; [] when there is none, raises on errors"""
+        params = {
+            "chainid": chain_id,
+            "module": "account",
+            "action": action,
+            "address": address,
+            "startblock": start_block,
+            "endblock": end_block,
+            "page": page_number,
+            "offset": page_size,
+            "sort": "asc",
+            "apikey": self.etherscan_api_key,
+        }
+        try:
+            response = self.etherscan.get(
+                self.etherscan_v2_url, params=params, timeout=10
+            )
+            data = response.json() if response.status_code == 200 else {}
+        except Exception as e:
+            raise RuntimeError(f"Etherscan page request failed: {e}")
+
+        if data.get("status") != "1":
+            if data.get("message") == "No transactions found":
+                return []
+            error_msg = data.get("message", "Unknown error")
+            raise RuntimeError(f"Etherscan V2 API error for {action}: {error_msg}")
+        return data.get("result", [])
+
+    @staticmethod
+    def _record_key(tx: Dict) -> tuple:
+        """Identify a raw record; token transfers share a hash within one tx"""
+        return (tx.get("hash"), tx.get("logIndex"), tx.get("contractAddress"))
+
     def _get_eth_transactions(self, address: str, limit: int) -> List[Dict]:
         """Get ETH transactions from Etherscan API V2"""
         try:
@@ -127,7 +340,9 @@ class TransactionHistory:
                 "apikey": self.etherscan_api_key,
             }
 
-            response = requests.get(self.etherscan_v2_url, params=params, timeout=10)
+            response = self.etherscan.get(
+                self.etherscan_v2_url, params=params, timeout=10
+            )
 
             if response.status_code == 200:
                 data = response.json()
@@ -181,7 +396,9 @@ class TransactionHistory:
                 "apikey": self.etherscan_api_key,
             }
 
-            response = requests.get(self.etherscan_v2_url, params=params, timeout=10)
+            response = self.etherscan.get(
+                self.etherscan_v2_url, params=params, timeout=10
+            )
 
             if response.status_code == 200:
                 data = response.json()
@@ -345,6 +562,7 @@ class TransactionHistory:
             total_sent = 0
             total_received = 0
             total_gas_spent = 0
+            total_gas_native = 0
 
             for tx in transactions:
                 # Recalculate USD value using fetched prices
@@ -359,6 +577,7 @@ class TransactionHistory:
 
                 # Calculate gas cost in USD (approximate)
                 gas_cost_native = (tx["gas_used"] * tx["gas_price"]) / 10**9
+                total_gas_native += gas_cost_native
                 native_price = token_prices.get(self.network_config.native_token)
                 if native_price:
                     total_gas_spent += gas_cost_native * native_price
@@ -368,6 +587,8 @@ class TransactionHistory:
                 "total_sent_usd": total_sent,
                 "total_received_usd": total_received,
                 "total_gas_spent_usd": total_gas_spent,
+                "total_gas_spent_native": total_gas_native,
+                "native_token": self.network_config.native_token,
                 "net_flow_usd": total_received - total_sent,
             }
 
@@ -377,6 +598,8 @@ class TransactionHistory:
                 "total_sent_usd": 0,
                 "total_received_usd": 0,
                 "total_gas_spent_usd": 0,
+                "total_gas_spent_native": 0,
+                "native_token": self.network_config.native_token,
                 "net_flow_usd": 0,
             }
 
@@ -521,11 +744,25 @@ class TransactionHistory:
 
     def discover_user_tokens(self, address: str) -> Dict[str, str]:
         """Discover tokens from user's transaction history"""
+        activity = self.discover_token_activity(address)
+        tokens: Dict[str, str] = {}
+        for info in activity.values():
+            tokens.setdefault(info["symbol"], info["address"])
+        return tokens
+
+    def discover_token_activity(
+        self, address: str, start_block: int = 0
+    ) -> Dict[str, Dict]:
+        """Discover tokens seen since start_block, keyed by lowercase contract address
+
+        Spam airdrops reuse real symbols, so two contracts named "USDC" are kept
+        apart, each with its symbol and the last block it was seen in.
+        """
         try:
             discovered = {}
 
             # Try to get raw token transaction data from API first
-            raw_token_data = self._get_raw_token_transactions(address, 100)
+            raw_token_data = self._get_raw_token_transactions(address, 100, start_block)
 
             for tx in raw_token_data:
                 try:
@@ -542,19 +779,39 @@ class TransactionHistory:
                     ):
                         continue
 
-                    # Skip if already discovered
-                    if token_symbol in discovered:
+                    block_number = int(tx.get("blockNumber", 0))
+                    is_outgoing = tx.get("from", "").lower() == address.lower()
+
+                    # Results are newest first, so keep the first sighting
+                    key = token_address.lower()
+                    if key in discovered:
+                        discovered[key]["sent"] |= is_outgoing
                         continue
 
                     # Add to discovered tokens
-                    discovered[token_symbol] = token_address
+                    discovered[key] = {
+                        "symbol": token_symbol,
+                        "address": token_address,
+                        "last_seen_block": block_number,
+                        "sent": is_outgoing,
+                    }
 
                 except Exception:
                     continue
 
-            # If no tokens discovered via raw API (e.g., Base networks), try fallback
+            # If no tokens discovered via raw API (e.g., Base networks), try fallback.
+            # Its entries never advance last_block, so it runs on every refresh
             if not discovered:
-                discovered = self._discover_tokens_from_parsed_history(address)
+                fallback = self._discover_tokens_from_parsed_history(address)
+                discovered = {
+                    token_address.lower(): {
+                        "symbol": symbol,
+                        "address": token_address,
+                        "last_seen_block": 0,
+                        "sent": False,
+                    }
+                    for symbol, token_address in fallback.items()
+                }
 
             return discovered
 
@@ -595,7 +852,9 @@ class TransactionHistory:
         except Exception:
             return {}
 
-    def _get_raw_token_transactions(self, address: str, limit: int) -> List[Dict]:
+    def _get_raw_token_transactions(
+        self, address: str, limit: int, start_block: int = 0
+    ) -> List[Dict]:
         """Get raw token transaction data from API for token discovery with retry logic"""
         try:
             # Use Etherscan V2 for all supported networks
@@ -608,7 +867,7 @@ class TransactionHistory:
                 "module": "account",
                 "action": "tokentx",
                 "address": address,
-                "startblock": 0,
+                "startblock": start_block,
                 "endblock": 99999999,
                 "page": 1,
                 "offset": limit,
@@ -621,7 +880,7 @@ class TransactionHistory:
 
             for attempt in range(max_retries):
                 try:
-                    response = requests.get(
+                    response = self.etherscan.get(
                         self.etherscan_v2_url, params=params, timeout=10
                     )
 
@@ -629,6 +888,9 @@ class TransactionHistory:
                         data = response.json()
                         if data.get("status") == "1":
                             return data.get("result", [])
+                        elif data.get("message") == "No transactions found":
+                            # Nothing new in range - not worth a retry
+                            return []
                         elif attempt < max_retries - 1:
                             # If NOTOK and we have retries left, try again
                             import time
@@ -644,3 +906,56 @@ class TransactionHistory:
 
         except Exception:
             return []
+
+
+def fetch_all_networks(
+    fn: Callable, networks: Optional[List[str]] = None
+) -> Tuple[Dict, Dict[str, str]]:
+    """Run fn(TransactionHistory) for every mainnet network concurrently
+
+    Returns (results, errors), both keyed by network. Failures are collected
+    rather than printed so the caller can report them after its output.
+    """
+    networks = networks or MAINNET_NETWORKS
+    results, errors = {}, {}
+
+    def run(network: str):
+        return fn(TransactionHistory(network))
+
+    with ThreadPoolExecutor(max_workers=len(networks)) as executor:
+        futures = {executor.submit(run, network): network for network in networks}
+        for future in as_completed(futures):
+            network = futures[future]
+            try:
+                results[network] = future.result()
+            except Exception as e:
+                errors[network] = str(e)
+
+    # Keep network order regardless of completion order
+    ordered = {network: results[network] for network in networks if network in results}
+    return ordered, errors
+
+
+def merge_transaction_histories(
+    histories: Iterable[List[Dict]], limit: Optional[int] = None
+) -> List[Dict]:
+    """K-way merge per-network histories that are already sorted newest first"""
+    merged = heapq.merge(*histories, key=lambda tx: tx["timestamp"], reverse=True)
+    return list(islice(merged, limit))
+
+
+def aggregate_summaries(summaries: Dict[str, Dict]) -> Dict:
+    """Combine per-network summaries; gas is already priced in each chain's native token"""
+    totals = {
+        "total_transactions": 0,
+        "total_sent_usd": 0,
+        "total_received_usd": 0,
+        "total_gas_spent_usd": 0,
+        "net_flow_usd": 0,
+    }
+    for stats in summaries.values():
+        for key in totals:
+            totals[key] += stats.get(key, 0)
+
+    totals["networks"] = summaries
+    return totals
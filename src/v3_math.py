@@ -0,0 +1,332 @@
+"""Uniswap V3 swap math, ported from the core contracts for local quoting
+
+Integer arithmetic mirrors TickMath, SqrtPriceMath and SwapMath exactly, so a
+pool snapshot quotes the same amounts QuoterV2 would without an eth_call.
+"""
+
+import bisect
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+
+MIN_TICK = -887272
+MAX_TICK = 887272
+MIN_SQRT_RATIO = 4295128739
+MAX_SQRT_RATIO = 1461446703485210103287273052203988822378723970342
+
+Q96 = 1 << 96
+UINT256_MAX = (1 << 256) - 1
+FEE_DENOMINATOR = 1_000_000
+
+# TickMath.getSqrtRatioAtTick multipliers for each bit of |tick|
+_TICK_RATIOS = [
+    (0x2, 0xFFF97272373D413259A46990580E213A),
+    (0x4, 0xFFF2E50F5F656932EF12357CF3C7FDCC),
+    (0x8, 0xFFE5CACA7E10E4E61C3624EAA0941CD0),
+    (0x10, 0xFFCB9843D60F6159C9DB58835C926644),
+    (0x20, 0xFF973B41FA98C081472E6896DFB254C0),
+    (0x40, 0xFF2EA16466C96A3843EC78B326B52861),
+    (0x80, 0xFE5DEE046A99A2A811C461F1969C3053),
+    (0x100, 0xFCBE86C7900A88AEDCFFC83B479AA3A4),
+    (0x200, 0xF987A7253AC413176F2B074CF7815E54),
+    (0x400, 0xF3392B0822B70005940C7A398E4B70F3),
+    (0x800, 0xE7159475A2C29B7443B29C7FA6E889D9),
+    (0x1000, 0xD097F3BDFD2022B8845AD8F792AA5825),
+    (0x2000, 0xA9F746462D870FDF8A65DC1F90E061E5),
+    (0x4000, 0x70D869A156D2A1B890BB3DF62BAF32F7),
+    (0x8000, 0x31BE135F97D08FD981231505542FCFA6),
+    (0x10000, 0x9AA508B5B7A84E1C677DE54F3E99BC9),
+    (0x20000, 0x5D6AF8DEDB81196699C329225EE604),
+    (0x40000, 0x2216E584F5FA1EA926041BEDFE98),
+    (0x80000, 0x48A170391F7DC42444E8FA2),
+]
+
+
+def _div_rounding_up(a: int, b: int) -> int:
+    return -(-a // b)
+
+
+def _mul_div_rounding_up(a: int, b: int, denominator: int) -> int:
+    return -(-a * b // denominator)
+
+
+def get_sqrt_ratio_at_tick(tick: int) -> int:
+    """sqrt(1.0001^tick) as a Q64.96"""
+    abs_tick = abs(tick)
+    if abs_tick > MAX_TICK:
+        raise ValueError(f"Tick {tick} out of range")
+
+    ratio = (
+        0xFFFCB933BD6FAD37AA2D162D1A594001
+        if abs_tick & 0x1
+        else 0x100000000000000000000000000000000
+    )
+    for bit, multiplier in _TICK_RATIOS:
+        if abs_tick & bit:
+            ratio = (ratio * multiplier) >> 128
+
+    if tick > 0:
+        ratio = UINT256_MAX // ratio
+
+    # Round up so getTickAtSqrtRatio of the result is consistent
+    return (ratio >> 32) + (0 if ratio % (1 << 32) == 0 else 1)
+
+
+def get_tick_at_sqrt_ratio(sqrt_price_x96: int) -> int:
+    """Greatest tick whose sqrt ratio is <= the given price"""
+    if not MIN_SQRT_RATIO <= sqrt_price_x96 < MAX_SQRT_RATIO:
+        raise ValueError("Sqrt price out of range")
+
+    # A float estimate is within a tick or two; settle it with exact math
+    estimate = math.log((sqrt_price_x96 / Q96) ** 2) / math.log(1.0001)
+    tick = max(MIN_TICK, min(MAX_TICK, math.floor(estimate)))
+    while tick > MIN_TICK and get_sqrt_ratio_at_tick(tick) > sqrt_price_x96:
+        tick -= 1
+    while tick < MAX_TICK and get_sqrt_ratio_at_tick(tick + 1) <= sqrt_price_x96:
+        tick += 1
+    return tick
+
+
+def get_amount0_delta(sqrt_a: int, sqrt_b: int, liquidity: int, round_up: bool) -> int:
+    """Token0 needed to move between two prices at constant liquidity"""
+    if sqrt_a > sqrt_b:
+        sqrt_a, sqrt_b = sqrt_b, sqrt_a
+    numerator1 = liquidity << 96
+    numerator2 = sqrt_b - sqrt_a
+    if round_up:
+        return _div_rounding_up(
+            _mul_div_rounding_up(numerator1, numerator2, sqrt_b), sqrt_a
+        )
+    return (numerator1 * numerator2 // sqrt_b) // sqrt_a
+
+
+def get_amount1_delta(sqrt_a: int, sqrt_b: int, liquidity: int, round_up: bool) -> int:
+    """Token1 needed to move between two prices at constant liquidity"""
+    if sqrt_a > sqrt_b:
+        sqrt_a, sqrt_b = sqrt_b, sqrt_a
+    if round_up:
+        return _mul_div_rounding_up(liquidity, sqrt_b - sqrt_a, Q96)
+    return liquidity * (sqrt_b - sqrt_a) // Q96
+
+
+def get_next_sqrt_price_from_input(
+    sqrt_price: int, liquidity: int, amount_in: int, zero_for_one: bool
+) -> int:
+    """Price after adding amount_in of the input token"""
+    if amount_in == 0:
+        return sqrt_price
+
+    if zero_for_one:
+        numerator1 = liquidity << 96
+        product = amount_in * sqrt_price
+        denominator = numerator1 + product
+        if product <= UINT256_MAX and denominator <= UINT256_MAX:
+            return _mul_div_rounding_up(numerator1, sqrt_price, denominator)
+        return _div_rounding_up(numerator1, numerator1 // sqrt_price + amount_in)
+
+    return sqrt_price + (amount_in << 96) // liquidity
+
+
+def compute_swap_step(
+    sqrt_current: int,
+    sqrt_target: int,
+    liquidity: int,
+    amount_remaining: int,
+    fee_pips: int,
+) -> Tuple[int, int, int, int]:
+    """One exact-input step: (next price, amount in, amount out, fee amount)"""
+    zero_for_one = sqrt_current >= sqrt_target
+    remaining_less_fee = (
+        amount_remaining * (FEE_DENOMINATOR - fee_pips) // FEE_DENOMINATOR
+    )
+
+    if zero_for_one:
+        amount_in = get_amount0_delta(sqrt_target, sqrt_current, liquidity, True)
+    else:
+        amount_in = get_amount1_delta(sqrt_current, sqrt_target, liquidity, True)
+
+    if remaining_less_fee >= amount_in:
+        sqrt_next = sqrt_target
+    else:
+        sqrt_next = get_next_sqrt_price_from_input(
+            sqrt_current, liquidity, remaining_less_fee, zero_for_one
+        )
+
+    reached_target = sqrt_next == sqrt_target
+    if zero_for_one:
+        if not reached_target:
+            amount_in = get_amount0_delta(sqrt_next, sqrt_current, liquidity, True)
+        amount_out = get_amount1_delta(sqrt_next, sqrt_current, liquidity, False)
+    else:
+        if not reached_target:
+            amount_in = get_amount1_delta(sqrt_current, sqrt_next, liquidity, True)
+        amount_out = get_amount0_delta(sqrt_current, sqrt_next, liquidity, False)
+
+    if not reached_target:
+        # Whatever wasn't swapped is taken as fee
+        fee_amount = amount_remaining - amount_in
+    else:
+        fee_amount = _mul_div_rounding_up(
+            amount_in, fee_pips, FEE_DENOMINATOR - fee_pips
+        )
+
+    return sqrt_next, amount_in, amount_out, fee_amount
+
+
+class InsufficientTickData(Exception):
+    """The swap would cross ticks outside the snapshot's tick bitmap words"""
+
+
+class V3Pool:
+    """Snapshot of one pool's state that can be quoted locally"""
+
+    def __init__(
+        self,
+        token0: str,
+        token1: str,
+        fee: int,
+        tick_spacing: int,
+        sqrt_price_x96: int,
+        tick: int,
+        liquidity: int,
+        ticks: Dict[int, int],
+        word_range: Tuple[int, int],
+    ):
+        self.token0 = token0
+        self.token1 = token1
+        self.fee = fee
+        self.tick_spacing = tick_spacing
+        self.sqrt_price_x96 = sqrt_price_x96
+        self.tick = tick
+        self.liquidity = liquidity
+        self.ticks = dict(ticks)  # Initialized tick -> liquidityNet
+        self.word_range = word_range  # Inclusive tick bitmap words covered
+        self._sorted_ticks = sorted(self.ticks)
+
+    def to_dict(self) -> Dict:
+        return {
+            "token0": self.token0,
+            "token1": self.token1,
+            "fee": self.fee,
+            "tick_spacing": self.tick_spacing,
+            "sqrt_price_x96": str(self.sqrt_price_x96),
+            "tick": self.tick,
+            "liquidity": str(self.liquidity),
+            "ticks": {str(tick): str(net) for tick, net in self.ticks.items()},
+            "word_range": list(self.word_range),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "V3Pool":
+        return cls(
+            data["token0"],
+            data["token1"],
+            data["fee"],
+            data["tick_spacing"],
+            int(data["sqrt_price_x96"]),
+            data["tick"],
+            int(data["liquidity"]),
+            {int(tick): int(net) for tick, net in data["ticks"].items()},
+            tuple(data["word_range"]),
+        )
+
+    def covers_tick(self, tick: int) -> bool:
+        """Whether the tick's bitmap word was read into the snapshot"""
+        word = (tick // self.tick_spacing) >> 8
+        return self.word_range[0] <= word <= self.word_range[1]
+
+    def set_tick(self, tick: int, liquidity_net: int):
+        """Update one tick's liquidityNet, removing it when it nets to zero"""
+        if liquidity_net:
+            self.ticks[tick] = liquidity_net
+        else:
+            self.ticks.pop(tick, None)
+        self._sorted_ticks = sorted(self.ticks)
+
+    def _next_initialized_tick(self, tick: int, lte: bool) -> Tuple[int, bool]:
+        """TickBitmap.nextInitializedTickWithinOneWord over the snapshot"""
+        compressed = tick // self.tick_spacing
+        if not lte:
+            compressed += 1
+        word = compressed >> 8
+
+        if lte:
+            word_edge = (word << 8) * self.tick_spacing
+            index = bisect.bisect_right(
+                self._sorted_ticks, compressed * self.tick_spacing
+            )
+            if index > 0 and self._sorted_ticks[index - 1] >= word_edge:
+                return self._sorted_ticks[index - 1], True
+        else:
+            word_edge = ((word << 8) + 255) * self.tick_spacing
+            index = bisect.bisect_left(
+                self._sorted_ticks, compressed * self.tick_spacing
+            )
+            if (
+                index < len(self._sorted_ticks)
+                and self._sorted_ticks[index] <= word_edge
+            ):
+                return self._sorted_ticks[index], True
+
+        # An empty word only means "no ticks" if the snapshot actually read it
+        if not self.word_range[0] <= word <= self.word_range[1]:
+            raise InsufficientTickData(f"Tick bitmap word {word} not in snapshot")
+        return word_edge, False
+
+    def quote(self, amount_in: int, zero_for_one: bool) -> int:
+        """Exact-input swap output, as QuoterV2.quoteExactInputSingle returns it"""
+        return self._swap(amount_in, zero_for_one)[0]
+
+    def swap(self, amount_in: int, zero_for_one: bool) -> int:
+        """Exact-input swap that moves the pool's price, tick and liquidity"""
+        amount_out, self.sqrt_price_x96, self.tick, self.liquidity = self._swap(
+            amount_in, zero_for_one
+        )
+        return amount_out
+
+    def _swap(self, amount_in: int, zero_for_one: bool) -> Tuple[int, int, int, int]:
+        """Walk the swap loop; returns (amount_out, sqrt price, tick, liquidity)"""
+        if amount_in <= 0:
+            return 0, self.sqrt_price_x96, self.tick, self.liquidity
+
+        limit = MIN_SQRT_RATIO + 1 if zero_for_one else MAX_SQRT_RATIO - 1
+        sqrt_price, tick, liquidity = self.sqrt_price_x96, self.tick, self.liquidity
+        remaining, amount_out = amount_in, 0
+
+        while remaining > 0 and sqrt_price != limit:
+            tick_next, initialized = self._next_initialized_tick(tick, zero_for_one)
+            tick_next = max(MIN_TICK, min(MAX_TICK, tick_next))
+            sqrt_price_next = get_sqrt_ratio_at_tick(tick_next)
+
+            if zero_for_one:
+                target = max(sqrt_price_next, limit)
+            else:
+                target = min(sqrt_price_next, limit)
+
+            step_start = sqrt_price
+            sqrt_price, step_in, step_out, fee_amount = compute_swap_step(
+                sqrt_price, target, liquidity, remaining, self.fee
+            )
+            remaining -= step_in + fee_amount
+            amount_out += step_out
+
+            if sqrt_price == sqrt_price_next:
+                if initialized:
+                    liquidity_net = self.ticks[tick_next]
+                    liquidity += -liquidity_net if zero_for_one else liquidity_net
+                tick = tick_next - 1 if zero_for_one else tick_next
+            elif sqrt_price != step_start:
+                tick = get_tick_at_sqrt_ratio(sqrt_price)
+
+        return amount_out, sqrt_price, tick, liquidity
+
+    def quote_many(self, amounts: Sequence[int], zero_for_one: bool) -> List[int]:
+        """Quote several input sizes against the same snapshot"""
+        return [self.quote(amount, zero_for_one) for amount in amounts]
+
+    def quote_token(self, token_in: str, amount_in: int) -> Optional[int]:
+        """Quote by input token address; None if the token isn't in this pool"""
+        if token_in.lower() == self.token0.lower():
+            return self.quote(amount_in, True)
+        if token_in.lower() == self.token1.lower():
+            return self.quote(amount_in, False)
+        return None
@@ -1,19 +1,34 @@
 import os
+from typing import Dict
 from web3 import Web3
 from web3.middleware import geth_poa_middleware
-from dotenv import load_dotenv
-from .config import NETWORKS
+from .config import BACKEND, NETWORKS, load_env
+from .rpc import batch_request
+from .simulation import preflight
 
-load_dotenv()
+load_env()  # No-op once config has loaded .env
+
+DECIMALS_SELECTOR = "0x313ce567"  # decimals()
+BALANCE_OF_SELECTOR = "0x70a08231"  # balanceOf(address)
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+# Token address -> decimals, read once per process
+_token_decimals = {}
 
 
 class Wallet:
     def __init__(self, network: str = "base"):
         self.network_config = NETWORKS[network]
-        self.w3 = Web3(Web3.HTTPProvider(self.network_config.rpc_url))
-        self.w3.middleware_onion.inject(geth_poa_middleware, layer=0)
-
         private_key = os.getenv("PRIVATE_KEY")
+        if BACKEND == "local":
+            from .local_chain import LOCAL_DEV_KEY, get_local_web3
+
+            self.w3 = get_local_web3(network)
+            private_key = private_key or LOCAL_DEV_KEY
+        else:
+            self.w3 = Web3(Web3.HTTPProvider(self.network_config.rpc_url))
+            self.w3.middleware_onion.inject(geth_poa_middleware, layer=0)
+
         if not private_key:
             raise ValueError("PRIVATE_KEY not found in environment")
 
@@ -22,30 +37,122 @@ class Wallet:
 
     def get_balance(self, token_address: str = None) -> float:
         """Get ETH balance or ERC20 token balance"""
-        if (
-            not token_address
-            or token_address == "0x0000000000000000000000000000000000000000"
-        ):
+        if not token_address or token_address == ZERO_ADDRESS:
             # Native ETH balance
             balance_wei = self.w3.eth.get_balance(self.address)
             return self.w3.from_wei(balance_wei, "ether")
         else:
             # ERC20 token balance
             try:
-                # ERC20 balanceOf function signature
-                balance_data = self.w3.eth.call(
-                    {
-                        "to": token_address,
-                        "data": "0x70a08231" + self.address[2:].zfill(64),
-                    }
-                )
-                balance = int(balance_data.hex(), 16)
-                # Most tokens use 6 decimals (USDC) or 18 decimals
-                decimals = 6 if "usdc" in token_address.lower() else 18
+                # balanceOf, plus decimals() the first time a token is seen
+                calls = [
+                    (
+                        "eth_call",
+                        [
+                            {
+                                "to": token_address,
+                                "data": BALANCE_OF_SELECTOR
+                                + self.address[2:].zfill(64),
+                            },
+                            "latest",
+                        ],
+                    )
+                ]
+                decimals = _token_decimals.get(token_address.lower())
+                if decimals is None:
+                    calls.append(
+                        (
+                            "eth_call",
+                            [
+                                {"to": token_address, "data": DECIMALS_SELECTOR},
+                                "latest",
+                            ],
+                        )
+                    )
+                results = batch_request(self.w3, calls)
+                balance = int(results[0], 16)
+                if decimals is None:
+                    # Tokens without decimals() are treated as 18
+                    decimals = (
+                        int(results[1], 16) if results[1] not in (None, "0x") else 18
+                    )
+                    _token_decimals[token_address.lower()] = decimals
                 return balance / (10**decimals)
             except Exception:
                 return 0.0
 
+    def get_balances(
+        self, tokens: Dict[str, str], timeout: int = 10
+    ) -> Dict[str, float]:
+        """Balances for {symbol: token address} in one batched request
+
+        The zero address is the native token. Unlike get_balance this raises
+        when the request itself fails, so a dead RPC isn't shown as zero.
+        """
+        calls = []
+        slots = []  # (symbol, token address or None for native, reads decimals)
+        for symbol, token_address in tokens.items():
+            if not token_address or token_address == ZERO_ADDRESS:
+                calls.append(("eth_getBalance", [self.address, "latest"]))
+                slots.append((symbol, None, False))
+                continue
+            calls.append(
+                (
+                    "eth_call",
+                    [
+                        {
+                            "to": token_address,
+                            "data": BALANCE_OF_SELECTOR + self.address[2:].zfill(64),
+                        },
+                        "latest",
+                    ],
+                )
+            )
+            reads_decimals = token_address.lower() not in _token_decimals
+            if reads_decimals:
+                calls.append(
+                    (
+                        "eth_call",
+                        [{"to": token_address, "data": DECIMALS_SELECTOR}, "latest"],
+                    )
+                )
+            slots.append((symbol, token_address, reads_decimals))
+
+        results = iter(batch_request(self.w3, calls, timeout))
+        balances = {}
+        for symbol, token_address, reads_decimals in slots:
+            raw = next(results)
+            if token_address is None:
+                decimals = 18
+            elif reads_decimals:
+                # Tokens without decimals() are treated as 18
+                result = next(results)
+                decimals = int(result, 16) if result not in (None, "0x") else 18
+                _token_decimals[token_address.lower()] = decimals
+            else:
+                decimals = _token_decimals[token_address.lower()]
+            balances[symbol] = (
+                int(raw, 16) / (10**decimals) if raw not in (None, "0x") else 0.0
+            )
+        return balances
+
+    def get_token_decimals(self, token_address: str) -> int:
+        """ERC20 decimals(), cached per token (18 if the token has none)"""
+        decimals = _token_decimals.get(token_address.lower())
+        if decimals is None:
+            result = batch_request(
+                self.w3,
+                [
+                    (
+                        "eth_call",
+                        [{"to": token_address, "data": DECIMALS_SELECTOR}, "latest"],
+                    )
+                ],
+            )[0]
+            decimals = int(result, 16) if result not in (None, "0x") else 18
+            _token_decimals[token_address.lower()] = decimals
+        return decimals
+
     def is_connected(self) -> bool:
         """Check if connected to network"""
         try:
@@ -75,6 +182,10 @@ class Wallet:
                 "nonce": self.w3.eth.get_transaction_count(self.address, "pending"),
             }
 
+            transaction = preflight(self.w3, transaction, "Transfer")
+            if not transaction:
+                return None
+
             # Sign and send transaction
             signed_tx = self.w3.eth.account.sign_transaction(
                 transaction, self.account.key
@@ -107,9 +218,7 @@ class Wallet:
                 }
             ]
 
-            # Get token decimals (assume 6 for USDC, 18 for others)
-            decimals = 6 if "usdc" in token_address.lower() else 18
-            amount_wei = int(amount * 10**decimals)
+            amount_wei = int(amount * 10 ** self.get_token_decimals(token_address))
 
             # Create contract instance
             token_contract = self.w3.eth.contract(address=token_address, abi=erc20_abi)
@@ -126,6 +235,10 @@ class Wallet:
                 }
             )
 
+            transaction = preflight(self.w3, transaction, "Transfer")
+            if not transaction:
+                return None
+
             # Sign and send transaction
             signed_tx = self.w3.eth.account.sign_transaction(
                 transaction, self.account.key
@@ -0,0 +1,67 @@
+"""Tests for the allowance cache"""
+
+from unittest.mock import Mock, patch
+from src.allowance import MAX_UINT256, AllowanceManager
+
+OWNER = "0x1111111111111111111111111111111111111111"
+ROUTER = "0x2626664c2603336E57B271c5C0b26F421741e481"
+USDC = "0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913"
+DEGEN = "0x4ed4E862860beD51a9570b96d89aF5E1B0Efefed"
+
+
+def _manager(tmp_path):
+    return AllowanceManager(Mock(), OWNER, "base", path=str(tmp_path / "a.json"))
+
+
+def test_allowances_read_in_one_batch_then_cached(tmp_path):
+    """Test unknown tokens are read together and not re-read while fresh"""
+    manager = _manager(tmp_path)
+    with patch(
+        "src.allowance.batch_request", return_value=[hex(5_000_000), hex(0)]
+    ) as batch:
+        assert manager.get_allowances([USDC, DEGEN], ROUTER) == {
+            USDC: 5_000_000,
+            DEGEN: 0,
+        }
+        assert manager.has_allowance(USDC, ROUTER, 5_000_000)
+        assert not manager.has_allowance(DEGEN, ROUTER, 1)
+
+    assert batch.call_count == 1
+    call = batch.call_args[0][1][0]
+    assert call[0] == "eth_call"
+    assert call[1][0]["data"].startswith("0xdd62ed3e")
+    assert OWNER[2:].lower() in call[1][0]["data"]
+
+
+def test_spend_decrements_except_unlimited(tmp_path):
+    """Test swaps use up exact approvals but not unlimited ones"""
+    manager = _manager(tmp_path)
+    manager.record_approval(USDC, ROUTER, 3_000_000)
+    manager.record_approval(DEGEN, ROUTER, MAX_UINT256)
+
+    manager.spend(USDC, ROUTER, 2_000_000)
+    manager.spend(DEGEN, ROUTER, 10**24)
+
+    with patch("src.allowance.batch_request") as batch:
+        assert not manager.has_allowance(USDC, ROUTER, 2_000_000)
+        assert manager.has_allowance(USDC, ROUTER, 1_000_000)
+        assert manager.has_allowance(DEGEN, ROUTER, 10**30)
+    batch.assert_not_called()
+
+    # The cache survives a restart
+    assert _manager(tmp_path).get_allowances([USDC], ROUTER) == {USDC: 1_000_000}
+
+
+def test_processes_see_and_keep_each_others_allowances(tmp_path):
+    """Test a long-lived manager never writes back a stale allowance"""
+    cli, daemon = _manager(tmp_path), _manager(tmp_path)
+    daemon.record_approval(USDC, ROUTER, 3_000_000)
+    cli.record_approval(DEGEN, ROUTER, MAX_UINT256)
+    daemon.spend(USDC, ROUTER, 1_000_000)
+
+    with patch("src.allowance.batch_request") as batch:
+        assert cli.get_allowances([USDC, DEGEN], ROUTER) == {
+            USDC: 2_000_000,
+            DEGEN: MAX_UINT256,
+        }
+    batch.assert_not_called()
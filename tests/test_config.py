@@ -19,3 +19,22 @@ def test_base_tokens():
     assert "ETH" in BASE_TOKENS
     assert "USDC" in BASE_TOKENS
     assert BASE_TOKENS["ETH"] == "0x0000000000000000000000000000000000000000"
+
+
+def test_local_backend_data_dir_is_removed_at_exit():
+    """Test each local-backend run cleans up its temporary data directory"""
+    import os
+    import subprocess
+    import sys
+
+    env = {**os.environ, "TERMINALSWAP_BACKEND": "local"}
+    data_dir = subprocess.run(
+        [sys.executable, "-c", "from src.config import DATA_DIR; print(DATA_DIR)"],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.strip()
+
+    assert "terminalswap-local-" in data_dir
+    assert not os.path.exists(data_dir)
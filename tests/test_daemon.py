@@ -0,0 +1,74 @@
+"""Tests for the background daemon"""
+
+import threading
+from unittest.mock import Mock
+from src.daemon import Daemon, can_serve, request, run_remote
+
+
+def _start(tmp_path, runner):
+    path = str(tmp_path / "daemon.sock")
+    daemon = Daemon(runner, path)
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+    for _ in range(100):
+        if request({"op": "status"}, path):
+            break
+        thread.join(0.02)
+    return daemon, thread, path
+
+
+def test_only_read_only_commands_are_served():
+    """Test commands that sign or prompt always run in-process"""
+    assert can_serve(["balance", "--all"])
+    assert can_serve(["swap", "1", "ETH", "to", "USDC", "--preview"])
+    assert can_serve(["swap", "1", "ETH", "to", "USDC", "--ladder", "auto"])
+    assert not can_serve(["swap", "1", "ETH", "to", "USDC"])
+    assert not can_serve(["send", "1", "ETH", "to", "0xabc", "--preview"])
+    assert not can_serve(["history", "--export", "out.csv"])
+    assert not can_serve(["balance", "--help"])
+    assert can_serve(["--output", "jsonl", "balance"])
+    assert not can_serve(["--output", "json", "swap", "1", "ETH", "to", "USDC"])
+    assert not can_serve(["--help"])
+    assert not can_serve([])
+
+
+def test_commands_run_in_the_daemon(tmp_path, capsys):
+    """Test the client prints the daemon's output and exit code"""
+    runner = Mock(return_value=(0, "Base Balances\n"))
+    daemon, thread, path = _start(tmp_path, runner)
+
+    assert run_remote(["balance", "--network", "base"], path) == 0
+    assert run_remote(["balance", "--network", "base"], path) == 0
+    assert capsys.readouterr().out == "Base Balances\n" * 2
+    assert runner.call_args[0][0] == ["balance", "--network", "base"]
+    assert request({"op": "status"}, path)["served"] == 2
+
+    request({"op": "stop"}, path)
+    thread.join(2)
+    assert not thread.is_alive()
+    assert run_remote(["balance"], path) is None
+
+
+def test_falls_back_without_a_daemon(tmp_path):
+    """Test a missing or stale socket means running in-process"""
+    path = tmp_path / "daemon.sock"
+    assert run_remote(["balance"], str(path)) is None
+
+    path.write_text("")  # Left behind by a killed daemon
+    assert run_remote(["balance"], str(path)) is None
+
+
+def test_other_settings_fall_back():
+    """Test a client with a different key or RPC isn't served stale state"""
+    runner = Mock(return_value=(0, ""))
+    daemon = Daemon(runner, "unused.sock")
+
+    response = daemon.handle({"op": "run", "argv": ["balance"], "fingerprint": "x"})
+    assert response["status"] == "fallback"
+
+    runner.side_effect = Exception("boom")
+    response = daemon.handle(
+        {"op": "run", "argv": ["balance"], "fingerprint": daemon.fingerprint}
+    )
+    assert response["status"] == "fallback"
+    runner.assert_called_once()
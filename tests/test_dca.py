@@ -0,0 +1,185 @@
+"""Tests for the DCA schedule and scheduler"""
+
+import pytest
+from unittest.mock import Mock
+from src.dca import (
+    TRANSFER_TOPIC,
+    WITHDRAWAL_TOPIC,
+    DCASchedule,
+    DCAScheduler,
+    parse_interval,
+)
+
+WALLET = "0x1111111111111111111111111111111111111111"
+USDC = "0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913"
+WETH = "0x4200000000000000000000000000000000000006"
+
+
+def _topic(address):
+    return "0x" + address[2:].lower().zfill(64)
+
+
+def _scheduler(tmp_path, receipt_logs):
+    """Scheduler with a fake preview and executor"""
+    schedule = DCASchedule(path=str(tmp_path / "dca.json"))
+    state = {"address": WALLET, "block_number": 100, "gas_price": 10**9, "nonce": 4}
+    preview = Mock()
+    preview._fetch_chain_state.return_value = state
+    preview.get_swap_quote.side_effect = lambda f, t, amount, network, state: {
+        "estimated_output": amount * (2800.0 if f == "ETH" else 1 / 2800),
+        "fee_tier": 500,
+        "route": None,
+        "quote_source": "Uniswap V3 (0.05% pool)",
+    }
+
+    executor = Mock()
+    executor.wallet.address = WALLET
+    executor.execute_swaps.return_value = "0xabc"
+    executor.wallet.w3.eth.wait_for_transaction_receipt.return_value = {
+        "status": 1,
+        "blockNumber": 101,
+        "logs": receipt_logs,
+    }
+
+    scheduler = DCAScheduler(
+        schedule, preview=preview, fills_path=str(tmp_path / "fills.jsonl")
+    )
+    scheduler.executors["base"] = executor
+    return scheduler, schedule, preview, executor
+
+
+def test_parse_interval():
+    """Test intervals parse to seconds and nonsense is rejected"""
+    assert parse_interval("30m") == 1800
+    assert parse_interval("1D") == 86400
+    with pytest.raises(ValueError):
+        parse_interval("daily")
+    with pytest.raises(ValueError):
+        parse_interval("0h")
+
+
+def test_schedule_persists_and_advances(tmp_path):
+    """Test due orders are grouped by network and skip missed runs when marked"""
+    schedule = DCASchedule(path=str(tmp_path / "dca.json"))
+    order = schedule.add("base", "eth", "usdc", 0.1, 3600, start=1000)
+    schedule.add("celo", "CELO", "cUSD", 5, 3600, start=5000)
+
+    due = DCASchedule(path=schedule.path).due(now=4000)
+    assert list(due) == ["base"]
+    assert due["base"][0]["from_token"] == "ETH"
+
+    schedule.mark_run([order["id"]], now=8000)
+    stored = schedule.list()[0]
+    assert stored["next_run"] == 8200
+    assert stored["runs"] == 1
+
+    assert schedule.remove(order["id"])
+    assert not schedule.remove(order["id"])
+
+
+def test_due_orders_bundled_with_one_state_read(tmp_path):
+    """Test a network's due orders share one chain state and one transaction"""
+    logs = [
+        {
+            "address": USDC,
+            "topics": [TRANSFER_TOPIC, _topic(WETH), _topic(WALLET)],
+            "data": hex(4200 * 10**6),
+        },
+        {
+            "address": WETH,
+            "topics": [WITHDRAWAL_TOPIC, _topic(WETH)],
+            "data": hex(35 * 10**15),
+        },
+    ]
+    scheduler, schedule, preview, executor = _scheduler(tmp_path, logs)
+    schedule.add("base", "ETH", "USDC", 1.0, 3600, start=0)
+    schedule.add("base", "ETH", "USDC", 0.5, 3600, start=0)
+    schedule.add("base", "USDC", "ETH", 100, 3600, start=0)
+    schedule.add("base", "ETH", "USDC", 1.0, 3600, start=10**12)
+
+    fills = scheduler.run_once(now=1000)
+
+    assert preview._fetch_chain_state.call_count == 1
+    assert executor.execute_swaps.call_count == 1
+    swaps, kwargs = executor.execute_swaps.call_args
+    assert len(swaps[0]) == 3
+    assert kwargs["state"] is preview._fetch_chain_state.return_value
+    assert swaps[0][0]["min_amount_out"] == pytest.approx(2800 * 0.995)
+
+    assert [fill["status"] for fill in fills] == ["filled"] * 3
+    # Orders sharing an output token split it pro rata to their quotes
+    assert fills[0]["realized_out"] == pytest.approx(2800)
+    assert fills[1]["realized_out"] == pytest.approx(1400)
+    assert fills[2]["realized_out"] == pytest.approx(0.035)
+    assert fills[0]["slippage_bps"] == pytest.approx(0)
+    assert len(scheduler.read_fills()) == 3
+    assert not schedule.due(now=1000)
+
+
+def test_failed_bundle_logs_and_still_advances(tmp_path):
+    """Test a bundle that isn't sent is logged as failed and not retried at once"""
+    scheduler, schedule, _, executor = _scheduler(tmp_path, [])
+    executor.execute_swaps.return_value = None
+    schedule.add("base", "ETH", "USDC", 1.0, 3600, start=0)
+
+    fills = scheduler.run_once(now=1000)
+
+    assert [fill["status"] for fill in fills] == ["failed"]
+    assert fills[0]["quoted_out"] == pytest.approx(2800)
+    assert not schedule.due(now=1000)
+
+
+def test_price_feed_quotes_are_not_executed(tmp_path):
+    """Test an order without a pool quote is skipped, not swapped at a feed price"""
+    scheduler, schedule, preview, executor = _scheduler(tmp_path, [])
+    preview.get_swap_quote.side_effect = None
+    preview.get_swap_quote.return_value = {
+        "estimated_output": 2800.0,
+        "quote_source": "Price API",
+    }
+    schedule.add("base", "ETH", "USDC", 1.0, 3600, start=0)
+
+    fills = scheduler.run_once(now=1000)
+
+    assert [fill["status"] for fill in fills] == ["no_quote"]
+    executor.execute_swaps.assert_not_called()
+
+
+def test_receipt_timeout_is_pending_then_reconciled(tmp_path):
+    """Test a broadcast bundle without a receipt is reconciled on the next cycle"""
+    from web3.exceptions import TimeExhausted
+
+    logs = [
+        {
+            "address": USDC,
+            "topics": [TRANSFER_TOPIC, _topic(WETH), _topic(WALLET)],
+            "data": hex(2790 * 10**6),
+        }
+    ]
+    scheduler, schedule, _, executor = _scheduler(tmp_path, logs)
+    eth = executor.wallet.w3.eth
+    eth.wait_for_transaction_receipt.side_effect = TimeExhausted()
+    schedule.add("base", "ETH", "USDC", 1.0, 3600, start=0)
+
+    fills = scheduler.run_once(now=1000)
+    assert [(fill["status"], fill["tx_hash"]) for fill in fills] == [
+        ("pending", "0xabc")
+    ]
+    assert not schedule.due(now=1000)
+
+    eth.get_transaction_receipt.return_value = {
+        "status": 1,
+        "blockNumber": 105,
+        "logs": logs,
+    }
+    fills = scheduler.reconcile_pending()
+    assert [fill["status"] for fill in fills] == ["filled"]
+    assert fills[0]["realized_out"] == pytest.approx(2790)
+    assert scheduler.reconcile_pending() == []
+
+
+def test_schedule_keeps_mixed_case_symbols(tmp_path):
+    """Test Celo symbols like cUSD keep their spelling whatever the input case"""
+    schedule = DCASchedule(path=str(tmp_path / "dca.json"))
+    order = schedule.add("celo", "celo", "CUSD", 5, 3600)
+    assert (order["from_token"], order["to_token"]) == ("CELO", "cUSD")
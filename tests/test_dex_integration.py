@@ -0,0 +1,218 @@
+"""Tests for Uniswap V3 quoting"""
+
+import pytest
+from unittest.mock import patch
+from eth_abi import decode, encode
+from eth_utils import keccak
+from src.dex_integration import UniswapV3Integration, WETH_ADDRESSES
+from src.pool_registry import FEE_TIERS
+
+TEST_KEY = "0x" + "11" * 32
+USDC = "0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913"
+
+
+@pytest.fixture
+def dex(monkeypatch, tmp_path):
+    monkeypatch.setenv("PRIVATE_KEY", TEST_KEY)
+    dex = UniswapV3Integration("base")
+    dex.pool_registry.path = str(tmp_path / "pools.json")
+    dex.pool_registry._data = {}
+    dex.pool_state.path = str(tmp_path / "pool_state.json")
+    dex.pool_state.pools = {}
+    dex.pool_state.last_block = None
+    return dex
+
+
+def _quote_result(amount_out, gas_estimate):
+    return (
+        True,
+        encode(
+            ["uint256", "uint160", "uint32", "uint256"],
+            [amount_out, 0, 1, gas_estimate],
+        ),
+    )
+
+
+def test_get_quote_batches_all_tiers_and_picks_best(dex):
+    """Test every fee tier is quoted in one Multicall and the best output wins"""
+    results = [
+        (True, encode(["uint256"], [0])),  # basefee
+        (False, b""),  # 0.01% pool missing
+        _quote_result(2_990_000_000, 90_000),
+        _quote_result(3_000_000_000, 120_000),
+        _quote_result(2_900_000_000, 150_000),
+    ]
+
+    with patch("src.dex_integration.Multicall.call", return_value=results) as call:
+        quote = dex.get_quote(WETH_ADDRESSES["base"], USDC, 10**18, FEE_TIERS)
+
+    assert call.call_count == 1
+    assert len(call.call_args[0][0]) == len(FEE_TIERS) + 1
+    assert quote["fee"] == 3000
+    assert quote["amount_out"] == 3_000_000_000
+    assert quote["gas_estimate"] == 120_000
+
+
+def test_quote_calls_match_the_real_quoter_v2_abi(dex):
+    """Test quoter calldata uses QuoterV2's (tokenIn, tokenOut, amountIn, fee) order"""
+    signature = "quoteExactInputSingle((address,address,uint256,uint24,uint160))"
+    with patch("src.dex_integration.Multicall.call", return_value=[]) as call:
+        dex.get_quote(WETH_ADDRESSES["base"], USDC, 10**18, [3000])
+
+    target, calldata = call.call_args[0][0][1]
+    assert calldata[:4] == keccak(text=signature)[:4]
+    (params,) = decode(["(address,address,uint256,uint24,uint160)"], calldata[4:])
+    assert params[2:] == (10**18, 3000, 0)
+
+
+def test_get_quote_accounts_for_gas(dex):
+    """Test a slightly better output loses when its gas costs more than it gains"""
+    basefee = 10**9
+    results = [
+        (True, encode(["uint256"], [basefee])),
+        _quote_result(10**18, 100_000),
+        _quote_result(10**18 + 10**13, 200_000),
+        (False, b""),
+        (False, b""),
+    ]
+
+    with patch("src.dex_integration.Multicall.call", return_value=results):
+        quote = dex.get_quote(USDC, WETH_ADDRESSES["base"], 3_000_000_000, FEE_TIERS)
+
+    # The 0.05% tier pays 1e14 wei more gas for only 1e13 more output
+    assert quote["fee"] == 100
+    assert quote["net_amount_out"] == 10**18 - 100_000 * basefee
+
+
+def test_get_quote_no_pools(dex):
+    """Test None is returned when no tier can quote"""
+    results = [(True, encode(["uint256"], [0]))] + [(False, b"")] * len(FEE_TIERS)
+
+    with patch("src.dex_integration.Multicall.call", return_value=results):
+        assert dex.get_quote(WETH_ADDRESSES["base"], USDC, 10**18, FEE_TIERS) is None
+
+
+def test_get_quote_skips_pairs_without_live_pools(dex):
+    """Test the registry stops a quote before any Multicall when no pool is live"""
+    with patch.object(dex.pool_registry, "ensure_pairs") as ensure, patch(
+        "src.dex_integration.Multicall.call"
+    ) as call:
+        assert dex.get_quote(WETH_ADDRESSES["base"], USDC, 10**18) is None
+
+    ensure.assert_called_once()
+    call.assert_not_called()
+
+
+def test_get_pool_snapshot_reads_bitmap_then_ticks(dex):
+    """Test a snapshot takes state, bitmap words and initialized ticks in three batches"""
+    pool = "0xd0b53D9277642d899DF5C87A3966A349A798F224"
+    state = [
+        (
+            True,
+            encode(
+                ["uint160", "int24", "uint16", "uint16", "uint16", "uint8", "bool"],
+                [2**96, 30, 0, 1, 1, 0, True],
+            ),
+        ),
+        (True, encode(["uint128"], [3 * 10**18])),
+        (True, encode(["uint24"], [3000])),
+        (True, encode(["int24"], [60])),
+        (True, encode(["address"], [WETH_ADDRESSES["base"]])),
+        (True, encode(["address"], [USDC])),
+    ]
+    # Word 0 has compressed tick 10 (tick 600) initialized, others empty
+    bitmaps = [
+        (True, encode(["uint256"], [1 << 10 if w == 0 else 0])) for w in range(-2, 3)
+    ]
+    ticks = [
+        (
+            True,
+            encode(
+                [
+                    "uint128",
+                    "int128",
+                    "uint256",
+                    "uint256",
+                    "int56",
+                    "uint160",
+                    "uint32",
+                    "bool",
+                ],
+                [10**18, -(10**18), 0, 0, 0, 0, 0, True],
+            ),
+        )
+    ]
+
+    with patch(
+        "src.dex_integration.Multicall.call", side_effect=[state, bitmaps, ticks]
+    ) as call:
+        snapshot = dex.get_pool_snapshot(pool)
+
+    assert call.call_count == 3
+    assert len(call.call_args_list[1][0][0]) == 5
+    assert snapshot.ticks == {600: -(10**18)}
+    assert snapshot.word_range == (-2, 2)
+    assert snapshot.fee == 3000 and snapshot.liquidity == 3 * 10**18
+
+
+def test_get_quote_ladder_one_multicall(dex):
+    """Test all sizes and tiers go in one Multicall and each size keeps its best tier"""
+    dex.pool_registry._store(
+        WETH_ADDRESSES["base"], USDC, 500, "0x" + "00" * 20, True, 10, 1e12
+    )
+    dex.pool_registry._store(
+        WETH_ADDRESSES["base"], USDC, 3000, "0x" + "00" * 20, True, 5, 1e12
+    )
+    amounts = [10**17, 10**18, 10**20]
+    # Per tier: reference size first, then each ladder size
+    results = [
+        _quote_result(3_000_000, 1),
+        _quote_result(300_000_000, 1),
+        _quote_result(2_990_000_000, 1),
+        _quote_result(250_000_000_000, 1),
+        _quote_result(2_999_000, 1),
+        _quote_result(299_000_000, 1),
+        _quote_result(2_995_000_000, 1),
+        _quote_result(260_000_000_000, 1),
+    ]
+
+    with patch.object(dex.pool_registry, "ensure_pairs"), patch(
+        "src.dex_integration.Multicall.call", return_value=results
+    ) as call:
+        ladder = dex.get_quote_ladder(WETH_ADDRESSES["base"], USDC, amounts)
+
+    assert call.call_count == 1
+    assert len(call.call_args[0][0]) == 2 * (len(amounts) + 1)
+    assert ladder["reference_in"] == 10**14
+    assert ladder["reference_out"] == 3_000_000
+    assert [q["fee"] for q in ladder["quotes"]] == [500, 3000, 3000]
+    assert ladder["quotes"][2]["amount_out"] == 260_000_000_000
+
+
+def test_get_pair_quotes_one_multicall_for_all_pairs(dex):
+    """Test every pair's live tiers share one Multicall and dead pairs go local"""
+    weth = WETH_ADDRESSES["base"]
+    degen = "0x4ed4E862860beD51a9570b96d89aF5E1B0Efefed"
+    dex.pool_registry._store(weth, USDC, 500, "0x" + "00" * 20, True, 10, 1e12)
+    dex.pool_registry._store(weth, USDC, 3000, "0x" + "00" * 20, True, 5, 1e12)
+    # Both directions use the same pools, deepest tier first
+    results = [
+        _quote_result(3_000_000_000, 1),
+        _quote_result(2_990_000_000, 1),
+        _quote_result(330_000_000_000_000, 1),
+        (False, b""),
+    ]
+
+    with patch.object(dex.pool_registry, "ensure_pairs"), patch(
+        "src.dex_integration.Multicall.call", return_value=results
+    ) as call, patch.object(dex, "get_local_quote", return_value=None) as local:
+        quotes = dex.get_pair_quotes(
+            [(weth, USDC, 10**18), (USDC, weth, 10**9), (degen, weth, 10**18)]
+        )
+
+    assert call.call_count == 1
+    assert len(call.call_args[0][0]) == 4
+    assert quotes[0] == {"amount_out": 3_000_000_000, "fee": 500, "source": "quoter"}
+    assert quotes[1]["amount_out"] == 330_000_000_000_000
+    assert quotes[2] is None
+    local.assert_called_once_with(degen, weth, 10**18)
@@ -0,0 +1,114 @@
+"""Tests for the Etherscan response cache"""
+
+from unittest.mock import Mock, patch
+from src.etherscan_cache import EtherscanCache
+
+URL = "https://api.etherscan.io/v2/api"
+
+
+def _params(**overrides):
+    params = {
+        "chainid": 1,
+        "module": "account",
+        "action": "tokentx",
+        "address": "0xABCDEF0000000000000000000000000000000001",
+        "startblock": 0,
+        "endblock": 99999999,
+        "apikey": "key-one",
+    }
+    params.update(overrides)
+    return params
+
+
+def _response(data, status_code=200):
+    response = Mock()
+    response.status_code = status_code
+    response.json.return_value = data
+    return response
+
+
+def test_key_ignores_api_key_and_case():
+    """Test requests differing only by API key or address case share a key"""
+    key = EtherscanCache.make_key(URL, _params())
+    assert key == EtherscanCache.make_key(URL, _params(apikey="key-two"))
+    assert key == EtherscanCache.make_key(
+        URL, _params(address="0xabcdef0000000000000000000000000000000001")
+    )
+    assert key != EtherscanCache.make_key(URL, _params(startblock=100))
+
+
+@patch("requests.get")
+def test_repeated_request_served_from_cache(mock_get, tmp_path):
+    """Test an identical request only hits the API once"""
+    mock_get.return_value = _response({"status": "1", "result": [{"hash": "0x1"}]})
+    cache = EtherscanCache(str(tmp_path))
+
+    first = cache.get(URL, _params())
+    second = cache.get(URL, _params(apikey="other"))
+
+    assert mock_get.call_count == 1
+    assert first.json() == second.json()
+
+
+@patch("requests.get")
+def test_errors_are_not_cached(mock_get, tmp_path):
+    """Test rate limit errors are retried instead of cached"""
+    mock_get.return_value = _response(
+        {"status": "0", "message": "NOTOK", "result": "Max rate limit reached"}
+    )
+    cache = EtherscanCache(str(tmp_path))
+
+    cache.get(URL, _params())
+    cache.get(URL, _params())
+
+    assert mock_get.call_count == 2
+
+
+@patch("requests.get")
+def test_finalized_ranges_never_expire(mock_get, tmp_path):
+    """Test closed ranges below the finalized block outlive the TTL"""
+    mock_get.return_value = _response({"status": "1", "result": []})
+    cache = EtherscanCache(str(tmp_path), ttl=0, finalized_block_fn=lambda: 1000)
+
+    cache.get(URL, _params(endblock=900))
+    cache.get(URL, _params(endblock=900))
+    assert mock_get.call_count == 1
+
+    # Open-ended and unfinalized ranges expire (TTL of zero here)
+    cache.get(URL, _params())
+    cache.get(URL, _params())
+    cache.get(URL, _params(endblock=1500))
+    cache.get(URL, _params(endblock=1500))
+    assert mock_get.call_count == 5
+
+
+@patch("requests.get")
+def test_open_ended_queries_reuse_the_finalized_half(mock_get, tmp_path):
+    """Test only the recent half of a history query is refetched after the TTL"""
+
+    def fake_get(url, params, timeout):
+        block = 20_000 if int(params["startblock"]) > 0 else 5
+        return _response({"status": "1", "result": [{"blockNumber": block}]})
+
+    mock_get.side_effect = fake_get
+    cache = EtherscanCache(str(tmp_path), ttl=0, finalized_block_fn=lambda: 25_000)
+
+    result = cache.get(URL, _params(sort="desc", offset=2)).json()["result"]
+    assert [tx["blockNumber"] for tx in result] == [20_000, 5]
+    assert mock_get.call_count == 2
+
+    cache.get(URL, _params(sort="desc", offset=2))
+    assert mock_get.call_count == 3  # Recent half only
+    assert mock_get.call_args[1]["params"]["startblock"] == 20_001
+
+
+def test_prune_evicts_old_and_excess_entries(tmp_path):
+    """Test the cache directory stays bounded"""
+    cache = EtherscanCache(str(tmp_path))
+    for block in range(4):
+        cache.store(URL, _params(endblock=block), {"status": "1", "result": []})
+
+    cache.prune(max_entries=2)
+    assert len(list(tmp_path.glob("*.json"))) == 2
+    cache.prune(max_age=-1)
+    assert list(tmp_path.glob("*.json")) == []
@@ -0,0 +1,69 @@
+"""Tests for streaming history export"""
+
+import csv
+import json
+import pytest
+from src.history_export import EXPORT_FIELDS, export_transactions, get_export_format
+
+
+def _records(count):
+    """Generate records lazily like the fetch stage does"""
+    for i in range(count):
+        yield {
+            "timestamp": 1640995200 + i,
+            "date": "2022-01-01 00:00",
+            "network": "ethereum",
+            "hash": f"0x{i:064x}",
+            "type": "Receive" if i % 2 else "Send",
+            "token": "ETH",
+            "amount": i / 10,
+            "usd_value": 0.0,
+            "from": "0x1111111111111111111111111111111111111111",
+            "to": "0x2222222222222222222222222222222222222222",
+            "gas_used": 21000,
+            "gas_price": 20.0,
+            "status": "Success",
+        }
+
+
+def test_export_format_from_extension():
+    """Test the format is chosen by file extension"""
+    assert get_export_format("out.CSV") == "csv"
+    assert get_export_format("dir/out.jsonl") == "jsonl"
+    with pytest.raises(ValueError):
+        get_export_format("out.xlsx")
+
+
+def test_export_csv(tmp_path):
+    """Test CSV export writes a header and every record"""
+    path = str(tmp_path / "out.csv")
+    assert export_transactions(_records(25), path, chunk_size=10) == 25
+
+    with open(path, newline="", encoding="utf-8") as fh:
+        rows = list(csv.DictReader(fh))
+    assert len(rows) == 25
+    assert list(rows[0].keys()) == EXPORT_FIELDS
+    assert rows[-1]["hash"] == f"0x{24:064x}"
+
+
+def test_export_jsonl(tmp_path):
+    """Test JSONL export keeps a stable schema per line"""
+    path = str(tmp_path / "out.jsonl")
+    assert export_transactions(_records(5), path, chunk_size=2) == 5
+
+    with open(path, encoding="utf-8") as fh:
+        lines = [json.loads(line) for line in fh]
+    assert [list(line.keys()) for line in lines] == [EXPORT_FIELDS] * 5
+    assert lines[3]["amount"] == 0.3
+
+
+def test_export_parquet_row_groups(tmp_path):
+    """Test Parquet export writes one row group per chunk"""
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = str(tmp_path / "out.parquet")
+    assert export_transactions(_records(25), path, chunk_size=10) == 25
+
+    parquet_file = pq.ParquetFile(path)
+    assert parquet_file.metadata.num_rows == 25
+    assert parquet_file.metadata.num_row_groups == 3
+    assert parquet_file.schema_arrow.names == EXPORT_FIELDS
@@ -0,0 +1,153 @@
+"""Tests for limit orders"""
+
+from unittest.mock import Mock
+from web3.exceptions import TransactionNotFound
+from src.limit_orders import PENDING_TIMEOUT, LimitOrderBook, LimitOrderWatcher
+
+USDC = "0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913"
+WETH = "0x4200000000000000000000000000000000000006"
+
+
+def _watcher(tmp_path, eth_usdc_rate=3000.0):
+    """Watcher over a fake preview whose quotes come back at fixed rates"""
+    book = LimitOrderBook(path=str(tmp_path / "orders.json"))
+    preview = Mock()
+    preview._get_token_addresses.return_value = {
+        "ETH": "0x0000000000000000000000000000000000000000",
+        "WETH": WETH,
+        "USDC": USDC,
+    }
+    preview._fetch_chain_state.return_value = {"block_number": 10, "nonce": 3}
+
+    def quotes(requests, block):
+        rates = {(WETH, USDC): eth_usdc_rate * 10**6 / 10**18}
+        return [
+            {"amount_out": int(amount * rates.get((a, b), 0)), "fee": 500}
+            for a, b, amount in requests
+        ]
+
+    preview._get_dex.return_value.get_pair_quotes.side_effect = quotes
+    watcher = LimitOrderWatcher(book, preview=preview)
+    watcher.executors["base"] = Mock()
+    return watcher, book, preview
+
+
+def test_triggered_is_a_prefix_of_sorted_rates(tmp_path):
+    """Test orders trigger at or below the rate, on their own pair only"""
+    book = LimitOrderBook(path=str(tmp_path / "orders.json"))
+    high = book.add("base", "ETH", "USDC", 1, 4000)
+    low = book.add("base", "eth", "usdc", 1, 2500)
+    mid = book.add("base", "ETH", "USDC", 1, 3000)
+    book.add("base", "USDC", "ETH", 100, 0.0001)
+
+    assert [o["id"] for o in book.triggered("base", "ETH", "USDC", 3000)] == [
+        low["id"],
+        mid["id"],
+    ]
+    assert book.triggered("base", "ETH", "USDC", 2000) == []
+
+    assert book.cancel(low["id"])
+    reloaded = LimitOrderBook(path=book.path)
+    assert [o["id"] for o in reloaded.triggered("base", "ETH", "USDC", 5000)] == [
+        mid["id"],
+        high["id"],
+    ]
+
+
+def test_watcher_quotes_each_pair_once_and_bundles(tmp_path):
+    """Test one batched quote per block covers every pair and orders share a tx"""
+    watcher, book, preview = _watcher(tmp_path)
+    book.add("base", "ETH", "USDC", 2, 2900)
+    book.add("base", "ETH", "USDC", 0.5, 2800)
+    book.add("base", "ETH", "USDC", 1, 3500)
+    executor = watcher.executors["base"]
+    executor.execute_swaps.return_value = "0xfeed"
+
+    assert watcher.run_once() == []  # Sent, but not filled until the receipt
+
+    get_pair_quotes = preview._get_dex.return_value.get_pair_quotes
+    assert get_pair_quotes.call_count == 1
+    requests = get_pair_quotes.call_args[0][0]
+    assert requests == [(WETH, USDC, 5 * 10**17)]  # Quoted at the smallest order
+
+    swaps = executor.execute_swaps.call_args[0][0]
+    assert sorted(swap["min_amount_out"] for swap in swaps) == [1400, 5800]
+    assert all(swap["fee"] == 500 for swap in swaps)
+    assert [order["tx_hash"] for order in book.list("pending")] == ["0xfeed"] * 2
+    assert len(book.list("open")) == 1
+
+    # Nothing is re-quoted until the next block, and the receipt fills the orders
+    executor.wallet.w3.eth.get_transaction_receipt.return_value = {"status": 1}
+    filled = watcher.run_once()
+    assert get_pair_quotes.call_count == 1
+    assert [order["tx_hash"] for order in filled] == ["0xfeed", "0xfeed"]
+    assert [order["rate"] for order in filled] == [3000.0, 3000.0]
+    assert len(book.list("filled")) == 2
+
+
+def test_failed_bundle_falls_back_to_single_orders(tmp_path):
+    """Test an order that can't fill at its size doesn't block the others"""
+    watcher, book, _ = _watcher(tmp_path)
+    small = book.add("base", "ETH", "USDC", 1, 2900)
+    book.add("base", "ETH", "USDC", 500, 2900)
+    executor = watcher.executors["base"]
+    executor.execute_swaps.side_effect = lambda swaps, state=None: (
+        "0xsmall" if len(swaps) == 1 and swaps[0]["amount"] == 1 else None
+    )
+
+    watcher.run_once()
+    executor.wallet.w3.eth.get_transaction_receipt.return_value = {"status": 1}
+    filled = watcher.run_once()
+
+    assert [order["id"] for order in filled] == [small["id"]]
+    assert [order["amount"] for order in book.list("open")] == [500]
+
+
+def test_reverted_or_dropped_orders_reopen(tmp_path):
+    """Test only a successful receipt fills; a revert or a lost tx reopens"""
+    watcher, book, preview = _watcher(tmp_path)
+    order = book.add("base", "ETH", "USDC", 1, 2900)
+    executor = watcher.executors["base"]
+    executor.execute_swaps.return_value = "0xbad"
+    get_receipt = executor.wallet.w3.eth.get_transaction_receipt
+
+    watcher.run_once()
+    get_receipt.return_value = {"status": 0}
+    assert watcher.run_once() == []
+    assert [o["id"] for o in book.triggered("base", "ETH", "USDC", 3000)] == [
+        order["id"]
+    ]
+
+    # Sent again on the next block, then never mined
+    preview._fetch_chain_state.return_value = {"block_number": 11, "nonce": 3}
+    watcher.run_once()
+    get_receipt.side_effect = TransactionNotFound("missing")
+    assert watcher.resolve_pending() == []
+    assert book.list("pending")[0]["id"] == order["id"]
+
+    sent_at = book.orders[order["id"]]["sent_at"]
+    assert watcher.resolve_pending(now=sent_at + PENDING_TIMEOUT + 1) == []
+    assert book.list("open")[0]["tx_hash"] is None
+
+
+def test_other_processes_changes_are_kept_and_cancels_win(tmp_path):
+    """Test a CLI add survives the watcher's writes and a cancel stops the send"""
+    watcher, book, preview = _watcher(tmp_path)
+    cancelled = book.add("base", "ETH", "USDC", 1, 2900)
+    cli = LimitOrderBook(path=book.path)
+    get_pair_quotes = preview._get_dex.return_value.get_pair_quotes
+    quotes = get_pair_quotes.side_effect
+
+    def quote_while_the_cli_runs(requests, block):
+        cli.cancel(cancelled["id"])
+        cli.add("base", "ETH", "USDC", 1, 5000)
+        return quotes(requests, block)
+
+    get_pair_quotes.side_effect = quote_while_the_cli_runs
+    executor = watcher.executors["base"]
+
+    watcher.run_once()
+
+    executor.execute_swaps.assert_not_called()
+    reloaded = LimitOrderBook(path=book.path)
+    assert [o["status"] for o in reloaded.list()] == ["cancelled", "open"]
@@ -0,0 +1,89 @@
+"""Tests for the in-process EVM backend"""
+
+import pytest
+
+pytest.importorskip("eth_tester")
+
+from src.allowance import AllowanceManager  # noqa: E402
+from src.rpc import batch_request  # noqa: E402
+from src.swap_executor import SwapExecutor  # noqa: E402
+from src.wallet import Wallet  # noqa: E402
+
+USDC = "0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913"
+
+
+@pytest.fixture
+def local_backend(monkeypatch):
+    monkeypatch.setattr("src.wallet.BACKEND", "local")
+    monkeypatch.delenv("PRIVATE_KEY", raising=False)
+
+
+@pytest.fixture
+def executor(local_backend, tmp_path):
+    executor = SwapExecutor("base")
+    executor.allowances = AllowanceManager(
+        executor.wallet.w3,
+        executor.wallet.address,
+        "base",
+        path=str(tmp_path / "allowances.json"),
+    )
+    return executor
+
+
+def test_wallet_is_funded(local_backend):
+    """Test the default wallet starts with ETH and every configured token"""
+    wallet = Wallet("base")
+
+    assert wallet.is_connected()
+    assert wallet.get_balance() >= 90
+    assert wallet.get_token_decimals(USDC) == 6
+    assert wallet.get_balance(USDC) > 0
+
+
+def test_get_balances_in_one_batch(local_backend, monkeypatch):
+    """Test batched balances match one-by-one reads, decimals included"""
+    wallet = Wallet("base")
+    tokens = {"ETH": "0x" + "00" * 20, "USDC": USDC}
+    expected = {"ETH": float(wallet.get_balance()), "USDC": wallet.get_balance(USDC)}
+
+    calls = []
+    monkeypatch.setattr(
+        "src.wallet.batch_request",
+        lambda w3, batch, timeout=10: calls.append(batch) or batch_request(w3, batch),
+    )
+    assert wallet.get_balances(tokens) == pytest.approx(expected)
+    assert len(calls) == 1
+
+
+def test_swap_round_trip(executor):
+    """Test ETH -> USDC and back, with the approval and unwrap on chain"""
+    wallet = executor.wallet
+    eth_before, usdc_before = wallet.get_balance(), wallet.get_balance(USDC)
+
+    assert executor.execute_swap("ETH", "USDC", 1.0, 2700, fee=3000)
+    usdc_after = wallet.get_balance(USDC)
+    assert 2700 < usdc_after - usdc_before < 2800
+
+    assert executor.execute_swap("USDC", "ETH", 1400.0, 0.45, fee=3000)
+    assert wallet.get_balance(USDC) == pytest.approx(usdc_after - 1400)
+    assert 0.45 < float(wallet.get_balance() - eth_before) + 1 < 0.5
+
+
+def test_failing_swap_is_not_sent(executor):
+    """Test a minimum above the pool price is caught before broadcasting"""
+    nonce = executor.wallet.w3.eth.get_transaction_count(executor.wallet.address)
+
+    assert executor.execute_swap("ETH", "USDC", 1.0, 5000, fee=3000) is None
+    assert (
+        executor.wallet.w3.eth.get_transaction_count(executor.wallet.address) == nonce
+    )
+
+
+def test_send_token_uses_token_decimals(local_backend):
+    """Test a 6-decimal token transfer moves whole tokens, not 10**18 units"""
+    wallet = Wallet("base")
+    recipient = "0x3333333333333333333333333333333333333333"
+    before = wallet.get_balance(USDC)
+
+    assert wallet.send_token(USDC, recipient, 1.5)
+    assert wallet.get_balance(USDC) == pytest.approx(before - 1.5)
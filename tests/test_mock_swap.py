@@ -0,0 +1,72 @@
+"""Tests for the local swap simulator"""
+
+import pytest
+from src.mock_swap import (
+    ConstantProductPool,
+    MockAMM,
+    MockHashGenerator,
+    MockSwapExecutor,
+)
+
+TEST_KEY = "0x" + "11" * 32
+
+
+@pytest.fixture
+def executor(monkeypatch):
+    monkeypatch.setenv("PRIVATE_KEY", TEST_KEY)
+    return MockSwapExecutor("base-sepolia", seed=42)
+
+
+def test_constant_product_matches_v2_formula():
+    """Test x*y=k output with a 0.3% fee"""
+    pool = ConstantProductPool("A", "B", 1000 * 10**18, 1000 * 10**18)
+    amount_out = pool.swap(10**18, True)
+
+    assert amount_out == 996006981039903216
+    assert pool.reserve0 == 1001 * 10**18
+    assert pool.reserve1 == 1000 * 10**18 - amount_out
+
+
+@pytest.mark.parametrize("pool_type", ["v2", "v3"])
+def test_pools_seeded_at_price(pool_type):
+    """Test a small trade fills near the seeded price and large ones move it"""
+    amm = MockAMM({"ETH": 2000.0, "USDC": 1.0}, pool_type=pool_type)
+    small = amm.quote("ETH", "USDC", 10**15) / 10**6
+    assert small == pytest.approx(2000 * 0.001 * 0.997, rel=1e-4)
+
+    before = amm.quote("ETH", "USDC", 10**18)
+    amm.swap("ETH", "USDC", 100 * 10**18)
+    assert amm.quote("ETH", "USDC", 10**18) < before
+
+
+def test_swap_updates_ledger(executor):
+    """Test balances move by exactly the swapped amounts"""
+    usdc_before = executor.get_balance("USDC")
+    tx_hash = executor.execute_mock_swap("ETH", "USDC", 1.0, 2700.0)
+
+    assert tx_hash and len(tx_hash) == 66
+    assert executor.get_balance("ETH") == pytest.approx(9.0)
+    entry = executor.ledger.entries[-1]
+    assert entry["hash"] == tx_hash
+    assert executor.get_balance("USDC") == pytest.approx(
+        usdc_before + entry["amount_out"] / 10**6
+    )
+
+
+def test_swap_rejects_slippage_and_overdraft(executor):
+    """Test failed swaps leave the ledger untouched"""
+    assert executor.execute_mock_swap("ETH", "USDC", 1.0, 5000.0) is None
+    assert executor.execute_mock_swap("ETH", "USDC", 50.0, 0) is None
+    assert executor.execute_mock_swap("ETH", "NOPE", 1.0, 0) is None
+    assert executor.get_balance("ETH") == pytest.approx(10.0)
+    assert executor.ledger.entries == []
+
+
+def test_hashes_are_seeded():
+    """Test the same seed gives the same hash sequence"""
+    first, second = MockHashGenerator(7), MockHashGenerator(7)
+    sequence = [first.next_hash() for _ in range(3)]
+
+    assert sequence == [second.next_hash() for _ in range(3)]
+    assert len(set(sequence)) == 3
+    assert MockHashGenerator(8).next_hash() != sequence[0]
@@ -0,0 +1,91 @@
+"""Tests for notification dispatch"""
+
+import time
+from unittest.mock import Mock, patch
+from src.notifications import (
+    DesktopSink,
+    NotificationDispatcher,
+    NotificationManager,
+    WebhookSink,
+)
+
+
+class RecordingSink:
+    name = "recording"
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.events = []
+
+    def send(self, event):
+        time.sleep(self.delay)
+        self.events.append(event)
+        return True
+
+
+def test_callers_never_wait_for_sinks():
+    """Test a slow sink doesn't slow down the code that notifies"""
+    sink = RecordingSink(delay=0.2)
+    manager = NotificationManager(NotificationDispatcher([sink], coalesce_window=0))
+
+    start = time.perf_counter()
+    manager.notify_swap_success("1", "ETH", "2800", "USDC", "0x" + "ab" * 32)
+    assert time.perf_counter() - start < 0.05
+
+    assert manager.dispatcher.flush()
+    assert sink.events[0]["title"] == "✅ Swap Successful"
+
+
+def test_bursts_coalesce_per_kind():
+    """Test a burst of one kind becomes one notification with a count"""
+    sink = RecordingSink()
+    dispatcher = NotificationDispatcher([sink], coalesce_window=0.2)
+    manager = NotificationManager(dispatcher)
+
+    for i in range(12):
+        manager.notify_transaction_success("Transfer", str(i), "USDC", "0x" + "cd" * 32)
+    manager.notify_swap_failed("1", "ETH", "USDC", "reverted")
+    assert dispatcher.flush()
+
+    assert [event["title"] for event in sink.events] == [
+        "✅ 12 Transfers Successful",
+        "❌ Swap Failed",
+    ]
+    assert sink.events[0]["count"] == 12
+    assert sink.events[0]["message"].endswith("+9 more")
+
+
+def test_full_queue_drops_instead_of_blocking():
+    """Test submitting past the bound returns at once and counts the drop"""
+    sink = RecordingSink(delay=0.5)
+    dispatcher = NotificationDispatcher([sink], max_queue=2, coalesce_window=0)
+    for i in range(10):
+        dispatcher.submit(f"kind{i}", "title", "message")
+
+    assert dispatcher.dropped >= 7
+
+
+def test_desktop_failure_is_remembered(monkeypatch):
+    """Test a failed desktop backend isn't retried for every event"""
+    monkeypatch.setattr(DesktopSink, "available", None)
+    monkeypatch.setattr(DesktopSink, "probe", staticmethod(lambda: True))
+    notify = Mock(side_effect=Exception("no dbus"))
+    with patch("plyer.notification.notify", notify):
+        sink = DesktopSink()
+        assert not sink.send({"title": "a", "message": "b"})
+        assert not sink.send({"title": "a", "message": "b"})
+
+    assert notify.call_count == 1
+
+
+def test_webhook_posts_json():
+    """Test the webhook sink sends the event as JSON"""
+    with patch("requests.post", return_value=Mock(status_code=204)) as post:
+        sent = WebhookSink("http://127.0.0.1:8787/notify").send(
+            {"kind": "swap:success", "title": "t", "message": "m", "timestamp": 1.0}
+        )
+
+    assert sent
+    assert post.call_args[0][0] == "http://127.0.0.1:8787/notify"
+    assert post.call_args[1]["json"]["kind"] == "swap:success"
+    assert post.call_args[1]["json"]["count"] == 1
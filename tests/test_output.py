@@ -0,0 +1,54 @@
+"""Tests for machine-readable command output"""
+
+import io
+import json
+import pytest
+from src.output import RecordWriter
+
+
+def test_jsonl_streams_one_record_per_line():
+    """Test each record is flushed as a complete line with every field"""
+    stream = io.StringIO()
+    with RecordWriter("jsonl", stream) as records:
+        records.write("balance", network="base", token="ETH", balance=1.5)
+        assert stream.getvalue().count("\n") == 1
+        print("DEBUG: not a record")
+        records.write_from("error", {"network": "celo", "error": "Timed out"})
+
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert lines[0]["type"] == "balance"
+    assert lines[0]["price_usd"] is None
+    assert lines[1] == {"type": "error", "network": "celo", "error": "Timed out"}
+
+
+def test_json_is_one_array():
+    """Test json output parses as an array, empty when nothing was found"""
+    stream = io.StringIO()
+    with RecordWriter("json", stream) as records:
+        records.write("export", network="base", path="out.csv", count=2)
+        records.write("error", network="celo", error="boom")
+    assert [r["type"] for r in json.loads(stream.getvalue())] == ["export", "error"]
+
+    stream = io.StringIO()
+    with RecordWriter("json", stream):
+        pass
+    assert json.loads(stream.getvalue()) == []
+
+
+def test_prints_go_to_stderr(capsys):
+    """Test stray prints can't corrupt the records on stdout"""
+    with RecordWriter("jsonl") as records:
+        print("DEBUG: fetching")
+        records.write("token", network="base", symbol="USDC", status="discovered")
+    out, err = capsys.readouterr()
+    assert json.loads(out)["symbol"] == "USDC"
+    assert "DEBUG: fetching" in err
+
+
+def test_rejects_unknown_fields():
+    """Test the schema stays stable: extra fields are a bug, not output"""
+    records = RecordWriter("jsonl", io.StringIO())
+    with pytest.raises(ValueError):
+        records.write("balance", network="base", usd=1.0)
+    with pytest.raises(ValueError):
+        RecordWriter("yaml")
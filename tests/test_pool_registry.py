@@ -0,0 +1,65 @@
+"""Tests for the Uniswap V3 pool registry"""
+
+from unittest.mock import Mock, patch
+from src.pool_registry import PoolRegistry, compute_pool_address, sort_tokens
+
+FACTORY = "0x1F98431c8aD98523631AE4a59f267346ea31F984"
+USDC = "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48"
+WETH = "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2"
+
+
+def test_pool_address_is_order_independent():
+    """Test the derived address doesn't depend on token order"""
+    assert sort_tokens(WETH, USDC) == (USDC, WETH)
+    address = compute_pool_address(FACTORY, USDC, WETH, 500)
+    assert address == compute_pool_address(FACTORY, WETH, USDC.lower(), 500)
+    assert address != compute_pool_address(FACTORY, USDC, WETH, 3000)
+    assert address.startswith("0x") and len(address) == 42
+
+
+def test_ensure_pairs_batches_code_and_liquidity(tmp_path):
+    """Test every unknown tier is confirmed in one batch and then cached"""
+    path = str(tmp_path / "pools.json")
+    registry = PoolRegistry("ethereum", Mock(), FACTORY, path)
+
+    # 100: no code, 500: live, 3000: live but deeper, 10000: empty pool
+    results = [
+        "0x",
+        None,
+        "0x6080",
+        hex(5_000),
+        "0x6080",
+        hex(9_000),
+        "0x6080",
+        hex(0),
+    ]
+    with patch("src.pool_registry.batch_request", return_value=results) as batch:
+        registry.ensure_pairs([(WETH, USDC)])
+        registry.ensure_pairs([(USDC, WETH)])
+
+    assert batch.call_count == 1
+    assert len(batch.call_args[0][1]) == 8
+    assert registry.live_fee_tiers(USDC, WETH) == [3000, 500]
+    assert registry.get_pool(WETH, USDC, 500)["pool"] == compute_pool_address(
+        FACTORY, USDC, WETH, 500
+    )
+
+    # Entries persist across runs
+    reloaded = PoolRegistry("ethereum", path=path)
+    assert reloaded.live_fee_tiers(WETH, USDC) == [3000, 500]
+    assert len(list(reloaded.iter_pools())) == 2
+
+
+def test_registries_for_other_networks_keep_each_others_pools(tmp_path):
+    """Test instances sharing pools.json merge their writes instead of overwriting"""
+    path = str(tmp_path / "pools.json")
+    ethereum = PoolRegistry("ethereum", Mock(), FACTORY, path)
+    base = PoolRegistry("base", Mock(), FACTORY, path)
+
+    live = ["0x6080", hex(5_000)] * 4
+    with patch("src.pool_registry.batch_request", return_value=live):
+        ethereum.ensure_pairs([(WETH, USDC)])
+        base.ensure_pairs([(WETH, USDC)])
+
+    assert PoolRegistry("ethereum", path=path).live_fee_tiers(WETH, USDC)
+    assert PoolRegistry("base", path=path).live_fee_tiers(WETH, USDC)
@@ -0,0 +1,149 @@
+"""Tests for log-driven pool state sync"""
+
+import pytest
+from unittest.mock import Mock
+from eth_abi import encode
+from web3 import Web3
+from src.pool_state import (
+    BURN_TOPIC,
+    MAX_LOG_RANGE,
+    MINT_TOPIC,
+    SWAP_TOPIC,
+    PoolStateFollower,
+)
+from src.v3_math import V3Pool, get_sqrt_ratio_at_tick
+
+POOL = "0xd0b53D9277642d899DF5C87A3966A349A798F224"
+OWNER = "0x" + "11" * 20
+OWNER_TOPIC = "0x" + "00" * 12 + "11" * 20
+
+
+def _tick_topic(tick):
+    return "0x" + (tick % (1 << 256)).to_bytes(32, "big").hex()
+
+
+def _log(block, index, topics, data):
+    return {
+        "address": POOL,
+        "blockNumber": block,
+        "logIndex": index,
+        "topics": topics,
+        "data": "0x" + data.hex(),
+    }
+
+
+@pytest.fixture
+def follower(tmp_path):
+    dex = Mock()
+    dex.network = "base"
+    dex.wallet.w3.codec = Web3().codec
+    dex.wallet.w3.eth.block_number = 100
+    dex.get_pool_snapshot.return_value = V3Pool(
+        "0x4200000000000000000000000000000000000006",
+        "0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913",
+        500,
+        10,
+        get_sqrt_ratio_at_tick(5),
+        5,
+        10**18,
+        {-100: 10**18, 100: -(10**18)},
+        (-2, 2),
+    )
+    return PoolStateFollower(dex, path=str(tmp_path / "pool_state.json"))
+
+
+def test_track_snapshots_at_follower_block(follower):
+    """Test a new pool is read at the block logs were applied to"""
+    follower.track(POOL)
+    follower.dex.get_pool_snapshot.assert_called_once_with(POOL, block_identifier=100)
+    assert follower.last_block == 100
+
+
+def test_apply_swap_mint_burn(follower):
+    """Test each event updates price, ticks and in-range liquidity"""
+    pool = follower.track(POOL)
+    swap_data = encode(
+        ["int256", "int256", "uint160", "uint128", "int24"],
+        [10**15, -(10**6), get_sqrt_ratio_at_tick(-20), 10**18, -20],
+    )
+    mint_data = encode(
+        ["address", "uint128", "uint256", "uint256"], [OWNER, 5 * 10**17, 1, 1]
+    )
+    burn_data = encode(["uint128", "uint256", "uint256"], [2 * 10**17, 1, 1])
+    logs = [
+        # Deliberately out of order; the follower applies them in chain order
+        _log(
+            102,
+            0,
+            [BURN_TOPIC, OWNER_TOPIC, _tick_topic(-60), _tick_topic(40)],
+            burn_data,
+        ),
+        _log(
+            101,
+            3,
+            [MINT_TOPIC, OWNER_TOPIC, _tick_topic(-60), _tick_topic(40)],
+            mint_data,
+        ),
+        _log(101, 1, [SWAP_TOPIC, OWNER_TOPIC, OWNER_TOPIC], swap_data),
+    ]
+    follower.apply_logs(logs)
+
+    assert pool.tick == -20
+    assert pool.sqrt_price_x96 == get_sqrt_ratio_at_tick(-20)
+    assert pool.liquidity == 10**18 + 3 * 10**17
+    assert pool.ticks[-60] == 3 * 10**17
+    assert pool.ticks[40] == -3 * 10**17
+
+
+def test_sync_fetches_all_pools_per_range_and_resumes(follower, tmp_path):
+    """Test one eth_getLogs per block range and the last block persists"""
+    follower.track(POOL)
+    w3 = follower.dex.wallet.w3
+    w3.eth.block_number = 100 + MAX_LOG_RANGE + 10
+    w3.eth.get_logs.return_value = []
+
+    assert follower.sync()
+    assert w3.eth.get_logs.call_count == 2
+    first = w3.eth.get_logs.call_args_list[0][0][0]
+    assert first["fromBlock"] == 101 and first["address"] == [POOL]
+    assert first["topics"] == [[SWAP_TOPIC, MINT_TOPIC, BURN_TOPIC]]
+
+    # A restart picks up where the last run stopped without re-snapshotting
+    restarted = PoolStateFollower(follower.dex, path=str(tmp_path / "pool_state.json"))
+    assert restarted.last_block == 100 + MAX_LOG_RANGE + 10
+    assert restarted.track(POOL).ticks == {-100: 10**18, 100: -(10**18)}
+    assert follower.dex.get_pool_snapshot.call_count == 1
+
+
+def test_mint_outside_snapshot_words_is_not_applied(follower):
+    """Test a tick beyond the read words can't make that word look complete"""
+    pool = follower.track(POOL)
+    mint_data = encode(
+        ["address", "uint128", "uint256", "uint256"], [OWNER, 10**17, 1, 1]
+    )
+    follower.apply_logs(
+        [
+            _log(
+                101,
+                0,
+                [MINT_TOPIC, OWNER_TOPIC, _tick_topic(-60), _tick_topic(9000)],
+                mint_data,
+            )
+        ]
+    )
+
+    assert pool.ticks[-60] == 10**17
+    assert 9000 not in pool.ticks
+    assert pool.liquidity == 10**18 + 10**17
+
+
+def test_followers_keep_other_networks_state(follower, tmp_path):
+    """Test a follower for one network doesn't drop another network's pools"""
+    dex = Mock(network="celo", wallet=follower.dex.wallet)
+    dex.get_pool_snapshot.return_value = follower.dex.get_pool_snapshot.return_value
+    celo = PoolStateFollower(dex, path=str(tmp_path / "pool_state.json"))
+    follower.track(POOL)
+    celo.track(POOL)  # Loaded before the base pool was saved
+
+    restarted = PoolStateFollower(follower.dex, path=str(tmp_path / "pool_state.json"))
+    assert POOL in restarted.pools
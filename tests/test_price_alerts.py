@@ -0,0 +1,141 @@
+"""Tests for price alerts"""
+
+import pytest
+from unittest.mock import Mock
+from src.price_alerts import PriceAlertEngine, parse_rule
+
+
+def _engine(tmp_path, **kwargs):
+    fetcher = Mock()
+    return PriceAlertEngine(
+        path=str(tmp_path / "alerts.json"),
+        price_fetcher=fetcher,
+        notifier=Mock(),
+        **kwargs,
+    )
+
+
+def test_parse_rule():
+    """Test thresholds and percent moves parse, and nonsense is rejected"""
+    assert parse_rule(["below", "0.40"]) == {"kind": "below", "threshold": 0.4}
+    assert parse_rule(["above", "$4000"]) == {"kind": "above", "threshold": 4000}
+    assert parse_rule(["+20%", "in", "1h"]) == {
+        "kind": "up",
+        "threshold": 20,
+        "window": 3600,
+    }
+    assert parse_rule(["-5%", "30m"])["kind"] == "down"
+    with pytest.raises(ValueError):
+        parse_rule(["sideways"])
+
+
+def test_one_batched_fetch_for_ruled_tokens(tmp_path):
+    """Test each tick fetches exactly the tokens that have rules, once"""
+    engine = _engine(tmp_path)
+    for threshold in range(100):
+        engine.add("CELO", "below", threshold / 100)
+    engine.add("ETH", "above", 4000)
+    engine.price_fetcher.get_timed_prices.return_value = {
+        "CELO": (0.5, 1000),
+        "ETH": (3000, 1000),
+    }
+
+    engine.check(now=1000)
+
+    engine.price_fetcher.get_timed_prices.assert_called_once_with(["CELO", "ETH"])
+
+
+def test_thresholds_fire_once_when_crossed(tmp_path):
+    """Test only rules crossed since the last tick fire, then cool down"""
+    engine = _engine(tmp_path, cooldown=600, notify_gap=0)
+    low = engine.add("CELO", "below", 0.40)
+    lower = engine.add("CELO", "below", 0.35)
+    engine.add("CELO", "above", 0.60)
+
+    assert engine.check(now=0, prices={"CELO": 0.45}) == []
+    fired = engine.check(now=60, prices={"CELO": 0.38})
+    assert [alert["id"] for alert in fired] == [low["id"]]
+    assert engine.check(now=120, prices={"CELO": 0.37}) == []
+
+    # Bouncing back over the threshold inside the cooldown is debounced
+    engine.check(now=180, prices={"CELO": 0.41})
+    fired = engine.check(now=240, prices={"CELO": 0.30})
+    assert [alert["id"] for alert in fired] == [lower["id"]]
+
+    # last_fired survives a restart
+    assert PriceAlertEngine(path=engine.path).rules[low["id"]]["last_fired"] == 60
+
+
+def test_percent_move_within_window(tmp_path):
+    """Test a move is measured against the oldest price inside the window"""
+    engine = _engine(tmp_path, notify_gap=0)
+    rule = engine.add("DEGEN", "up", 20, window=3600)
+
+    engine.check(now=0, prices={"DEGEN": 0.010})
+    assert engine.check(now=1800, prices={"DEGEN": 0.011}) == []
+    fired = engine.check(now=3000, prices={"DEGEN": 0.0125})
+    assert [alert["id"] for alert in fired] == [rule["id"]]
+    assert fired[0]["value"] == pytest.approx(25)
+
+
+def test_bursts_coalesce_into_one_notification(tmp_path):
+    """Test alerts firing together, or within the gap, share a notification"""
+    engine = _engine(tmp_path, notify_gap=300)
+    for threshold in (1.0, 2.0, 3.0):
+        engine.add("ETH", "above", threshold)
+    engine.add("CELO", "above", 1.0)
+
+    engine.check(now=1000, prices={"ETH": 2.5, "CELO": 0.5})
+    engine.check(now=1060, prices={"ETH": 3.5, "CELO": 1.5})
+    engine.check(now=1400, prices={"ETH": 3.5, "CELO": 1.5})
+
+    notify = engine.notifier.notify_price_alerts
+    assert notify.call_count == 2
+    assert len(notify.call_args_list[0][0][0]) == 2
+    assert len(notify.call_args_list[1][0][0]) == 2
+
+
+def test_stale_prices_are_skipped(tmp_path):
+    """Test a cached price served again, or too old, neither fires nor is recorded"""
+    engine = _engine(tmp_path, notify_gap=0)
+    engine.add("DEGEN", "up", 20, window=3600)
+    above = engine.add("DEGEN", "above", 0.02)
+    fetch = engine.price_fetcher.get_timed_prices
+
+    fetch.return_value = {"DEGEN": (0.010, 0)}
+    engine.check(now=0)
+    # CoinGecko is down: the same cached price comes back with its fetch time
+    fetch.return_value = {"DEGEN": (0.010, 0)}
+    assert engine.check(now=600) == []
+    assert list(engine._history["DEGEN"]) == [(0, 0.010)]
+
+    fetch.return_value = {"DEGEN": (0.030, 700)}
+    assert engine.check(now=1200) == []
+
+    fired = engine.check(now=1200, prices={"DEGEN": 0.030})
+    assert {alert["kind"] for alert in fired} == {"up", "above"}
+    assert above["id"] in [alert["id"] for alert in fired]
+
+
+def test_firing_merges_into_rules_changed_meanwhile(tmp_path):
+    """Test rules added or removed from the CLI during a tick are kept that way"""
+    engine = _engine(tmp_path, notify_gap=0)
+    kept = engine.add("CELO", "below", 0.40)
+    removed = engine.add("CELO", "below", 0.45)
+    cli = PriceAlertEngine(path=engine.path, price_fetcher=Mock(), notifier=Mock())
+    engine.check(now=0, prices={"CELO": 0.50})
+
+    def prices_while_the_cli_runs(tokens):
+        cli.remove(removed["id"])
+        cli.add("ETH", "above", 4000)
+        return {"CELO": (0.30, 60)}
+
+    engine.price_fetcher.get_timed_prices.side_effect = prices_while_the_cli_runs
+    fired = engine.check(now=60)
+
+    assert [alert["id"] for alert in fired] == [kept["id"]]
+    rules = PriceAlertEngine(path=engine.path).list()
+    assert [(rule["token"], rule["last_fired"]) for rule in rules] == [
+        ("CELO", 60),
+        ("ETH", None),
+    ]
@@ -1,3 +1,5 @@
+import time
+from unittest.mock import Mock, patch
 from src.price_fetcher import PriceFetcher
 
 
@@ -28,3 +30,29 @@ def test_get_multiple_prices():
     prices = fetcher.get_multiple_prices(["ETH", "USDC"])
     assert isinstance(prices, dict)
     assert "ETH" in prices or "USDC" in prices
+
+
+def test_get_multiple_prices_single_request():
+    """Test uncached tokens are fetched together and shared IDs once"""
+    fetcher = PriceFetcher()
+    fetcher.cache["USDC"] = (1.0, time.time())
+    response = Mock(status_code=200)
+    response.json.return_value = {"ethereum": {"usd": 3000.0}, "celo": {"usd": 0.5}}
+
+    with patch("src.price_fetcher.requests.get", return_value=response) as get:
+        prices = fetcher.get_multiple_prices(["ETH", "WETH", "CELO", "USDC"])
+
+    assert get.call_count == 1
+    assert get.call_args[1]["params"]["ids"] == "celo,ethereum"
+    assert prices == {"ETH": 3000.0, "WETH": 3000.0, "CELO": 0.5, "USDC": 1.0}
+
+
+def test_timed_prices_keep_the_fetch_time_of_stale_fallbacks():
+    """Test a cached price returned after a failed request keeps its fetch time"""
+    fetcher = PriceFetcher()
+    fetcher.cache["ETH"] = (3000.0, time.time() - 600)
+
+    with patch("src.price_fetcher.requests.get", side_effect=Exception("down")):
+        prices = fetcher.get_timed_prices(["ETH"])
+
+    assert prices == {"ETH": fetcher.cache["ETH"]}
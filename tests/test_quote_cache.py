@@ -0,0 +1,81 @@
+"""Tests for block-pinned quote reuse"""
+
+import time
+from unittest.mock import Mock, patch
+from src.quote_cache import QuoteCache, max_block_drift
+from src.swap_preview import SwapPreview
+
+
+def _quote(block, network="base", quoted_at=None):
+    return {
+        "network": network,
+        "from_token": "ETH",
+        "to_token": "USDC",
+        "from_amount": 0.5,
+        "estimated_output": 1500.0,
+        "block_number": block,
+        "quoted_at": quoted_at if quoted_at is not None else time.time(),
+        "state": {"nonce": 7},
+    }
+
+
+def test_get_within_block_drift():
+    """Test a quote is reused until the chain moves past the drift"""
+    cache = QuoteCache()
+    quote = _quote(100)
+    cache.put(quote)
+
+    drift = max_block_drift("base")
+    assert cache.get("base", "eth", "usdc", 0.5, 100) is quote
+    assert cache.get("base", "ETH", "USDC", 0.5, 100 + drift) is quote
+    assert cache.get("base", "ETH", "USDC", 0.5, 101 + drift) is None
+    assert cache.get("base", "ETH", "USDC", 1.0, 100) is None
+    assert cache.get("base", "ETH", "USDC", 0.5, None) is None
+
+
+def test_expired_quotes_are_not_reused():
+    """Test the TTL applies even if the block hasn't moved"""
+    cache = QuoteCache(ttl=30)
+    cache.put(_quote(100, quoted_at=time.time() - 31))
+    assert cache.get("base", "ETH", "USDC", 0.5, 100) is None
+    assert not cache.is_fresh(_quote(100, quoted_at=time.time() - 31), 100)
+
+
+def test_refresh_quote_reuses_or_requotes():
+    """Test refresh costs one block number read while the quote is fresh"""
+    preview = SwapPreview()
+    wallet = Mock()
+    preview.wallets["base"] = wallet
+    quote = _quote(100)
+
+    wallet.w3.eth.block_number = 101
+    with patch.object(preview, "get_swap_quote") as requote:
+        assert preview.refresh_quote(quote) is quote
+        requote.assert_not_called()
+
+    wallet.w3.eth.block_number = 100 + max_block_drift("base") + 1
+    with patch.object(preview, "get_swap_quote", return_value=_quote(106)) as requote:
+        assert preview.refresh_quote(quote)["block_number"] == 106
+        requote.assert_called_once_with("ETH", "USDC", 0.5, "base")
+
+
+def test_worse_requote_after_confirmation_asks_again(monkeypatch):
+    """Test a re-quote below the confirmed minimum is never executed silently"""
+    from src.cli import _recheck_confirmed_quote
+
+    confirmed = {**_quote(100), "min_output": 1490.0}
+    worse = {**_quote(110), "estimated_output": 1400.0, "min_output": 1393.0}
+    preview = Mock()
+    preview.refresh_quote.return_value = worse
+
+    answers = iter(["no"])
+    monkeypatch.setattr("builtins.input", lambda prompt: next(answers))
+    assert _recheck_confirmed_quote(preview, confirmed, "USDC") is None
+
+    answers = iter(["yes"])
+    assert _recheck_confirmed_quote(preview, confirmed, "USDC") is worse
+
+    # A better re-quote goes ahead without a second prompt
+    better = {**_quote(110), "min_output": 1495.0}
+    preview.refresh_quote.return_value = better
+    assert _recheck_confirmed_quote(preview, confirmed, "USDC") is better
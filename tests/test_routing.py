@@ -0,0 +1,92 @@
+"""Tests for multi-hop route finding"""
+
+import time
+import pytest
+from unittest.mock import patch
+from eth_abi import encode
+from src.dex_integration import UniswapV3Integration
+from src.pool_registry import PoolRegistry
+from src.routing import PoolGraph, RouteFinder, decode_path, encode_path
+
+TEST_KEY = "0x" + "11" * 32
+WETH = "0x4200000000000000000000000000000000000006"
+USDC = "0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913"
+DEGEN = "0x4ed4E862860beD51a9570b96d89aF5E1B0Efefed"
+BRETT = "0x532f27101965dd16442E59d40670FaF5eBB142E4"
+
+
+def _registry(tmp_path, pools):
+    registry = PoolRegistry("base", path=str(tmp_path / "pools.json"))
+    for token_a, token_b, fee, liquidity in pools:
+        registry._store(
+            token_a, token_b, fee, "0x" + "00" * 20, True, liquidity, time.time()
+        )
+    return registry
+
+
+@pytest.fixture
+def dex(monkeypatch, tmp_path):
+    monkeypatch.setenv("PRIVATE_KEY", TEST_KEY)
+    dex = UniswapV3Integration("base")
+    dex.pool_registry = _registry(
+        tmp_path,
+        [
+            (DEGEN, WETH, 3000, 10**20),
+            (DEGEN, WETH, 10000, 10**18),
+            (WETH, USDC, 500, 10**22),
+            (WETH, USDC, 3000, 10**21),
+            (BRETT, WETH, 10000, 10**15),
+        ],
+    )
+    return dex
+
+
+def test_path_round_trip():
+    """Test a path packs to 20 + 23 bytes per hop and unpacks unchanged"""
+    path = encode_path([DEGEN, WETH, USDC], [3000, 500])
+    assert len(path) == 20 + 2 * 23
+    assert decode_path(path) == ([DEGEN, WETH, USDC], [3000, 500])
+
+    with pytest.raises(ValueError):
+        encode_path([DEGEN, WETH], [3000, 500])
+
+
+def test_graph_only_routes_through_hubs(dex):
+    """Test paths are limited to hub intermediates and the deepest tiers"""
+    graph = PoolGraph(dex.pool_registry, max_tiers_per_pair=1)
+    paths = list(graph.iter_paths(DEGEN, USDC, hubs=[WETH, USDC]))
+    assert [(tokens, fees) for tokens, fees, _ in paths] == [
+        ([DEGEN, WETH, USDC], [3000, 500])
+    ]
+
+    # BRETT is not a hub, so DEGEN can't route through it
+    assert list(graph.iter_paths(DEGEN, BRETT, hubs=[USDC])) == []
+
+
+def test_find_route_quotes_all_candidates_once(dex):
+    """Test every candidate path is quoted in one Multicall and the best wins"""
+
+    def quote(amount_out):
+        return True, encode(
+            ["uint256", "uint160[]", "uint32[]", "uint256"],
+            [amount_out, [0, 0], [1, 1], 150_000],
+        )
+
+    with patch.object(dex.pool_registry, "ensure_pairs"):
+        candidates = RouteFinder(dex).candidate_paths(DEGEN, USDC)
+    assert len(candidates) == 4  # 2 DEGEN/WETH tiers x 2 WETH/USDC tiers
+    best_index = candidates.index(([DEGEN, WETH, USDC], [10000, 500]))
+
+    results = [(True, encode(["uint256"], [0]))] + [
+        quote(2_000_000 if i == best_index else 1_000_000)
+        for i in range(len(candidates))
+    ]
+    with patch.object(dex.pool_registry, "ensure_pairs"), patch(
+        "src.routing.Multicall.call", return_value=results
+    ) as call:
+        route = dex.get_route(DEGEN, USDC, 10**21)
+
+    assert call.call_count == 1
+    assert route["fees"] == [10000, 500]
+    assert route["amount_out"] == 2_000_000
+    assert route["path"] == "0x" + encode_path([DEGEN, WETH, USDC], [10000, 500]).hex()
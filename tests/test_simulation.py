@@ -0,0 +1,69 @@
+"""Tests for pre-flight transaction simulation"""
+
+from unittest.mock import Mock, patch
+from eth_abi import encode
+from src.simulation import decode_revert_reason, preflight, simulate_transaction
+
+TX = {
+    "from": "0x1111111111111111111111111111111111111111",
+    "to": "0x2626664c2603336E57B271c5C0b26F421741e481",
+    "data": "0x414bf389",
+    "value": 10**16,
+    "gas": 200000,
+    "gasPrice": 10**9,
+    "nonce": 3,
+}
+
+
+def test_decode_revert_reason():
+    """Test Error(string), Panic(uint256), custom errors and empty data"""
+    error = "0x08c379a0" + encode(["string"], ["Too little received"]).hex()
+    panic = "0x4e487b71" + encode(["uint256"], [0x11]).hex()
+    assert decode_revert_reason(error) == "Too little received"
+    assert "overflow" in decode_revert_reason(panic)
+    assert decode_revert_reason("0xdeadbeef") == "custom error 0xdeadbeef"
+    assert "no reason" in decode_revert_reason("0x")
+
+
+def test_revert_is_rejected_in_one_round_trip():
+    """Test a reverting call stops the transaction with its decoded reason"""
+    revert = "0x08c379a0" + encode(["string"], ["STF"]).hex()
+    responses = [
+        {"error": {"code": 3, "message": "execution reverted: STF", "data": revert}},
+        {"error": {"code": 3, "message": "execution reverted: STF", "data": revert}},
+        {"result": hex(10**18)},
+    ]
+    with patch("src.simulation.batch_call", return_value=responses) as batch:
+        result = simulate_transaction(Mock(), TX)
+
+    assert batch.call_count == 1
+    methods = [method for method, _ in batch.call_args[0][1]]
+    assert methods == ["eth_call", "eth_estimateGas", "eth_getBalance"]
+    assert batch.call_args[0][1][0][1][1] == "pending"
+    assert result == {"success": False, "error": "STF", "gas_limit": None}
+
+
+def test_success_uses_estimate_and_checks_balance():
+    """Test the gas limit comes from the estimate and must be affordable"""
+    responses = [{"result": "0x"}, {"result": hex(100_000)}, {"result": hex(10**18)}]
+    with patch("src.simulation.batch_call", return_value=responses):
+        tx = preflight(Mock(), TX, "Swap")
+    assert tx["gas"] == 120_000
+    assert tx["nonce"] == 3 and TX["gas"] == 200000
+
+    poor = [{"result": "0x"}, {"result": hex(100_000)}, {"result": hex(10**16)}]
+    with patch("src.simulation.batch_call", return_value=poor):
+        result = simulate_transaction(Mock(), TX)
+    assert not result["success"]
+    assert "insufficient" in result["error"]
+
+
+def test_balance_check_uses_the_max_fee_of_eip1559_transactions():
+    """Test gas is counted for transactions priced with maxFeePerGas"""
+    tx = {k: v for k, v in TX.items() if k != "gasPrice"}
+    tx.update(maxFeePerGas=10**12, maxPriorityFeePerGas=10**9, value=0)
+    responses = [{"result": "0x"}, {"result": hex(100_000)}, {"result": hex(10**16)}]
+    with patch("src.simulation.batch_call", return_value=responses):
+        result = simulate_transaction(Mock(), tx)
+    assert not result["success"]
+    assert "insufficient" in result["error"]
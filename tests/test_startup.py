@@ -0,0 +1,61 @@
+"""Tests for CLI start-up cost"""
+
+import os
+import subprocess
+import sys
+from unittest.mock import patch
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cumulative import time allowed for src.cli, in microseconds. Locally it is
+# ~45ms; the headroom is for slow CI machines, not for new eager imports.
+IMPORT_BUDGET_US = 150_000
+
+# Modules that must only load when a command actually needs them
+HEAVY_MODULES = ("web3", "eth_account", "requests", "rich", "plyer")
+
+
+def _importtime(*args):
+    """(module -> cumulative microseconds) for a fresh interpreter"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_help_skips_heavy_imports():
+    """Test --help loads the CLI without web3, requests or rich"""
+    times = _importtime("main.py", "--help")
+
+    assert "src.cli" in times
+    loaded = [m for m in times if m.split(".")[0] in HEAVY_MODULES]
+    assert loaded == []
+
+
+def test_cli_import_within_budget():
+    """Test importing the CLI stays inside the cold-start budget"""
+    # Best of three, so one noisy run doesn't fail the build
+    best = min(_importtime("-c", "import src.cli")["src.cli"] for _ in range(3))
+    assert best < IMPORT_BUDGET_US
+
+
+def test_env_loaded_once():
+    """Test .env is read by the first load_env call only"""
+    from src import config
+
+    with patch("src.config.load_dotenv") as load_dotenv:
+        config.load_env()
+        import src.wallet  # noqa: F401
+
+    load_dotenv.assert_not_called()
@@ -0,0 +1,106 @@
+"""Tests for swap execution"""
+
+import time
+import pytest
+from unittest.mock import Mock, patch
+from src.allowance import AllowanceManager
+from src.swap_executor import ADDRESS_THIS, SWAP_ROUTER02_ABI, SwapExecutor
+
+TEST_KEY = "0x" + "11" * 32
+
+
+@pytest.fixture
+def executor(monkeypatch, tmp_path):
+    monkeypatch.setenv("PRIVATE_KEY", TEST_KEY)
+    executor = SwapExecutor("base")
+    executor.allowances = AllowanceManager(
+        executor.wallet.w3,
+        executor.wallet.address,
+        "base",
+        path=str(tmp_path / "allowances.json"),
+    )
+    return executor
+
+
+def _execute(executor, allowance):
+    """Run a USDC -> ETH swap, capturing signed transactions instead of sending"""
+    signed = []
+    state = {
+        "address": executor.wallet.address,
+        "nonce": 7,
+        "gas_price": 10**9,
+        "balance": 100.0,
+    }
+    with patch("src.allowance.batch_request", return_value=[hex(allowance)]), patch(
+        "src.swap_executor.preflight", side_effect=lambda w3, tx, label: tx
+    ), patch.object(
+        executor.wallet.w3.eth.account,
+        "sign_transaction",
+        side_effect=lambda tx, key: signed.append(tx) or Mock(rawTransaction=b""),
+    ), patch.object(
+        executor.wallet.w3.eth, "send_raw_transaction", return_value=b"\x01"
+    ) as send:
+        executor.execute_swap("USDC", "ETH", 10.0, 0.003, fee=500, state=state)
+    return signed, send
+
+
+def test_approval_pipelined_with_swap(executor):
+    """Test a missing allowance sends approve then swap on consecutive nonces"""
+    signed, send = _execute(executor, allowance=0)
+
+    assert send.call_count == 2
+    assert [tx["nonce"] for tx in signed] == [7, 8]
+    assert signed[0]["to"] == "0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913"
+    assert signed[1]["to"] == executor.router_addresses["base"]
+
+
+def test_existing_allowance_skips_approval(executor):
+    """Test a sufficient cached allowance means a single transaction"""
+    signed, send = _execute(executor, allowance=10**12)
+
+    assert send.call_count == 1
+    assert [tx["nonce"] for tx in signed] == [7]
+    remaining = executor.allowances.get_allowances(
+        ["0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913"],
+        executor.router_addresses["base"],
+    )
+    assert list(remaining.values()) == [10**12 - 10_000_000]
+
+
+def test_swap_to_eth_unwraps_in_same_transaction(executor):
+    """Test a swap to ETH is one multicall ending in unwrapWETH9"""
+    signed, _ = _execute(executor, allowance=10**12)
+
+    router = executor.wallet.w3.eth.contract(abi=SWAP_ROUTER02_ABI)
+    fn, args = router.decode_function_input(signed[0]["data"])
+    assert fn.fn_name == "multicall"
+    assert args["deadline"] > time.time()
+
+    names = []
+    for call in args["data"]:
+        inner, inner_args = router.decode_function_input(call)
+        names.append(inner.fn_name)
+        if inner.fn_name == "exactInputSingle":
+            assert inner_args["params"]["recipient"] == ADDRESS_THIS
+        if inner.fn_name == "unwrapWETH9":
+            assert inner_args["amountMinimum"] == 3 * 10**15
+            assert inner_args["recipient"] == executor.wallet.address
+    assert names == ["exactInputSingle", "unwrapWETH9"]
+    assert signed[0]["value"] == 0
+
+
+def test_missing_fee_uses_deepest_registry_tier(executor):
+    """Test a swap without a quoted tier takes the registry's deepest one"""
+    with patch("src.pool_registry.PoolRegistry.ensure_pairs"), patch(
+        "src.pool_registry.PoolRegistry.live_fee_tiers", return_value=[500, 3000]
+    ):
+        leg = executor._resolve_swap(
+            {
+                "from_token": "USDC",
+                "to_token": "ETH",
+                "amount": 10.0,
+                "min_amount_out": 0.003,
+            }
+        )
+
+    assert leg["fee"] == 500
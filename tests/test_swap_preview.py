@@ -0,0 +1,43 @@
+"""Tests for swap preview sizing"""
+
+import pytest
+from unittest.mock import Mock
+from src.swap_preview import SwapPreview, ladder_sizes
+
+
+def test_ladder_sizes_are_log_spaced():
+    """Test the automatic ladder spans two decades either side of the amount"""
+    sizes = ladder_sizes(1.0)
+    assert sizes[0] == 0.01 and sizes[-1] == 100.0
+    assert 1.0 in sizes
+    assert len(sizes) == 9
+    ratios = [b / a for a, b in zip(sizes, sizes[1:])]
+    assert all(ratio == pytest.approx(10**0.5, rel=1e-4) for ratio in ratios)
+
+
+def test_swap_ladder_price_impact():
+    """Test each size's rate is compared with the reference quote"""
+    preview = SwapPreview()
+    dex = Mock()
+    dex.get_quote_ladder.return_value = {
+        "reference_in": 10**14,
+        "reference_out": 300_000,  # 3000 USDC per ETH
+        "source": "quoter",
+        "quotes": [
+            {"amount_in": 10**18, "amount_out": 2_997_000_000, "fee": 500},
+            {"amount_in": 10**20, "amount_out": 270_000_000_000, "fee": 3000},
+        ],
+    }
+    preview.dex_integrations["base"] = dex
+
+    ladder = preview.get_swap_ladder("ETH", "USDC", [100, 1], "base")
+
+    # ETH is quoted as WETH and sizes are sorted before quoting
+    args = dex.get_quote_ladder.call_args[0]
+    assert args[0] == "0x4200000000000000000000000000000000000006"
+    assert args[2] == [10**18, 10**20]
+    assert ladder["spot_rate"] == pytest.approx(3000)
+    small, large = ladder["rows"]
+    assert small["price_impact"] == pytest.approx(0.1)
+    assert large["price_impact"] == pytest.approx(10.0)
+    assert large["fee_tier"] == 3000
@@ -0,0 +1,71 @@
+"""Tests for spam token classification"""
+
+from unittest.mock import Mock
+from src.token_filter import TokenClassifier
+from src.token_registry import TokenRegistry
+
+ADDRESS = "0x1234567890123456789012345678901234567890"
+
+
+def test_suspicious_symbols():
+    """Test scam-looking symbols are flagged and real ones are not"""
+    classifier = TokenClassifier()
+    assert classifier.is_suspicious_symbol("Telegram @TronVanity88_bot")
+    assert classifier.is_suspicious_symbol("Visit usdc-claim.com")
+    assert classifier.is_suspicious_symbol("ᗪEGEN")
+    assert not classifier.is_suspicious_symbol("USDC")
+    assert not classifier.is_suspicious_symbol("G$")
+    assert not classifier.is_suspicious_symbol("delvin233")
+
+
+def test_classify_known_token_is_not_spam():
+    """Test a priced token is never spam even if only received"""
+    result = TokenClassifier().classify("ZORA", {"address": "0xaaa", "sent": False})
+    assert not result["spam"]
+    assert result["spam_reasons"] == ["unsolicited"]
+
+
+def test_liquidity_check_only_for_undecided_tokens():
+    """Test the on-chain check settles unpriceable airdrops"""
+    checker = Mock(return_value=False)
+    classifier = TokenClassifier(liquidity_checker=checker)
+
+    airdrop = classifier.classify("FREEBIE", {"address": "0xbbb", "sent": False})
+    assert airdrop["spam"]
+    assert "no_liquidity" in airdrop["spam_reasons"]
+    checker.assert_called_once_with("0xbbb")
+
+    # Obvious spam is decided without spending an RPC call
+    checker.reset_mock()
+    scam = classifier.classify("claim-rewards.io", {"address": "0xccc"})
+    assert scam["spam"]
+    checker.assert_not_called()
+
+
+def test_registry_hides_spam(tmp_path):
+    """Test spam classification is persisted and filtered from hot paths"""
+    path = str(tmp_path / "tokens.json")
+    registry = TokenRegistry(path)
+    registry.update(
+        "celo",
+        ADDRESS,
+        {
+            "0xaaa": {
+                "symbol": "G$",
+                "address": "0xaaa",
+                "last_seen_block": 10,
+                "sent": True,
+            },
+            "0xbbb": {
+                "symbol": "www.scam.xyz",
+                "address": "0xbbb",
+                "last_seen_block": 11,
+            },
+        },
+    )
+    registry.classify("celo", ADDRESS, TokenClassifier())
+
+    reloaded = TokenRegistry(path)
+    assert reloaded.get_tokens("celo", ADDRESS) == {"G$": "0xaaa"}
+    assert reloaded.get_spam_tokens("celo", ADDRESS) == {"www.scam.xyz": "0xbbb"}
+    assert len(reloaded.get_tokens("celo", ADDRESS, include_spam=True)) == 2
@@ -0,0 +1,157 @@
+"""Tests for the persistent token registry"""
+
+from unittest.mock import Mock
+from src.token_registry import TokenRegistry
+
+ADDRESS = "0x1234567890123456789012345678901234567890"
+
+
+def test_registry_empty(tmp_path):
+    """Test reading a registry that does not exist yet"""
+    registry = TokenRegistry(str(tmp_path / "tokens.json"))
+    assert registry.get_entry("base", ADDRESS) is None
+    assert registry.get_tokens("base", ADDRESS) == {}
+    assert registry.is_stale("base", ADDRESS)
+
+
+def test_registry_persists_tokens(tmp_path):
+    """Test tokens survive a reload and the last block is tracked"""
+    path = str(tmp_path / "tokens.json")
+    registry = TokenRegistry(path)
+    registry.update(
+        "celo",
+        ADDRESS,
+        {
+            "0xaaa": {"symbol": "cUSD", "address": "0xaaa", "last_seen_block": 100},
+            "0xbbb": {"symbol": "G$", "address": "0xbbb", "last_seen_block": 250},
+        },
+    )
+
+    reloaded = TokenRegistry(path)
+    assert reloaded.get_tokens("celo", ADDRESS.upper()) == {
+        "cUSD": "0xaaa",
+        "G$": "0xbbb",
+    }
+    assert reloaded.get_entry("celo", ADDRESS)["last_block"] == 250
+    assert not reloaded.is_stale("celo", ADDRESS)
+
+
+def test_reload_picks_up_other_writers(tmp_path):
+    """Test a long-lived registry sees entries another process saved"""
+    path = str(tmp_path / "tokens.json")
+    warm = TokenRegistry(path)
+    TokenRegistry(path).update(
+        "base",
+        ADDRESS,
+        {"0xccc": {"symbol": "DEGEN", "address": "0xccc", "last_seen_block": 7}},
+    )
+
+    warm.reload(force=False)
+    assert warm.get_tokens("base", ADDRESS) == {"DEGEN": "0xccc"}
+
+
+def test_refresh_only_fetches_delta(tmp_path):
+    """Test refresh asks for activity after the last seen block"""
+    registry = TokenRegistry(str(tmp_path / "tokens.json"))
+    registry.update(
+        "ethereum",
+        ADDRESS,
+        {"0xccc": {"symbol": "USDT", "address": "0xccc", "last_seen_block": 500}},
+    )
+
+    tx_history = Mock()
+    tx_history.discover_token_activity.return_value = {
+        "0xddd": {"symbol": "ZORA", "address": "0xddd", "last_seen_block": 650}
+    }
+
+    tokens = registry.refresh("ethereum", ADDRESS, tx_history)
+
+    tx_history.discover_token_activity.assert_called_once_with(ADDRESS, 501)
+    assert tokens == {"USDT": "0xccc", "ZORA": "0xddd"}
+    assert registry.get_entry("ethereum", ADDRESS)["last_block"] == 650
+
+
+def test_writers_do_not_drop_each_others_entries(tmp_path):
+    """Test two long-lived registries merge into the file instead of overwriting"""
+    path = str(tmp_path / "tokens.json")
+    cli, daemon = TokenRegistry(path), TokenRegistry(path)
+    cli.update("base", ADDRESS, {"0xccc": {"symbol": "DEGEN", "address": "0xccc"}})
+    daemon.update("celo", ADDRESS, {"0xaaa": {"symbol": "cUSD", "address": "0xaaa"}})
+
+    reloaded = TokenRegistry(path)
+    assert reloaded.get_tokens("base", ADDRESS) == {"DEGEN": "0xccc"}
+    assert reloaded.get_tokens("celo", ADDRESS) == {"cUSD": "0xaaa"}
+
+
+def test_classify_scores_outside_the_lock(tmp_path):
+    """Test slow liquidity checks don't block other registry users"""
+    registry = TokenRegistry(str(tmp_path / "tokens.json"))
+    registry.update("base", ADDRESS, {"0xddd": {"symbol": "ZORA", "address": "0xddd"}})
+
+    def classify(symbol, info):
+        assert not registry._lock.locked()
+        return {"spam": True, "spam_score": 3, "spam_reasons": []}
+
+    registry.classify("base", ADDRESS, Mock(classify=Mock(side_effect=classify)))
+    assert registry.get_spam_tokens("base", ADDRESS) == {"ZORA": "0xddd"}
+
+
+def test_impostor_with_a_known_symbol_is_classified_separately(tmp_path):
+    """Test a second contract named like a clean token gets its own verdict"""
+    registry = TokenRegistry(str(tmp_path / "tokens.json"))
+    registry.update(
+        "base", ADDRESS, {"0xaaa": {"symbol": "USDC", "address": "0xaaa", "sent": True}}
+    )
+    classifier = Mock()
+    classifier.classify.return_value = {"spam": False, "spam_score": 0}
+    registry.classify("base", ADDRESS, classifier)
+
+    registry.update("base", ADDRESS, {"0xbad": {"symbol": "USDC", "address": "0xbad"}})
+    classifier.classify.return_value = {"spam": True, "spam_score": 3}
+    registry.classify("base", ADDRESS, classifier)
+
+    assert classifier.classify.call_count == 2
+    assert registry.get_tokens("base", ADDRESS) == {"USDC": "0xaaa"}
+    assert registry.get_spam_tokens("base", ADDRESS) == {"USDC (0xbad)": "0xbad"}
+
+
+def test_symbol_keyed_registry_files_are_rekeyed(tmp_path):
+    """Test a registry written before tokens were keyed by address still loads"""
+    path = tmp_path / "tokens.json"
+    path.write_text(
+        '{"base:0xabc": {"last_block": 5, "refreshed_at": 0,'
+        ' "tokens": {"DEGEN": {"address": "0xCCC", "spam": false}}}}'
+    )
+
+    registry = TokenRegistry(str(path))
+    assert registry.get_entry("base", "0xabc")["tokens"] == {
+        "0xccc": {"symbol": "DEGEN", "address": "0xCCC", "spam": False}
+    }
+
+
+def test_background_refresh_finishes_before_exit(tmp_path):
+    """Test a one-shot run still classifies the tokens its refresh found"""
+    import subprocess
+    import sys
+
+    path = str(tmp_path / "tokens.json")
+    script = f"""
+import time
+from unittest.mock import Mock
+from src.token_registry import TokenRegistry
+
+def classify(symbol, info):
+    time.sleep(0.5)
+    return {{"spam": True, "spam_score": 3}}
+
+tx_history = Mock()
+tx_history.discover_token_activity.return_value = {{
+    "0xddd": {{"symbol": "ZORA", "address": "0xddd"}}
+}}
+TokenRegistry({path!r}).refresh_in_background(
+    "base", {ADDRESS!r}, tx_history, Mock(classify=classify)
+)
+"""
+    subprocess.run([sys.executable, "-c", script], check=True)
+
+    assert TokenRegistry(path).get_spam_tokens("base", ADDRESS) == {"ZORA": "0xddd"}
@@ -84,3 +84,144 @@ def test_parse_eth_transactions():
     assert tx["token"] == "ETH"
     assert tx["amount"] == 1.0
     assert tx["status"] == "Success"
+
+
+def test_iter_raw_pages_walks_block_ranges():
+    """Test full-history paging restarts at the last block without duplicates"""
+    tx_history = TransactionHistory("ethereum")
+    tx_history.etherscan_api_key = "test"
+    tx_history._finalized_block = 0  # Skip the finalized-range phase
+
+    def raw(block, index):
+        return {"hash": f"0x{block}{index}", "blockNumber": str(block), "logIndex": "0"}
+
+    pages = {
+        0: [raw(1, 0), raw(2, 0), raw(3, 0)],
+        3: [raw(3, 0), raw(3, 1), raw(4, 0)],
+        4: [raw(4, 0)],
+    }
+
+    def fake_get(url, params, timeout):
+        response = Mock()
+        response.status_code = 200
+        response.json.return_value = {
+            "status": "1",
+            "result": pages[params["startblock"]],
+        }
+        return response
+
+    with patch.object(tx_history.etherscan, "get", side_effect=fake_get):
+        records = [
+            tx
+            for page in tx_history._iter_raw_pages("txlist", "0xabc", page_size=3)
+            for tx in page
+        ]
+
+    assert [tx["hash"] for tx in records] == ["0x10", "0x20", "0x30", "0x31", "0x40"]
+
+
+def test_iter_raw_pages_pages_within_a_crowded_block():
+    """Test a block with more records than a page is paged, not skipped"""
+    tx_history = TransactionHistory("ethereum")
+    tx_history.etherscan_api_key = "test"
+    tx_history._finalized_block = 0
+
+    def raw(block, index):
+        return {"hash": f"0x{block}{index}", "blockNumber": str(block), "logIndex": "0"}
+
+    crowded = [raw(5, index) for index in range(5)]
+
+    def fake_get(url, params, timeout):
+        if params["startblock"] == params["endblock"]:
+            page = params["page"]
+            result = crowded[(page - 1) * 2 : page * 2]
+        elif params["startblock"] == 0:
+            result = [raw(4, 0), raw(5, 0)]
+        elif params["startblock"] == 5:
+            result = crowded[:2]
+        else:
+            result = [raw(6, 0)]
+        response = Mock()
+        response.status_code = 200
+        response.json.return_value = {"status": "1", "result": result}
+        return response
+
+    with patch.object(tx_history.etherscan, "get", side_effect=fake_get):
+        records = [
+            tx["hash"]
+            for page in tx_history._iter_raw_pages("tokentx", "0xabc", page_size=2)
+            for tx in page
+        ]
+
+    assert records == ["0x40", "0x50", "0x51", "0x52", "0x53", "0x54", "0x60"]
+
+
+def test_merge_transaction_histories():
+    """Test per-network histories are merged newest first and limited"""
+    from src.transaction_history import merge_transaction_histories
+
+    ethereum = [{"timestamp": 50, "network": "ethereum"}, {"timestamp": 10}]
+    celo = [{"timestamp": 40, "network": "celo"}, {"timestamp": 30}]
+    base = []
+
+    merged = merge_transaction_histories([ethereum, celo, base], limit=3)
+
+    assert [tx["timestamp"] for tx in merged] == [50, 40, 30]
+
+
+def test_aggregate_summaries():
+    """Test totals add up USD values already priced per chain"""
+    from src.transaction_history import aggregate_summaries
+
+    summaries = {
+        "ethereum": {
+            "total_transactions": 2,
+            "total_sent_usd": 10.0,
+            "total_received_usd": 5.0,
+            "total_gas_spent_usd": 3.0,
+            "net_flow_usd": -5.0,
+        },
+        "celo": {
+            "total_transactions": 1,
+            "total_sent_usd": 0.0,
+            "total_received_usd": 2.0,
+            "total_gas_spent_usd": 0.01,
+            "net_flow_usd": 2.0,
+        },
+    }
+
+    totals = aggregate_summaries(summaries)
+
+    assert totals["total_transactions"] == 3
+    assert totals["total_gas_spent_usd"] == 3.01
+    assert totals["net_flow_usd"] == -3.0
+    assert totals["networks"] is summaries
+
+
+def test_discovery_fallback_runs_on_incremental_refresh():
+    """Test Base keeps finding tokens after the first run seeded the registry"""
+    tx_history = TransactionHistory("base")
+    tx_history._get_raw_token_transactions = Mock(return_value=[])
+    tx_history._discover_tokens_from_parsed_history = Mock(
+        return_value={"ZORA": "0xddd"}
+    )
+
+    activity = tx_history.discover_token_activity(
+        "0x1234567890123456789012345678901234567890", start_block=1
+    )
+    assert activity["0xddd"]["symbol"] == "ZORA"
+
+
+def test_fetch_all_networks_skips_testnets_and_collects_errors():
+    """Test --all totals leave testnets out and failures are returned, not printed"""
+    from src.transaction_history import fetch_all_networks
+
+    def fetch(tx_history):
+        if tx_history.network == "celo":
+            raise ValueError("rate limited")
+        return tx_history.network
+
+    results, errors = fetch_all_networks(fetch)
+
+    assert results == {"base": "base", "ethereum": "ethereum"}
+    assert errors == {"celo": "rate limited"}
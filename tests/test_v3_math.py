@@ -0,0 +1,128 @@
+"""Tests for local Uniswap V3 swap math"""
+
+import pytest
+from decimal import Decimal, ROUND_FLOOR, getcontext
+from src.v3_math import (
+    MAX_SQRT_RATIO,
+    MAX_TICK,
+    MIN_SQRT_RATIO,
+    MIN_TICK,
+    Q96,
+    InsufficientTickData,
+    V3Pool,
+    compute_swap_step,
+    get_sqrt_ratio_at_tick,
+    get_tick_at_sqrt_ratio,
+)
+
+WETH = "0x4200000000000000000000000000000000000006"
+USDC = "0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913"
+
+
+def encode_price_sqrt(reserve1, reserve0):
+    """Same helper the v3-core tests use (40 decimal places, floored)"""
+    getcontext().prec = 80
+    root = (Decimal(reserve1) / Decimal(reserve0)).sqrt()
+    root = root.quantize(Decimal(10) ** -40, rounding=ROUND_FLOOR)
+    return int((root * Q96).to_integral_value(rounding=ROUND_FLOOR))
+
+
+def test_tick_math_bounds():
+    """Test the contract's published bounds and round trips"""
+    assert get_sqrt_ratio_at_tick(MIN_TICK) == MIN_SQRT_RATIO
+    assert get_sqrt_ratio_at_tick(MAX_TICK) == MAX_SQRT_RATIO
+    assert get_sqrt_ratio_at_tick(0) == Q96
+    for tick in [MIN_TICK, -200_000, -1, 0, 1, 60, 199_999, MAX_TICK - 1]:
+        sqrt_price = get_sqrt_ratio_at_tick(tick)
+        assert get_tick_at_sqrt_ratio(sqrt_price) == tick
+        assert get_tick_at_sqrt_ratio(sqrt_price + 1) == tick
+    with pytest.raises(ValueError):
+        get_sqrt_ratio_at_tick(MAX_TICK + 1)
+
+
+def test_compute_swap_step_matches_core_vectors():
+    """Test against the SwapMath vectors from the v3-core test suite"""
+    price = encode_price_sqrt(1, 1)
+    target = encode_price_sqrt(101, 100)
+    liquidity, amount = 2 * 10**18, 10**18
+
+    # Exact input capped at the price target, one for zero
+    sqrt_next, amount_in, amount_out, fee = compute_swap_step(
+        price, target, liquidity, amount, 600
+    )
+    assert sqrt_next == target
+    assert amount_in == 9975124224178055
+    assert amount_out == 9925619580021728
+    assert fee == 5988667735148
+
+    # Exact input fully spent before the target
+    sqrt_next, amount_in, amount_out, fee = compute_swap_step(
+        price, encode_price_sqrt(1000, 100), liquidity, amount, 600
+    )
+    assert sqrt_next < encode_price_sqrt(1000, 100)
+    assert amount_in == 999400000000000000
+    assert amount_out == 666399946655997866
+    assert fee == 600000000000000
+
+
+@pytest.fixture
+def pool():
+    """Recorded-style snapshot: a wide range with a narrow range above price"""
+    return V3Pool(
+        token0=WETH,
+        token1=USDC,
+        fee=3000,
+        tick_spacing=60,
+        sqrt_price_x96=get_sqrt_ratio_at_tick(30),
+        tick=30,
+        liquidity=3 * 10**18,
+        ticks={-6000: 10**18, -600: 2 * 10**18, 600: -2 * 10**18, 6000: -(10**18)},
+        word_range=(-2, 1),
+    )
+
+
+def test_quote_within_one_range(pool):
+    """Test a small swap matches one compute_swap_step"""
+    amount_in = 10**15
+    _, _, expected, _ = compute_swap_step(
+        pool.sqrt_price_x96, get_sqrt_ratio_at_tick(0), pool.liquidity, amount_in, 3000
+    )
+    assert pool.quote(amount_in, True) == expected
+    assert pool.quote_token(WETH, amount_in) == expected
+    assert pool.quote_token("0x" + "00" * 20, amount_in) is None
+
+
+def test_quote_crosses_ticks(pool):
+    """Test liquidity drops after crossing tick -600, so output per unit falls"""
+    small, large = pool.quote_many([10**16, 2 * 10**17], True)
+    assert 0 < small and 0 < large
+    assert large / (2 * 10**17) < small / 10**16
+
+    # Walking the same swap by hand across the crossing gives the same output
+    remaining, out = 2 * 10**17, 0
+    sqrt_price, liquidity = pool.sqrt_price_x96, pool.liquidity
+    for tick_next, net in [(0, 0), (-600, 2 * 10**18), (-6000, 10**18)]:
+        target = get_sqrt_ratio_at_tick(tick_next)
+        sqrt_price, step_in, step_out, fee = compute_swap_step(
+            sqrt_price, target, liquidity, remaining, 3000
+        )
+        remaining -= step_in + fee
+        out += step_out
+        liquidity -= net
+        if remaining == 0:
+            break
+    assert large == out
+
+
+def test_quote_outside_snapshot_raises(pool):
+    """Test swaps that would leave the read bitmap words are refused"""
+    pool.word_range = (0, 0)
+    with pytest.raises(InsufficientTickData):
+        pool.quote(10**24, True)
+
+
+def test_snapshot_round_trip(pool):
+    """Test snapshots survive JSON-friendly serialization"""
+    restored = V3Pool.from_dict(pool.to_dict())
+    assert restored.quote(10**17, False) == pool.quote(10**17, False)
+    assert restored.ticks == pool.ticks